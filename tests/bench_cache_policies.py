@@ -0,0 +1,97 @@
+"""Benchmark — cache hit rates per eviction policy on a replayed access trace.
+
+Usage:
+    python tests/bench_cache_policies.py [trace_file] [max_entries]
+
+*trace_file* is a lookup log recorded with ``TINKYWIKI_CACHE_TRACE``
+(``<time>\\t<namespace>\\t<key>`` per line); without one, a synthetic
+trace is used: a team working on a small set of repos all day while an
+agent scans long runs of one-off repos.  Each namespace is replayed
+through a real ``cache._BudgetCache`` per policy (insert on miss), sized
+with the configured entry cap of that cache unless *max_entries* is
+given.  Prints the hit rate of every policy per namespace.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tinkywiki_mcp import config  # noqa: E402
+from tinkywiki_mcp.cache import _BudgetCache  # noqa: E402  # pylint: disable=protected-access
+from tinkywiki_mcp.eviction import POLICY_LRU, POLICY_TINYLFU  # noqa: E402
+
+POLICIES = (POLICY_LRU, POLICY_TINYLFU)
+
+_ENTRY_CAPS = {
+    "html": config.CACHE_MAX_SIZE,
+    "parsed": config.PARSED_CACHE_MAX_SIZE,
+    "search": config.SEARCH_CACHE_MAX_SIZE,
+    "topic": config.TOPIC_CACHE_MAX_SIZE,
+    "section": config.SECTION_CACHE_MAX_SIZE,
+}
+
+
+def synthetic_trace(
+    lookups: int = 20000, hot_repos: int = 20, scan_every: int = 400, scan_length: int = 60,
+    seed: int = 7,
+) -> list[tuple[str, str]]:
+    """Zipf-ish lookups of *hot_repos*, plus a scan of one-off repos every *scan_every*."""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(hot_repos)]
+    hot = [f"https://github.com/team/repo-{i}" for i in range(hot_repos)]
+    trace: list[tuple[str, str]] = []
+    one_off = 0
+    while len(trace) < lookups:
+        if len(trace) % scan_every == 0:
+            for _ in range(scan_length):
+                one_off += 1
+                trace.append(("parsed", f"https://github.com/scan/repo-{one_off}"))
+        trace.append(("parsed", rng.choices(hot, weights)[0]))
+    return trace[:lookups]
+
+
+def load_trace(path: str) -> list[tuple[str, str]]:
+    """Read a ``TINKYWIKI_CACHE_TRACE`` log."""
+    trace = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) == 3:
+                trace.append((parts[1], parts[2]))
+    return trace
+
+
+def replay(keys: list[str], policy: str, max_entries: int) -> float:
+    """Hit rate of *keys* through a cache of *max_entries* using *policy*."""
+    cache = _BudgetCache(max_bytes=1 << 40, max_entries=max_entries, ttl=1e9, policy=policy)
+    hits = 0
+    for key in keys:
+        if cache.get(key) is not None:
+            hits += 1
+        else:
+            cache[key] = key
+    return hits / len(keys) if keys else 0.0
+
+
+def main() -> None:
+    trace = load_trace(sys.argv[1]) if len(sys.argv) > 1 else synthetic_trace()
+    max_entries = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    by_namespace: dict[str, list[str]] = defaultdict(list)
+    for namespace, key in trace:
+        by_namespace[namespace].append(key)
+
+    print(f"{'namespace':<10} {'lookups':>8} {'entries':>8} "
+          + " ".join(f"{name:>8}" for name in POLICIES))
+    for namespace, keys in sorted(by_namespace.items()):
+        size = max_entries or _ENTRY_CAPS.get(namespace, config.CACHE_MAX_SIZE)
+        rates = " ".join(f"{replay(keys, name, size):>8.1%}" for name in POLICIES)
+        print(f"{namespace:<10} {len(keys):>8} {size:>8} {rates}")
+
+
+if __name__ == "__main__":
+    main()
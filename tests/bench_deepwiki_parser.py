@@ -0,0 +1,114 @@
+"""Benchmark — DeepWiki content parser, previous vs. single-pass implementation.
+
+Usage:
+    python tests/bench_deepwiki_parser.py [iterations]
+
+Parses the saved DeepWiki pages in ``tests/fixtures/`` with the previous
+selector-loop parser (kept below for reference) and the current
+``deepwiki._parse_deepwiki_content``, checks both produce the same
+sections, and prints the mean time per page.  HTML parsing itself
+(``BeautifulSoup(...)``) is excluded — only content extraction is timed.
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup, Tag
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tinkywiki_mcp import config  # noqa: E402
+from tinkywiki_mcp.deepwiki import _parse_deepwiki_content  # noqa: E402
+from tinkywiki_mcp.parser import WikiSection, _extract_text, _tag_to_markdown  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def legacy_parse_deepwiki_content(soup: BeautifulSoup) -> list[WikiSection]:
+    """The selector-loop parser as it was before the single-pass rewrite."""
+    sections: list[WikiSection] = []
+    main = None
+    for sel in config.DEEPWIKI_CONTENT_SELECTORS:
+        if sel.startswith("."):
+            main = soup.find(class_=re.compile(sel[1:], re.I))
+        elif sel.startswith("["):
+            attr_match = re.match(r"\[(\w+)\*='([^']+)'\]", sel)
+            if attr_match:
+                _an, _av = attr_match.group(1), attr_match.group(2)
+                main = soup.find(lambda tag, an=_an, av=_av: tag and av.lower() in (str(tag.get(an, "")) or "").lower() if hasattr(tag, 'get') else False)  # type: ignore[call-overload]
+        else:
+            main = soup.find(sel)
+        if main:
+            break
+    if not main:
+        main = soup.find("body")
+    if not main:
+        return sections
+
+    current_section: WikiSection | None = None
+    content_parts: list[str] = []
+    all_headings = main.find_all(re.compile(r"h[1-6]"))
+    if not all_headings:
+        text = _extract_text(main) if isinstance(main, Tag) else main.get_text(strip=True)
+        if text and len(text) > 50:
+            sections.append(WikiSection(title="Overview", level=1, content=text))
+        return sections
+
+    for heading in all_headings:
+        if current_section is not None:
+            current_section.content = "\n".join(content_parts).strip()
+            sections.append(current_section)
+            content_parts = []
+        title = re.sub(r"\s*\[Image:.*?\]\s*$", "", heading.get_text(strip=True)).strip()
+        current_section = WikiSection(title=title, level=int(heading.name[1]))
+        for sibling in heading.find_next_siblings():
+            if isinstance(sibling, Tag):
+                if re.match(r"h[1-6]", sibling.name or ""):
+                    break
+                text = _tag_to_markdown(sibling)
+                if text:
+                    content_parts.append(text)
+
+    if current_section is not None:
+        current_section.content = "\n".join(content_parts).strip()
+        sections.append(current_section)
+    return sections
+
+
+def _time(fn, soup: BeautifulSoup, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(soup)
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def _run(html: str, iterations: int) -> tuple[float, float]:
+    soup = BeautifulSoup(html, "lxml")
+    assert legacy_parse_deepwiki_content(soup) == _parse_deepwiki_content(soup)
+    return (
+        _time(legacy_parse_deepwiki_content, soup, iterations),
+        _time(_parse_deepwiki_content, soup, iterations),
+    )
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(f"{'fixture':<32} {'legacy ms':>10} {'current ms':>11} {'speedup':>8}")
+    for path in sorted(FIXTURES.glob("deepwiki_*.html")):
+        legacy_ms, current_ms = _run(path.read_text(encoding="utf-8"), iterations)
+        print(f"{path.name:<32} {legacy_ms:>10.2f} {current_ms:>11.2f} {legacy_ms / current_ms:>7.1f}x")
+
+    # A page with no <article>/<main>/.prose forces a scan for every selector
+    bare = (FIXTURES / "deepwiki_topic_page.html").read_text(encoding="utf-8")
+    bare = bare.replace("<main", "<section").replace("</main>", "</section>")
+    bare = bare.replace("prose-custom prose", "markdown-body")
+    legacy_ms, current_ms = _run(bare, iterations)
+    print(f"{'(topic page, late selector)':<32} {legacy_ms:>10.2f} {current_ms:>11.2f} {legacy_ms / current_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark — GitHub fallback page over REST vs. GraphQL.
+
+Usage:
+    python tests/bench_github_backends.py [iterations] [latency_ms]
+
+Builds the fallback ``WikiPage`` for a sample repository through the
+in-process GitHub stub (``tests/github_stub.py``), which sleeps
+*latency_ms* per request to stand in for the network round-trip.  Prints
+the mean wall time per page, the requests issued and the rate-limit cost
+of each backend (REST: one request of the 5000/h core budget per call;
+GraphQL: the query's point cost against the 5000 points/h budget).
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tinkywiki_mcp import config, github_client  # noqa: E402
+from tinkywiki_mcp.cache import clear_cache  # noqa: E402
+from tinkywiki_mcp.github_api import fetch_github_wiki_page  # noqa: E402
+from tinkywiki_mcp.github_client import reset_github_client  # noqa: E402
+from tests.github_stub import GitHubStub, sample_repo  # noqa: E402
+
+REPO_URL = "https://github.com/octo/widget"
+
+
+def _run(graphql: bool, iterations: int, latency: float) -> tuple[float, int, int, object]:
+    stub = GitHubStub([sample_repo()], latency=latency)
+    github_client._transport = stub.transport()  # pylint: disable=protected-access
+    reset_github_client()
+    config.GITHUB_TOKEN = "bench-token"
+    config.GITHUB_GRAPHQL_ENABLED = graphql
+
+    page = None
+    start = time.perf_counter()
+    for _ in range(iterations):
+        clear_cache()  # measure cold fetches, not the metadata cache
+        page = fetch_github_wiki_page(REPO_URL)
+    elapsed_ms = (time.perf_counter() - start) / iterations * 1000
+    return elapsed_ms, len(stub.requests) // iterations, stub.rest_calls + stub.graphql_cost, page
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 50.0) / 1000
+
+    rest_ms, rest_requests, rest_cost, rest_page = _run(False, iterations, latency)
+    gql_ms, gql_requests, gql_cost, gql_page = _run(True, iterations, latency)
+    assert rest_page == gql_page, "backends produced different pages"
+
+    print(f"{'backend':<10} {'ms/page':>9} {'requests':>9} {'rate-limit cost':>16}")
+    print(f"{'REST':<10} {rest_ms:>9.1f} {rest_requests:>9} {rest_cost // iterations:>16}")
+    print(f"{'GraphQL':<10} {gql_ms:>9.1f} {gql_requests:>9} {gql_cost // iterations:>16}")
+
+
+if __name__ == "__main__":
+    main()
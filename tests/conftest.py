@@ -4,11 +4,22 @@ from __future__ import annotations
 
 from typing import Any
 
+import httpx
 import pytest
 
+from tinkywiki_mcp import config, github_client, http_client
+from tinkywiki_mcp.background import reset_background
 from tinkywiki_mcp.cache import clear_cache
+from tinkywiki_mcp.circuit_breaker import reset_breakers
+from tinkywiki_mcp.github_client import reset_github_client
+from tinkywiki_mcp.http_client import reset_http_client
+from tinkywiki_mcp.local_index import clear_indexes
 from tinkywiki_mcp.parser import WikiPage, WikiSection
 from tinkywiki_mcp.rate_limit import reset_rate_limits
+from tinkywiki_mcp.refresh_ahead import reset_refresh_ahead
+from tinkywiki_mcp.retry import reset_retry_stats
+from tinkywiki_mcp.storage import close_all_stores
+from tinkywiki_mcp.warmup import reset_warmup
 
 # ---------------------------------------------------------------------------
 # Sample data
@@ -70,17 +81,69 @@ def make_wiki_page(**overrides: Any) -> WikiPage:
     return WikiPage(**defaults)
 
 
+def mock_github(mocker, handler) -> list[httpx.Request]:
+    """Route the pooled GitHub client through *handler*; return the requests seen."""
+    calls: list[httpx.Request] = []
+
+    def _record(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return handler(request)
+
+    mocker.patch.object(github_client, "_transport", httpx.MockTransport(_record))
+    reset_github_client()
+    return calls
+
+
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
+def _refuse_connection(request: httpx.Request) -> httpx.Response:
+    raise httpx.ConnectError("network disabled in tests", request=request)
+
+
 @pytest.fixture(autouse=True)
-def _clean_state():
-    """Reset caches and rate limits before each test."""
+def _clean_state(mocker, tmp_path):
+    """Reset caches, indexes, rate limits, retry counters, breakers and the
+    refresh-ahead tracker before each test.
+
+    Retry backoff sleeps are skipped so transient-failure tests stay fast,
+    persistent stores live in a per-test temporary directory, the
+    indexing queue never starts workers (tests drain it explicitly) and
+    the shared HTTP and GitHub clients never reach the network.
+    """
+    mocker.patch("tinkywiki_mcp.retry._sleep")
+    close_all_stores()
+    mocker.patch.object(config, "DATA_DIR", str(tmp_path / "data"))
+    mocker.patch.object(config, "INDEXING_QUEUE_WORKERS", 0)
+    mocker.patch.object(http_client, "_transport", httpx.MockTransport(_refuse_connection))
+    mocker.patch.object(github_client, "_transport", httpx.MockTransport(_refuse_connection))
+    reset_http_client()
+    reset_github_client()
     clear_cache()
+    clear_indexes()
     reset_rate_limits()
+    reset_retry_stats()
+    reset_breakers()
+    reset_refresh_ahead()
+    reset_warmup()
     yield
+    reset_background()
+    close_all_stores()
+    reset_http_client()
+    reset_github_client()
     clear_cache()
+    clear_indexes()
     reset_rate_limits()
+    reset_retry_stats()
+    reset_breakers()
+    reset_refresh_ahead()
+    reset_warmup()
+
+
+@pytest.fixture
+def cache_clock(mocker):
+    """Patch time.time (shared by the caches)."""
+    return mocker.patch("tinkywiki_mcp.cache.time.time", return_value=1_000_000.0)
 
 
 @pytest.fixture
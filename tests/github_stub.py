@@ -0,0 +1,224 @@
+"""In-process GitHub API stub for tests and benchmarks (v1.5.0).
+
+Serves the REST endpoints used by ``github_api`` (repo metadata, README,
+tree, code search, tarball via a ``codeload.github.com`` redirect) and
+the wiki-page GraphQL query from one
+in-memory dataset, through an ``httpx.MockTransport`` installed on the
+pooled GitHub client — so both backends can be compared on identical
+data without network access.  ``latency`` simulates a round-trip per
+request; counters record REST calls and GraphQL rate-limit cost.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import io
+import json
+import re
+import tarfile
+import threading
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+
+@dataclass
+class StubRepo:
+    """One repository served by the stub."""
+
+    owner: str
+    name: str
+    files: dict[str, str]
+    description: str = ""
+    stars: int = 0
+    language: str = ""
+    topics: list[str] = field(default_factory=list)
+    default_branch: str = "main"
+
+    def tree_sha(self) -> str:
+        """Deterministic stand-in for the root tree SHA (changes with any file)."""
+        digest = hashlib.sha1()  # noqa: S324
+        for path in sorted(self.files):
+            digest.update(f"{path}\0{self.files[path]}\0".encode())
+        return digest.hexdigest()
+
+    def tarball(self) -> bytes:
+        """The repo as GitHub serves ``/tarball/{ref}``: gzip'd, one top-level dir."""
+        buffer = io.BytesIO()
+        prefix = f"{self.owner}-{self.name}-{self.tree_sha()[:7]}"
+        with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+            root = tarfile.TarInfo(prefix)
+            root.type = tarfile.DIRTYPE
+            archive.addfile(root)
+            for path in sorted(self.files):
+                data = self.files[path].encode()
+                info = tarfile.TarInfo(f"{prefix}/{path}")
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+        return buffer.getvalue()
+
+    def tree(self) -> dict:
+        """Nested ``{name: subtree-or-None}`` view of :attr:`files`."""
+        root: dict = {}
+        for path in self.files:
+            node = root
+            *dirs, leaf = path.split("/")
+            for part in dirs:
+                node = node.setdefault(part, {})
+            node[leaf] = None
+        return root
+
+
+def _rest_entries(node: dict, prefix: str = "") -> list[dict]:
+    """Flatten a nested tree depth-first in name order, like ``recursive=1``."""
+    entries: list[dict] = []
+    for name in sorted(node):
+        path = f"{prefix}{name}"
+        if node[name] is None:
+            entries.append({"path": path, "type": "blob"})
+        else:
+            entries.append({"path": path, "type": "tree"})
+            entries.extend(_rest_entries(node[name], f"{path}/"))
+    return entries
+
+
+def _graphql_entries(node: dict, depth: int, prefix: str = "") -> list[dict]:
+    entries: list[dict] = []
+    for name in sorted(node):
+        path = f"{prefix}{name}"
+        if node[name] is None:
+            entries.append({"path": path, "type": "blob"})
+        else:
+            entry: dict = {"path": path, "type": "tree"}
+            if depth > 1:
+                entry["object"] = {"entries": _graphql_entries(node[name], depth - 1, f"{path}/")}
+            entries.append(entry)
+    return entries
+
+
+class GitHubStub:
+    """Fake ``api.github.com`` answering from in-memory :class:`StubRepo` data."""
+
+    def __init__(self, repos: list[StubRepo], latency: float = 0.0) -> None:
+        self.repos = {f"{r.owner}/{r.name}".lower(): r for r in repos}
+        self.latency = latency
+        self._lock = threading.Lock()
+        self.requests: list[str] = []
+        self.rest_calls = 0
+        self.graphql_cost = 0
+        self.tarball_downloads = 0
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.requests.append(f"{request.method} {request.url.path}")
+        if request.url.path == "/graphql" and request.method == "POST":
+            return self._graphql(json.loads(request.content))
+        if request.url.host == "codeload.github.com":
+            return self._codeload(request)
+        with self._lock:
+            self.rest_calls += 1
+        return self._rest(request)
+
+    # -- REST ---------------------------------------------------------------
+    def _rest(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.startswith("/search/"):
+            return httpx.Response(200, json={"items": []})
+        match = re.match(r"^/repos/([^/]+)/([^/]+)(/.*)?$", path)
+        repo = self.repos.get(f"{match.group(1)}/{match.group(2)}".lower()) if match else None
+        if repo is None:
+            return httpx.Response(404, json={"message": "Not Found"})
+        rest = match.group(3) or ""
+        if rest == "":
+            return httpx.Response(200, json={
+                "description": repo.description,
+                "stargazers_count": repo.stars,
+                "language": repo.language or None,
+                "topics": repo.topics,
+                "default_branch": repo.default_branch,
+            })
+        if rest == "/readme":
+            # like GitHub: any top-level file named README, whatever its extension
+            readme = next(
+                (p for p in sorted(repo.files) if p.split(".")[0].lower() == "readme"), None
+            )
+            if readme is None:
+                return httpx.Response(404, json={"message": "Not Found"})
+            content = base64.b64encode(repo.files[readme].encode()).decode()
+            return httpx.Response(200, json={"content": content, "encoding": "base64"})
+        if rest.startswith("/git/trees/"):
+            if request.url.params.get("recursive"):
+                return httpx.Response(200, json={"tree": _rest_entries(repo.tree())})
+            return httpx.Response(200, json={"sha": repo.tree_sha(), "tree": []})
+        if rest.startswith("/tarball/"):
+            ref = rest.split("/", 2)[2]
+            location = f"https://codeload.github.com/{repo.owner}/{repo.name}/legacy.tar.gz/{ref}"
+            return httpx.Response(302, headers={"Location": location})
+        return httpx.Response(404, json={"message": "Not Found"})
+
+    def _codeload(self, request: httpx.Request) -> httpx.Response:
+        match = re.match(r"^/([^/]+)/([^/]+)/legacy\.tar\.gz/", request.url.path)
+        repo = self.repos.get(f"{match.group(1)}/{match.group(2)}".lower()) if match else None
+        if repo is None:
+            return httpx.Response(404)
+        with self._lock:
+            self.tarball_downloads += 1
+        return httpx.Response(200, content=repo.tarball(),
+                              headers={"Content-Type": "application/x-gzip"})
+
+    # -- GraphQL ------------------------------------------------------------
+    def _graphql(self, payload: dict) -> httpx.Response:
+        query = payload.get("query", "")
+        variables = payload.get("variables", {})
+        with self._lock:
+            self.graphql_cost += 1  # a single-repository query costs 1 point
+        repo = self.repos.get(f"{variables.get('owner')}/{variables.get('name')}".lower())
+        data: dict = {"rateLimit": {"cost": 1, "remaining": 4999}}
+        if repo is None:
+            data["repository"] = None
+            return httpx.Response(200, json={
+                "data": data,
+                "errors": [{"type": "NOT_FOUND", "message": "Could not resolve to a Repository"}],
+            })
+
+        node: dict = {
+            "description": repo.description or None,
+            "stargazerCount": repo.stars,
+            "primaryLanguage": {"name": repo.language} if repo.language else None,
+            "repositoryTopics": {"nodes": [{"topic": {"name": t}} for t in repo.topics]},
+            "defaultBranchRef": {"name": repo.default_branch},
+        }
+        for alias, name in re.findall(r'(readme\d+): object\(expression: "HEAD:([^"]+)"\)', query):
+            node[alias] = {"text": repo.files[name]} if name in repo.files else None
+        depth = query.count("entries {")
+        node["tree"] = {"entries": _graphql_entries(repo.tree(), depth)}
+        data["repository"] = node
+        return httpx.Response(200, json={"data": data})
+
+
+def sample_repo() -> StubRepo:
+    """A small repository used by the tests and the benchmark."""
+    return StubRepo(
+        owner="octo",
+        name="widget",
+        description="Widgets for everyone",
+        stars=1234,
+        language="Python",
+        topics=["widgets", "ui"],
+        default_branch="main",
+        files={
+            "README.md": "# Widget\n\nInstall with pip.",
+            "pyproject.toml": "[project]",
+            "docs/index.md": "Docs",
+            "src/widget/__init__.py": "",
+            "src/widget/core.py": "def run(): ...",
+            "tests/test_core.py": "def test_run(): ...",
+        },
+    )
@@ -0,0 +1,119 @@
+"""In-process stand-in for a Redis server (RESP2), for the shared-cache tests.
+
+Implements the handful of commands ``shared_cache.py`` sends — PING,
+AUTH, SELECT, GET, SET (NX / PX), DEL and SCAN (MATCH) — over a real
+TCP socket on 127.0.0.1, so the client's protocol code is exercised.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import socketserver
+import threading
+import time
+
+
+class RedisStub:
+    """A threaded RESP server; ``url`` points a client at it."""
+
+    def __init__(self, password: str | None = None) -> None:
+        self.password = password
+        self.data: dict[bytes, tuple[bytes, float | None]] = {}
+        self.commands: list[list[bytes]] = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                authed = stub.password is None
+                while True:
+                    args = _read_command(self.rfile)
+                    if args is None:
+                        return
+                    with stub._lock:
+                        stub.commands.append(args)
+                    name = args[0].upper()
+                    if name == b"AUTH":
+                        authed = args[-1].decode() == stub.password
+                        reply = b"+OK\r\n" if authed else b"-WRONGPASS invalid password\r\n"
+                    elif not authed:
+                        reply = b"-NOAUTH Authentication required.\r\n"
+                    else:
+                        reply = stub._execute(name, args[1:])
+                    self.wfile.write(reply)
+
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.02}, daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        auth = f":{self.password}@" if self.password else ""
+        return f"redis://{auth}127.0.0.1:{self._server.server_address[1]}/0"
+
+    def start(self) -> RedisStub:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def command_names(self) -> list[str]:
+        with self._lock:
+            return [args[0].decode().upper() for args in self.commands]
+
+    # ------------------------------------------------------------------
+    def _live(self, key: bytes) -> bytes | None:
+        item = self.data.get(key)
+        if item is None:
+            return None
+        value, expires = item
+        if expires is not None and expires <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def _execute(self, name: bytes, args: list[bytes]) -> bytes:
+        with self._lock:
+            if name in (b"PING", b"SELECT"):
+                return b"+OK\r\n" if name == b"SELECT" else b"+PONG\r\n"
+            if name == b"GET":
+                return _bulk(self._live(args[0]))
+            if name == b"SET":
+                key, value, options = args[0], args[1], [a.upper() for a in args[2:]]
+                if b"NX" in options and self._live(key) is not None:
+                    return b"$-1\r\n"
+                expires = None
+                if b"PX" in options:
+                    expires = time.monotonic() + int(args[2 + options.index(b"PX") + 1]) / 1000
+                self.data[key] = (value, expires)
+                return b"+OK\r\n"
+            if name == b"DEL":
+                removed = sum(self.data.pop(key, None) is not None for key in args)
+                return b":%d\r\n" % removed
+            if name == b"SCAN":
+                pattern = args[args.index(b"MATCH") + 1].decode() if b"MATCH" in args else "*"
+                keys = [k for k in list(self.data) if self._live(k) is not None
+                        and fnmatch.fnmatchcase(k.decode(), pattern)]
+                return b"*2\r\n$1\r\n0\r\n" + b"*%d\r\n" % len(keys) + b"".join(_bulk(k) for k in keys)
+            return b"-ERR unknown command '%s'\r\n" % name
+
+
+def _bulk(value: bytes | None) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def _read_command(rfile) -> list[bytes] | None:
+    line = rfile.readline()
+    if not line.startswith(b"*"):
+        return None
+    args = []
+    for _ in range(int(line[1:])):
+        length = int(rfile.readline()[1:])
+        args.append(rfile.read(length + 2)[:-2])
+    return args
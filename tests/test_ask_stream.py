@@ -0,0 +1,187 @@
+"""Tests for tinkywiki_mcp.ask_stream — streamed DeepWiki Ask capture (v1.5.0)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+from tinkywiki_mcp.ask_stream import AskCapture, AskStreamParser, is_answer_stream
+
+
+def _sse(*payloads: str) -> str:
+    return "".join(f"data: {p}\n\n" for p in payloads)
+
+
+class TestAskStreamParser:
+    def test_sse_json_deltas(self):
+        parser = AskStreamParser()
+        parser.feed(_sse('{"delta": "Hello"}', '{"delta": " world"}', "[DONE]"))
+        assert parser.text == "Hello world"
+        assert parser.done
+
+    def test_chunks_split_mid_line(self):
+        body = _sse('{"content": "React uses"}', '{"content": " a virtual DOM."}')
+        parser = AskStreamParser()
+        for i in range(0, len(body), 7):
+            parser.feed(body[i:i + 7])
+        assert parser.text == "React uses a virtual DOM."
+        assert not parser.done
+        parser.close()
+        assert parser.done
+
+    def test_plain_text_tokens_keep_spaces(self):
+        parser = AskStreamParser()
+        parser.feed("data: The\n\ndata:  answer\n\n")
+        assert parser.text == "The answer"
+
+    def test_multiline_event_data(self):
+        parser = AskStreamParser()
+        parser.feed("data: line one\ndata: line two\n\n")
+        assert parser.text == "line one\nline two"
+
+    def test_done_event_and_comments(self):
+        parser = AskStreamParser()
+        parser.feed(": keep-alive\nid: 1\n" + _sse('{"text": "ok"}') + "event: done\n\n")
+        assert parser.text == "ok"
+        assert parser.done
+
+    def test_openai_style_choices(self):
+        parser = AskStreamParser()
+        parser.feed(_sse(json.dumps({"choices": [{"delta": {"content": "Hi"}}]})))
+        assert parser.text == "Hi"
+
+    def test_ndjson_body(self):
+        parser = AskStreamParser()
+        parser.feed('{"type": "chunk", "data": "Part 1. "}\n{"type": "chunk", "data": "Part 2."}\n')
+        parser.feed('{"type": "done"}\n')
+        assert parser.text == "Part 1. Part 2."
+        assert parser.done
+
+    def test_cumulative_messages_replace(self):
+        parser = AskStreamParser()
+        for partial in ("The", "The answer", "The answer is 42."):
+            parser.feed_message(json.dumps({"answer": partial}))
+        assert parser.text == "The answer is 42."
+
+    def test_websocket_frames(self):
+        parser = AskStreamParser()
+        parser.feed_message('{"type": "chunk", "data": "Uses "}')
+        parser.feed_message('{"type": "chunk", "data": "hooks."}')
+        assert not parser.done
+        parser.feed_message('{"done": true}')
+        assert parser.text == "Uses hooks."
+        assert parser.done
+
+
+class TestFeedBody:
+    def test_pretty_printed_json_is_one_message(self):
+        parser = AskStreamParser()
+        parser.feed_body('{\n  "answer": "Uses hooks.",\n  "done": true\n}')
+        assert parser.text == "Uses hooks."
+        assert parser.done and parser.messages == 1
+
+    def test_ndjson_falls_back_to_lines(self):
+        parser = AskStreamParser()
+        parser.feed_body('{"delta": "Uses "}\n{"delta": "hooks."}\n')
+        assert parser.text == "Uses hooks."
+        assert parser.done
+
+
+class TestIsAnswerStream:
+    def test_event_stream_content_type(self):
+        assert is_answer_stream("https://x/anything", "text/event-stream; charset=utf-8", "fetch", "GET")
+
+    def test_url_pattern_needs_non_get(self):
+        assert is_answer_stream("https://api.devin.ai/ada/query", "application/json", "fetch", "POST")
+        assert not is_answer_stream("https://api.devin.ai/ada/query", "application/json", "fetch", "GET")
+
+    def test_url_pattern_needs_deepwiki_host(self):
+        assert is_answer_stream("https://deepwiki.com/api/chat", "application/json", "fetch", "POST")
+        assert not is_answer_stream("https://analytics.example.com/query", "application/json",
+                                    "fetch", "POST")
+        assert not is_answer_stream("https://example.com/chat", "", "fetch", "POST")
+        assert not is_answer_stream("https://notdevin.ai/ada/query", "", "fetch", "POST")
+
+    def test_ignores_documents_and_assets(self):
+        assert not is_answer_stream("https://deepwiki.com/chat.js", "text/event-stream", "script", "GET")
+
+    def test_websocket_url(self):
+        assert is_answer_stream("wss://api.devin.ai/ada/ws/query/abc")
+        assert not is_answer_stream("wss://example.com/telemetry")
+
+
+def _response(url: str, body: str, content_type: str = "text/event-stream"):
+    response = MagicMock()
+    response.url = url
+    response.headers = {"content-type": content_type}
+    response.request.resource_type = "fetch"
+    response.request.method = "POST"
+
+    async def text():
+        return body
+
+    response.text = text
+    return response
+
+
+class _FakeEmitter:
+    def __init__(self, url: str = ""):
+        self.url = url
+        self.handlers: dict[str, object] = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+
+class TestAskCapture:
+    async def test_captures_sse_response(self):
+        page = _FakeEmitter()
+        capture = AskCapture()
+        capture.attach(page)
+        await page.handlers["response"](
+            _response("https://api/ada/query", _sse('{"delta": "Answer"}', "[DONE]"))
+        )
+        assert await capture.wait(detect_timeout=0.1, total_timeout=0.1) == "Answer"
+
+    async def test_longest_finished_stream_wins(self):
+        page = _FakeEmitter()
+        capture = AskCapture()
+        capture.attach(page)
+        await page.handlers["response"](_response("https://api/stream/a", _sse('"ok"')))
+        await page.handlers["response"](
+            _response("https://api/stream/b", _sse('"The full answer"'))
+        )
+        assert capture.answer() == "The full answer"
+
+    async def test_ignores_unrelated_responses(self):
+        page = _FakeEmitter()
+        capture = AskCapture()
+        capture.attach(page)
+        await page.handlers["response"](
+            _response("https://deepwiki.com/_next/data", '{"content": "x"}', "application/json")
+        )
+        assert not capture.detected.is_set()
+        assert await capture.wait(detect_timeout=0.01, total_timeout=1) == ""
+
+    async def test_websocket_frames_until_close(self):
+        page = _FakeEmitter()
+        capture = AskCapture()
+        capture.attach(page)
+        socket = _FakeEmitter("wss://api.devin.ai/ada/ws/query/1")
+        page.handlers["websocket"](socket)
+        socket.handlers["framereceived"]('{"type": "chunk", "data": "Streamed"}')
+        assert capture.answer() == ""  # not finished yet
+        socket.handlers["close"](socket)
+        assert await capture.wait(detect_timeout=0.1, total_timeout=0.1) == "Streamed"
+
+    async def test_unfinished_stream_times_out(self):
+        page = _FakeEmitter()
+        capture = AskCapture()
+        capture.attach(page)
+        socket = _FakeEmitter("wss://api.devin.ai/ada/ws/query/1")
+        page.handlers["websocket"](socket)
+        socket.handlers["framereceived"]('{"data": "partial"}')
+        start = asyncio.get_running_loop().time()
+        assert await capture.wait(detect_timeout=1, total_timeout=0.05) == ""
+        assert asyncio.get_running_loop().time() - start < 1
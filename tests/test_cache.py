@@ -1,8 +1,14 @@
-"""Tests for the in-memory TTL cache layer."""
+"""Tests for the in-memory TTL cache layer and its persistent L2."""
 
 from __future__ import annotations
 
+import secrets
+import sqlite3
+import time
+
+from tinkywiki_mcp import cache, config, disk_cache
 from tinkywiki_mcp.cache import (
+    CacheLookup,
     cache_stats,
     clear_cache,
     get_cached_page,
@@ -10,11 +16,23 @@ from tinkywiki_mcp.cache import (
     get_cached_topics,
     get_cached_wiki_page,
     invalidate,
+    lookup_topics,
+    lookup_wiki_page,
     set_cached_page,
     set_cached_search,
     set_cached_topics,
     set_cached_wiki_page,
 )
+from tinkywiki_mcp.disk_cache import disk_get
+from tinkywiki_mcp.parser import WikiPage, WikiSection
+from tinkywiki_mcp.storage import close_all_stores
+
+
+def _restart() -> None:
+    """Drop every L1 cache and close the stores, as a fresh process would start."""
+    for l1 in (cache._page_cache, cache._parsed_cache, cache._search_cache, cache._topic_cache):
+        l1.clear()
+    close_all_stores()
 
 
 class TestPageCache:
@@ -124,3 +142,247 @@ class TestTopicCache:
         set_cached_topics("repo", "data")
         stats = cache_stats()
         assert stats["topic"]["current_size"] == 1
+
+
+class TestPersistentL2:
+    def test_entries_survive_restart(self):
+        set_cached_page("https://a.com", "<html>a</html>")
+        set_cached_search("repo", "What is X?", "X is great.")
+        set_cached_topics("repo", "topics")
+        _restart()
+        assert get_cached_page("https://a.com") == "<html>a</html>"
+        assert get_cached_search("repo", "what is x?") == "X is great."
+        assert get_cached_topics("repo") == "topics"
+        assert cache_stats()["l2"]["hits"] == 3
+        assert cache_stats()["html"]["current_size"] == 1  # promoted to L1
+
+    def test_wiki_page_round_trip(self):
+        page = WikiPage(
+            repo_name="o/r",
+            url="https://x/o/r",
+            title="R",
+            sections=[WikiSection("A", 1, "a", [WikiSection("B", 2, "b")])],
+            toc=[{"title": "A", "level": "1"}],
+            raw_text="a b",
+            source="deepwiki",
+        )
+        set_cached_wiki_page("deepwiki::o/r", page)
+        _restart()
+        assert get_cached_wiki_page("deepwiki::o/r") == page
+
+    def test_unsupported_values_stay_in_memory(self):
+        set_cached_wiki_page("repo", {"fake": True})
+        _restart()
+        assert get_cached_wiki_page("repo") is None
+
+    def test_expired_entries_are_not_served(self, mocker):
+        set_cached_page("https://a.com", "old")
+        mocker.patch("tinkywiki_mcp.disk_cache.time.time", return_value=time.time() + 10_000)
+        mocker.patch("tinkywiki_mcp.cache.time.time", return_value=time.time() + 10_000)
+        assert get_cached_page("https://a.com") is None
+        assert cache_stats()["l2"]["expired"] == 1
+        assert cache_stats()["l2"]["entries"] == 0
+
+    def test_promoted_entry_keeps_original_expiry(self, mocker):
+        set_cached_page("https://a.com", "html")
+        _restart()
+        now = time.time()
+        get_cached_page("https://a.com")  # promoted with the L2 expiry
+        mocker.patch("tinkywiki_mcp.cache.time.time", return_value=now + config.CACHE_TTL_SECONDS + 1)
+        mocker.patch("tinkywiki_mcp.disk_cache.time.time", return_value=now + config.CACHE_TTL_SECONDS + 1)
+        assert get_cached_page("https://a.com") is None
+
+    def test_evicts_least_recently_read_over_budget(self, mocker):
+        mocker.patch.object(config, "CACHE_L2_MAX_BYTES", 2500)
+        for i in range(3):
+            set_cached_page(f"https://p{i}.com", "x" * 1000)
+        stats = cache_stats()["l2"]
+        assert stats["bytes"] <= 2500
+        assert stats["evictions"] == 1
+        assert disk_get("html", "https://p0.com") is None
+        assert disk_get("html", "https://p2.com") is not None
+
+    def test_budget_checked_periodically(self, mocker):
+        mocker.patch.object(config, "CACHE_L2_MAX_BYTES", 10_000)
+        mocker.patch.object(disk_cache, "_EVICT_CHECK_INTERVAL", 4)
+        check = mocker.spy(disk_cache, "_evict_if_needed")
+        for i in range(5):  # small writes: the first checks, then every fourth
+            set_cached_page(f"https://p{i}.com", "small")
+        assert check.call_count == 2
+        set_cached_page("https://big.com", secrets.token_hex(2000))  # ~2 KB compressed
+        assert check.call_count == 3  # past the trim headroom: checked at once
+
+    def test_invalidate_removes_persisted_entry(self):
+        set_cached_page("https://a.com", "html")
+        invalidate("https://a.com")
+        _restart()
+        assert get_cached_page("https://a.com") is None
+
+    def test_disabled(self, mocker):
+        mocker.patch.object(config, "CACHE_L2_ENABLED", False)
+        set_cached_page("https://a.com", "html")
+        _restart()
+        assert get_cached_page("https://a.com") is None
+        assert cache_stats()["l2"]["entries"] == 0
+
+    def test_shared_with_other_processes(self):
+        set_cached_topics("repo", "mine")
+        _restart()
+        # Another server process writes through its own connection
+        path = f"{config.DATA_DIR}/page_cache.sqlite3"
+        with sqlite3.connect(path) as other:
+            other.execute(
+                "UPDATE entries SET value = ? WHERE namespace = 'topic' AND key = 'repo'",
+                (b"theirs",),
+            )
+        assert get_cached_topics("repo") == "theirs"
+
+    def test_locked_store_degrades_to_miss(self, mocker):
+        mocker.patch(
+            "tinkywiki_mcp.disk_cache._store.execute",
+            side_effect=sqlite3.OperationalError("database is locked"),
+        )
+        set_cached_page("https://a.com", "html")  # L1 still works
+        assert get_cached_page("https://a.com") == "html"
+        assert get_cached_page("https://b.com") is None
+
+
+class TestStaleWhileRevalidate:
+    REPO = "https://github.com/owner/repo"
+
+    def _later(self, mocker, seconds: float) -> None:
+        now = time.time() + seconds
+        mocker.patch("tinkywiki_mcp.cache.time.time", return_value=now)
+        mocker.patch("tinkywiki_mcp.disk_cache.time.time", return_value=now)
+
+    def test_fresh_hit_schedules_nothing(self, mocker):
+        submit = mocker.patch("tinkywiki_mcp.cache.submit_background")
+        set_cached_topics(self.REPO, "topics")
+        hit = lookup_topics(self.REPO, refresh=lambda: None)
+        assert hit == CacheLookup("topics", stale=False)
+        submit.assert_not_called()
+
+    def test_stale_hit_schedules_one_refresh(self, mocker):
+        submit = mocker.patch("tinkywiki_mcp.cache.submit_background", side_effect=[True, False])
+        set_cached_topics(self.REPO, "topics")
+        self._later(mocker, config.TOPIC_CACHE_TTL_SECONDS + 1)
+        refresh = mocker.Mock()
+        assert lookup_topics(self.REPO, refresh=refresh) == CacheLookup("topics", stale=True)
+        assert lookup_topics(self.REPO, refresh=refresh).stale
+        assert submit.call_args_list[0].args == (f"swr::topic::{self.REPO}", refresh)
+        swr = cache_stats()["stale_while_revalidate"]
+        assert swr == {"stale_served": 2, "refreshes_scheduled": 1}
+
+    def test_stale_without_refresh_is_a_miss(self, mocker):
+        set_cached_wiki_page(self.REPO, {"page": 1})
+        self._later(mocker, config.CACHE_TTL_SECONDS + 1)
+        assert get_cached_wiki_page(self.REPO) is None
+        assert lookup_wiki_page(self.REPO, refresh=lambda: None).value == {"page": 1}
+
+    def test_past_hard_ttl_is_a_miss(self, mocker):
+        submit = mocker.patch("tinkywiki_mcp.cache.submit_background")
+        set_cached_topics(self.REPO, "topics")
+        self._later(mocker, config.CACHE_HARD_TTL_SECONDS + 1)
+        assert lookup_topics(self.REPO, refresh=lambda: None) is None
+        submit.assert_not_called()
+
+    def test_soft_ttl_survives_restart(self, mocker):
+        mocker.patch("tinkywiki_mcp.cache.submit_background")
+        set_cached_topics(self.REPO, "topics")
+        _restart()
+        self._later(mocker, config.TOPIC_CACHE_TTL_SECONDS + 1)
+        assert lookup_topics(self.REPO, refresh=lambda: None).stale
+
+    def test_stale_marker_is_never_stored(self):
+        page = WikiPage(repo_name="o/r", url="u", stale=True)
+        set_cached_wiki_page(self.REPO, page)
+        assert get_cached_wiki_page(self.REPO).stale is False
+
+
+class TestFetchServesStale:
+    REPO = "https://github.com/owner/repo"
+
+    def test_stale_page_returned_then_refreshed(self, mocker):
+        from tinkywiki_mcp.background import wait_for_background
+        from tinkywiki_mcp.parser import fetch_wiki_page
+
+        html = mocker.patch(
+            "tinkywiki_mcp.parser._fetch_html",
+            side_effect=["<html><body><h1>Old</h1></body></html>",
+                         "<html><body><h1>New</h1></body></html>"],
+        )
+        assert fetch_wiki_page(self.REPO).title == "Old"
+        later = time.time() + config.CACHE_TTL_SECONDS + 1
+        mocker.patch("tinkywiki_mcp.cache.time.time", return_value=later)
+
+        stale = fetch_wiki_page(self.REPO)
+        assert (stale.title, stale.stale) == ("Old", True)
+        wait_for_background(timeout=5)
+        assert html.call_count == 2
+        fresh = fetch_wiki_page(self.REPO)
+        assert (fresh.title, fresh.stale) == ("New", False)
+
+
+class TestMemoryBudgets:
+    PAGE = "<div><p>" + "rendered wiki text " * 500 + "</p></div>"
+
+    def test_html_is_compressed_in_memory(self):
+        set_cached_page("https://a.com", self.PAGE)
+        entry = cache._page_cache["https://a.com"]
+        assert isinstance(entry.value, cache._Packed)
+        assert get_cached_page("https://a.com") == self.PAGE
+        stats = cache_stats()["html"]
+        assert stats["compression_ratio"] > 5
+        assert stats["bytes"] < len(self.PAGE) / 5
+
+    def test_evicts_by_bytes(self):
+        budget = cache._BudgetCache(max_bytes=3000, max_entries=100, ttl=60, policy="lru")
+        for i in range(5):
+            budget[f"k{i}"] = "x" * 1000
+        assert len(budget) == 2
+        assert budget.currsize <= 3000
+        assert budget.evictions == 3
+        assert "k4" in budget and "k0" not in budget
+
+    def test_evicts_by_entry_count(self):
+        budget = cache._BudgetCache(max_bytes=10**6, max_entries=2, ttl=60, policy="lru")
+        for i in range(3):
+            budget[f"k{i}"] = "x"
+        assert list(budget) == ["k1", "k2"]
+        assert budget.stats()["evictions"] == 1
+
+    def test_oversized_value_not_kept(self):
+        budget = cache._BudgetCache(max_bytes=1000, max_entries=10, ttl=60)
+        budget["k"] = "small"
+        cache._store(budget, "k", "x" * 5000)
+        assert "k" not in budget  # the old value must not linger either
+
+    def test_page_size_estimate_counts_content(self):
+        page = WikiPage(repo_name="o/r", url="u", raw_text="t" * 5000,
+                        sections=[WikiSection("A", 1, "c" * 3000)])
+        assert 8000 <= cache._sizeof(page) < 9000
+
+    def test_stats_report_memory_envelope(self):
+        set_cached_search("repo", "q", "answer")
+        stats = cache_stats()
+        names = ("html", "parsed", "search", "topic", "section", "negative")
+        assert stats["memory"]["bytes"] == sum(stats[name]["bytes"] for name in names)
+        assert stats["memory"]["max_bytes"] == sum(stats[name]["max_bytes"] for name in names)
+
+    def test_l2_values_are_compressed(self):
+        set_cached_page("https://a.com", self.PAGE)
+        path = f"{config.DATA_DIR}/page_cache.sqlite3"
+        with sqlite3.connect(path) as conn:
+            kind, size = conn.execute("SELECT kind, size FROM entries").fetchone()
+        assert kind.startswith("text+")
+        assert size < len(self.PAGE) / 5
+        assert cache_stats()["l2"]["compression_ratio"] > 5
+        _restart()
+        assert get_cached_page("https://a.com") == self.PAGE
+
+    def test_l2_reads_uncompressed_entries(self, mocker):
+        mocker.patch.object(config, "CACHE_COMPRESSION", "none")
+        set_cached_page("https://a.com", self.PAGE)
+        mocker.patch.object(config, "CACHE_COMPRESSION", "auto")
+        _restart()
+        assert get_cached_page("https://a.com") == self.PAGE
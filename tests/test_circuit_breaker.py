@@ -0,0 +1,195 @@
+"""Tests for per-upstream circuit breakers (v1.5.0)."""
+
+from __future__ import annotations
+
+import json
+import urllib.error
+
+import pytest
+
+from tinkywiki_mcp import circuit_breaker
+from tinkywiki_mcp.circuit_breaker import (
+    BreakerSettings,
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    breaker_settings,
+    breaker_stats,
+    call_with_breaker,
+    get_breaker,
+    is_open,
+)
+
+
+def _settings(**overrides) -> BreakerSettings:
+    defaults = {
+        "window_seconds": 60.0,
+        "min_calls": 3,
+        "failure_rate": 0.5,
+        "open_seconds": 30.0,
+        "half_open_calls": 1,
+    }
+    defaults.update(overrides)
+    return BreakerSettings(**defaults)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(mocker):
+    fake = _Clock()
+    mocker.patch("tinkywiki_mcp.circuit_breaker.time.monotonic", fake)
+    return fake
+
+
+class TestCircuitBreaker:
+    def test_starts_closed(self):
+        assert CircuitBreaker("x", _settings()).state is CircuitState.CLOSED
+
+    def test_needs_min_calls_before_opening(self, clock):
+        breaker = CircuitBreaker("x", _settings())
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state is CircuitState.CLOSED
+        breaker.record_failure()
+        assert breaker.state is CircuitState.OPEN
+
+    def test_failure_rate_below_threshold_stays_closed(self, clock):
+        breaker = CircuitBreaker("x", _settings(min_calls=4))
+        for _ in range(3):
+            breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state is CircuitState.CLOSED
+
+    def test_old_outcomes_leave_window(self, clock):
+        breaker = CircuitBreaker("x", _settings())
+        breaker.record_failure()
+        breaker.record_failure()
+        clock.now += 61
+        breaker.record_failure()
+        assert breaker.state is CircuitState.CLOSED
+
+    def test_open_rejects_calls(self, clock):
+        breaker = CircuitBreaker("x", _settings(min_calls=1))
+        breaker.record_failure()
+        assert not breaker.allow()
+        assert breaker.retry_after() == 30.0
+
+    def test_half_open_after_timeout(self, clock):
+        breaker = CircuitBreaker("x", _settings(min_calls=1))
+        breaker.record_failure()
+        clock.now += 30
+        assert breaker.state is CircuitState.HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()  # only one trial call
+
+    def test_half_open_success_closes(self, clock):
+        breaker = CircuitBreaker("x", _settings(min_calls=1))
+        breaker.record_failure()
+        clock.now += 30
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state is CircuitState.CLOSED
+
+    def test_half_open_failure_reopens(self, clock):
+        breaker = CircuitBreaker("x", _settings(min_calls=1))
+        breaker.record_failure()
+        clock.now += 30
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state is CircuitState.OPEN
+        assert breaker.snapshot()["times_opened"] == 2
+
+
+class TestSettings:
+    def test_global_defaults(self, mocker):
+        mocker.patch.object(circuit_breaker.config, "CB_MIN_CALLS", 7)
+        assert breaker_settings("github_api").min_calls == 7
+
+    def test_per_source_override(self, monkeypatch):
+        monkeypatch.setenv("TINKYWIKI_CB_GITHUB_API_OPEN_SECONDS", "5")
+        assert breaker_settings("github_api").open_seconds == 5.0
+        assert breaker_settings("deepwiki_ask").open_seconds != 5.0
+
+
+class TestCallWithBreaker:
+    def test_passes_value_through(self):
+        assert call_with_breaker("up", lambda: 42) == 42
+
+    def test_open_breaker_skips_call(self, mocker):
+        mocker.patch.object(circuit_breaker.config, "CB_MIN_CALLS", 1)
+        with pytest.raises(TimeoutError):
+            call_with_breaker("up", mocker.Mock(side_effect=TimeoutError("t")))
+        fn = mocker.Mock()
+        with pytest.raises(CircuitOpenError):
+            call_with_breaker("up", fn)
+        fn.assert_not_called()
+        assert is_open("up")
+
+    def test_http_4xx_not_counted_as_failure(self, mocker):
+        mocker.patch.object(circuit_breaker.config, "CB_MIN_CALLS", 1)
+        exc = urllib.error.HTTPError("https://api.github.com", 404, "nope", {}, None)
+        with pytest.raises(urllib.error.HTTPError):
+            call_with_breaker("up", mocker.Mock(side_effect=exc))
+        assert not is_open("up")
+
+    def test_is_failure_predicate(self, mocker):
+        mocker.patch.object(circuit_breaker.config, "CB_MIN_CALLS", 1)
+        call_with_breaker("up", lambda: "", is_failure=lambda v: not v)
+        assert get_breaker("up").state is CircuitState.OPEN
+
+    def test_disabled(self, mocker):
+        mocker.patch.object(circuit_breaker.config, "CB_ENABLED", False)
+        mocker.patch.object(circuit_breaker.config, "CB_MIN_CALLS", 1)
+        with pytest.raises(TimeoutError):
+            call_with_breaker("up", mocker.Mock(side_effect=TimeoutError("t")))
+        assert call_with_breaker("up", lambda: 1) == 1
+        assert "up" not in breaker_stats()
+
+
+class TestIntegration:
+    def test_github_get_skips_when_open(self, mocker):
+        from tinkywiki_mcp.github_api import _github_get
+
+        mocker.patch.object(circuit_breaker.config, "CB_MIN_CALLS", 1)
+        get_json = mocker.patch(
+            "tinkywiki_mcp.github_api.github_get_json", side_effect=TimeoutError("t")
+        )
+        assert _github_get("/repos/a/b") is None
+        calls = get_json.call_count
+        assert _github_get("/repos/a/b") is None
+        assert get_json.call_count == calls  # second call short-circuited
+
+    def test_search_tool_skips_open_chat(self, mocker):
+        from mcp.server.fastmcp import FastMCP
+        from tinkywiki_mcp.tools.search import register
+
+        mocker.patch.object(circuit_breaker.config, "FALLBACK_ENABLED", False)
+        mocker.patch.object(circuit_breaker.config, "CB_MIN_CALLS", 1)
+        get_breaker("tinkywiki_chat").record_failure()
+        run_search = mocker.patch("tinkywiki_mcp.tools.search._run_search")
+
+        mcp = FastMCP("test")
+        register(mcp)
+        fn = mcp._tool_manager._tools["tinkywiki_search_wiki"].fn
+        parsed = json.loads(fn(repo_url="microsoft/vscode", query="q", answer_mode="chat"))
+
+        run_search.assert_not_called()
+        assert parsed["code"] == "CIRCUIT_OPEN"
+
+    def test_diagnostics_tool_reports_breakers(self):
+        from tinkywiki_mcp.server import create_server
+
+        get_breaker("deepwiki_ask").record_success()
+        mcp = create_server()
+        fn = mcp._tool_manager._tools["tinkywiki_diagnostics"].fn
+        parsed = json.loads(fn())
+        data = json.loads(parsed["data"])
+        assert data["circuit_breakers"]["deepwiki_ask"]["state"] == "closed"
+        assert "retries" in data
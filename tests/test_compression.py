@@ -0,0 +1,74 @@
+"""Tests for cached-value compression (v1.5.0)."""
+
+from __future__ import annotations
+
+import pytest
+
+from tinkywiki_mcp import compression, config
+from tinkywiki_mcp.compression import (
+    CODEC_NONE,
+    CODEC_ZLIB,
+    CODEC_ZSTD,
+    compress,
+    decompress,
+    preferred_codec,
+)
+
+HTML = ("<div class='section'><p>" + "wiki content " * 40 + "</p></div>\n").encode() * 50
+
+
+class TestCompress:
+    def test_round_trip(self):
+        codec, payload = compress(HTML)
+        assert codec in (CODEC_ZLIB, CODEC_ZSTD)
+        assert len(payload) * 5 < len(HTML)
+        assert decompress(codec, payload) == HTML
+
+    def test_small_values_kept_as_is(self):
+        assert compress(b"<p>hi</p>") == (CODEC_NONE, b"<p>hi</p>")
+
+    def test_incompressible_values_kept_as_is(self):
+        import os
+
+        data = os.urandom(4096)
+        assert compress(data) == (CODEC_NONE, data)
+
+    def test_disabled(self, mocker):
+        mocker.patch.object(config, "CACHE_COMPRESSION", "none")
+        assert compress(HTML) == (CODEC_NONE, HTML)
+
+    def test_zlib_forced(self, mocker):
+        mocker.patch.object(config, "CACHE_COMPRESSION", "zlib")
+        assert compress(HTML)[0] == CODEC_ZLIB
+
+
+class TestCodecSelection:
+    def test_auto_without_zstandard_uses_zlib(self, mocker):
+        mocker.patch.object(compression, "zstandard", None)
+        assert preferred_codec() == CODEC_ZLIB
+
+    def test_zstd_requested_but_missing_falls_back(self, mocker):
+        mocker.patch.object(compression, "zstandard", None)
+        mocker.patch.object(config, "CACHE_COMPRESSION", "zstd")
+        assert preferred_codec() == CODEC_ZLIB
+
+    def test_zstd_round_trip(self):
+        pytest.importorskip("zstandard")
+        codec, payload = compress(HTML)
+        assert codec == CODEC_ZSTD
+        assert decompress(codec, payload) == HTML
+
+
+class TestDecompressErrors:
+    def test_unknown_codec(self):
+        with pytest.raises(ValueError):
+            decompress("brotli", b"x")
+
+    def test_corrupt_payload(self):
+        with pytest.raises(ValueError):
+            decompress(CODEC_ZLIB, b"not zlib")
+
+    def test_zstd_payload_without_package(self, mocker):
+        mocker.patch.object(compression, "zstandard", None)
+        with pytest.raises(ValueError):
+            decompress(CODEC_ZSTD, b"x")
@@ -0,0 +1,163 @@
+"""Tests for content-hash change detection of cached pages (v1.5.0)."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+
+import pytest
+
+from tinkywiki_mcp import config
+from tinkywiki_mcp.cache import (
+    cache_stats,
+    get_cached_search,
+    get_cached_topics,
+    get_cached_wiki_page,
+    set_cached_search,
+    set_cached_topics,
+    set_cached_wiki_page,
+)
+from tinkywiki_mcp.deepwiki import fetch_deepwiki_page
+from tinkywiki_mcp.local_index import get_index, index_page
+from tinkywiki_mcp.parser import WikiSection, fetch_wiki_page, page_content_hash
+from tinkywiki_mcp.shared_cache import l2_get
+from tests.conftest import SAMPLE_HTML, make_wiki_page
+
+REPO = "https://github.com/microsoft/vscode"
+OTHER = "https://github.com/team/other"
+CHANGED_HTML = SAMPLE_HTML.replace("Electron", "Tauri")
+
+
+def _page(**overrides):
+    page = make_wiki_page(**overrides)
+    page.content_hash = page_content_hash(page)
+    return page
+
+
+class TestPageContentHash:
+    def test_stable_for_equal_content(self):
+        assert page_content_hash(make_wiki_page()) == page_content_hash(make_wiki_page())
+
+    def test_ignores_raw_text_and_flags(self):
+        page = make_wiki_page()
+        noisy = replace(page, raw_text="Rendered at 12:01", stale=True, html_digest="x")
+        assert page_content_hash(noisy) == page_content_hash(page)
+
+    def test_changes_with_content(self):
+        page = make_wiki_page()
+        edited = replace(page, sections=page.sections + [WikiSection("Deployment", 2, "CI")])
+        assert page_content_hash(edited) != page_content_hash(page)
+
+    def test_set_on_parse_and_kept_in_l2(self, mocker):
+        mocker.patch("tinkywiki_mcp.parser._fetch_html", return_value=SAMPLE_HTML)
+        page = fetch_wiki_page(REPO)
+        assert page.content_hash == page_content_hash(page)
+        assert page.html_digest
+        assert l2_get("parsed", REPO).value.content_hash == page.content_hash
+
+
+class TestReRender:
+    def test_unchanged_html_skips_parse(self, mocker):
+        mocker.patch("tinkywiki_mcp.parser._fetch_html", return_value=SAMPLE_HTML)
+        first = fetch_wiki_page(REPO)
+        parse = mocker.patch("tinkywiki_mcp.parser._parse_sections")
+        again = fetch_wiki_page(REPO, force=True)
+        parse.assert_not_called()
+        assert again.content_hash == first.content_hash and not again.stale
+        assert cache_stats()["content_hash"]["unchanged"] == 1
+
+    def test_same_content_new_html_reparsed(self, mocker):
+        fetch = mocker.patch("tinkywiki_mcp.parser._fetch_html", return_value=SAMPLE_HTML)
+        first = fetch_wiki_page(REPO)
+        fetch.return_value = SAMPLE_HTML.replace("</body>", "<!-- build 42 --></body>")
+        again = fetch_wiki_page(REPO, force=True)
+        assert again.html_digest != first.html_digest
+        assert again.content_hash == first.content_hash
+        assert cache_stats()["content_hash"]["unchanged"] == 1
+
+    def test_changed_content(self, mocker):
+        fetch = mocker.patch("tinkywiki_mcp.parser._fetch_html", return_value=SAMPLE_HTML)
+        first = fetch_wiki_page(REPO)
+        fetch.return_value = CHANGED_HTML
+        again = fetch_wiki_page(REPO, force=True)
+        assert again.content_hash != first.content_hash
+        assert get_cached_wiki_page(REPO).content_hash == again.content_hash
+        assert cache_stats()["content_hash"]["changed"] == 1
+
+    def test_deepwiki_unchanged_html_skips_parse(self, mocker):
+        html = "<html><body><h1>vscode</h1><h2>Overview</h2><p>Editor.</p></body></html>"
+        mocker.patch("tinkywiki_mcp.deepwiki._fetch_deepwiki_html", return_value=html)
+        first = fetch_deepwiki_page(REPO)
+        parse = mocker.patch("tinkywiki_mcp.deepwiki._parse_deepwiki_content")
+        again = fetch_deepwiki_page(REPO, force=True)
+        parse.assert_not_called()
+        assert again.content_hash == first.content_hash != ""
+
+
+class TestDerivedEntries:
+    def test_unchanged_page_restamps_topics_and_answers(self, cache_clock):
+        page = _page()
+        set_cached_wiki_page(REPO, page)
+        set_cached_topics(REPO, "topics", page.content_hash)
+        set_cached_search(REPO, "How to build?", "Run make.")
+        cache_clock.return_value += min(config.TOPIC_CACHE_TTL_SECONDS,
+                                        config.SEARCH_CACHE_TTL_SECONDS) - 10
+        set_cached_wiki_page(REPO, _page())  # re-render, same content
+        cache_clock.return_value += 20
+        assert get_cached_topics(REPO) == "topics"
+        assert get_cached_search(REPO, "How to build?") == "Run make."
+        assert cache_stats()["content_hash"]["restamped"] == 2
+
+    def test_without_restamp_entries_expire(self, cache_clock):
+        set_cached_wiki_page(REPO, _page())
+        set_cached_topics(REPO, "topics")
+        cache_clock.return_value += config.TOPIC_CACHE_TTL_SECONDS + 10
+        assert get_cached_topics(REPO) is None
+
+    def test_changed_page_invalidates_dependents(self):
+        set_cached_wiki_page(REPO, _page())
+        set_cached_wiki_page(OTHER, _page())
+        set_cached_topics(REPO, "topics")
+        set_cached_search(REPO, "How to build?", "Run make.")
+        set_cached_search(OTHER, "How to build?", "Other answer.")
+        set_cached_wiki_page(REPO, _page(title="VS Code (renamed)"))
+        assert get_cached_topics(REPO) is None
+        assert get_cached_search(REPO, "How to build?") is None
+        assert l2_get("search", f"{REPO}::how to build?") is None
+        assert get_cached_search(OTHER, "How to build?") == "Other answer."
+        assert cache_stats()["content_hash"]["invalidated"] == 2
+
+    def test_entries_built_from_the_new_page_survive(self):
+        set_cached_wiki_page(REPO, _page())
+        new = _page(title="VS Code (renamed)")
+        set_cached_topics(REPO, "new topics", new.content_hash)  # built before the store
+        set_cached_wiki_page(REPO, new)
+        assert get_cached_topics(REPO) == "new topics"
+
+    def test_deepwiki_page_tracked(self):
+        key = f"deepwiki::{REPO}"
+        set_cached_wiki_page(key, _page(source="deepwiki"))
+        set_cached_search(REPO, "q", "answer")
+        set_cached_wiki_page(key, _page(source="deepwiki", title="changed"))
+        assert get_cached_search(REPO, "q") is None
+
+    def test_untracked_without_a_page(self):
+        set_cached_search(REPO, "q", "answer")
+        set_cached_wiki_page(REPO, _page())
+        set_cached_wiki_page(REPO, _page(title="changed"))
+        assert get_cached_search(REPO, "q") == "answer"
+        assert cache_stats()["content_hash"]["tracked_pages"] == 0
+
+    def test_pages_without_hash_ignored(self):
+        set_cached_wiki_page(REPO, make_wiki_page())
+        set_cached_topics(REPO, "topics")
+        set_cached_wiki_page(REPO, make_wiki_page(title="changed"))
+        assert get_cached_topics(REPO) == "topics"
+
+
+class TestLocalIndex:
+    def test_same_content_reuses_index(self, mocker):
+        mocker.patch.object(config, "LOCAL_INDEX_ENABLED", True)
+        index = index_page(REPO, _page())
+        assert index_page(REPO, _page()) is index
+        changed = index_page(REPO, _page(title="changed"))
+        assert changed is not index and get_index(REPO) is changed
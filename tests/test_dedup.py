@@ -7,6 +7,7 @@ import time
 
 import pytest
 
+from tinkywiki_mcp import config
 from tinkywiki_mcp.dedup import dedup_fetch, inflight_count
 
 
@@ -84,6 +85,28 @@ class TestDedupFetch:
         assert all(isinstance(e, RuntimeError) for e in errors)
         assert all("shared failure" in str(e) for e in errors)
 
+    def test_waiter_times_out(self, mocker):
+        """A waiter raises TimeoutError once the lock TTL + hard timeout pass."""
+        mocker.patch.object(config, "CACHE_LOCK_TTL_SECONDS", 0.05)
+        mocker.patch.object(config, "HARD_TIMEOUT_SECONDS", 0.05)
+        started = threading.Event()
+        release = threading.Event()
+
+        def stuck_fetch():
+            started.set()
+            release.wait(timeout=5)
+            return "late"
+
+        owner = threading.Thread(target=lambda: dedup_fetch("stuck-key", stuck_fetch))
+        owner.start()
+        started.wait(timeout=5)
+        try:
+            with pytest.raises(TimeoutError):
+                dedup_fetch("stuck-key", stuck_fetch)
+        finally:
+            release.set()
+            owner.join(timeout=5)
+
     def test_different_keys_run_independently(self):
         """Requests with different keys run in parallel, not deduplicated."""
         call_count = 0
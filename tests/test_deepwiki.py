@@ -11,19 +11,26 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from bs4 import BeautifulSoup
 
+from tinkywiki_mcp.cache import CacheLookup
 from tinkywiki_mcp.deepwiki import (
     DeepWikiTopic,
     build_deepwiki_url,
     _extract_owner_repo,
     _parse_sidebar_topics,
     _parse_deepwiki_content,
+    _find_content_root,
     is_deepwiki_not_indexed,
     fetch_deepwiki_page,
     fetch_deepwiki_section,
+    crawl_deepwiki_page,
+    fetch_deepwiki_topic,
+    crawl_progress,
+    extract_payload_markdown,
+    _fetch_deepwiki_html,
     deepwiki_ask,
     deepwiki_request_indexing,
 )
-from tinkywiki_mcp.parser import WikiPage, WikiSection
+from tinkywiki_mcp.parser import WikiPage, WikiSection, get_section_by_title
 
 
 # ---------------------------------------------------------------------------
@@ -178,6 +185,47 @@ class TestParseDeepwikiContent:
         sections = _parse_deepwiki_content(soup)
         assert len(sections) >= 1
 
+    def test_nested_headings_own_only_their_siblings(self):
+        html = """
+        <html><body><article>
+          <h2>A</h2><p>a1</p>
+          <div><h3>B</h3><p>b1</p></div>
+          <p>a2</p>
+          <h2>C</h2><p>c1</p>
+        </article></body></html>
+        """
+        sections = _parse_deepwiki_content(BeautifulSoup(html, "lxml"))
+        assert [s.title for s in sections] == ["A", "B", "C"]
+        assert sections[0].content.endswith("a2")
+        assert sections[1].content == "b1"
+        assert sections[2].content == "c1"
+
+
+class TestFindContentRoot:
+    def test_selector_priority_beats_document_order(self):
+        html = '<body><div class="prose">p</div><main>m</main><article>a</article></body>'
+        assert _find_content_root(BeautifulSoup(html, "lxml")).name == "article"
+
+    def test_attribute_contains_selector(self, mocker):
+        mocker.patch("tinkywiki_mcp.deepwiki.config.DEEPWIKI_CONTENT_SELECTORS",
+                     ["[id*='Content']"])
+        html = '<body><div id="page-content-area">x</div></body>'
+        assert _find_content_root(BeautifulSoup(html, "lxml"))["id"] == "page-content-area"
+
+    def test_no_match(self):
+        assert _find_content_root(BeautifulSoup("<body><div>x</div></body>", "lxml")) is None
+
+    def test_saved_pages(self):
+        from pathlib import Path
+
+        fixtures = Path(__file__).parent / "fixtures"
+        soup = BeautifulSoup((fixtures / "deepwiki_topic_page.html").read_text(), "lxml")
+        assert _find_content_root(soup).name == "main"
+        sections = _parse_deepwiki_content(soup)
+        assert sections[0].title == "Fiber Reconciler"
+        assert len(sections) == 121
+        assert all(s.content for s in sections)
+
 
 # ---------------------------------------------------------------------------
 # Page fetching (mocked)
@@ -211,19 +259,19 @@ class TestFetchDeepwikiPage:
         page = fetch_deepwiki_page("https://github.com/unknown/repo")
         assert page is None
 
-    def test_returns_none_when_html_empty(self, mocker):
+    def test_raises_timeout_when_html_empty(self, mocker):
         mocker.patch("tinkywiki_mcp.deepwiki._fetch_deepwiki_html", return_value="")
         mocker.patch("tinkywiki_mcp.deepwiki.get_cached_wiki_page", return_value=None)
 
-        page = fetch_deepwiki_page("https://github.com/owner/repo")
-        assert page is None
+        with pytest.raises(TimeoutError):
+            fetch_deepwiki_page("https://github.com/owner/repo")
 
     def test_uses_cache(self, mocker):
         cached = WikiPage(
             repo_name="o/r", url="u", title="t",
             sections=[], toc=[], diagrams=[], raw_text="cached",
         )
-        mocker.patch("tinkywiki_mcp.deepwiki.get_cached_wiki_page", return_value=cached)
+        mocker.patch("tinkywiki_mcp.deepwiki.lookup_wiki_page", return_value=CacheLookup(cached))
         mock_html = mocker.patch("tinkywiki_mcp.deepwiki._fetch_deepwiki_html")
 
         page = fetch_deepwiki_page("https://github.com/o/r")
@@ -262,6 +310,263 @@ class TestFetchDeepwikiSection:
         assert page is None
 
 
+_REPO_HTML = """
+<html><body>
+<h1>React</h1>
+<nav>
+  <a href="/facebook/react/1-overview">Overview</a>
+  <a href="/facebook/react/2-component-system">Component System</a>
+  <a href="/facebook/react/2.1-hooks">Hooks</a>
+</nav>
+<article><p>React is a JavaScript library for building user interfaces.</p></article>
+</body></html>
+"""
+
+
+def _topic_html(title: str) -> str:
+    return f"""
+    <html><body><article>
+      <h1>{title}</h1>
+      <p>{title} explained in enough detail to be useful to a reader.</p>
+      <h2>{title} internals</h2>
+      <p>How {title} works under the hood.</p>
+    </article></body></html>
+    """
+
+
+def _patch_html(mocker, fail: set[str] = frozenset()):
+    def _html(url: str) -> str:
+        slug = url.rsplit("/", 1)[-1]
+        if url.endswith("/facebook/react"):
+            return _REPO_HTML
+        if slug in fail:
+            raise TimeoutError("render timed out")
+        return _topic_html(slug)
+
+    return mocker.patch("tinkywiki_mcp.deepwiki._fetch_deepwiki_html", side_effect=_html)
+
+
+class TestCrawlDeepwikiPage:
+    REPO = "https://github.com/facebook/react"
+
+    @pytest.fixture(autouse=True)
+    def _crawl_enabled(self, mocker):
+        mocker.patch("tinkywiki_mcp.deepwiki.config.DEEPWIKI_CRAWL_ENABLED", True)
+
+    def test_merges_all_topics(self, mocker):
+        _patch_html(mocker)
+        page = crawl_deepwiki_page(self.REPO)
+        titles = [s.title for s in page.sections]
+        assert titles[-3:] == ["Overview", "Component System", "Hooks"]
+        hooks = page.sections[-1]
+        assert hooks.level == 2
+        assert "2.1-hooks explained" in hooks.content
+        assert "### 2.1-hooks internals" in hooks.content
+        assert not any(s.content.startswith("[Full content at:") for s in page.sections)
+        assert page.source == "deepwiki"
+
+    def test_failed_topic_keeps_stub(self, mocker):
+        _patch_html(mocker, fail={"2.1-hooks"})
+        page = crawl_deepwiki_page(self.REPO)
+        assert page.sections[-1].content == "[Full content at: https://deepwiki.com/facebook/react/2.1-hooks]"
+        assert crawl_progress(self.REPO)["failed"] == 1
+
+    def test_topics_are_cached_individually(self, mocker):
+        html = _patch_html(mocker, fail={"2.1-hooks"})
+        crawl_deepwiki_page(self.REPO)  # partial — not cached as a whole
+        html.reset_mock()
+        crawl_deepwiki_page(self.REPO)
+        topic_urls = [c.args[0] for c in html.call_args_list if "/facebook/react/" in c.args[0]]
+        assert topic_urls == ["https://deepwiki.com/facebook/react/2.1-hooks"]
+
+    def test_complete_crawl_is_cached(self, mocker):
+        html = _patch_html(mocker)
+        first = crawl_deepwiki_page(self.REPO)
+        calls = html.call_count
+        assert crawl_deepwiki_page(self.REPO) is first
+        assert html.call_count == calls
+
+    def test_bounded_concurrency(self, mocker):
+        import threading
+        import time
+
+        mocker.patch("tinkywiki_mcp.deepwiki.config.DEEPWIKI_CRAWL_CONCURRENCY", 2)
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def _html(url: str) -> str:
+            if url.endswith("/facebook/react"):
+                return _REPO_HTML
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+            return _topic_html("t")
+
+        mocker.patch("tinkywiki_mcp.deepwiki._fetch_deepwiki_html", side_effect=_html)
+        crawl_deepwiki_page(self.REPO)
+        assert state["peak"] == 2
+        assert crawl_progress(self.REPO)["done"] == 3
+
+    def test_max_topics(self, mocker):
+        mocker.patch("tinkywiki_mcp.deepwiki.config.DEEPWIKI_CRAWL_MAX_TOPICS", 1)
+        _patch_html(mocker)
+        page = crawl_deepwiki_page(self.REPO)
+        assert [s.title for s in page.sections][-1] == "Overview"
+        assert crawl_progress(self.REPO)["total"] == 1
+
+    def test_disabled_returns_plain_page(self, mocker):
+        mocker.patch("tinkywiki_mcp.deepwiki.config.DEEPWIKI_CRAWL_ENABLED", False)
+        html = _patch_html(mocker)
+        page = crawl_deepwiki_page(self.REPO)
+        assert page.sections[-1].content.startswith("[Full content at:")
+        assert html.call_count == 1
+
+    def test_not_indexed_returns_none(self, mocker):
+        mocker.patch(
+            "tinkywiki_mcp.deepwiki._fetch_deepwiki_html",
+            return_value="<html><body><h1>Repository Not Found</h1></body></html>",
+        )
+        assert crawl_deepwiki_page(self.REPO) is None
+
+
+class TestFetchDeepwikiTopic:
+    REPO = "https://github.com/facebook/react"
+
+    def test_fetches_only_the_matching_topic(self, mocker):
+        html = _patch_html(mocker)
+        page = fetch_deepwiki_topic(self.REPO, "hooks")
+        hooks = get_section_by_title(page, "hooks")
+        assert "2.1-hooks explained" in hooks.content
+        assert [c.args[0] for c in html.call_args_list if "/facebook/react/" in c.args[0]] == [
+            "https://deepwiki.com/facebook/react/2.1-hooks"
+        ]
+        assert get_section_by_title(page, "Component System").content.startswith(
+            "[Full content at:"
+        )
+
+    def test_no_matching_topic_returns_plain_page(self, mocker):
+        html = _patch_html(mocker)
+        page = fetch_deepwiki_topic(self.REPO, "Deployment")
+        assert page.sections[-1].content.startswith("[Full content at:")
+        assert not [c for c in html.call_args_list if "/facebook/react/" in c.args[0]]
+
+    def test_failed_topic_returns_plain_page(self, mocker):
+        _patch_html(mocker, fail={"2.1-hooks"})
+        page = fetch_deepwiki_topic(self.REPO, "hooks")
+        assert get_section_by_title(page, "hooks").content.startswith("[Full content at:")
+
+    def test_expired_sidebar_html_failing_returns_plain_page(self, mocker):
+        _patch_html(mocker)
+        base = fetch_deepwiki_page(self.REPO)  # parsed page cached
+        mocker.patch("tinkywiki_mcp.deepwiki._fetch_deepwiki_html",
+                     side_effect=TimeoutError("render timed out"))
+        assert fetch_deepwiki_topic(self.REPO, "hooks") == base
+        mocker.patch("tinkywiki_mcp.deepwiki.config.DEEPWIKI_CRAWL_ENABLED", True)
+        assert crawl_deepwiki_page(self.REPO) == base
+
+    def test_failed_page_returns_none(self, mocker):
+        mocker.patch("tinkywiki_mcp.deepwiki._fetch_deepwiki_html",
+                     side_effect=TimeoutError("render timed out"))
+        assert fetch_deepwiki_topic(self.REPO, "hooks") is None
+        assert crawl_deepwiki_page(self.REPO) is None
+
+
+_MARKDOWN = (
+    "# Overview\n\nReact is a JavaScript library for building user interfaces. "
+    "It lets you compose complex UIs from small, isolated pieces of code.\n\n"
+    "## Rendering\n\nReconciliation compares element trees and applies the "
+    "minimal set of DOM mutations.\n\n```js\nroot.render(<App />);\n```\n"
+)
+_SHELL = '<html><body><nav><a href="/facebook/react/1-overview">Overview</a></nav>{}</body></html>'
+
+
+def _rsc_page(markdown: str) -> str:
+    import json
+
+    row = f"5:T{len(markdown.encode()):x},{markdown}"
+    return _SHELL.format(f"<script>self.__next_f.push([1,{json.dumps(row)}])</script>")
+
+
+class TestPayloadExtraction:
+    def test_next_data(self):
+        import json
+
+        data = {"props": {"pageProps": {"page": {"content": _MARKDOWN}}}}
+        html = _SHELL.format(
+            f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(data)}</script>'
+        )
+        assert extract_payload_markdown(html) == _MARKDOWN
+
+    def test_rsc_text_row(self):
+        assert extract_payload_markdown(_rsc_page(_MARKDOWN)) == _MARKDOWN
+
+    def test_rsc_json_row(self):
+        import json
+
+        row = "3:" + json.dumps(["$", "div", None, {"markdown": _MARKDOWN}])
+        html = _SHELL.format(f"<script>self.__next_f.push([1,{json.dumps(row)}])</script>")
+        assert extract_payload_markdown(html) == _MARKDOWN
+
+    def test_no_payload(self):
+        assert extract_payload_markdown(_SHELL.format("")) == ""
+
+
+class TestStaticFetch:
+    URL = "https://deepwiki.com/facebook/react"
+
+    def _serve(self, mocker, status: int, body: str):
+        import httpx
+        from tinkywiki_mcp import http_client
+
+        mocker.patch.object(
+            http_client, "_transport",
+            httpx.MockTransport(lambda r: httpx.Response(status, text=body)),
+        )
+        http_client.reset_http_client()
+        return mocker.patch("tinkywiki_mcp.deepwiki.fetch_rendered_html", return_value="")
+
+    def test_ssr_html_skips_browser(self, mocker):
+        ssr = _SHELL.format(
+            "<article><h1>Overview</h1><p>" + "React renders UI. " * 20 + "</p></article>"
+        )
+        render = self._serve(mocker, 200, ssr)
+        assert "React renders UI." in _fetch_deepwiki_html(self.URL)
+        render.assert_not_called()
+
+    def test_payload_is_rendered_into_page(self, mocker):
+        render = self._serve(mocker, 200, _rsc_page(_MARKDOWN))
+        page = fetch_deepwiki_page("https://github.com/facebook/react")
+        render.assert_not_called()
+        titles = [s.title for s in page.sections]
+        assert titles[:2] == ["Overview", "Rendering"]
+        assert "root.render(<App />);" in page.sections[1].content
+
+    def test_incomplete_page_falls_back_to_browser(self, mocker):
+        render = self._serve(mocker, 200, _SHELL.format("<main>Loading…</main>"))
+        render.return_value = "<html><body>rendered</body></html>"
+        assert _fetch_deepwiki_html(self.URL) == "<html><body>rendered</body></html>"
+        render.assert_called_once()
+
+    def test_server_error_falls_back_to_browser(self, mocker):
+        render = self._serve(mocker, 503, "unavailable")
+        _fetch_deepwiki_html(self.URL)
+        render.assert_called_once()
+
+    def test_not_found_page_is_final(self, mocker):
+        render = self._serve(mocker, 404, "<html><body><h1>Repository not found</h1></body></html>")
+        assert fetch_deepwiki_page("https://github.com/unknown/repo") is None
+        render.assert_not_called()
+
+    def test_disabled(self, mocker):
+        mocker.patch("tinkywiki_mcp.deepwiki.config.DEEPWIKI_HTTP_ENABLED", False)
+        render = self._serve(mocker, 200, _rsc_page(_MARKDOWN))
+        _fetch_deepwiki_html(self.URL)
+        render.assert_called_once()
+
+
 # ---------------------------------------------------------------------------
 # DeepWiki Ask / Chat (mocked)
 # ---------------------------------------------------------------------------
@@ -0,0 +1,168 @@
+"""Tests for the pluggable cache eviction policies (v1.5.0)."""
+
+from __future__ import annotations
+
+import threading
+
+from tinkywiki_mcp import cache, config
+from tinkywiki_mcp.cache import cache_stats, get_cached_search, set_cached_search
+from tinkywiki_mcp.eviction import CountMinSketch, LRUPolicy, TinyLFUPolicy, make_policy
+from tests.bench_cache_policies import replay, synthetic_trace
+
+
+def _fill(budget, keys):
+    for key in keys:
+        if budget.get(key) is None:
+            budget[key] = key
+
+
+class TestCountMinSketch:
+    def test_counts(self):
+        sketch = CountMinSketch(100)
+        for _ in range(5):
+            sketch.increment("hot")
+        sketch.increment("cold")
+        assert sketch.estimate("hot") == 5
+        assert sketch.estimate("cold") == 1
+        assert sketch.estimate("never") == 0
+
+    def test_counters_saturate(self):
+        sketch = CountMinSketch(1000)
+        for _ in range(40):
+            sketch.increment("k")
+        assert sketch.estimate("k") == 15
+
+    def test_ages_by_halving(self):
+        sketch = CountMinSketch(1)  # resets every 10 increments
+        for _ in range(8):
+            sketch.increment("k")
+        sketch.increment("a")
+        sketch.increment("b")
+        assert sketch.resets == 1
+        assert sketch.estimate("k") == 4
+
+
+class TestPolicies:
+    def test_factory(self):
+        assert isinstance(make_policy("lru", 100, 10), LRUPolicy)
+        assert isinstance(make_policy("tinylfu", 100, 10), TinyLFUPolicy)
+        assert isinstance(make_policy("arc", 100, 10), LRUPolicy)
+
+    def test_lru_victim_is_least_recent(self):
+        policy = LRUPolicy()
+        for key in "abc":
+            policy.on_insert(key, 1)
+        policy.on_access("a")
+        assert policy.victim() == "b"
+
+    def test_tinylfu_rejects_one_off_newcomer(self):
+        budget = cache._BudgetCache(10**6, 10, 60, policy="tinylfu")
+        hot = [f"hot-{i}" for i in range(9)]
+        for _ in range(3):
+            _fill(budget, hot)
+        _fill(budget, [f"scan-{i}" for i in range(50)])
+        assert all(key in budget for key in hot)
+        assert budget.policy.rejected >= 49
+
+    def test_lru_is_flushed_by_scan(self):
+        budget = cache._BudgetCache(10**6, 10, 60, policy="lru")
+        hot = [f"hot-{i}" for i in range(9)]
+        for _ in range(3):
+            _fill(budget, hot)
+        _fill(budget, [f"scan-{i}" for i in range(50)])
+        assert not any(key in budget for key in hot)
+
+    def test_tinylfu_admits_newly_popular_key(self):
+        budget = cache._BudgetCache(10**6, 10, 60, policy="tinylfu")
+        _fill(budget, [f"k{i}" for i in range(10)])
+        for _ in range(5):  # misses count too: each one re-inserts
+            budget.pop("new", None)
+            _fill(budget, ["new"])
+        _fill(budget, ["other"])
+        assert "new" in budget
+        assert len(budget) == 10
+
+    def test_second_hit_promotes_to_protected(self):
+        policy = TinyLFUPolicy(10**6, 100)
+        for key in ("a", "b", "c"):
+            policy.on_insert(key, 10)
+        policy.on_access("a")
+        stats = policy.stats()
+        assert stats["protected"] == 1
+        assert stats["window"] + stats["probation"] == 2
+
+    def test_respects_byte_budget(self):
+        budget = cache._BudgetCache(10_000, 100, 60, policy="tinylfu")
+        for i in range(40):
+            budget[f"k{i}"] = "x" * 1000
+        assert budget.currsize <= 10_000
+        assert budget.evictions == 40 - len(budget)
+
+    def test_expired_and_deleted_keys_leave_the_policy(self, mocker):
+        clock = mocker.patch("tinkywiki_mcp.cache.time.monotonic", return_value=1000.0)
+        budget = cache._BudgetCache(10**6, 10, 60, policy="tinylfu")
+        budget.timer.__init__(clock)  # cachetools captured the real monotonic
+        _fill(budget, ["a", "b"])
+        del budget["a"]
+        clock.return_value = 2000.0
+        budget.expire()
+        assert budget.policy.victim() is None
+
+    def test_concurrent_reads_and_writes(self):
+        for name in ("lru", "tinylfu"):
+            budget = cache._BudgetCache(50_000, 20, 60, policy=name)
+            errors = []
+
+            def worker(seed):
+                try:
+                    for i in range(2000):
+                        key = f"k{(i * seed) % 60}"
+                        if budget.get(key) is None:
+                            budget[key] = "x" * 500
+                        if i % 7 == 0:
+                            budget.pop(key, None)
+                except Exception as exc:  # surfaced by the assert below
+                    errors.append(exc)
+
+            threads = [threading.Thread(target=worker, args=(seed,)) for seed in (1, 3, 7, 11)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert errors == []
+            assert len(budget) <= 20
+
+    def test_clear_resets_policy(self):
+        budget = cache._BudgetCache(10**6, 10, 60, policy="tinylfu")
+        _fill(budget, ["a", "b"])
+        budget.reset()
+        assert budget.policy.victim() is None
+        assert budget.policy.sketch.estimate("a") == 0
+
+
+class TestCacheIntegration:
+    def test_default_policy_from_config(self):
+        assert cache._search_cache.policy.name == config.CACHE_EVICTION_POLICY
+        set_cached_search("repo", "q", "answer")
+        assert get_cached_search("repo", "q") == "answer"
+        assert cache_stats()["search"]["policy"] == config.CACHE_EVICTION_POLICY
+
+    def test_trace_records_lookups(self, mocker, tmp_path):
+        trace = tmp_path / "trace.log"
+        mocker.patch.object(config, "CACHE_TRACE_FILE", str(trace))
+        get_cached_search("repo", "q")
+        cache.get_cached_section("https://deepwiki.com/o/r/1")
+        lines = [line.split("\t")[1:] for line in trace.read_text().splitlines()]
+        assert lines == [["search", "repo::q"], ["section", "https://deepwiki.com/o/r/1"]]
+
+
+class TestTraceReplay:
+    def test_tinylfu_beats_lru_under_scans(self):
+        keys = [key for _, key in synthetic_trace(lookups=8000)]
+        lru = replay(keys, "lru", 30)
+        tinylfu = replay(keys, "tinylfu", 30)
+        assert tinylfu > lru + 0.03
+
+    def test_no_regression_without_scans(self):
+        keys = [key for _, key in synthetic_trace(lookups=8000, scan_length=0)]
+        assert replay(keys, "tinylfu", 30) >= replay(keys, "lru", 30) - 0.01
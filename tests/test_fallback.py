@@ -1,11 +1,14 @@
 """Tests for tinkywiki_mcp.fallback — Fallback orchestrator (v1.4.0).
 
 Covers: FallbackResult, SearchFallbackResult, _is_not_indexed_error,
-fetch_page_with_fallback, search_with_fallback, build_source_banner.
+fetch_page_with_fallback (sequential and parallel), search_with_fallback,
+build_source_banner.
 """
 
 from __future__ import annotations
 
+import time
+
 import pytest
 
 from tinkywiki_mcp.fallback import (
@@ -244,6 +247,151 @@ class TestFetchPageWithFallback:
         assert result.source == SOURCE_DEEPWIKI
 
 
+# ---------------------------------------------------------------------------
+# fetch_page_with_fallback — parallel mode (v1.5.0)
+# ---------------------------------------------------------------------------
+def _slow(result: FallbackResult, delay: float):
+    def _fn(_repo_url):
+        time.sleep(delay)
+        return result
+    return _fn
+
+
+class TestParallelFallback:
+    @pytest.fixture(autouse=True)
+    def _parallel(self, mocker):
+        mocker.patch("tinkywiki_mcp.fallback.config.FALLBACK_ENABLED", True)
+        mocker.patch("tinkywiki_mcp.fallback.config.DEEPWIKI_ENABLED", True)
+        mocker.patch("tinkywiki_mcp.fallback.config.GITHUB_API_ENABLED", True)
+        mocker.patch("tinkywiki_mcp.fallback.config.FALLBACK_MODE", "parallel")
+        mocker.patch("tinkywiki_mcp.fallback.config.FALLBACK_STAGGER_SECONDS", 0.05)
+        mocker.patch("tinkywiki_mcp.fallback.config.FALLBACK_PARALLEL_DEADLINE_SECONDS", 2.0)
+        return mocker.patch("tinkywiki_mcp.fallback._request_tinkywiki_indexing_async")
+
+    def test_fast_tinkywiki_skips_lower_layers(self, mocker):
+        page = _page()
+        mocker.patch(
+            "tinkywiki_mcp.fallback._try_tinkywiki",
+            return_value=FallbackResult(page=page, source=SOURCE_CODEWIKI),
+        )
+        dw_mock = mocker.patch("tinkywiki_mcp.fallback._try_deepwiki")
+        gh_mock = mocker.patch("tinkywiki_mcp.fallback._try_github_api")
+
+        result = fetch_page_with_fallback("https://github.com/owner/repo")
+        assert result.page is page
+        assert result.source == SOURCE_CODEWIKI
+        dw_mock.assert_not_called()
+        gh_mock.assert_not_called()
+
+    def test_prefers_higher_priority_even_if_slower(self, mocker):
+        tw_page, dw_page = _page(), _page()
+        mocker.patch(
+            "tinkywiki_mcp.fallback._try_tinkywiki",
+            side_effect=_slow(FallbackResult(page=tw_page, source=SOURCE_CODEWIKI), 0.3),
+        )
+        mocker.patch(
+            "tinkywiki_mcp.fallback._try_deepwiki",
+            return_value=FallbackResult(page=dw_page, source=SOURCE_DEEPWIKI),
+        )
+        mocker.patch(
+            "tinkywiki_mcp.fallback._try_github_api",
+            return_value=FallbackResult(page=_page(), source=SOURCE_GITHUB_API),
+        )
+
+        result = fetch_page_with_fallback("https://github.com/owner/repo")
+        assert result.page is tw_page
+        assert result.tinkywiki_not_indexed is False
+
+    def test_lower_layer_overlaps_slow_not_indexed(self, mocker, _parallel):
+        dw_page = _page()
+        mocker.patch(
+            "tinkywiki_mcp.fallback._try_tinkywiki",
+            side_effect=_slow(
+                FallbackResult(page=_not_indexed_page(), source=SOURCE_CODEWIKI), 0.3
+            ),
+        )
+        dw_mock = mocker.patch(
+            "tinkywiki_mcp.fallback._try_deepwiki",
+            side_effect=_slow(FallbackResult(page=dw_page, source=SOURCE_DEEPWIKI), 0.3),
+        )
+        mocker.patch(
+            "tinkywiki_mcp.fallback._try_github_api",
+            side_effect=_slow(FallbackResult(page=None, source=SOURCE_GITHUB_API), 0.3),
+        )
+
+        start = time.monotonic()
+        result = fetch_page_with_fallback("https://github.com/owner/repo")
+        elapsed = time.monotonic() - start
+
+        assert result.page is dw_page
+        assert result.source == SOURCE_DEEPWIKI
+        assert result.tinkywiki_not_indexed is True
+        assert result.deepwiki_not_indexed is False
+        dw_mock.assert_called_once()
+        _parallel.assert_called_once()
+        assert elapsed < 0.55  # overlapped, not 0.3 + 0.3 sequentially
+
+    def test_falls_through_to_github_with_flags(self, mocker):
+        gh_page = _page()
+        mocker.patch(
+            "tinkywiki_mcp.fallback._try_tinkywiki",
+            return_value=FallbackResult(page=None, source=SOURCE_CODEWIKI),
+        )
+        mocker.patch(
+            "tinkywiki_mcp.fallback._try_deepwiki",
+            return_value=FallbackResult(page=None, source=SOURCE_DEEPWIKI),
+        )
+        mocker.patch(
+            "tinkywiki_mcp.fallback._try_github_api",
+            return_value=FallbackResult(page=gh_page, source=SOURCE_GITHUB_API),
+        )
+
+        result = fetch_page_with_fallback("https://github.com/owner/repo")
+        assert result.page is gh_page
+        assert result.tinkywiki_not_indexed is True
+        assert result.deepwiki_not_indexed is True
+
+    def test_deadline_returns_best_available(self, mocker):
+        mocker.patch("tinkywiki_mcp.fallback.config.FALLBACK_PARALLEL_DEADLINE_SECONDS", 0.2)
+        dw_page = _page()
+        mocker.patch(
+            "tinkywiki_mcp.fallback._try_tinkywiki",
+            side_effect=_slow(FallbackResult(page=_page(), source=SOURCE_CODEWIKI), 1.0),
+        )
+        mocker.patch(
+            "tinkywiki_mcp.fallback._try_deepwiki",
+            return_value=FallbackResult(page=dw_page, source=SOURCE_DEEPWIKI),
+        )
+        mocker.patch(
+            "tinkywiki_mcp.fallback._try_github_api",
+            return_value=FallbackResult(page=None, source=SOURCE_GITHUB_API),
+        )
+
+        result = fetch_page_with_fallback("https://github.com/owner/repo")
+        assert result.page is dw_page
+        # TinkyWiki was still rendering — unknown, so not flagged as not indexed
+        assert result.tinkywiki_not_indexed is False
+
+    def test_all_failed(self, mocker):
+        mocker.patch(
+            "tinkywiki_mcp.fallback._try_tinkywiki",
+            return_value=FallbackResult(page=None, source=SOURCE_CODEWIKI),
+        )
+        mocker.patch(
+            "tinkywiki_mcp.fallback._try_deepwiki",
+            return_value=FallbackResult(page=None, source=SOURCE_DEEPWIKI),
+        )
+        mocker.patch(
+            "tinkywiki_mcp.fallback._try_github_api",
+            side_effect=RuntimeError("boom"),
+        )
+
+        result = fetch_page_with_fallback("https://github.com/owner/repo")
+        assert result.page is None
+        assert result.tinkywiki_not_indexed is True
+        assert result.deepwiki_not_indexed is True
+
+
 # ---------------------------------------------------------------------------
 # search_with_fallback
 # ---------------------------------------------------------------------------
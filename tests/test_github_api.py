@@ -7,16 +7,20 @@ file tree, code search, WikiPage builder, and search answer.
 from __future__ import annotations
 
 import base64
-import json
+import threading
 from unittest.mock import patch
 
+import httpx
 import pytest
 
+from tinkywiki_mcp import github_client
+from tinkywiki_mcp.cache import clear_cache
 from tinkywiki_mcp.github_api import (
     RepoMeta,
     _extract_owner_repo,
     _github_get,
     _github_headers,
+    github_request_scope,
     fetch_file_tree,
     fetch_github_wiki_page,
     fetch_readme,
@@ -24,7 +28,10 @@ from tinkywiki_mcp.github_api import (
     github_search_answer,
     search_code,
 )
+from tinkywiki_mcp.github_client import reset_github_client
 from tinkywiki_mcp.parser import WikiPage
+from tests.conftest import mock_github
+from tests.github_stub import GitHubStub, sample_repo
 
 
 # ---------------------------------------------------------------------------
@@ -46,25 +53,28 @@ class TestGithubHeaders:
 
 class TestGithubGet:
     def test_success(self, mocker):
-        class _Resp:
-            def __enter__(self):
-                return self
-
-            def __exit__(self, *_):
-                return False
-
-            def read(self):
-                return json.dumps({"name": "react"}).encode()
-
-        mocker.patch("urllib.request.urlopen", return_value=_Resp())
+        mock_github(mocker, lambda request: httpx.Response(200, json={"name": "react"}))
         result = _github_get("/repos/facebook/react")
         assert result == {"name": "react"}
 
     def test_timeout_returns_none(self, mocker):
-        mocker.patch("urllib.request.urlopen", side_effect=TimeoutError("timeout"))
+        def _timeout(request):
+            raise httpx.ReadTimeout("timeout", request=request)
+
+        mock_github(mocker, _timeout)
         result = _github_get("/repos/facebook/react")
         assert result is None
 
+    def test_not_found_returns_none_without_retry(self, mocker):
+        calls = mock_github(mocker, lambda request: httpx.Response(404, json={}))
+        assert _github_get("/repos/o/missing") is None
+        assert len(calls) == 1
+
+    def test_server_error_is_retried(self, mocker):
+        calls = mock_github(mocker, lambda request: httpx.Response(502, json={}))
+        assert _github_get("/repos/o/r") is None
+        assert len(calls) > 1
+
     def test_blocks_non_github_host(self):
         # This should be blocked because the URL isn't api.github.com
         result = _github_get("https://evil.com/repos/o/r")
@@ -292,3 +302,132 @@ class TestGithubSearchAnswer:
         answer = github_search_answer("https://github.com/o/r", "nonexistent")
         assert answer is not None
         assert "o/r" in answer
+
+
+# ---------------------------------------------------------------------------
+# Concurrent assembly + request-scoped memo
+# ---------------------------------------------------------------------------
+_REPO_DATA = {"description": "Lib", "stargazers_count": 5, "default_branch": "trunk"}
+_README_DATA = {"content": base64.b64encode(b"# Lib").decode(), "encoding": "base64"}
+_TREE_DATA = {"tree": [{"path": "lib.py", "type": "blob"}]}
+
+
+def _fake_fetch(endpoint: str):
+    if endpoint.endswith("/readme"):
+        return _README_DATA
+    if "/git/trees/" in endpoint:
+        return _TREE_DATA
+    return _REPO_DATA
+
+
+class TestConcurrentAssembly:
+    def test_each_endpoint_fetched_once(self, mocker):
+        fetch = mocker.patch("tinkywiki_mcp.github_api._github_fetch", side_effect=_fake_fetch)
+        page = fetch_github_wiki_page("https://github.com/o/r")
+        assert [s.title for s in page.sections] == ["Repository Overview", "README", "File Structure"]
+        endpoints = sorted(c.args[0] for c in fetch.call_args_list)
+        assert len(endpoints) == 3
+        assert endpoints[0] == "/repos/o/r"
+        assert endpoints[1].startswith("/repos/o/r/git/trees/")
+        assert endpoints[2] == "/repos/o/r/readme"
+
+    def test_fetches_run_in_parallel(self, mocker):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def _fetch(endpoint):
+            barrier.wait()  # raises BrokenBarrierError if calls were sequential
+            return _fake_fetch(endpoint)
+
+        mocker.patch("tinkywiki_mcp.github_api._github_fetch", side_effect=_fetch)
+        assert fetch_github_wiki_page("https://github.com/o/r") is not None
+
+    def test_metadata_cached_across_calls(self, mocker):
+        fetch = mocker.patch("tinkywiki_mcp.github_api._github_fetch", side_effect=_fake_fetch)
+        fetch_github_wiki_page("https://github.com/o/r")
+        fetch.reset_mock()
+        assert fetch_repo_meta("https://github.com/O/R").default_branch == "trunk"
+        assert fetch_file_tree("https://github.com/o/r") == ["lib.py"]
+        assert [c.args[0] for c in fetch.call_args_list] == [
+            "/repos/o/r/git/trees/trunk?recursive=1",
+        ]
+
+    def test_request_scope_memoizes(self, mocker):
+        fetch = mocker.patch("tinkywiki_mcp.github_api._github_fetch", return_value={"x": 1})
+        with github_request_scope():
+            _github_get("/repos/o/r/readme")
+            _github_get("/repos/o/r/readme")
+        _github_get("/repos/o/r/readme")  # outside the scope: fetched again
+        assert fetch.call_count == 2
+
+    def test_search_answer_hits_each_endpoint_once(self, mocker):
+        fetch = mocker.patch(
+            "tinkywiki_mcp.github_api._github_fetch",
+            side_effect=lambda e: {"items": []} if e.startswith("/search/") else _fake_fetch(e),
+        )
+        assert "o/r" in github_search_answer("https://github.com/o/r", "nothing")
+        assert fetch.call_count == 3  # search + readme + metadata
+
+
+# ---------------------------------------------------------------------------
+# GraphQL backend
+# ---------------------------------------------------------------------------
+class TestGraphqlBackend:
+    REPO_URL = "https://github.com/octo/widget"
+
+    def _stub(self, mocker, token: str = "ghp_test") -> GitHubStub:
+        stub = GitHubStub([sample_repo()])
+        mocker.patch.object(github_client, "_transport", stub.transport())
+        mocker.patch("tinkywiki_mcp.github_api.config.GITHUB_TOKEN", token)
+        mocker.patch("tinkywiki_mcp.github_api.config.GITHUB_GRAPHQL_ENABLED", True)
+        reset_github_client()
+        return stub
+
+    def test_identical_page_in_one_request(self, mocker):
+        stub = self._stub(mocker)
+        graphql_page = fetch_github_wiki_page(self.REPO_URL)
+        assert stub.requests == ["POST /graphql"]
+
+        clear_cache()
+        mocker.patch("tinkywiki_mcp.github_api.config.GITHUB_GRAPHQL_ENABLED", False)
+        rest_page = fetch_github_wiki_page(self.REPO_URL)
+        assert stub.rest_calls == 3
+        assert graphql_page == rest_page
+        assert "src/widget/core.py" in graphql_page.raw_text
+
+    def test_rest_without_token(self, mocker):
+        stub = self._stub(mocker, token="")
+        assert fetch_github_wiki_page(self.REPO_URL) is not None
+        assert stub.graphql_cost == 0
+        assert stub.rest_calls == 3
+
+    def test_missing_repo(self, mocker):
+        stub = self._stub(mocker)
+        assert fetch_github_wiki_page("https://github.com/octo/nope") is None
+        assert stub.rest_calls == 0
+
+    def test_graphql_failure_falls_back_to_rest(self, mocker):
+        stub = self._stub(mocker)
+        mocker.patch(
+            "tinkywiki_mcp.github_api.github_post_json",
+            side_effect=httpx.HTTPStatusError(
+                "bad", request=httpx.Request("POST", "https://api.github.com/graphql"),
+                response=httpx.Response(502),
+            ),
+        )
+        assert fetch_github_wiki_page(self.REPO_URL) is not None
+        assert stub.rest_calls == 3
+
+    def test_tree_deeper_than_query_uses_rest_tree(self, mocker):
+        stub = self._stub(mocker)
+        mocker.patch("tinkywiki_mcp.github_api.config.GITHUB_GRAPHQL_TREE_DEPTH", 1)
+        page = fetch_github_wiki_page(self.REPO_URL)
+        assert "src/widget/core.py" in page.raw_text
+        assert stub.requests == ["POST /graphql", "GET /repos/octo/widget/git/trees/main"]
+
+    def test_readme_under_other_name_uses_rest_readme(self, mocker):
+        stub = self._stub(mocker)
+        repo = stub.repos["octo/widget"]
+        repo.files["README.markdown"] = repo.files.pop("README.md")
+        page = fetch_github_wiki_page(self.REPO_URL)
+        assert "Install with pip." in page.raw_text
+        assert stub.requests == ["POST /graphql", "GET /repos/octo/widget/readme"]
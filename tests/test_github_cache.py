@@ -0,0 +1,162 @@
+"""Tests for the GitHub conditional-request cache and rate-limit tracking (v1.5.0)."""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import time
+
+import httpx
+import pytest
+
+from tinkywiki_mcp import config, github_cache, github_client
+from tinkywiki_mcp.circuit_breaker import breaker_stats
+from tinkywiki_mcp.github_cache import RateLimitDeferredError, github_cache_stats
+from tinkywiki_mcp.github_client import github_get_json, reset_github_client
+from tinkywiki_mcp.storage import close_all_stores
+
+URL = "https://api.github.com/repos/o/r/readme"
+
+
+def _resource(path: str) -> str:
+    if path.startswith("/search/code"):
+        return "code_search"
+    return "search" if path.startswith("/search/") else "core"
+
+
+class _Api:
+    """Handler serving one ETag'd body and configurable rate-limit headers."""
+
+    def __init__(self, remaining: int = 59, reset_in: float = 3600) -> None:
+        self.requests: list[httpx.Request] = []
+        self.remaining = remaining
+        self.reset_in = reset_in
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        headers = {
+            "X-RateLimit-Limit": "60",
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(int(time.time() + self.reset_in)),
+            "X-RateLimit-Resource": _resource(request.url.path),
+        }
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, json={"path": request.url.path},
+                              headers={**headers, "ETag": '"v1"'})
+
+
+def _install(mocker, api: _Api) -> _Api:
+    mocker.patch.object(github_client, "_transport", httpx.MockTransport(api))
+    reset_github_client()
+    return api
+
+
+class TestConditionalRequests:
+    def test_second_get_is_conditional_and_served_from_store(self, mocker):
+        api = _install(mocker, _Api())
+        first = github_get_json(URL)
+        second = github_get_json(URL)
+        assert first == second == {"path": "/repos/o/r/readme"}
+        assert "If-None-Match" not in api.requests[0].headers
+        assert api.requests[1].headers["If-None-Match"] == '"v1"'
+        stats = github_cache_stats()
+        assert stats["not_modified"] == 1
+        assert stats["hit_ratio"] == 0.5
+        assert stats["not_modified_ratio"] == 1.0
+
+    def test_survives_restart(self, mocker):
+        api = _install(mocker, _Api())
+        github_get_json(URL)
+        close_all_stores()
+        reset_github_client()
+        assert github_get_json(URL) == {"path": "/repos/o/r/readme"}
+        assert api.requests[-1].headers["If-None-Match"] == '"v1"'
+
+    def test_scoped_by_token(self, mocker):
+        api = _install(mocker, _Api())
+        github_get_json(URL)
+        mocker.patch.object(config, "GITHUB_TOKEN", "ghp_other")
+        github_get_json(URL)
+        assert "If-None-Match" not in api.requests[1].headers
+
+    def test_disabled(self, mocker):
+        mocker.patch.object(config, "GITHUB_HTTP_CACHE_ENABLED", False)
+        api = _install(mocker, _Api())
+        github_get_json(URL)
+        github_get_json(URL)
+        assert "If-None-Match" not in api.requests[1].headers
+
+    def test_size_cap_checked_periodically(self, mocker):
+        mocker.patch.object(config, "GITHUB_HTTP_CACHE_MAX_ENTRIES", 2)
+        mocker.patch.object(github_cache, "_TRIM_INTERVAL", 4)
+        _install(mocker, _Api())
+        for n in range(4):  # the first store checks the cap, the next three don't
+            github_get_json(f"{URL}?n={n}")
+        assert github_cache_stats()["entries"] == 4
+        github_get_json(f"{URL}?n=4")
+        assert github_cache_stats()["entries"] == 2
+        assert github_get_json(f"{URL}?n=4") == {"path": "/repos/o/r/readme"}
+
+    def test_store_errors_act_as_no_cache(self, mocker, caplog):
+        mocker.patch.object(github_cache._store, "execute",
+                            side_effect=sqlite3.OperationalError("database is locked"))
+        api = _install(mocker, _Api())
+        with caplog.at_level(logging.WARNING, logger="TinkyWiki"):
+            assert github_get_json(URL) == {"path": "/repos/o/r/readme"}
+            assert github_get_json(URL) == {"path": "/repos/o/r/readme"}
+        assert "If-None-Match" not in api.requests[1].headers
+        assert sum("continuing without the cache" in r.message for r in caplog.records) == 1
+        stats = github_cache_stats()
+        assert stats["errors"] >= 4
+        assert stats["entries"] == 0
+
+
+class TestRateLimitDeferral:
+    def test_low_budget_serves_stored_body_without_request(self, mocker):
+        api = _install(mocker, _Api(remaining=3))
+        github_get_json(URL)
+        assert github_get_json(URL) == {"path": "/repos/o/r/readme"}
+        assert len(api.requests) == 1
+        assert github_cache_stats()["deferred_served"] == 1
+
+    def test_low_budget_without_stored_body_is_refused(self, mocker):
+        api = _install(mocker, _Api(remaining=3))
+        github_get_json(URL)
+        with pytest.raises(RateLimitDeferredError) as info:
+            github_get_json("https://api.github.com/repos/o/r")
+        assert 0 < info.value.retry_after <= 3600
+        assert len(api.requests) == 1
+        assert github_cache_stats()["rate_limits"]["core"]["remaining"] == 3
+
+    def test_resets_after_window(self, mocker):
+        api = _install(mocker, _Api(remaining=0, reset_in=-1))
+        github_get_json(URL)
+        github_get_json("https://api.github.com/repos/o/r")
+        assert len(api.requests) == 2
+
+    def test_resources_are_tracked_separately(self, mocker):
+        api = _install(mocker, _Api(remaining=0))
+        github_get_json(URL)
+        github_get_json("https://api.github.com/search/repositories", params={"q": "vue"})
+        assert len(api.requests) == 2
+
+    def test_code_search_deferred_on_its_own_budget(self, mocker):
+        api = _install(mocker, _Api(remaining=0))
+        github_get_json("https://api.github.com/search/code", params={"q": "x repo:o/r"})
+        with pytest.raises(RateLimitDeferredError):
+            github_get_json("https://api.github.com/search/code", params={"q": "y repo:o/r"})
+        assert set(github_cache_stats()["rate_limits"]) == {"code_search"}
+        github_get_json("https://api.github.com/search/repositories", params={"q": "vue"})
+        assert len(api.requests) == 2
+
+    def test_github_get_skips_without_tripping_breaker(self, mocker):
+        from tinkywiki_mcp.github_api import _github_get
+
+        mocker.patch.object(config, "CB_MIN_CALLS", 1)
+        api = _install(mocker, _Api(remaining=1))
+        assert _github_get("/repos/o/r/readme") is not None
+        for _ in range(3):
+            assert _github_get("/repos/o/r") is None
+        assert len(api.requests) == 1
+        assert breaker_stats()["github_api"]["state"] == "closed"
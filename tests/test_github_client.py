@@ -0,0 +1,66 @@
+"""Tests for the pooled GitHub client and its host allowlist (v1.5.0)."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from tinkywiki_mcp.github_client import (
+    BlockedRequestError,
+    get_github_client,
+    github_client_stats,
+    github_get_json,
+    is_allowed_url,
+)
+from tinkywiki_mcp.retry import is_retryable_exception
+from tests.conftest import mock_github
+
+
+class TestAllowlist:
+    def test_allowed(self):
+        assert is_allowed_url("https://api.github.com/repos/o/r")
+
+    @pytest.mark.parametrize("url", [
+        "http://api.github.com/repos/o/r",
+        "https://evil.com/repos/o/r",
+        "https://api.github.com.evil.com/",
+        "https://api.github.com:8443/",
+        "not a url",
+    ])
+    def test_blocked(self, url):
+        assert not is_allowed_url(url)
+
+    def test_transport_blocks_redirect_off_host(self, mocker):
+        def handler(request):
+            if request.url.host == "api.github.com":
+                return httpx.Response(302, headers={"Location": "https://evil.com/steal"})
+            return httpx.Response(200, json={"leaked": True})
+
+        calls = mock_github(mocker, handler)
+        with pytest.raises(BlockedRequestError):
+            github_get_json("https://api.github.com/repos/o/r")
+        assert [c.url.host for c in calls] == ["api.github.com"]
+        assert github_client_stats()["blocked"] == 1
+
+
+class TestClient:
+    def test_shared_client(self):
+        assert get_github_client() is get_github_client()
+
+    def test_get_json_sends_headers(self, mocker):
+        calls = mock_github(mocker, lambda request: httpx.Response(200, json=[1, 2]))
+        assert github_get_json("https://api.github.com/x", params={"q": "a b"}) == [1, 2]
+        assert calls[0].headers["X-GitHub-Api-Version"] == "2022-11-28"
+        assert calls[0].url.params["q"] == "a b"
+
+    def test_get_json_keeps_query_string(self, mocker):
+        calls = mock_github(mocker, lambda request: httpx.Response(200, json={}))
+        github_get_json("https://api.github.com/git/trees/HEAD?recursive=1")
+        assert calls[0].url.params["recursive"] == "1"
+
+    def test_status_errors_raise(self, mocker):
+        mock_github(mocker, lambda request: httpx.Response(503, json={}))
+        with pytest.raises(httpx.HTTPStatusError) as info:
+            github_get_json("https://api.github.com/x")
+        assert is_retryable_exception(info.value)
+        assert github_client_stats()["errors"] == 1
@@ -0,0 +1,93 @@
+"""Tests for the shared pooled HTTP client (v1.5.0)."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from tinkywiki_mcp import http_client
+from tinkywiki_mcp.cache import _BudgetCache
+from tinkywiki_mcp.http_client import (
+    fetch_text,
+    get_http_client,
+    http_client_stats,
+    reset_http_client,
+)
+
+URL = "https://deepwiki.com/facebook/react"
+
+
+def _use_transport(mocker, handler) -> None:
+    mocker.patch.object(http_client, "_transport", httpx.MockTransport(handler))
+    reset_http_client()
+
+
+class TestClient:
+    def test_client_is_shared(self):
+        assert get_http_client() is get_http_client()
+
+    def test_reset_creates_new_client(self):
+        first = get_http_client()
+        reset_http_client()
+        assert get_http_client() is not first
+
+    def test_http2_needs_h2(self, mocker):
+        mocker.patch("importlib.util.find_spec", return_value=None)
+        assert http_client_stats()["http2"] is False
+
+
+class TestFetchText:
+    def test_returns_status_and_text(self, mocker):
+        _use_transport(mocker, lambda r: httpx.Response(404, text="nope"))
+        result = fetch_text(URL)
+        assert (result.status, result.text) == (404, "nope")
+
+    def test_conditional_request_reuses_body(self, mocker):
+        seen: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, text="<html>v1</html>", headers={"ETag": '"v1"'})
+
+        _use_transport(mocker, handler)
+        assert fetch_text(URL).text == "<html>v1</html>"
+        second = fetch_text(URL)
+        assert second.text == "<html>v1</html>"
+        assert second.from_revalidation is True
+        assert "If-None-Match" not in seen[0].headers
+        assert http_client_stats()["not_modified"] == 1
+
+    def test_last_modified_validator(self, mocker):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.headers.get("If-Modified-Since"):
+                return httpx.Response(304)
+            return httpx.Response(
+                200, text="body", headers={"Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+            )
+
+        _use_transport(mocker, handler)
+        fetch_text(URL)
+        assert fetch_text(URL).from_revalidation is True
+
+    def test_remembered_bodies_are_byte_budgeted(self, mocker):
+        mocker.patch.object(http_client, "_validators", _BudgetCache(4096, 200, ttl=3600))
+        seen: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            size = int(request.url.params["kb"]) * 1024
+            return httpx.Response(200, text="x" * size, headers={"ETag": '"v1"'})
+
+        _use_transport(mocker, handler)
+        for kb in (1, 2, 2, 8):
+            fetch_text(f"{URL}?kb={kb}&n={len(seen)}")
+            assert http_client_stats()["conditional_bytes"] <= 4096
+        fetch_text(f"{URL}?kb=8&n=3")  # too big to remember — no validators sent
+        assert "If-None-Match" not in seen[-1].headers
+
+    def test_transport_errors_raise_and_count(self):
+        with pytest.raises(httpx.ConnectError):
+            fetch_text(URL)  # conftest refuses all connections
+        assert http_client_stats()["errors"] == 1
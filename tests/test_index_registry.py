@@ -0,0 +1,263 @@
+"""Tests for the persistent index registry, SQLite storage and background runner (v1.5.0)."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+from tinkywiki_mcp import config, index_registry
+from tinkywiki_mcp.background import (
+    background_stats,
+    submit_background,
+    wait_for_background,
+)
+from tinkywiki_mcp.fallback import (
+    SOURCE_CODEWIKI,
+    SOURCE_DEEPWIKI,
+    SOURCE_GITHUB_API,
+    FallbackResult,
+    fetch_page_with_fallback,
+)
+from tinkywiki_mcp.index_registry import (
+    STATUS_INDEXED,
+    STATUS_NOT_INDEXED,
+    clear_registry,
+    get_status,
+    is_known_missing,
+    record_status,
+    registry_stats,
+)
+from tinkywiki_mcp.parser import WikiPage
+from tinkywiki_mcp.storage import SQLiteStore, close_all_stores
+from tests.conftest import make_wiki_page
+
+REPO = "https://github.com/owner/repo"
+
+
+def _not_indexed_page() -> WikiPage:
+    return make_wiki_page(sections=[], raw_text="This page doesn’t exist")
+
+
+class TestStorage:
+    def test_persists_across_reopen(self, tmp_path):
+        store = SQLiteStore("t", "CREATE TABLE IF NOT EXISTS kv (k TEXT PRIMARY KEY, v TEXT);")
+        store.execute("INSERT INTO kv VALUES (?, ?)", ("a", "1"))
+        close_all_stores()
+        assert store.execute("SELECT v FROM kv WHERE k = ?", ("a",)) == [("1",)]
+        assert store.path.startswith(config.DATA_DIR)
+
+    def test_unwritable_dir_falls_back_to_memory(self, mocker, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("x")
+        mocker.patch.object(config, "DATA_DIR", str(blocker / "sub"))
+        store = SQLiteStore("t2", "CREATE TABLE IF NOT EXISTS kv (k TEXT);")
+        store.execute("INSERT INTO kv VALUES ('a')")
+        assert store.path == ":memory:"
+
+
+class TestRegistry:
+    def test_record_and_get(self):
+        record_status(REPO, SOURCE_CODEWIKI, indexed=False)
+        status = get_status(REPO, SOURCE_CODEWIKI)
+        assert status.status == STATUS_NOT_INDEXED
+        assert status.age_seconds < 5
+
+    def test_repo_url_is_case_insensitive(self):
+        record_status("https://github.com/Owner/Repo", SOURCE_DEEPWIKI, indexed=True)
+        assert get_status(REPO, SOURCE_DEEPWIKI).status == STATUS_INDEXED
+
+    def test_known_missing(self):
+        assert not is_known_missing(REPO, SOURCE_CODEWIKI)
+        record_status(REPO, SOURCE_CODEWIKI, indexed=False)
+        assert is_known_missing(REPO, SOURCE_CODEWIKI)
+        record_status(REPO, SOURCE_CODEWIKI, indexed=True)
+        assert not is_known_missing(REPO, SOURCE_CODEWIKI)
+
+    def test_stale_verdict_schedules_reprobe(self, mocker):
+        mocker.patch.object(config, "INDEX_REGISTRY_REPROBE_SECONDS", 0)
+        record_status(REPO, SOURCE_CODEWIKI, indexed=False)
+        reprobe = mocker.Mock()
+        assert is_known_missing(REPO, SOURCE_CODEWIKI, reprobe=reprobe)
+        wait_for_background(timeout=2)
+        reprobe.assert_called_once()
+
+    def test_fresh_verdict_does_not_reprobe(self, mocker):
+        record_status(REPO, SOURCE_CODEWIKI, indexed=False)
+        reprobe = mocker.Mock()
+        assert is_known_missing(REPO, SOURCE_CODEWIKI, reprobe=reprobe)
+        wait_for_background(timeout=2)
+        reprobe.assert_not_called()
+
+    def test_disabled(self, mocker):
+        mocker.patch.object(config, "INDEX_REGISTRY_ENABLED", False)
+        record_status(REPO, SOURCE_CODEWIKI, indexed=False)
+        assert not is_known_missing(REPO, SOURCE_CODEWIKI)
+
+    def test_stats_and_clear(self):
+        record_status(REPO, SOURCE_CODEWIKI, indexed=False)
+        record_status(REPO, SOURCE_DEEPWIKI, indexed=True)
+        stats = registry_stats()
+        assert stats[SOURCE_CODEWIKI] == {STATUS_NOT_INDEXED: 1}
+        assert stats[SOURCE_DEEPWIKI] == {STATUS_INDEXED: 1}
+        clear_registry()
+        assert get_status(REPO, SOURCE_CODEWIKI) is None
+
+
+class TestBackground:
+    def test_dedup_by_key(self):
+        release = threading.Event()
+        assert submit_background("k", release.wait)
+        assert not submit_background("k", release.wait)
+        release.set()
+        wait_for_background(timeout=2)
+        stats = background_stats()
+        assert stats["deduplicated"] == 1
+        assert stats["completed"] == 1
+
+    def test_bounded_queue(self, mocker):
+        mocker.patch.object(config, "BACKGROUND_MAX_PENDING", 1)
+        release = threading.Event()
+        assert submit_background("a", release.wait)
+        assert not submit_background("b", release.wait)
+        release.set()
+        wait_for_background(timeout=2)
+        assert background_stats()["dropped"] == 1
+
+    def test_failures_are_counted(self):
+        def _boom():
+            raise RuntimeError("x")
+
+        submit_background("boom", _boom)
+        wait_for_background(timeout=2)
+        assert background_stats()["failed"] == 1
+
+
+class TestFallbackRouting:
+    def _patch_layers(self, mocker, tw, dw, gh):
+        mocker.patch.object(config, "FALLBACK_ENABLED", True)
+        mocker.patch.object(config, "DEEPWIKI_ENABLED", True)
+        mocker.patch.object(config, "GITHUB_API_ENABLED", True)
+        mocker.patch("tinkywiki_mcp.fallback._request_tinkywiki_indexing_async")
+        return (
+            mocker.patch("tinkywiki_mcp.fallback._try_tinkywiki", return_value=tw),
+            mocker.patch("tinkywiki_mcp.fallback._try_deepwiki", return_value=dw),
+            mocker.patch("tinkywiki_mcp.fallback._try_github_api", return_value=gh),
+        )
+
+    def test_not_indexed_verdicts_are_recorded(self, mocker):
+        self._patch_layers(
+            mocker,
+            FallbackResult(page=_not_indexed_page(), source=SOURCE_CODEWIKI),
+            FallbackResult(page=make_wiki_page(), source=SOURCE_DEEPWIKI),
+            FallbackResult(page=None, source=SOURCE_GITHUB_API),
+        )
+        fetch_page_with_fallback(REPO)
+        assert get_status(REPO, SOURCE_CODEWIKI).status == STATUS_NOT_INDEXED
+        assert get_status(REPO, SOURCE_DEEPWIKI).status == STATUS_INDEXED
+
+    def test_not_indexed_page_with_heading_is_recorded_missing(self, mocker):
+        missing = make_wiki_page(raw_text="This page doesn’t exist")
+        assert missing.sections  # the 404 page's heading
+        self._patch_layers(
+            mocker,
+            FallbackResult(page=missing, source=SOURCE_CODEWIKI),
+            FallbackResult(page=make_wiki_page(), source=SOURCE_DEEPWIKI),
+            FallbackResult(page=None, source=SOURCE_GITHUB_API),
+        )
+        fetch_page_with_fallback(REPO)
+        assert get_status(REPO, SOURCE_CODEWIKI).status == STATUS_NOT_INDEXED
+
+    def test_timeouts_are_not_recorded(self, mocker):
+        self._patch_layers(
+            mocker,
+            FallbackResult(page=None, source=SOURCE_CODEWIKI),
+            FallbackResult(page=make_wiki_page(), source=SOURCE_DEEPWIKI),
+            FallbackResult(page=None, source=SOURCE_GITHUB_API),
+        )
+        fetch_page_with_fallback(REPO)
+        assert get_status(REPO, SOURCE_CODEWIKI) is None
+
+    def test_known_missing_source_is_skipped(self, mocker):
+        record_status(REPO, SOURCE_CODEWIKI, indexed=False)
+        dw_page = make_wiki_page()
+        tw, _dw, _gh = self._patch_layers(
+            mocker,
+            FallbackResult(page=_not_indexed_page(), source=SOURCE_CODEWIKI),
+            FallbackResult(page=dw_page, source=SOURCE_DEEPWIKI),
+            FallbackResult(page=None, source=SOURCE_GITHUB_API),
+        )
+        result = fetch_page_with_fallback(REPO)
+        tw.assert_not_called()
+        assert result.page is dw_page
+        assert result.tinkywiki_not_indexed is True
+
+    def test_both_missing_goes_straight_to_github(self, mocker):
+        record_status(REPO, SOURCE_CODEWIKI, indexed=False)
+        record_status(REPO, SOURCE_DEEPWIKI, indexed=False)
+        gh_page = make_wiki_page()
+        tw, dw, _gh = self._patch_layers(
+            mocker,
+            FallbackResult(page=None, source=SOURCE_CODEWIKI),
+            FallbackResult(page=None, source=SOURCE_DEEPWIKI),
+            FallbackResult(page=gh_page, source=SOURCE_GITHUB_API),
+        )
+        result = fetch_page_with_fallback(REPO)
+        tw.assert_not_called()
+        dw.assert_not_called()
+        assert result.page is gh_page
+        assert result.deepwiki_not_indexed is True
+
+    def test_parallel_mode_skips_known_missing(self, mocker):
+        mocker.patch.object(config, "FALLBACK_MODE", "parallel")
+        mocker.patch.object(config, "FALLBACK_STAGGER_SECONDS", 5.0)
+        record_status(REPO, SOURCE_CODEWIKI, indexed=False)
+        dw_page = make_wiki_page()
+        tw, _dw, _gh = self._patch_layers(
+            mocker,
+            FallbackResult(page=None, source=SOURCE_CODEWIKI),
+            FallbackResult(page=dw_page, source=SOURCE_DEEPWIKI),
+            FallbackResult(page=None, source=SOURCE_GITHUB_API),
+        )
+        start = time.monotonic()
+        result = fetch_page_with_fallback(REPO)
+        assert time.monotonic() - start < 2  # no stagger wait behind a skipped layer
+        tw.assert_not_called()
+        assert result.page is dw_page
+        assert result.tinkywiki_not_indexed is True
+
+    def test_background_reprobe_updates_registry(self, mocker):
+        mocker.patch.object(config, "INDEX_REGISTRY_REPROBE_SECONDS", 0)
+        record_status(REPO, SOURCE_CODEWIKI, indexed=False)
+        self._patch_layers(
+            mocker,
+            FallbackResult(page=make_wiki_page(), source=SOURCE_CODEWIKI),
+            FallbackResult(page=make_wiki_page(), source=SOURCE_DEEPWIKI),
+            FallbackResult(page=None, source=SOURCE_GITHUB_API),
+        )
+        fetch_page_with_fallback(REPO)
+        wait_for_background(timeout=2)
+        assert get_status(REPO, SOURCE_CODEWIKI).status == STATUS_INDEXED
+
+
+class TestSearchSkipsChat:
+    def test_chat_skipped_for_known_missing_repo(self, mocker):
+        from mcp.server.fastmcp import FastMCP
+        from tinkywiki_mcp.tools.search import register
+
+        mocker.patch.object(config, "FALLBACK_ENABLED", False)
+        record_status(REPO, SOURCE_CODEWIKI, indexed=False)
+        run_search = mocker.patch("tinkywiki_mcp.tools.search._run_search")
+
+        mcp = FastMCP("test")
+        register(mcp)
+        fn = mcp._tool_manager._tools["tinkywiki_search_wiki"].fn
+        parsed = json.loads(fn(repo_url="owner/repo", query="q", answer_mode="chat"))
+
+        run_search.assert_not_called()
+        assert parsed["code"] == "NOT_INDEXED"
+
+
+def test_module_store_uses_data_dir():
+    record_status(REPO, SOURCE_CODEWIKI, indexed=True)
+    assert index_registry._store.path.startswith(config.DATA_DIR)
@@ -0,0 +1,172 @@
+"""Tests for the durable auto-indexing job queue (v1.5.0)."""
+
+from __future__ import annotations
+
+import json
+
+from tinkywiki_mcp import config, indexing_queue
+from tinkywiki_mcp.indexing_queue import (
+    ALREADY_PENDING,
+    COOLING_DOWN,
+    ENQUEUED,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_SUBMITTED,
+    enqueue_indexing,
+    get_job,
+    list_jobs,
+    process_next_job,
+    queue_stats,
+    start_indexing_workers,
+)
+from tinkywiki_mcp.storage import close_all_stores
+from tinkywiki_mcp.types import ErrorCode, ToolResponse
+
+REPO = "https://github.com/owner/repo"
+
+
+def _patch_submit(mocker, response: ToolResponse | None = None):
+    return mocker.patch(
+        "tinkywiki_mcp.tools.request_indexing._run_request_indexing",
+        return_value=response or ToolResponse.success("Repo requested"),
+    )
+
+
+class TestEnqueue:
+    def test_enqueue_creates_job(self):
+        assert enqueue_indexing(REPO) == ENQUEUED
+        job = get_job(REPO)
+        assert job.status == JOB_QUEUED
+        assert job.attempts == 0
+
+    def test_duplicate_while_pending(self):
+        enqueue_indexing(REPO)
+        assert enqueue_indexing("https://github.com/Owner/Repo") == ALREADY_PENDING
+        assert len(list_jobs()) == 1
+
+    def test_cooldown_after_submission(self, mocker):
+        _patch_submit(mocker)
+        enqueue_indexing(REPO)
+        process_next_job()
+        assert enqueue_indexing(REPO) == COOLING_DOWN
+
+    def test_requeue_after_cooldown(self, mocker):
+        _patch_submit(mocker)
+        mocker.patch.object(config, "INDEXING_COOLDOWN_SECONDS", 0)
+        enqueue_indexing(REPO)
+        process_next_job()
+        assert enqueue_indexing(REPO) == ENQUEUED
+
+
+class TestProcess:
+    def test_success_marks_submitted(self, mocker):
+        submit = _patch_submit(mocker)
+        enqueue_indexing(REPO)
+        job = process_next_job()
+        submit.assert_called_once_with(REPO)
+        assert job.status == JOB_SUBMITTED
+        assert get_job(REPO).status == JOB_SUBMITTED
+
+    def test_empty_queue(self):
+        assert process_next_job() is None
+
+    def test_failure_is_retried_later(self, mocker):
+        _patch_submit(mocker, ToolResponse.error(ErrorCode.TIMEOUT, "timed out"))
+        enqueue_indexing(REPO)
+        process_next_job()
+        job = get_job(REPO)
+        assert job.status == JOB_QUEUED
+        assert job.last_error == "timed out"
+        assert process_next_job() is None  # waits out the retry delay
+
+    def test_gives_up_after_max_attempts(self, mocker):
+        submit = _patch_submit(mocker)
+        submit.side_effect = RuntimeError("browser crashed")
+        mocker.patch.object(config, "INDEXING_RETRY_DELAY_SECONDS", 0)
+        mocker.patch.object(config, "INDEXING_MAX_ATTEMPTS", 2)
+        enqueue_indexing(REPO)
+        process_next_job()
+        job = process_next_job()
+        assert job.status == JOB_FAILED
+        assert get_job(REPO).attempts == 2
+        assert submit.call_count == 2
+
+    def test_fifo_order(self, mocker):
+        _patch_submit(mocker)
+        enqueue_indexing("https://github.com/a/first")
+        enqueue_indexing("https://github.com/b/second")
+        assert process_next_job().repo_url == "https://github.com/a/first"
+
+
+class TestDurability:
+    def test_queue_survives_restart(self, mocker):
+        enqueue_indexing(REPO)
+        close_all_stores()  # simulate a new process reopening the file
+        assert get_job(REPO).status == JOB_QUEUED
+
+    def test_interrupted_jobs_are_resumed(self, mocker):
+        _patch_submit(mocker)
+        enqueue_indexing(REPO)
+        indexing_queue._claim_next_job()  # crashed mid-run
+        assert get_job(REPO).status == JOB_RUNNING
+        close_all_stores()
+        assert start_indexing_workers() == 0  # workers disabled in tests
+        assert get_job(REPO).status == JOB_QUEUED
+
+    def test_worker_drains_queue(self, mocker):
+        _patch_submit(mocker)
+        mocker.patch.object(config, "INDEXING_QUEUE_WORKERS", 1)
+        mocker.patch.object(config, "INDEXING_WORKER_NICE", 0)
+        enqueue_indexing(REPO)
+        try:
+            assert start_indexing_workers() == 1
+            assert start_indexing_workers() == 1  # idempotent
+            for _ in range(200):
+                if get_job(REPO).status == JOB_SUBMITTED:
+                    break
+                indexing_queue._stop.wait(0.01)
+            assert get_job(REPO).status == JOB_SUBMITTED
+        finally:
+            indexing_queue.stop_indexing_workers()
+
+    def test_stats(self):
+        enqueue_indexing(REPO)
+        assert queue_stats() == {JOB_QUEUED: 1, "workers": 0}
+
+
+class TestFallbackIntegration:
+    def test_auto_indexing_is_queued_once(self, mocker):
+        from tinkywiki_mcp.fallback import _request_tinkywiki_indexing_async
+
+        submit = _patch_submit(mocker)
+        for _ in range(5):
+            _request_tinkywiki_indexing_async(REPO)
+        assert queue_stats()[JOB_QUEUED] == 1
+        submit.assert_not_called()  # nothing runs in the caller's thread
+
+
+class TestStatusTool:
+    def _tool(self):
+        from mcp.server.fastmcp import FastMCP
+        from tinkywiki_mcp.tools.indexing_status import register
+
+        mcp = FastMCP("test")
+        register(mcp)
+        return mcp._tool_manager._tools["tinkywiki_indexing_status"].fn
+
+    def test_single_repo(self):
+        enqueue_indexing(REPO)
+        parsed = json.loads(self._tool()(repo_url="owner/repo"))
+        assert json.loads(parsed["data"])["status"] == JOB_QUEUED
+
+    def test_unknown_repo(self):
+        parsed = json.loads(self._tool()(repo_url="owner/other"))
+        assert json.loads(parsed["data"])["status"] == "none"
+
+    def test_listing(self):
+        enqueue_indexing(REPO)
+        parsed = json.loads(self._tool()())
+        data = json.loads(parsed["data"])
+        assert data["counts"][JOB_QUEUED] == 1
+        assert data["jobs"][0]["repo_url"] == REPO
@@ -12,6 +12,7 @@ from types import SimpleNamespace
 
 import pytest
 
+from tinkywiki_mcp.cache import SearchHit
 from tinkywiki_mcp.fallback import FallbackResult
 from tinkywiki_mcp.server import create_server
 from tests.conftest import make_wiki_page
@@ -168,8 +169,8 @@ class TestSearchKeywordResolution:
             return_value='> **Resolved:** "vue" → **vuejs/vue**\n',
         )
         mocker.patch(
-            "tinkywiki_mcp.tools.search.get_cached_search",
-            return_value="Vue is a progressive JS framework.",
+            "tinkywiki_mcp.tools.search.lookup_search",
+            return_value=SearchHit("Vue is a progressive JS framework."),
         )
         mocker.patch(_HELPERS_RATE, return_value=True)
 
@@ -191,8 +192,8 @@ class TestSearchKeywordResolution:
             return_value="",
         )
         mocker.patch(
-            "tinkywiki_mcp.tools.search.get_cached_search",
-            return_value="cached answer",
+            "tinkywiki_mcp.tools.search.lookup_search",
+            return_value=SearchHit("cached answer"),
         )
         mocker.patch(_HELPERS_RATE, return_value=True)
 
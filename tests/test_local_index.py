@@ -0,0 +1,206 @@
+"""Tests for the local BM25 answer engine (v1.5.0)."""
+
+from __future__ import annotations
+
+import json
+
+from tinkywiki_mcp import local_index
+from tinkywiki_mcp.local_index import (
+    LocalIndex,
+    answer_locally,
+    clear_indexes,
+    get_index,
+    index_page,
+    index_stats,
+    query_terms,
+    tokenize,
+)
+from tinkywiki_mcp.parser import WikiSection
+from tests.conftest import SAMPLE_REPO_URL, make_wiki_page
+
+
+def _rich_page():
+    return make_wiki_page(
+        sections=[
+            WikiSection(
+                title="Architecture",
+                level=2,
+                content=(
+                    "VS Code is built on Electron for cross-platform support.\n\n"
+                    "The renderer process hosts the workbench UI."
+                ),
+            ),
+            WikiSection(
+                title="Extensions",
+                level=2,
+                content=(
+                    "Extensions run in a separate extension host process "
+                    "so a misbehaving extension cannot block the editor."
+                ),
+            ),
+            WikiSection(
+                title="Testing",
+                level=2,
+                content="Unit tests are written using Mocha and run via the CLI.",
+            ),
+        ],
+    )
+
+
+class TestTokenize:
+    def test_lowercases_and_splits(self):
+        assert tokenize("Hello, World!") == ["hello", "world"]
+
+    def test_folds_plurals(self):
+        assert tokenize("components libraries class") == ["component", "library", "class"]
+
+    def test_query_terms_drop_stop_words(self):
+        assert query_terms("How does the extension host work?") == ["extension", "host"]
+
+    def test_query_terms_keep_tokens_when_all_stop_words(self):
+        assert query_terms("what is it") == ["what", "is", "it"]
+
+    def test_query_terms_are_distinct(self):
+        assert query_terms("tests tests test") == ["test"]
+
+
+class TestLocalIndex:
+    def test_splits_sections_into_passages(self):
+        index = LocalIndex(_rich_page())
+        assert len(index) == 4
+        assert index.passages[0].section == "Architecture"
+
+    def test_ranks_matching_passage_first(self):
+        index = LocalIndex(_rich_page())
+        hits = index.search("extension host process")
+        assert hits[0].passage.section == "Extensions"
+        assert hits[0].coverage == 1.0
+
+    def test_section_title_is_searchable(self):
+        index = LocalIndex(_rich_page())
+        hits = index.search("testing")
+        assert hits[0].passage.section == "Testing"
+
+    def test_no_match_returns_empty(self):
+        index = LocalIndex(_rich_page())
+        assert index.search("kubernetes") == []
+
+    def test_empty_page(self):
+        index = LocalIndex(make_wiki_page(sections=[]))
+        assert len(index) == 0
+        assert index.search("anything") == []
+
+
+class TestRegistry:
+    def test_index_and_get(self):
+        page = _rich_page()
+        index_page(SAMPLE_REPO_URL, page)
+        assert get_index(SAMPLE_REPO_URL).page is page
+
+    def test_reindex_same_page_is_noop(self):
+        page = _rich_page()
+        first = index_page(SAMPLE_REPO_URL, page)
+        assert index_page(SAMPLE_REPO_URL, page) is first
+
+    def test_disabled(self, mocker):
+        mocker.patch.object(local_index.config, "LOCAL_INDEX_ENABLED", False)
+        assert index_page(SAMPLE_REPO_URL, _rich_page()) is None
+        assert get_index(SAMPLE_REPO_URL) is None
+
+    def test_clear_and_stats(self):
+        index_page(SAMPLE_REPO_URL, _rich_page())
+        stats = index_stats()
+        assert stats["current_size"] == 1
+        assert stats["passages"] == 4
+        clear_indexes()
+        assert index_stats()["current_size"] == 0
+
+
+class TestAnswerLocally:
+    def test_no_index_returns_none(self):
+        assert answer_locally(SAMPLE_REPO_URL, "extension host") is None
+
+    def test_confident_answer(self, mocker):
+        mocker.patch.object(local_index.config, "LOCAL_ANSWER_MIN_SCORE", 0.5)
+        index_page(SAMPLE_REPO_URL, _rich_page())
+        answer = answer_locally(SAMPLE_REPO_URL, "Why do extensions run in a separate host?")
+        assert answer is not None
+        assert answer.confident
+        assert answer.text.startswith("### Extensions")
+        assert answer.page_source == "tinkywiki"
+
+    def test_low_coverage_is_not_confident(self):
+        index_page(SAMPLE_REPO_URL, _rich_page())
+        answer = answer_locally(SAMPLE_REPO_URL, "electron kubernetes docker helm")
+        assert answer is not None
+        assert not answer.confident
+
+
+class TestSearchToolLocalMode:
+    def _fn(self):
+        from mcp.server.fastmcp import FastMCP
+        from tinkywiki_mcp.tools.search import register
+
+        mcp = FastMCP("test")
+        register(mcp)
+        return mcp._tool_manager._tools["tinkywiki_search_wiki"].fn
+
+    def test_auto_uses_confident_local_answer(self, mocker):
+        mocker.patch.object(local_index.config, "LOCAL_ANSWER_MIN_SCORE", 0.5)
+        run_search = mocker.patch("tinkywiki_mcp.tools.search._run_search")
+        index_page(SAMPLE_REPO_URL, _rich_page())
+
+        parsed = json.loads(
+            self._fn()(repo_url="microsoft/vscode", query="extension host process")
+        )
+        assert parsed["status"] == "ok"
+        assert parsed["meta"]["source"] == "local_index"
+        assert "Local wiki index" in parsed["data"]
+        run_search.assert_not_called()
+
+    def test_chat_mode_skips_local_index(self, mocker):
+        from tinkywiki_mcp.types import ToolResponse
+
+        run_search = mocker.patch(
+            "tinkywiki_mcp.tools.search._run_search",
+            return_value=ToolResponse.success("chat answer"),
+        )
+        index_page(SAMPLE_REPO_URL, _rich_page())
+
+        parsed = json.loads(
+            self._fn()(
+                repo_url="microsoft/vscode",
+                query="extension host process",
+                answer_mode="chat",
+            )
+        )
+        assert parsed["data"] == "chat answer"
+        run_search.assert_called_once()
+
+    def test_local_mode_fetches_page_when_not_indexed(self, mocker):
+        def _fetch(repo_url):
+            index_page(repo_url, _rich_page())
+
+        fetch = mocker.patch(
+            "tinkywiki_mcp.tools.search.fetch_page_with_fallback", side_effect=_fetch
+        )
+        parsed = json.loads(
+            self._fn()(repo_url="microsoft/vscode", query="mocha", answer_mode="local")
+        )
+        fetch.assert_called_once_with(SAMPLE_REPO_URL)
+        assert parsed["status"] == "ok"
+        assert "Mocha" in parsed["data"]
+
+    def test_local_mode_no_match(self, mocker):
+        mocker.patch("tinkywiki_mcp.tools.search.fetch_page_with_fallback")
+        parsed = json.loads(
+            self._fn()(repo_url="microsoft/vscode", query="kubernetes", answer_mode="local")
+        )
+        assert parsed["status"] == "error"
+        assert parsed["code"] == "NO_CONTENT"
+
+    def test_invalid_mode(self):
+        parsed = json.loads(
+            self._fn()(repo_url="microsoft/vscode", query="x", answer_mode="magic")
+        )
+        assert parsed["code"] == "VALIDATION"
@@ -0,0 +1,253 @@
+"""Tests for negative caching of not-found / not-indexed / timed-out results (v1.5.0)."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import json
+
+import httpx
+import pytest
+
+from tinkywiki_mcp import cache, config
+from tinkywiki_mcp.cache import (
+    NEGATIVE_NOT_FOUND,
+    NEGATIVE_NOT_INDEXED,
+    NEGATIVE_TIMEOUT,
+    cache_stats,
+    get_negative,
+    set_negative,
+)
+from tinkywiki_mcp.deepwiki import fetch_deepwiki_page
+from tinkywiki_mcp.fallback import SOURCE_DEEPWIKI, _is_not_indexed_error, _probe
+from tinkywiki_mcp.github_api import fetch_github_wiki_page
+from tinkywiki_mcp.index_registry import get_status
+from tinkywiki_mcp.parser import fetch_wiki_page
+from tinkywiki_mcp.shared_cache import l2_get
+from tinkywiki_mcp.types import ResponseMeta, ToolResponse
+from tests.conftest import mock_github
+
+REPO = "https://github.com/ghost/missing"
+NOT_INDEXED_HTML = f"<html><body><h1>{config.NOT_INDEXED_INDICATORS[0]}</h1></body></html>"
+PAGE_HTML = "<html><body><h1>Repo</h1><h2>Architecture</h2><p>Layers.</p></body></html>"
+
+
+class TestNegativeCache:
+    def test_ttl_per_kind(self, cache_clock):
+        set_negative("a", NEGATIVE_NOT_FOUND)
+        set_negative("b", NEGATIVE_NOT_INDEXED)
+        set_negative("c", NEGATIVE_TIMEOUT)
+        assert get_negative("c").retry_after == config.NEGATIVE_CACHE_TIMEOUT_TTL_SECONDS
+        cache_clock.return_value += config.NEGATIVE_CACHE_TIMEOUT_TTL_SECONDS + 1
+        assert get_negative("c") is None  # transient failures go first
+        assert get_negative("b").kind == NEGATIVE_NOT_INDEXED
+        cache_clock.return_value += config.NEGATIVE_CACHE_NOT_INDEXED_TTL_SECONDS
+        assert get_negative("b") is None
+        assert get_negative("a").kind == NEGATIVE_NOT_FOUND
+        cache_clock.return_value += config.NEGATIVE_CACHE_NOT_FOUND_TTL_SECONDS
+        assert get_negative("a") is None
+
+    def test_real_misses_outlive_transient_failures(self):
+        assert (
+            config.NEGATIVE_CACHE_NOT_FOUND_TTL_SECONDS
+            > config.NEGATIVE_CACHE_NOT_INDEXED_TTL_SECONDS
+            > config.NEGATIVE_CACHE_TIMEOUT_TTL_SECONDS
+        )
+
+    def test_max_ttl_caps(self, cache_clock):
+        set_negative("k", NEGATIVE_NOT_FOUND, max_ttl=10)
+        cache_clock.return_value += 11
+        assert get_negative("k") is None
+
+    def test_disabled(self, mocker):
+        mocker.patch.object(config, "NEGATIVE_CACHE_ENABLED", False)
+        set_negative("k", NEGATIVE_NOT_FOUND)
+        assert get_negative("k") is None
+
+    def test_zero_ttl_kind_not_cached(self, mocker):
+        mocker.patch.object(config, "NEGATIVE_CACHE_TIMEOUT_TTL_SECONDS", 0)
+        set_negative("k", NEGATIVE_TIMEOUT)
+        assert get_negative("k") is None
+
+    def test_shared_through_l2(self):
+        set_negative("k", NEGATIVE_NOT_INDEXED)
+        assert l2_get("negative", "k").value == NEGATIVE_NOT_INDEXED
+        cache._negative_cache.reset()  # another process: empty L1
+        assert get_negative("k").kind == NEGATIVE_NOT_INDEXED
+
+    def test_stats(self):
+        set_negative("k", NEGATIVE_TIMEOUT)
+        get_negative("k")
+        stats = cache_stats()["negative"]
+        assert stats["stored"] == {NEGATIVE_TIMEOUT: 1}
+        assert stats["hits"] == {NEGATIVE_TIMEOUT: 1}
+        assert stats["ttl_seconds"][NEGATIVE_NOT_FOUND] == config.NEGATIVE_CACHE_NOT_FOUND_TTL_SECONDS
+
+
+class TestTinkyWikiPages:
+    def test_not_indexed_page_remembered(self, mocker):
+        render = mocker.patch("tinkywiki_mcp.parser._fetch_html", return_value=NOT_INDEXED_HTML)
+        first = fetch_wiki_page(REPO)
+        second = fetch_wiki_page(REPO)
+        assert render.call_count == 1
+        assert _is_not_indexed_error(first) and _is_not_indexed_error(second)
+        assert cache.get_cached_wiki_page(REPO) is None  # not kept as a page
+        assert get_negative(f"tinkywiki::{REPO}").kind == NEGATIVE_NOT_INDEXED
+
+    def test_timeout_remembered_briefly(self, mocker, cache_clock):
+        render = mocker.patch("tinkywiki_mcp.parser._fetch_html", side_effect=TimeoutError)
+        for _ in range(2):
+            with pytest.raises(TimeoutError):
+                fetch_wiki_page(REPO)
+        assert render.call_count == 1
+        cache_clock.return_value += config.NEGATIVE_CACHE_TIMEOUT_TTL_SECONDS + 1
+        render.side_effect = None
+        render.return_value = PAGE_HTML
+        assert fetch_wiki_page(REPO).sections
+
+    def test_browser_loop_timeout_normalised(self, mocker):
+        mocker.patch("tinkywiki_mcp.parser._fetch_html",
+                     side_effect=concurrent.futures.TimeoutError)
+        with pytest.raises(TimeoutError):
+            fetch_wiki_page(REPO)
+        assert get_negative(f"tinkywiki::{REPO}").kind == NEGATIVE_TIMEOUT
+
+    def test_empty_render_is_transient(self, mocker):
+        mocker.patch("tinkywiki_mcp.parser._fetch_html", return_value="")
+        fetch_wiki_page(REPO)
+        assert get_negative(f"tinkywiki::{REPO}").kind == NEGATIVE_TIMEOUT
+
+    def test_force_bypasses(self, mocker):
+        render = mocker.patch("tinkywiki_mcp.parser._fetch_html", return_value=NOT_INDEXED_HTML)
+        fetch_wiki_page(REPO)
+        render.return_value = PAGE_HTML
+        assert fetch_wiki_page(REPO, force=True).sections
+        assert fetch_wiki_page(REPO).sections  # the real page wins over the verdict
+        assert render.call_count == 2
+
+
+class TestDeepWikiPages:
+    def test_not_indexed_remembered(self, mocker):
+        fetch = mocker.patch("tinkywiki_mcp.deepwiki._fetch_deepwiki_html",
+                             return_value="<html><body>Repository not found</body></html>")
+        assert fetch_deepwiki_page(REPO) is None
+        assert fetch_deepwiki_page(REPO) is None
+        assert fetch.call_count == 1
+        assert get_negative(f"deepwiki::{REPO}").kind == NEGATIVE_NOT_INDEXED
+
+    def test_failed_fetch_is_transient(self, mocker):
+        fetch = mocker.patch("tinkywiki_mcp.deepwiki._fetch_deepwiki_html", return_value="")
+        for _ in range(2):
+            with pytest.raises(TimeoutError):
+                fetch_deepwiki_page(REPO)
+        assert fetch.call_count == 1
+        assert get_negative(f"deepwiki::{REPO}").kind == NEGATIVE_TIMEOUT
+
+    @pytest.mark.parametrize("outcome", [{"return_value": ""},
+                                         {"side_effect": concurrent.futures.TimeoutError}])
+    def test_timeout_leaves_registry_untouched(self, mocker, outcome):
+        mocker.patch("tinkywiki_mcp.deepwiki._fetch_deepwiki_html", **outcome)
+        for _ in range(2):  # the render, then the negative-cache hit
+            result = _probe(SOURCE_DEEPWIKI, REPO)
+            assert result.page is None and not result.deepwiki_not_indexed
+        assert get_status(REPO, SOURCE_DEEPWIKI) is None
+
+
+class TestGitHubPages:
+    @pytest.fixture(autouse=True)
+    def _rest_only(self, mocker):
+        mocker.patch.object(config, "GITHUB_TOKEN", "")
+
+    def test_404_remembered(self, mocker):
+        calls = mock_github(mocker, lambda request: httpx.Response(404, json={}))
+        assert fetch_github_wiki_page(REPO) is None
+        first = len(calls)
+        assert fetch_github_wiki_page(REPO) is None
+        assert len(calls) == first
+        assert get_negative(f"github::{REPO}").kind == NEGATIVE_NOT_FOUND
+
+    def test_timeout_remembered(self, mocker):
+        def _timeout(request):
+            if request.url.path == "/repos/ghost/missing":
+                raise httpx.ReadTimeout("slow", request=request)
+            return httpx.Response(404, json={})
+
+        mock_github(mocker, _timeout)
+        assert fetch_github_wiki_page(REPO) is None
+        assert get_negative(f"github::{REPO}").kind == NEGATIVE_TIMEOUT
+
+    def test_server_errors_not_cached(self, mocker):
+        mock_github(mocker, lambda request: httpx.Response(500, json={}))
+        assert fetch_github_wiki_page(REPO) is None
+        assert get_negative(f"github::{REPO}") is None
+
+    def test_graphql_null_repository(self, mocker):
+        mocker.patch.object(config, "GITHUB_TOKEN", "t")
+        mock_github(mocker, lambda request: httpx.Response(
+            200, json={"data": {"repository": None},
+                       "errors": [{"type": "NOT_FOUND", "message": "no repo"}]},
+        ))
+        assert fetch_github_wiki_page(REPO) is None
+        assert get_negative(f"github::{REPO}").kind == NEGATIVE_NOT_FOUND
+
+
+class TestSearchAnswers:
+    @pytest.fixture
+    def search_fn(self, mocker):
+        from mcp.server.fastmcp import FastMCP
+
+        from tinkywiki_mcp.tools.search import register
+        from tests.test_tools import _tool_fn
+
+        mocker.patch.object(config, "LOCAL_INDEX_ENABLED", False)
+        mocker.patch.object(config, "FALLBACK_ENABLED", True)
+        mcp = FastMCP("test")
+        register(mcp)
+        return _tool_fn(mcp, "tinkywiki_search_wiki")
+
+    @pytest.fixture
+    def chat(self, mocker):
+        return mocker.patch("tinkywiki_mcp.tools.search._run_search")
+
+    @pytest.fixture
+    def no_fallback(self, mocker):
+        from tinkywiki_mcp.fallback import SearchFallbackResult
+
+        return mocker.patch("tinkywiki_mcp.tools.search.search_with_fallback",
+                            return_value=SearchFallbackResult(response=None, source="tinkywiki"))
+
+    def test_chain_failure_remembered(self, search_fn, chat, no_fallback):
+        chat.return_value = ToolResponse.error("NOT_INDEXED", "not indexed", repo_url=REPO)
+        first = json.loads(search_fn(repo_url=REPO, query="How to build?"))
+        second = json.loads(search_fn(repo_url=REPO, query="how to build? "))
+        assert first["code"] == second["code"] == "NOT_INDEXED"
+        assert chat.call_count == 1 and no_fallback.call_count == 1
+        assert second["meta"]["retry_after_seconds"] <= config.SEARCH_CACHE_TTL_SECONDS
+
+    def test_timeouts_kept_briefly(self, search_fn, chat, no_fallback, cache_clock):
+        chat.return_value = ToolResponse.error("TIMEOUT", "slow", repo_url=REPO)
+        assert json.loads(search_fn(repo_url=REPO, query="q"))["code"] == "RETRY_EXHAUSTED"
+        assert json.loads(search_fn(repo_url=REPO, query="q"))["code"] == "TIMEOUT"
+        cache_clock.return_value += config.NEGATIVE_CACHE_TIMEOUT_TTL_SECONDS + 1
+        search_fn(repo_url=REPO, query="q")
+        assert no_fallback.call_count == 2
+
+    def test_empty_answers_kept_briefly(self, search_fn, chat, no_fallback, cache_clock):
+        chat.return_value = ToolResponse.error("NO_CONTENT", "empty", repo_url=REPO)
+        search_fn(repo_url=REPO, query="q")
+        assert get_negative(f"search::{REPO}::q").kind == NEGATIVE_TIMEOUT
+        cache_clock.return_value += config.NEGATIVE_CACHE_TIMEOUT_TTL_SECONDS + 1
+        search_fn(repo_url=REPO, query="q")
+        assert no_fallback.call_count == 2
+
+    def test_other_errors_not_remembered(self, search_fn, chat, no_fallback):
+        chat.return_value = ToolResponse.error("INPUT_NOT_FOUND", "no chat box", repo_url=REPO)
+        search_fn(repo_url=REPO, query="q")
+        search_fn(repo_url=REPO, query="q")
+        assert no_fallback.call_count == 2
+
+    def test_answers_win(self, search_fn, chat, no_fallback):
+        set_negative(f"search::{REPO}::q", NEGATIVE_NOT_INDEXED)
+        cache.set_cached_search(REPO, "q", "cached answer")
+        assert json.loads(search_fn(repo_url=REPO, query="q"))["status"] == "ok"
+        chat.return_value = ToolResponse.success("fresh", repo_url=REPO, meta=ResponseMeta())
+        assert json.loads(search_fn(repo_url=REPO, query="q", answer_mode="chat"))["status"] == "ok"
@@ -0,0 +1,159 @@
+"""Tests for canonical and near-duplicate search-question matching (v1.5.0)."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from tinkywiki_mcp import config, query_match
+from tinkywiki_mcp.cache import (
+    _search_cache,
+    cache_stats,
+    get_cached_search,
+    lookup_search,
+    search_key,
+    set_cached_search,
+)
+from tinkywiki_mcp.query_match import (
+    canonical_query,
+    find_similar,
+    query_match_stats,
+    remember_query,
+)
+from tinkywiki_mcp.shared_cache import l2_delete
+from tinkywiki_mcp.types import ToolResponse
+
+REPO = "https://github.com/facebook/react"
+
+
+class TestCanonicalQuery:
+    def test_rewordings_collide(self):
+        assert canonical_query("How does the scheduler work?", REPO) == canonical_query(
+            "how does the React scheduler work", REPO
+        ) == "how scheduler"
+
+    def test_whitespace_punctuation_and_order(self):
+        assert canonical_query("  Fiber   reconciler, hooks!! ") == canonical_query(
+            "hooks — fiber reconciler?"
+        )
+
+    def test_question_words_kept(self):
+        assert canonical_query("Why is the scheduler slow?") != canonical_query(
+            "How is the scheduler slow?"
+        )
+
+    def test_multi_part_repo_name(self):
+        repo = "https://github.com/microsoft/vscode-copilot-chat"
+        assert canonical_query("How does vscode copilot chat index files?", repo) == (
+            canonical_query("how does vscodecopilotchat index files", repo)
+        ) == "file how index"
+
+    def test_never_empty(self):
+        assert canonical_query("What is React?", REPO) == "what"
+        assert canonical_query("is it", REPO) == "is it"
+
+
+class TestNearDuplicateIndex:
+    def test_similar_questions_found(self):
+        remember_query(REPO, canonical_query("How do lanes interact with the scheduler?", REPO),
+                       "How do lanes interact with the scheduler?")
+        matches = find_similar(REPO, canonical_query(
+            "How does the lane model interact with the React scheduler?", REPO))
+        assert [m.question for m in matches] == ["How do lanes interact with the scheduler?"]
+        assert matches[0].similarity == pytest.approx(0.8)
+
+    def test_threshold_is_configurable(self, mocker):
+        remember_query(REPO, "how lane scheduler", "How do lanes schedule?")
+        assert find_similar(REPO, "how lane scheduler suspense")
+        mocker.patch.object(config, "SEARCH_DEDUP_THRESHOLD", 0.9)
+        assert find_similar(REPO, "how lane scheduler suspense") == []
+
+    def test_unrelated_and_other_repos_not_found(self):
+        remember_query(REPO, "how scheduler", "How does the scheduler work?")
+        assert find_similar(REPO, "hook rule") == []
+        assert find_similar("https://github.com/vuejs/core", "how scheduler") == []
+
+    def test_best_match_first(self):
+        remember_query(REPO, "a b c d e f g", "seven")
+        remember_query(REPO, "a b c d e f g h i", "nine")
+        assert [m.question for m in find_similar(REPO, "a b c d e f g h")] == ["nine", "seven"]
+
+    def test_bounded_per_repo(self, mocker):
+        mocker.patch.object(query_match, "_MAX_QUESTIONS_PER_REPO", 3)
+        for i in range(5):
+            remember_query(REPO, f"topic{i} detail", f"q{i}")
+        assert query_match_stats()["indexed_questions"] == 3
+        assert find_similar(REPO, "topic0 detail extra") == []
+
+
+class TestSearchCache:
+    def test_reworded_question_hits(self):
+        set_cached_search(REPO, "How does the scheduler work?", "It uses lanes.")
+        hit = lookup_search(REPO, "how does the React scheduler work")
+        assert hit.value == "It uses lanes."
+        assert hit.matched_query == "How does the scheduler work?"
+        assert hit.similarity == 1.0
+
+    def test_same_wording_reports_no_match(self):
+        set_cached_search(REPO, "How does the scheduler work?", "It uses lanes.")
+        assert lookup_search(REPO, "how does the scheduler work? ").matched_query is None
+
+    def test_near_duplicate_hits(self):
+        set_cached_search(REPO, "How do lanes interact with the scheduler?", "Via priorities.")
+        hit = lookup_search(REPO, "How does the lane model interact with the scheduler?")
+        assert hit.value == "Via priorities."
+        assert hit.matched_query == "How do lanes interact with the scheduler?"
+        assert hit.similarity == pytest.approx(0.8)
+        stats = cache_stats()["search"]
+        assert stats["near_duplicate_hits"] == 1 and stats["threshold"] == 0.75
+
+    def test_expired_answers_forgotten(self):
+        set_cached_search(REPO, "How do lanes interact with the scheduler?", "Via priorities.")
+        _search_cache.clear()
+        l2_delete("search", search_key(REPO, "How do lanes interact with the scheduler?"))
+        assert lookup_search(REPO, "How does the lane model interact with the scheduler?") is None
+        assert query_match_stats()["indexed_questions"] == 0
+
+    def test_disabled(self, mocker):
+        mocker.patch.object(config, "SEARCH_DEDUP_ENABLED", False)
+        set_cached_search(REPO, "How does the scheduler work?", "It uses lanes.")
+        assert search_key(REPO, " How does the scheduler work?") == (
+            f"{REPO}::how does the scheduler work?"
+        )
+        assert get_cached_search(REPO, "how does the React scheduler work") is None
+        assert get_cached_search(REPO, "how does the scheduler work?") == "It uses lanes."
+
+
+class TestSearchTool:
+    @pytest.fixture
+    def search_fn(self, mocker):
+        from mcp.server.fastmcp import FastMCP
+
+        from tinkywiki_mcp.tools.search import register
+        from tests.test_tools import _tool_fn
+
+        mocker.patch.object(config, "LOCAL_INDEX_ENABLED", False)
+        mcp = FastMCP("test")
+        register(mcp)
+        return _tool_fn(mcp, "tinkywiki_search_wiki")
+
+    def test_hit_names_the_matched_question(self, search_fn, mocker):
+        chat = mocker.patch("tinkywiki_mcp.tools.search._run_search")
+        set_cached_search(REPO, "How do lanes interact with the scheduler?", "Via priorities.")
+        result = json.loads(search_fn(
+            repo_url=REPO, query="How does the lane model interact with the scheduler?"))
+        chat.assert_not_called()
+        assert result["status"] == "ok"
+        assert "How do lanes interact with the scheduler?" in result["data"]
+        assert result["meta"]["matched_query"] == "How do lanes interact with the scheduler?"
+        assert result["meta"]["similarity"] == pytest.approx(0.8)
+
+    def test_chat_answer_serves_rewordings(self, search_fn, mocker):
+        chat = mocker.patch("tinkywiki_mcp.tools.search._run_search",
+                            return_value=ToolResponse.success("It uses lanes.", repo_url=REPO))
+        search_fn(repo_url=REPO, query="How does the scheduler work?")
+        result = json.loads(search_fn(repo_url=REPO, query="how does the React scheduler work"))
+        assert chat.call_count == 1
+        assert result["data"].endswith("It uses lanes.")
+        assert result["meta"]["similarity"] == 1.0
@@ -0,0 +1,206 @@
+"""Tests for refresh-ahead of hot repositories (v1.5.0)."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from tinkywiki_mcp import config, refresh_ahead
+from tinkywiki_mcp.cache import set_cached_wiki_page, wiki_page_fresh_until
+from tinkywiki_mcp.diagnostics import collect_diagnostics
+from tinkywiki_mcp.refresh_ahead import (
+    hot_repos,
+    record_access,
+    refresh_ahead_stats,
+    refresh_due,
+    start_refresh_ahead,
+    stop_refresh_ahead,
+)
+from tinkywiki_mcp.shared_cache import l2_set
+from tinkywiki_mcp.tools._helpers import fetch_page_or_error
+from tests.conftest import make_wiki_page
+
+REPO = "https://github.com/team/hot"
+OTHER = "https://github.com/team/warm"
+
+
+@pytest.fixture
+def clock(mocker):
+    """Patch time.time (shared by the tracker and the caches)."""
+    return mocker.patch("tinkywiki_mcp.refresh_ahead.time.time", return_value=1_000_000.0)
+
+
+def _hits(repo_url, n):
+    for _ in range(n):
+        record_access(repo_url)
+
+
+@pytest.fixture
+def render(mocker, clock):
+    """Stand-in for parser.fetch_wiki_page(force=True): re-caches the page."""
+
+    def _render(repo_url, force=False):
+        page = make_wiki_page(title=f"rendered at {clock.return_value}")
+        set_cached_wiki_page(repo_url, page)
+        return page
+
+    return mocker.patch("tinkywiki_mcp.parser.fetch_wiki_page", side_effect=_render)
+
+
+class TestAccessTracker:
+    def test_scores_accumulate_and_rank(self, clock):
+        _hits(REPO, 5)
+        _hits(OTHER, 3)
+        record_access("https://github.com/one/off")
+        assert [url for url, _ in hot_repos()] == [REPO, OTHER]
+        assert hot_repos()[0][1] == pytest.approx(5.0)
+
+    def test_scores_decay(self, clock):
+        _hits(REPO, 4)
+        clock.return_value += refresh_ahead._HALF_LIFE_SECONDS
+        assert hot_repos()[0][1] == pytest.approx(2.0)
+
+    def test_inactive_repos_drop_out(self, clock):
+        _hits(REPO, 50)
+        clock.return_value += config.REFRESH_AHEAD_ACTIVE_SECONDS + 1
+        assert hot_repos() == []
+
+    def test_top_k(self, clock, mocker):
+        mocker.patch.object(config, "REFRESH_AHEAD_TOP_K", 1)
+        _hits(REPO, 3)
+        _hits(OTHER, 4)
+        assert hot_repos() == [(OTHER, pytest.approx(4.0))]
+
+    def test_tracked_repos_are_bounded(self, clock, mocker):
+        mocker.patch.object(refresh_ahead, "_MAX_TRACKED", 3)
+        _hits(REPO, 5)
+        for i in range(10):
+            record_access(f"https://github.com/scan/r{i}")
+        assert refresh_ahead_stats()["tracked_repos"] == 3
+        assert hot_repos()[0][0] == REPO
+
+    def test_page_requests_are_recorded(self, clock, mocker):
+        mocker.patch("tinkywiki_mcp.tools._helpers.fetch_page_with_fallback",
+                     side_effect=TimeoutError("slow"))
+        for _ in range(2):
+            fetch_page_or_error("team/hot")
+        assert hot_repos() == [(REPO, pytest.approx(2.0))]
+
+
+class TestRefreshDue:
+    def test_refreshes_hot_page_near_expiry(self, clock, render):
+        set_cached_wiki_page(REPO, make_wiki_page())
+        _hits(REPO, 3)
+        clock.return_value += config.CACHE_TTL_SECONDS - 30
+        assert refresh_due() == 1
+        render.assert_called_once_with(REPO, force=True)
+        assert wiki_page_fresh_until(REPO) == clock.return_value + config.CACHE_TTL_SECONDS
+        stats = refresh_ahead_stats()
+        assert stats["refreshed"] == 1 and stats["renders_last_hour"] == 1
+
+    def test_fresh_pages_left_alone(self, clock, render):
+        set_cached_wiki_page(REPO, make_wiki_page())
+        _hits(REPO, 3)
+        clock.return_value += 10
+        assert refresh_due() == 0
+        render.assert_not_called()
+
+    def test_uncached_and_cold_repos_left_alone(self, clock, render):
+        _hits(REPO, 3)  # never cached
+        set_cached_wiki_page(OTHER, make_wiki_page())
+        record_access(OTHER)  # below REFRESH_AHEAD_MIN_SCORE
+        clock.return_value += config.CACHE_TTL_SECONDS - 30
+        assert refresh_due() == 0
+        render.assert_not_called()
+
+    def test_deepwiki_pages_refreshed_through_deepwiki(self, clock, mocker):
+        fetch = mocker.patch("tinkywiki_mcp.deepwiki.fetch_deepwiki_page")
+        set_cached_wiki_page(f"deepwiki::{REPO}", make_wiki_page(source="deepwiki"))
+        _hits(REPO, 3)
+        clock.return_value += config.CACHE_TTL_SECONDS - 30
+        assert refresh_due() == 1
+        fetch.assert_called_once_with(REPO, force=True)
+
+    def test_hourly_budget(self, clock, render, mocker):
+        mocker.patch.object(config, "REFRESH_AHEAD_MAX_PER_HOUR", 1)
+        for repo in (REPO, OTHER):
+            set_cached_wiki_page(repo, make_wiki_page())
+            _hits(repo, 3)
+        clock.return_value += config.CACHE_TTL_SECONDS - 30
+        assert refresh_due() == 1
+        assert refresh_ahead_stats()["skipped_budget"] == 1
+        clock.return_value += 3601
+        _hits(OTHER, 3)
+        assert refresh_due() == 1
+
+    def test_failures_counted(self, clock, mocker):
+        mocker.patch("tinkywiki_mcp.parser.fetch_wiki_page", side_effect=TimeoutError("slow"))
+        set_cached_wiki_page(REPO, make_wiki_page())
+        _hits(REPO, 3)
+        clock.return_value += config.CACHE_TTL_SECONDS - 30
+        assert refresh_due() == 0
+        assert refresh_ahead_stats()["failed"] == 1
+
+    def test_skips_page_another_process_refreshed(self, clock, render):
+        set_cached_wiki_page(REPO, make_wiki_page())
+        _hits(REPO, 3)
+        clock.return_value += config.CACHE_TTL_SECONDS - 30
+        l2_set("parsed", REPO, make_wiki_page(title="from worker 2"), config.CACHE_HARD_TTL_SECONDS)
+        assert refresh_due() == 0
+        render.assert_not_called()
+        stats = refresh_ahead_stats()
+        assert stats["skipped_shared"] == 1 and stats["renders_last_hour"] == 0
+        assert wiki_page_fresh_until(REPO) == clock.return_value + config.CACHE_TTL_SECONDS
+
+
+class TestSavedRenders:
+    def _refresh(self, clock):
+        set_cached_wiki_page(REPO, make_wiki_page())
+        _hits(REPO, 3)
+        start = clock.return_value
+        clock.return_value += config.CACHE_TTL_SECONDS - 30
+        refresh_due()
+        return start + config.CACHE_TTL_SECONDS  # when the page would have gone stale
+
+    def test_request_after_old_expiry_is_saved(self, clock, render):
+        old_expiry = self._refresh(clock)
+        clock.return_value = old_expiry + 10
+        record_access(REPO)
+        record_access(REPO)  # counted once per refresh
+        assert refresh_ahead_stats()["saved_renders"] == 1
+
+    def test_request_before_old_expiry_not_counted(self, clock, render):
+        old_expiry = self._refresh(clock)
+        clock.return_value = old_expiry - 10
+        record_access(REPO)
+        assert refresh_ahead_stats()["saved_renders"] == 0
+
+    def test_not_counted_once_refreshed_page_is_stale_too(self, clock, render):
+        self._refresh(clock)
+        clock.return_value += 2 * config.CACHE_TTL_SECONDS
+        record_access(REPO)
+        assert refresh_ahead_stats()["saved_renders"] == 0
+
+
+class TestRefresherThread:
+    def test_disabled(self, mocker):
+        mocker.patch.object(config, "REFRESH_AHEAD_ENABLED", False)
+        assert start_refresh_ahead() is False
+
+    def test_start_stop(self, mocker):
+        mocker.patch.object(config, "REFRESH_AHEAD_INTERVAL_SECONDS", 0.01)
+        due = mocker.patch.object(refresh_ahead, "refresh_due", return_value=0)
+        assert start_refresh_ahead()
+        deadline = time.monotonic() + 2
+        while not due.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert refresh_ahead_stats()["running"]
+        stop_refresh_ahead()
+        assert due.called
+        assert not refresh_ahead_stats()["running"]
+
+    def test_in_diagnostics(self):
+        assert collect_diagnostics()["refresh_ahead"]["budget_per_hour"] == (
+            config.REFRESH_AHEAD_MAX_PER_HOUR
+        )
@@ -0,0 +1,148 @@
+"""Tests for local repository snapshots (v1.5.0)."""
+
+from __future__ import annotations
+
+import pytest
+
+from tinkywiki_mcp import config, github_client, repo_snapshot
+from tinkywiki_mcp.github_api import fetch_file_tree, search_code
+from tinkywiki_mcp.github_client import reset_github_client
+from tinkywiki_mcp.repo_snapshot import (
+    clear_snapshots,
+    get_snapshot,
+    ingest_snapshot,
+    schedule_snapshot,
+    search_snapshot,
+    snapshot_stats,
+    snapshot_tree,
+)
+from tests.github_stub import GitHubStub, sample_repo
+
+REPO_URL = "https://github.com/octo/widget"
+
+
+@pytest.fixture
+def stub(mocker) -> GitHubStub:
+    repo = sample_repo()
+    repo.files["src/widget/core.py"] = "import os\n\ndef run_widget():\n    return os.getcwd()\n"
+    repo.files["assets/logo.png"] = "\x89PNG\0\0binary"
+    server = GitHubStub([repo])
+    mocker.patch.object(github_client, "_transport", server.transport())
+    reset_github_client()
+    return server
+
+
+class TestIngest:
+    def test_builds_full_tree(self, stub):
+        info = ingest_snapshot(REPO_URL)
+        assert info is not None
+        assert info.file_count == 7
+        assert info.indexed_files == 6  # the PNG is listed, not indexed
+        assert info.new_blobs == 7
+        assert snapshot_tree(REPO_URL) == sorted(stub.repos["octo/widget"].files)
+        assert snapshot_tree(REPO_URL, max_entries=2) == ["README.md", "assets/logo.png"]
+        assert stub.tarball_downloads == 1
+
+    def test_unchanged_tree_downloads_nothing(self, stub):
+        ingest_snapshot(REPO_URL)
+        info = ingest_snapshot(REPO_URL, force=True)
+        assert stub.tarball_downloads == 1
+        assert info is not None and info.generation == 1
+
+    def test_fresh_snapshot_makes_no_request(self, stub):
+        ingest_snapshot(REPO_URL)
+        before = len(stub.requests)
+        ingest_snapshot(REPO_URL)
+        assert len(stub.requests) == before
+
+    def test_changed_file_stores_only_new_blobs(self, stub):
+        ingest_snapshot(REPO_URL)
+        stub.repos["octo/widget"].files["docs/index.md"] = "Docs, revised"
+        info = ingest_snapshot(REPO_URL, force=True)
+        assert stub.tarball_downloads == 2
+        assert info.generation == 2
+        assert info.new_blobs == 1
+        assert snapshot_stats()["blobs"] == 7  # the old docs blob was collected
+        assert search_snapshot(REPO_URL, "revised")[0]["path"] == "docs/index.md"
+
+    def test_oversized_file_is_listed_not_indexed(self, stub, mocker):
+        mocker.patch.object(config, "GITHUB_SNAPSHOT_MAX_FILE_BYTES", 20)
+        info = ingest_snapshot(REPO_URL)
+        assert "src/widget/core.py" in snapshot_tree(REPO_URL)
+        assert info.indexed_files < info.file_count - 1
+        assert search_snapshot(REPO_URL, "getcwd") == []
+
+    def test_max_files_truncates(self, stub, mocker):
+        mocker.patch.object(config, "GITHUB_SNAPSHOT_MAX_FILES", 3)
+        info = ingest_snapshot(REPO_URL)
+        assert info.truncated is True
+        assert info.file_count == 3
+
+    def test_missing_repo_returns_none(self, stub):
+        assert ingest_snapshot("https://github.com/octo/missing") is None
+        assert get_snapshot("https://github.com/octo/missing") is None
+
+    def test_gc_waits_for_running_ingest(self, stub):
+        fts = repo_snapshot._fts_available()
+        with repo_snapshot._ingesting(fts):  # another repo, blobs stored, files not yet
+            repo_snapshot._store_blobs([("0" * 40, 5, "other")], fts)
+            ingest_snapshot(REPO_URL)
+            assert repo_snapshot._store.execute(
+                "SELECT COUNT(*) FROM blobs WHERE blob_sha = ?", ("0" * 40,)
+            ) == [(1,)]
+        assert snapshot_stats()["blobs"] == get_snapshot(REPO_URL).file_count
+
+    def test_clear(self, stub):
+        ingest_snapshot(REPO_URL)
+        clear_snapshots()
+        assert get_snapshot(REPO_URL) is None
+        assert snapshot_stats()["blobs"] == 0
+
+
+class TestSearch:
+    def test_trigram_search_returns_fragment(self, stub):
+        ingest_snapshot(REPO_URL)
+        results = search_snapshot(REPO_URL, "getcwd")
+        assert [r["path"] for r in results] == ["src/widget/core.py"]
+        assert results[0]["line"] == 4
+        assert "os.getcwd()" in results[0]["fragment"]
+        assert results[0]["url"] == "https://github.com/octo/widget/blob/HEAD/src/widget/core.py#L4"
+
+    def test_substring_fallback_without_fts(self, stub, mocker):
+        mocker.patch.object(repo_snapshot, "_fts_available", return_value=False)
+        ingest_snapshot(REPO_URL)
+        results = search_snapshot(REPO_URL, "run_widget")
+        assert [r["path"] for r in results] == ["src/widget/core.py"]
+        assert results[0]["line"] == 3
+
+    def test_no_snapshot_returns_none(self):
+        assert search_snapshot(REPO_URL, "anything") is None
+
+
+class TestGitHubApiIntegration:
+    def test_tree_and_search_use_snapshot(self, stub, mocker):
+        mocker.patch.object(config, "GITHUB_SNAPSHOT_ENABLED", True)
+        ingest_snapshot(REPO_URL)
+        before = len(stub.requests)
+        assert "assets/logo.png" in fetch_file_tree(REPO_URL)
+        assert search_code(REPO_URL, "getcwd")[0]["fragment"]
+        assert len(stub.requests) == before
+
+    def test_snapshot_ignored_when_disabled(self, stub, mocker):
+        mocker.patch.object(config, "GITHUB_SNAPSHOT_ENABLED", False)
+        ingest_snapshot(REPO_URL)
+        before = len(stub.requests)
+        fetch_file_tree(REPO_URL)
+        assert len(stub.requests) == before + 1
+
+    def test_schedule_is_noop_when_disabled(self, mocker):
+        mocker.patch.object(config, "GITHUB_SNAPSHOT_ENABLED", False)
+        submit = mocker.patch.object(repo_snapshot, "submit_background")
+        assert schedule_snapshot(REPO_URL) is False
+        submit.assert_not_called()
+
+    def test_schedule_submits_when_due(self, mocker):
+        mocker.patch.object(config, "GITHUB_SNAPSHOT_ENABLED", True)
+        submit = mocker.patch.object(repo_snapshot, "submit_background", return_value=True)
+        assert schedule_snapshot(REPO_URL) is True
+        assert submit.call_args.args[0] == "snapshot::octo/widget"
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-import json
 from types import SimpleNamespace
 
+import httpx
 import pytest
 
 from tinkywiki_mcp import resolver
+from tests.conftest import mock_github
 
 
 def _result(owner: str, repo: str, stars: int = 0) -> resolver.SearchResult:
@@ -123,37 +124,31 @@ def test_fetch_search_results_handles_errors(mocker):
 
 
 def test_github_search_success_and_cache(mocker):
-    class _Resp:
-        def __enter__(self):
-            return self
-
-        def __exit__(self, *_args):
-            return False
-
-        def read(self):
-            payload = {
-                "items": [
-                    {
-                        "full_name": "vuejs/vue",
-                        "description": "Vue framework",
-                        "stargazers_count": 200000,
-                    }
-                ]
+    payload = {
+        "items": [
+            {
+                "full_name": "vuejs/vue",
+                "description": "Vue framework",
+                "stargazers_count": 200000,
             }
-            return json.dumps(payload).encode()
-
-    urlopen = mocker.patch("urllib.request.urlopen", return_value=_Resp())
+        ]
+    }
+    calls = mock_github(mocker, lambda request: httpx.Response(200, json=payload))
     out = resolver._github_search("veu")
     assert out[0].full_name == "vuejs/vue"
     assert out[0].stars == 200000
+    assert calls[0].url.params["q"] == "veu"
 
     out2 = resolver._github_search("veu")
     assert out2[0].full_name == "vuejs/vue"
-    assert urlopen.call_count == 1
+    assert len(calls) == 1
 
 
 def test_github_search_failure_returns_empty(mocker):
-    mocker.patch("urllib.request.urlopen", side_effect=TimeoutError("timeout"))
+    def _timeout(request):
+        raise httpx.ReadTimeout("timeout", request=request)
+
+    mock_github(mocker, _timeout)
     assert resolver._github_search("veu") == []
 
 
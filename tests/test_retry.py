@@ -0,0 +1,178 @@
+"""Tests for the shared retry engine (v1.5.0)."""
+
+from __future__ import annotations
+
+import json
+import urllib.error
+
+import pytest
+
+from tinkywiki_mcp import retry
+from tinkywiki_mcp.retry import (
+    RetryPolicy,
+    backoff_delay,
+    get_policy,
+    is_retryable_code,
+    is_retryable_exception,
+    retry_call,
+    retry_stats,
+)
+from tinkywiki_mcp.types import ErrorCode, ToolResponse
+
+
+def _policy(**overrides) -> RetryPolicy:
+    defaults = {
+        "name": "test",
+        "max_attempts": 3,
+        "base_delay": 1.0,
+        "max_delay": 10.0,
+        "multiplier": 2.0,
+        "jitter": 0.0,
+        "budget_seconds": 60.0,
+    }
+    defaults.update(overrides)
+    return RetryPolicy(**defaults)
+
+
+class TestClassification:
+    @pytest.mark.parametrize("code", [ErrorCode.TIMEOUT, ErrorCode.DRIVER_ERROR])
+    def test_retryable_codes(self, code):
+        assert is_retryable_code(code)
+
+    @pytest.mark.parametrize(
+        "code",
+        [
+            ErrorCode.INPUT_NOT_FOUND,
+            ErrorCode.VALIDATION,
+            ErrorCode.NOT_INDEXED,
+            ErrorCode.RATE_LIMITED,
+        ],
+    )
+    def test_terminal_codes(self, code):
+        assert not is_retryable_code(code)
+
+    def test_timeout_is_retryable(self):
+        assert is_retryable_exception(TimeoutError("slow"))
+
+    def test_url_error_is_retryable(self):
+        assert is_retryable_exception(urllib.error.URLError("reset"))
+
+    def test_http_5xx_is_retryable(self):
+        exc = urllib.error.HTTPError("https://api.github.com", 503, "down", {}, None)
+        assert is_retryable_exception(exc)
+
+    def test_http_4xx_is_terminal(self):
+        exc = urllib.error.HTTPError("https://api.github.com", 404, "nope", {}, None)
+        assert not is_retryable_exception(exc)
+
+    def test_value_error_is_terminal(self):
+        assert not is_retryable_exception(ValueError("bad json"))
+
+
+class TestBackoff:
+    def test_exponential(self):
+        policy = _policy()
+        assert [backoff_delay(policy, n) for n in (1, 2, 3)] == [1.0, 2.0, 4.0]
+
+    def test_capped(self):
+        assert backoff_delay(_policy(max_delay=3.0), 5) == 3.0
+
+    def test_jitter_bounds(self):
+        policy = _policy(jitter=0.5)
+        for _ in range(50):
+            assert 0.5 <= backoff_delay(policy, 1) <= 1.5
+
+
+class TestRetryCall:
+    def test_success_first_try(self):
+        outcome = retry_call(_policy(), lambda: "ok")
+        assert outcome.value == "ok"
+        assert outcome.attempts == 1
+
+    def test_retries_transient_exception(self, mocker):
+        fn = mocker.Mock(side_effect=[TimeoutError("t"), "ok"])
+        outcome = retry_call(_policy(), fn)
+        assert outcome.value == "ok"
+        assert outcome.attempts == 2
+        retry._sleep.assert_called_once_with(1.0)
+
+    def test_terminal_exception_not_retried(self, mocker):
+        fn = mocker.Mock(side_effect=ValueError("bad"))
+        with pytest.raises(ValueError):
+            retry_call(_policy(), fn)
+        assert fn.call_count == 1
+        assert retry_stats()["test"]["terminal"] == 1
+
+    def test_exhausted_reraises_last_exception(self, mocker):
+        fn = mocker.Mock(side_effect=TimeoutError("t"))
+        with pytest.raises(TimeoutError):
+            retry_call(_policy(), fn)
+        assert fn.call_count == 3
+
+    def test_retry_if_on_result(self, mocker):
+        fn = mocker.Mock(side_effect=["bad", "bad", "good"])
+        outcome = retry_call(_policy(), fn, retry_if=lambda v: v == "bad")
+        assert outcome.value == "good"
+        assert outcome.attempts == 3
+
+    def test_returns_last_failed_result(self):
+        outcome = retry_call(_policy(max_attempts=2), lambda: "bad", retry_if=lambda v: True)
+        assert outcome.value == "bad"
+        assert outcome.attempts == 2
+
+    def test_budget_stops_retries(self, mocker):
+        fn = mocker.Mock(side_effect=TimeoutError("t"))
+        with pytest.raises(TimeoutError):
+            retry_call(_policy(budget_seconds=0.5), fn)
+        assert fn.call_count == 1
+        assert retry_stats()["test"]["budget_exhausted"] == 1
+
+    def test_caller_deadline_stops_retries(self, mocker):
+        fn = mocker.Mock(side_effect=TimeoutError("t"))
+        with pytest.raises(TimeoutError):
+            retry_call(_policy(), fn, deadline=0.0)
+        assert fn.call_count == 1
+
+    def test_stats(self, mocker):
+        retry_call(_policy(), mocker.Mock(side_effect=[TimeoutError("t"), "ok"]))
+        stats = retry_stats()["test"]
+        assert stats["calls"] == 1
+        assert stats["attempts"] == 2
+        assert stats["retries"] == 1
+        assert stats["successes"] == 1
+
+    def test_named_policy(self, mocker):
+        mocker.patch.object(retry.config, "GITHUB_API_MAX_ATTEMPTS", 5)
+        assert get_policy(retry.GITHUB_API).max_attempts == 5
+
+
+class TestSearchToolRetries:
+    def _fn(self):
+        from mcp.server.fastmcp import FastMCP
+        from tinkywiki_mcp.tools.search import register
+
+        mcp = FastMCP("test")
+        register(mcp)
+        return mcp._tool_manager._tools["tinkywiki_search_wiki"].fn
+
+    def test_terminal_error_not_retried(self, mocker):
+        mocker.patch.object(retry.config, "FALLBACK_ENABLED", False)
+        run_search = mocker.patch(
+            "tinkywiki_mcp.tools.search._run_search",
+            return_value=ToolResponse.error(ErrorCode.INPUT_NOT_FOUND, "no chat"),
+        )
+        parsed = json.loads(self._fn()(repo_url="microsoft/vscode", query="q"))
+        assert run_search.call_count == 1
+        assert parsed["code"] == "INPUT_NOT_FOUND"
+
+    def test_transient_error_retried_then_exhausted(self, mocker):
+        mocker.patch.object(retry.config, "FALLBACK_ENABLED", False)
+        mocker.patch.object(retry.config, "MAX_RETRIES", 3)
+        run_search = mocker.patch(
+            "tinkywiki_mcp.tools.search._run_search",
+            return_value=ToolResponse.error(ErrorCode.DRIVER_ERROR, "boom"),
+        )
+        parsed = json.loads(self._fn()(repo_url="microsoft/vscode", query="q"))
+        assert run_search.call_count == 3
+        assert parsed["code"] == "RETRY_EXHAUSTED"
+        assert parsed["meta"]["attempt"] == 3
@@ -0,0 +1,231 @@
+"""Tests for the shared cache backends and cross-process single-flight (v1.5.0)."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from tinkywiki_mcp import cache, config, shared_cache
+from tinkywiki_mcp.cache import (
+    cache_stats,
+    get_cached_page,
+    get_cached_wiki_page,
+    set_cached_page,
+    set_cached_wiki_page,
+)
+from tinkywiki_mcp.dedup import dedup_fetch
+from tinkywiki_mcp.disk_cache import disk_try_lock
+from tinkywiki_mcp.resp_client import RespClient, RespError
+from tinkywiki_mcp.shared_cache import backend_name, l2_get, single_flight
+from tests.conftest import make_wiki_page
+from tests.redis_stub import RedisStub
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _clear_l1():
+    for budgeted in (cache._page_cache, cache._parsed_cache, cache._search_cache,
+                     cache._topic_cache):
+        budgeted.reset()
+
+
+@pytest.fixture
+def redis_stub(mocker):
+    stub = RedisStub().start()
+    mocker.patch.object(config, "CACHE_BACKEND", "redis")
+    mocker.patch.object(config, "CACHE_REDIS_URL", stub.url)
+    yield stub
+    stub.stop()
+
+
+class TestRespClient:
+    def test_round_trip(self):
+        stub = RedisStub().start()
+        try:
+            client = RespClient(stub.url)
+            assert client.command("PING") == "PONG"
+            assert client.command("SET", "k", b"\x00bin\r\nary") == "OK"
+            assert client.command("GET", "k") == b"\x00bin\r\nary"
+            assert client.command("GET", "missing") is None
+            assert client.command("DEL", "k", "other") == 1
+        finally:
+            stub.stop()
+
+    def test_auth_and_error_replies(self):
+        stub = RedisStub(password="s3cret").start()
+        try:
+            client = RespClient(stub.url)
+            assert client.command("PING") == "PONG"
+            assert stub.command_names()[0] == "AUTH"
+            with pytest.raises(RespError):
+                client.command("FLUSHALL")
+        finally:
+            stub.stop()
+
+    def test_connection_refused(self):
+        stub = RedisStub().start()
+        url = stub.url
+        stub.stop()
+        with pytest.raises(OSError):
+            RespClient(url, timeout=0.5).command("PING")
+
+    def test_rejects_other_schemes(self):
+        with pytest.raises(ValueError):
+            RespClient("http://localhost:6379")
+
+
+class TestBackendSelection:
+    def test_default_is_sqlite(self):
+        assert backend_name() == "sqlite"
+        assert cache_stats()["l2"]["backend"] == "sqlite"
+
+    def test_none(self, mocker):
+        mocker.patch.object(config, "CACHE_BACKEND", "none")
+        set_cached_page("https://a.com", "<p>x</p>")
+        assert l2_get("html", "https://a.com") is None
+
+    def test_l2_disabled_wins(self, mocker):
+        mocker.patch.object(config, "CACHE_L2_ENABLED", False)
+        mocker.patch.object(config, "CACHE_BACKEND", "redis")
+        assert backend_name() == "none"
+
+
+class TestRedisBackend:
+    def test_pages_shared_through_redis(self, redis_stub):
+        page = make_wiki_page()
+        set_cached_wiki_page("https://github.com/o/r", page)
+        set_cached_page("https://a.com", "<p>" + "html " * 1000 + "</p>")
+        assert any(k.startswith(b"tinkywiki:parsed:") for k in redis_stub.data)
+        _clear_l1()  # another worker: empty L1, same server
+        assert get_cached_wiki_page("https://github.com/o/r") == page
+        assert get_cached_page("https://a.com").startswith("<p>html")
+        stats = cache_stats()["l2"]
+        assert stats["backend"] == "redis"
+        assert stats["hits"] == 2 and stats["writes"] == 2
+
+    def test_entries_expire_with_server_ttl(self, redis_stub, mocker):
+        mocker.patch.object(cache._search_cache, "_TTLCache__ttl", 0.05)
+        cache.set_cached_search("repo", "q", "answer")
+        time.sleep(0.1)
+        _clear_l1()
+        assert l2_get("search", "repo::q") is None
+
+    def test_unreachable_server_degrades_and_backs_off(self, mocker):
+        stub = RedisStub().start()
+        url = stub.url
+        stub.stop()
+        mocker.patch.object(config, "CACHE_BACKEND", "redis")
+        mocker.patch.object(config, "CACHE_REDIS_URL", url)
+        connect = mocker.spy(shared_cache.RespClient, "_connect")
+        set_cached_page("https://a.com", "<p>x</p>")
+        _clear_l1()
+        assert get_cached_page("https://a.com") is None
+        assert connect.call_count == 1
+        assert cache_stats()["l2"]["available"] is False
+
+    def test_clear_only_touches_own_prefix(self, redis_stub):
+        redis_stub.data[b"someone-else"] = (b"keep", None)
+        set_cached_page("https://a.com", "<p>x</p>")
+        cache.clear_cache()
+        assert list(redis_stub.data) == [b"someone-else"]
+
+    def test_lock_through_redis(self, redis_stub):
+        with single_flight("fetch::x") as taken:
+            assert taken
+            assert b"tinkywiki:lock:fetch::x" in redis_stub.data
+        assert b"tinkywiki:lock:fetch::x" not in redis_stub.data
+
+
+class TestSingleFlight:
+    def test_second_owner_waits(self, mocker):
+        mocker.patch.object(shared_cache, "_LOCK_POLL_SECONDS", 0.01)
+        order = []
+        inside = threading.Event()
+
+        def first():
+            with single_flight("k"):
+                order.append("first-in")
+                inside.set()
+                time.sleep(0.2)
+                order.append("first-out")
+
+        thread = threading.Thread(target=first)
+        thread.start()
+        inside.wait(2)
+        with single_flight("k") as taken:
+            order.append("second-in")
+        thread.join()
+        assert taken
+        assert order == ["first-in", "first-out", "second-in"]
+        assert cache_stats()["l2"]["locks"]["waited"] == 1
+
+    def test_expired_lock_is_taken_over(self, mocker):
+        mocker.patch.object(config, "CACHE_LOCK_TTL_SECONDS", 0.05)
+        assert disk_try_lock("k", "crashed-owner", 0.05)
+        time.sleep(0.06)
+        with single_flight("k") as taken:
+            assert taken
+
+    def test_wait_times_out(self, mocker):
+        mocker.patch.object(config, "CACHE_LOCK_TTL_SECONDS", 0.1)
+        mocker.patch.object(shared_cache, "_LOCK_POLL_SECONDS", 0.01)
+        assert disk_try_lock("k", "slow-owner", 60)
+        with single_flight("k") as taken:
+            assert not taken
+        assert cache_stats()["l2"]["locks"]["timeouts"] == 1
+
+    def test_no_backend_runs_unlocked(self, mocker):
+        mocker.patch.object(config, "CACHE_BACKEND", "none")
+        with single_flight("k") as taken:
+            assert not taken
+
+    def test_dedup_holds_shared_lock(self):
+        seen = []
+
+        def fetch():
+            seen.append(disk_try_lock("fetch::repo", "someone-else", 60))
+            return "page"
+
+        assert dedup_fetch("repo", fetch) == "page"
+        assert seen == [False]
+        assert disk_try_lock("fetch::repo", "someone-else", 60)  # released afterwards
+
+
+_WORKER = textwrap.dedent("""
+    import sys, time
+    from tinkywiki_mcp.cache import get_cached_search, set_cached_search
+    from tinkywiki_mcp.dedup import dedup_fetch
+
+    def render():
+        cached = get_cached_search("repo", "q")
+        if cached is not None:
+            return cached
+        with open(sys.argv[1], "a") as fh:
+            fh.write("render\\n")
+        time.sleep(0.5)
+        set_cached_search("repo", "q", "answer")
+        return "answer"
+
+    print(dedup_fetch("repo", render))
+""")
+
+
+class TestAcrossProcesses:
+    def test_one_render_serves_every_worker(self, tmp_path):
+        renders = tmp_path / "renders.log"
+        env = dict(os.environ, TINKYWIKI_DATA_DIR=str(tmp_path / "data"), PYTHONPATH=str(ROOT))
+        workers = [
+            subprocess.Popen([sys.executable, "-c", _WORKER, str(renders)], env=env,
+                             stdout=subprocess.PIPE, text=True)
+            for _ in range(3)
+        ]
+        outputs = [worker.communicate(timeout=30)[0].strip() for worker in workers]
+        assert outputs == ["answer"] * 3
+        assert renders.read_text().count("render") == 1
@@ -203,6 +203,28 @@ class TestTopicsTool:
         assert "Architecture" in parsed["data"]
         assert "Extensions" in parsed["data"]
 
+    def test_stale_cache_served_with_meta_flag(self, mocker):
+        import time
+
+        from tinkywiki_mcp import config
+        from tinkywiki_mcp.tools.topics import register
+        from mcp.server.fastmcp import FastMCP
+
+        fetch = mocker.patch(_HELPERS_FETCH, return_value=_fb(make_wiki_page()))
+        submit = mocker.patch("tinkywiki_mcp.cache.submit_background", return_value=True)
+        mcp = FastMCP("test")
+        register(mcp)
+        fn = _tool_fn(mcp, "tinkywiki_list_topics")
+
+        first = json.loads(fn(repo_url="microsoft/vscode"))
+        assert "stale" not in first["meta"]
+        mocker.patch("time.time", return_value=time.time() + config.TOPIC_CACHE_TTL_SECONDS + 1)
+        second = json.loads(fn(repo_url="microsoft/vscode"))
+        assert second["meta"]["stale"] is True
+        assert second["data"] == first["data"]
+        assert fetch.call_count == 1  # served from cache, refreshed in the background
+        submit.assert_called_once()
+
 
 # ---------------------------------------------------------------------------
 # tinkywiki_read_structure tool
@@ -323,6 +345,68 @@ class TestContentsTool:
         assert "Extensions" in parsed["data"]
         assert "offset=2" in parsed["data"]  # next_offset hint
 
+    def test_deepwiki_page_is_crawled(self, mocker):
+        """DeepWiki topic stubs are replaced by crawled topic content."""
+        from tinkywiki_mcp.fallback import FallbackResult
+        from tinkywiki_mcp.parser import WikiSection
+
+        stub = make_wiki_page(
+            source="deepwiki",
+            sections=[WikiSection(title="Hooks", level=1, content="[Full content at: x]")],
+        )
+        full = make_wiki_page(
+            source="deepwiki",
+            sections=[WikiSection(title="Hooks", level=1, content="useState keeps state.")],
+        )
+        mocker.patch(_HELPERS_FETCH, return_value=FallbackResult(page=stub, source="deepwiki"))
+        mocker.patch("tinkywiki_mcp.tools.contents.config.DEEPWIKI_CRAWL_ENABLED", True)
+        crawl = mocker.patch(
+            "tinkywiki_mcp.tools.contents.crawl_deepwiki_page", return_value=full
+        )
+
+        from tinkywiki_mcp.tools.contents import register
+        from mcp.server.fastmcp import FastMCP
+
+        mcp = FastMCP("test")
+        register(mcp)
+
+        fn = _tool_fn(mcp, "tinkywiki_read_contents")
+        parsed = json.loads(fn(repo_url="facebook/react"))
+        crawl.assert_called_once_with("https://github.com/facebook/react")
+        assert "useState keeps state." in parsed["data"]
+
+    def test_deepwiki_section_fetches_one_topic(self, mocker):
+        """A section request fetches just that topic, even with crawling off."""
+        from tinkywiki_mcp.fallback import FallbackResult
+        from tinkywiki_mcp.parser import WikiSection
+
+        stub = make_wiki_page(
+            source="deepwiki",
+            sections=[WikiSection(title="Hooks", level=1, content="[Full content at: x]")],
+        )
+        full = make_wiki_page(
+            source="deepwiki",
+            sections=[WikiSection(title="Hooks", level=1, content="useState keeps state.")],
+        )
+        mocker.patch(_HELPERS_FETCH, return_value=FallbackResult(page=stub, source="deepwiki"))
+        mocker.patch("tinkywiki_mcp.tools.contents.config.DEEPWIKI_CRAWL_ENABLED", True)
+        crawl = mocker.patch("tinkywiki_mcp.tools.contents.crawl_deepwiki_page")
+        topic = mocker.patch(
+            "tinkywiki_mcp.tools.contents.fetch_deepwiki_topic", return_value=full
+        )
+
+        from tinkywiki_mcp.tools.contents import register
+        from mcp.server.fastmcp import FastMCP
+
+        mcp = FastMCP("test")
+        register(mcp)
+
+        fn = _tool_fn(mcp, "tinkywiki_read_contents")
+        parsed = json.loads(fn(repo_url="facebook/react", section_title="hooks"))
+        topic.assert_called_once_with("https://github.com/facebook/react", "hooks")
+        crawl.assert_not_called()
+        assert "useState keeps state." in parsed["data"]
+
 
 # ---------------------------------------------------------------------------
 # tinkywiki_search_wiki tool (Playwright — mocked)
@@ -370,7 +454,7 @@ class TestSearchTool:
         )
         # Ensure search cache doesn't interfere
         mocker.patch(
-            "tinkywiki_mcp.tools.search.get_cached_search",
+            "tinkywiki_mcp.tools.search.lookup_search",
             return_value=None,
         )
 
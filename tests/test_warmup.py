@@ -0,0 +1,227 @@
+"""Tests for startup cache warming (v1.5.0)."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+import pytest
+
+from tinkywiki_mcp import config, warmup
+from tinkywiki_mcp.cache import get_cached_search, get_cached_topics, set_cached_search
+from tinkywiki_mcp.diagnostics import collect_diagnostics
+from tinkywiki_mcp.fallback import FallbackResult
+from tinkywiki_mcp.local_index import LocalAnswer
+from tinkywiki_mcp.server import parse_args
+from tinkywiki_mcp.tools import search
+from tinkywiki_mcp.types import ErrorCode, ToolResponse, validate_search_input
+from tinkywiki_mcp.warmup import (
+    WarmupEntry,
+    load_manifest,
+    parse_manifest,
+    run_warmup,
+    start_warmup,
+    warm_repo,
+    warmup_status,
+)
+from tests.conftest import make_wiki_page
+
+REPO = "https://github.com/team/core"
+
+
+@pytest.fixture
+def fetch(mocker):
+    return mocker.patch(
+        "tinkywiki_mcp.fallback.fetch_page_with_fallback",
+        return_value=FallbackResult(page=make_wiki_page(), source="tinkywiki"),
+    )
+
+
+class TestManifest:
+    def test_plain_text(self):
+        entries, invalid = parse_manifest("# team repos\nteam/core\n\nteam/web  # frontend\n")
+        assert [e.repo_url for e in entries] == [REPO, "https://github.com/team/web"]
+        assert invalid == 0
+
+    def test_json_objects_and_strings(self):
+        text = json.dumps({"repos": [
+            "team/web",
+            {"repo": "team/core", "sections": ["Architecture"], "questions": ["How to build?"]},
+        ]})
+        entries, _ = parse_manifest(text)
+        assert entries[1] == WarmupEntry(REPO, ["Architecture"], ["How to build?"])
+
+    def test_duplicates_merged(self):
+        text = json.dumps([
+            {"repo": "team/core", "questions": ["a"]},
+            {"repo": REPO, "questions": ["a", "b"]},
+        ])
+        entries, _ = parse_manifest(text)
+        assert entries == [WarmupEntry(REPO, [], ["a", "b"])]
+
+    def test_invalid_entries_counted(self):
+        entries, invalid = parse_manifest(json.dumps(["team/core", 42, {"sections": ["x"]}]))
+        assert len(entries) == 1 and invalid == 2
+
+    def test_malformed_json_raises(self):
+        with pytest.raises(ValueError):
+            parse_manifest("[not json")
+
+    def test_file_and_env(self, tmp_path, mocker):
+        path = tmp_path / "repos.txt"
+        path.write_text("team/core\n")
+        assert load_manifest(str(path))[0] == [WarmupEntry(REPO)]
+        mocker.patch.object(config, "WARMUP_MANIFEST", str(path))
+        assert load_manifest()[0] == [WarmupEntry(REPO)]
+        mocker.patch.object(config, "WARMUP_MANIFEST", "")
+        mocker.patch.object(config, "WARMUP_REPOS", "team/core, team/web")
+        assert len(load_manifest()[0]) == 2
+
+    def test_none_configured(self):
+        assert load_manifest() == ([], 0)
+        assert start_warmup() is False
+        assert warmup_status() == {"configured": False}
+
+    def test_cli_flag(self):
+        assert parse_args(["--warmup", "repos.json"]).warmup == "repos.json"
+        assert parse_args([]).warmup is None
+
+
+class TestWarmRepo:
+    def test_caches_page_and_topics(self, fetch):
+        summary = warm_repo(WarmupEntry(REPO))
+        fetch.assert_called_once_with(REPO)
+        assert summary["status"] == "ok" and summary["source"] == "tinkywiki"
+        assert "Architecture" in get_cached_topics(REPO)
+
+    def test_stale_page_topics_not_cached(self, fetch):
+        fetch.return_value.page.stale = True
+        assert warm_repo(WarmupEntry(REPO))["status"] == "ok"
+        assert get_cached_topics(REPO) is None
+
+    def test_missing_repo(self, fetch):
+        fetch.return_value = FallbackResult(page=None, source="github_api")
+        assert warm_repo(WarmupEntry(REPO))["status"] == "missing"
+
+    def test_missing_sections_reported(self, fetch):
+        summary = warm_repo(WarmupEntry(REPO, sections=["testing", "Deployment"]))
+        assert summary["sections_missing"] == ["Deployment"]
+
+    def test_deepwiki_sections_crawled(self, fetch, mocker):
+        mocker.patch.object(config, "DEEPWIKI_CRAWL_ENABLED", True)
+        fetch.return_value = FallbackResult(page=make_wiki_page(source="deepwiki"), source="deepwiki")
+        crawl = mocker.patch("tinkywiki_mcp.deepwiki.crawl_deepwiki_page", return_value=None)
+        warm_repo(WarmupEntry(REPO))
+        crawl.assert_not_called()  # no sections requested
+        warm_repo(WarmupEntry(REPO, sections=["Architecture"]))
+        crawl.assert_called_once_with(REPO)
+
+    def test_deepwiki_section_topics_fetched(self, fetch, mocker):
+        fetch.return_value = FallbackResult(page=make_wiki_page(source="deepwiki"), source="deepwiki")
+        crawl = mocker.patch("tinkywiki_mcp.deepwiki.crawl_deepwiki_page")
+        topic = mocker.patch("tinkywiki_mcp.deepwiki.fetch_deepwiki_topic", return_value=None)
+        summary = warm_repo(WarmupEntry(REPO, sections=["Architecture", "Deployment"]))
+        assert [c.args for c in topic.call_args_list] == [(REPO, "Architecture"), (REPO, "Deployment")]
+        crawl.assert_not_called()
+        assert summary["sections_missing"] == ["Deployment"]
+
+    def test_questions_prefetched(self, fetch, mocker):
+        prefetch = mocker.patch.object(search, "prefetch_answer", side_effect=["local", "chat"])
+        summary = warm_repo(WarmupEntry(REPO, questions=["How to build?", "Where is CI?"]))
+        assert summary["questions"] == {"local": 1, "chat": 1}
+        assert prefetch.call_args.kwargs == {"use_chat": config.WARMUP_USE_CHAT}
+
+
+class TestPrefetchAnswer:
+    @pytest.fixture
+    def inp(self):
+        return validate_search_input(REPO, "How to build?")
+
+    def test_already_cached(self, inp, mocker):
+        chat = mocker.patch.object(search, "_guarded_search")
+        set_cached_search(REPO, "How to build?", "answer")
+        assert search.prefetch_answer(inp) == "cached"
+        chat.assert_not_called()
+
+    def test_confident_local_answer(self, inp, mocker):
+        mocker.patch.object(search, "_answer_from_local_index",
+                            return_value=LocalAnswer("text", 9.0, 1.0, True, "tinkywiki"))
+        chat = mocker.patch.object(search, "_guarded_search")
+        assert search.prefetch_answer(inp) == "local"
+        chat.assert_not_called()
+
+    def test_chat_answer_cached(self, inp, mocker):
+        mocker.patch.object(search, "_answer_from_local_index", return_value=None)
+        mocker.patch.object(search, "_guarded_search",
+                            return_value=ToolResponse.success("Run make.", repo_url=REPO))
+        assert search.prefetch_answer(inp) == "chat"
+        assert get_cached_search(REPO, "How to build?") == "Run make."
+
+    def test_chat_disabled_or_failing(self, inp, mocker):
+        mocker.patch.object(search, "_answer_from_local_index", return_value=None)
+        chat = mocker.patch.object(search, "_guarded_search",
+                                   return_value=ToolResponse.error(ErrorCode.TIMEOUT, "slow"))
+        assert search.prefetch_answer(inp, use_chat=False) == "skipped"
+        chat.assert_not_called()
+        assert search.prefetch_answer(inp) == "skipped"
+        assert get_cached_search(REPO, "How to build?") is None
+
+
+class TestRunner:
+    def test_concurrency_is_bounded(self, mocker):
+        mocker.patch.object(config, "WARMUP_CONCURRENCY", 2)
+        active, peak = [0], [0]
+        guard = threading.Lock()
+
+        def slow(entry):
+            with guard:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with guard:
+                active[0] -= 1
+            return {"repo_url": entry.repo_url, "status": "ok"}
+
+        mocker.patch.object(warmup, "warm_repo", side_effect=slow)
+        entries = [WarmupEntry(f"https://github.com/team/r{i}") for i in range(6)]
+        status = run_warmup(entries)
+        assert peak[0] == 2
+        assert status["done"] == 6 and status["finished"]
+
+    def test_failures_counted(self, mocker):
+        def flaky(entry):
+            if entry.repo_url.endswith("bad"):
+                raise TimeoutError("render timed out")
+            return {"repo_url": entry.repo_url, "status": "ok"}
+
+        mocker.patch.object(warmup, "warm_repo", side_effect=flaky)
+        status = run_warmup([WarmupEntry(REPO), WarmupEntry("https://github.com/team/bad")], 1)
+        assert (status["done"], status["failed"], status["invalid"]) == (1, 1, 1)
+        failed = [r for r in status["repos"] if r["status"] == "failed"]
+        assert failed[0]["error"] == "render timed out"
+
+    def test_start_does_not_block(self, mocker, tmp_path):
+        release = threading.Event()
+        mocker.patch.object(warmup, "warm_repo", side_effect=lambda e: (
+            release.wait(2), {"repo_url": e.repo_url, "status": "ok"})[1])
+        path = tmp_path / "repos.txt"
+        path.write_text("team/core\nteam/web\n")
+        begin = time.monotonic()
+        assert start_warmup(str(path))
+        assert time.monotonic() - begin < 0.5
+        assert warmup_status()["finished"] is False
+        release.set()
+        warmup._thread.join(timeout=2)
+        status = collect_diagnostics()["warmup"]
+        assert status["finished"] and status["done"] == 2
+
+    def test_stop_skips_pending_repos(self, mocker):
+        warm = mocker.patch.object(warmup, "warm_repo")
+        mocker.patch.object(config, "WARMUP_REPOS", "team/a,team/b")
+        warmup._stop.set()
+        run_warmup(load_manifest()[0])
+        warm.assert_not_called()
+
+    def test_unreadable_manifest(self, tmp_path):
+        assert start_warmup(str(tmp_path / "missing.json")) is False
@@ -0,0 +1,283 @@
+"""Capture of streamed DeepWiki Ask answers from network traffic (v1.5.0).
+
+DeepWiki streams its Ask answers to the browser — as Server-Sent Events,
+a chunked fetch body (NDJSON) or WebSocket frames.  Instead of polling the
+DOM for an element that looks like the answer, the Ask flow attaches an
+:class:`AskCapture` to the Playwright page *before* submitting the query.
+It feeds every matching response body / frame into an
+:class:`AskStreamParser`, which assembles the answer text and detects the
+end of the stream (``[DONE]``, ``event: done``, ``{"type": "done"}``,
+end of an SSE body, or the socket closing).
+
+:class:`AskStreamParser` is pure (no Playwright) so the chunk handling can
+be tested directly.  Each stream gets its own parser; the longest finished
+answer wins, so unrelated traffic matching the URL patterns cannot
+interleave with the answer.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any
+from urllib.parse import urlsplit
+
+from . import config
+
+logger = logging.getLogger("TinkyWiki")
+
+# MIME types that are always treated as answer streams
+_STREAM_CONTENT_TYPES = ("text/event-stream", "application/x-ndjson", "application/stream+json")
+# Request types the browser uses for fetch/XHR/EventSource traffic
+_STREAM_RESOURCE_TYPES = ("fetch", "xhr", "eventsource", "other")
+# Markers that end a stream
+_DONE_PAYLOADS = frozenset({"[DONE]", "[END]"})
+_DONE_EVENT_TYPES = frozenset({"done", "end", "complete", "completed", "finish", "finished"})
+# JSON fields that carry answer text, in priority order
+_TEXT_KEYS = ("delta", "content", "text", "chunk", "token", "answer", "message", "data")
+
+
+def _text_from_json(obj: Any) -> str:
+    """Return the answer text carried by one decoded JSON event."""
+    if isinstance(obj, str):
+        return obj
+    if isinstance(obj, dict):
+        choices = obj.get("choices")
+        if isinstance(choices, list) and choices:
+            return _text_from_json(choices[0])
+        for key in _TEXT_KEYS:
+            value = obj.get(key)
+            if isinstance(value, (str, dict)):
+                text = _text_from_json(value)
+                if text:
+                    return text
+    return ""
+
+
+def _is_done_event(obj: Any) -> bool:
+    """Return True if a decoded JSON event marks the end of the stream."""
+    if not isinstance(obj, dict):
+        return False
+    if obj.get("done") is True:
+        return True
+    kind = obj.get("type") or obj.get("event") or obj.get("status")
+    return isinstance(kind, str) and kind.lower() in _DONE_EVENT_TYPES
+
+
+class AskStreamParser:
+    """Incrementally assemble an answer from stream chunks.
+
+    * :meth:`feed` takes raw body text (SSE or NDJSON), possibly split at
+      arbitrary points; complete lines are processed, the tail is buffered.
+    * :meth:`feed_message` takes one complete message (a WebSocket frame or
+      an SSE ``data:`` payload).
+    * :meth:`feed_body` takes a whole response body: one JSON document
+      (even pretty-printed) is a single message, anything else goes
+      through :meth:`feed`; the stream is then finished.
+    * :meth:`close` flushes the buffer and marks the stream finished.
+
+    JSON messages contribute their text field (``delta``, ``content``,
+    ``text`` … or OpenAI-style ``choices[0].delta.content``); non-JSON
+    ``data:`` payloads are taken verbatim.  Messages that repeat the answer
+    so far plus new text (cumulative streams) replace it instead of being
+    appended.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._event_data: list[str] = []  # ``data:`` lines of the current SSE event
+        self._text = ""
+        self.done = False
+        self.messages = 0
+
+    @property
+    def text(self) -> str:
+        """The answer assembled so far."""
+        return self._text
+
+    def feed(self, chunk: str) -> None:
+        """Process a piece of an SSE / NDJSON body."""
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split("\n")
+        for line in lines:
+            self._feed_line(line.rstrip("\r"))
+
+    def close(self) -> None:
+        """Flush any buffered partial line and mark the stream finished."""
+        if self._buffer:
+            self._feed_line(self._buffer.rstrip("\r"))
+            self._buffer = ""
+        self._dispatch_event()
+        self.done = True
+
+    def feed_body(self, body: str) -> None:
+        """Process a complete response body and finish the stream."""
+        try:
+            obj = json.loads(body)
+        except ValueError:  # SSE, NDJSON or plain text
+            self.feed(body)
+        else:
+            self._feed_json(obj)
+        self.close()
+
+    def feed_message(self, payload: str) -> None:
+        """Process one complete message."""
+        stripped = payload.strip()
+        if not stripped:
+            return
+        if stripped in _DONE_PAYLOADS:
+            self.done = True
+            return
+        try:
+            obj = json.loads(stripped)
+        except ValueError:
+            self._append(payload)  # plain-text token: keep its whitespace
+            return
+        self._feed_json(obj)
+
+    def _feed_json(self, obj: Any) -> None:
+        self._append(_text_from_json(obj))
+        if _is_done_event(obj):
+            self.done = True
+
+    def _dispatch_event(self) -> None:
+        if self._event_data:
+            self.feed_message("\n".join(self._event_data))
+            self._event_data = []
+
+    def _feed_line(self, line: str) -> None:
+        if not line:  # blank line ends an SSE event
+            self._dispatch_event()
+            return
+        if line.startswith(":"):  # SSE comment / keep-alive
+            return
+        field, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if field == "data":
+            self._event_data.append(value)
+        elif field == "event":
+            if value.strip().lower() in _DONE_EVENT_TYPES:
+                self.done = True
+        elif field in ("id", "retry"):
+            return
+        elif line.lstrip().startswith(("{", "[", '"')):  # NDJSON line
+            self.feed_message(line)
+
+    def _append(self, text: str) -> None:
+        if not text:
+            return
+        self.messages += 1
+        if self._text and text.startswith(self._text):
+            self._text = text  # cumulative stream: each message repeats the answer
+        else:
+            self._text += text
+
+
+def is_answer_stream(
+    url: str, content_type: str = "", resource_type: str = "", method: str = ""
+) -> bool:
+    """Return True if a response/socket looks like the Ask answer stream.
+
+    Streaming content types always match.  Otherwise the URL must be a
+    DeepWiki endpoint — a ``DEEPWIKI_ASK_STREAM_HOSTS`` host whose path
+    contains one of ``DEEPWIKI_ASK_STREAM_URL_PATTERNS`` — and, for HTTP
+    responses, the request must not be a plain ``GET`` (page data, history
+    lists…).  Generic ``/query`` or ``/chat`` calls elsewhere never match.
+    """
+    if resource_type and resource_type not in _STREAM_RESOURCE_TYPES:
+        return False
+    if any(kind in content_type.lower() for kind in _STREAM_CONTENT_TYPES):
+        return True
+    if method.upper() == "GET":
+        return False
+    parts = urlsplit(url.lower())
+    host = parts.hostname or ""
+    if not any(host == h or host.endswith(f".{h}") for h in config.DEEPWIKI_ASK_STREAM_HOSTS):
+        return False
+    return any(pattern in parts.path for pattern in config.DEEPWIKI_ASK_STREAM_URL_PATTERNS)
+
+
+class AskCapture:
+    """Listen to a Playwright page's network traffic for the Ask answer."""
+
+    def __init__(self) -> None:
+        self.parsers: list[AskStreamParser] = []
+        self.detected = asyncio.Event()  # a candidate stream was seen
+        self.finished = asyncio.Event()  # a stream ended with answer text
+
+    def attach(self, page: Any) -> None:
+        """Subscribe to the page's responses and WebSockets."""
+        page.on("response", self._on_response)
+        page.on("websocket", self._on_websocket)
+
+    def _new_parser(self) -> AskStreamParser:
+        parser = AskStreamParser()
+        self.parsers.append(parser)
+        self.detected.set()
+        return parser
+
+    def _check(self, parser: AskStreamParser) -> None:
+        if parser.done and parser.text.strip():
+            self.finished.set()
+
+    async def _on_response(self, response: Any) -> None:
+        try:
+            content_type = (response.headers or {}).get("content-type", "")
+            resource_type = response.request.resource_type
+            method = response.request.method
+        except (AttributeError, RuntimeError):
+            return
+        if not is_answer_stream(response.url, content_type, resource_type, method):
+            return
+        parser = self._new_parser()
+        logger.debug("DeepWiki Ask: capturing stream %s", response.url)
+        try:
+            body = await response.text()  # resolves when the stream ends
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.debug("DeepWiki Ask: could not read stream %s: %s", response.url, exc)
+            return
+        parser.feed_body(body)
+        self._check(parser)
+
+    def _on_websocket(self, websocket: Any) -> None:
+        if not is_answer_stream(websocket.url):
+            return
+        parser = self._new_parser()
+        logger.debug("DeepWiki Ask: capturing WebSocket %s", websocket.url)
+
+        def on_frame(payload: str | bytes) -> None:
+            if isinstance(payload, bytes):
+                payload = payload.decode("utf-8", errors="replace")
+            parser.feed_message(payload)
+            self._check(parser)
+
+        def on_close(*_args: Any) -> None:
+            parser.close()
+            self._check(parser)
+
+        websocket.on("framereceived", on_frame)
+        websocket.on("close", on_close)
+
+    def answer(self) -> str:
+        """Longest finished answer, or ``""`` if no stream has finished."""
+        finished = [p.text.strip() for p in self.parsers if p.done]
+        return max(finished, key=len, default="")
+
+    async def wait(self, detect_timeout: float, total_timeout: float) -> str:
+        """Wait for a finished answer.
+
+        Gives up after *detect_timeout* if no candidate stream appeared at
+        all, otherwise after *total_timeout*.  Returns ``""`` on timeout so
+        the caller can fall back to DOM polling.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + total_timeout
+        try:
+            await asyncio.wait_for(self.detected.wait(), detect_timeout)
+            await asyncio.wait_for(
+                self.finished.wait(), max(0.0, deadline - loop.time())
+            )
+        except asyncio.TimeoutError:
+            pass
+        return self.answer()
@@ -0,0 +1,95 @@
+"""Bounded, de-duplicated background task runner (v1.5.0).
+
+Used for best-effort work that must never block a tool call — e.g.
+re-probing a repo that a source previously reported as not indexed.
+
+- **Bounded**: at most ``BACKGROUND_WORKERS`` tasks run at once and at most
+  ``BACKGROUND_MAX_PENDING`` are queued; extra submissions are dropped.
+- **De-duplicated**: a task whose *key* is already queued or running is
+  not submitted again.
+
+Thread-safe: uses a ``threading.Lock`` to guard the pending-key set.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable
+
+from . import config
+
+logger = logging.getLogger("TinkyWiki")
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_pending: dict[str, Future] = {}
+_stats = {"submitted": 0, "deduplicated": 0, "dropped": 0, "completed": 0, "failed": 0}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor  # pylint: disable=global-statement
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=max(1, config.BACKGROUND_WORKERS),
+            thread_name_prefix="tinkywiki-bg",
+        )
+    return _executor
+
+
+def _run(key: str, fn: Callable[[], object]) -> None:
+    try:
+        fn()
+        with _lock:
+            _stats["completed"] += 1
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.debug("background: task %s failed: %s", key, exc)
+        with _lock:
+            _stats["failed"] += 1
+    finally:
+        with _lock:
+            _pending.pop(key, None)
+
+
+def submit_background(key: str, fn: Callable[[], object]) -> bool:
+    """Run *fn()* in the background unless *key* is already pending.
+
+    Returns:
+        True if the task was scheduled, False if it was de-duplicated or
+        dropped because the queue is full.
+    """
+    with _lock:
+        if key in _pending:
+            _stats["deduplicated"] += 1
+            return False
+        if len(_pending) >= config.BACKGROUND_MAX_PENDING:
+            _stats["dropped"] += 1
+            logger.debug("background: queue full, dropped %s", key)
+            return False
+        _stats["submitted"] += 1
+        _pending[key] = _get_executor().submit(_run, key, fn)
+        return True
+
+
+def wait_for_background(timeout: float | None = None) -> None:
+    """Block until every pending task has finished (mainly for testing)."""
+    with _lock:
+        futures = list(_pending.values())
+    if futures:
+        wait(futures, timeout=timeout)
+
+
+def background_stats() -> dict:
+    """Return background task counters."""
+    with _lock:
+        return {"pending": len(_pending), **_stats}
+
+
+def reset_background() -> None:
+    """Wait for running tasks and reset counters (mainly for testing)."""
+    wait_for_background(timeout=5)
+    with _lock:
+        _pending.clear()
+        for key in _stats:
+            _stats[key] = 0
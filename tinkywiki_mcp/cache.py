@@ -3,36 +3,371 @@
 Uses cachetools TTLCache to avoid hitting TinkyWiki for every request.
 Wiki pages are updated infrequently (on PR merges), making caching very effective.
 
-Four caches:
+Seven caches:
 - **HTML cache** — raw rendered HTML keyed by URL
 - **Parsed cache** — ``WikiPage`` objects keyed by repo URL (avoids re-parsing)
-- **Search cache** — search responses keyed by ``repo_url::query``
+- **Search cache** — search responses keyed by ``repo_url::`` plus the
+  question's canonical form; near-duplicate questions also hit
+  (``query_match.py``)
 - **Topic cache** — pre-built topic-list strings keyed by repo URL (30-min TTL)
+- **Section cache** — parsed DeepWiki topic pages keyed by topic URL, sized
+  for whole-repo crawls so they don't evict the parsed cache (30-min TTL)
+- **GitHub metadata cache** — ``RepoMeta`` keyed by ``owner/repo``, shared
+  by the GitHub fallback calls (5-min TTL)
+- **Negative cache** (v1.5.0) — "not found" / "not indexed" / "timed out"
+  verdicts of the page fetchers and of search, each kind with its own TTL
+  so a transient failure is never remembered as long as a real miss
+
+**Persistent L2** (v1.5.0): the HTML, parsed, search and topic caches are
+the L1 in front of a store shared by every server process — by default
+``disk_cache.py``'s SQLite file, or a Redis-protocol server (see
+``shared_cache.py``).  Writes go to both levels; an L1 miss reads the L2 and
+promotes the entry with its original expiry, so restarts start warm.
+
+**Stale-while-revalidate** (v1.5.0): parsed pages and topic lists carry a
+soft TTL (``CACHE_TTL_SECONDS`` / ``TOPIC_CACHE_TTL_SECONDS``) and a hard
+TTL (``CACHE_HARD_TTL_SECONDS``).  Between the two, :func:`lookup_wiki_page`
+and :func:`lookup_topics` return the stale value at once and schedule one
+de-duplicated background refresh, so popular repos never wait on a render.
+
+**Content-hash change detection** (v1.5.0): parsed pages carry the hash
+of their extracted content, and topic lists and search answers are
+recorded as derived from the page hash current when they were stored.
+Re-storing a page with the same hash re-stamps those entries (fresh
+again, no rebuild); a different hash invalidates exactly the entries
+derived from the old one.  The dependency index is per process — other
+processes' derived entries just run out their TTL.
+
+**Memory budgets** (v1.5.0): the caches are bounded by bytes
+(``*_CACHE_MAX_BYTES``, sized with :func:`_sizeof`) as well as by entry
+count, so one multi-MB page can't crowd the budget unnoticed.  HTML is
+kept compressed in memory (``compression.py``); ``cache_stats()`` reports
+bytes used, evictions and the compression ratio per cache.  Which entry
+is evicted is up to ``eviction.py`` (W-TinyLFU by default, so a scan of
+one-off repos doesn't flush the hot ones); ``TINKYWIKI_CACHE_TRACE``
+records lookups for replay in ``tests/bench_cache_policies.py``.
 """
 
 from __future__ import annotations
 
+import dataclasses
 import logging
-from typing import Any
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
 
-from cachetools import TTLCache
+from cachetools import Cache, TTLCache
 
 from . import config
+from .background import submit_background
+from .compression import CODEC_NONE, compress, decompress
+from .eviction import make_policy
+from .query_match import (
+    canonical_query,
+    clear_query_index,
+    count_hit,
+    find_similar,
+    forget_query,
+    query_match_stats,
+    question_for,
+    remember_query,
+)
+from .shared_cache import l2_clear, l2_delete, l2_get, l2_set, l2_stats
 
 logger = logging.getLogger("TinkyWiki")
 
+
+# ---------------------------------------------------------------------------
+# Byte-budgeted caches
+# ---------------------------------------------------------------------------
+_ENTRY_OVERHEAD = 256  # key, entry object and cache bookkeeping, roughly
+
+
+@dataclass
+class _Packed:
+    """A compressed string held in memory."""
+
+    codec: str
+    payload: bytes
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate payload bytes of *value* (strings, containers, dataclasses)."""
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, _Packed):
+        return len(value.payload)
+    if isinstance(value, dict):
+        return sum(_estimate_size(k) + _estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(_estimate_size(item) for item in value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return sum(_estimate_size(getattr(value, f.name)) for f in dataclasses.fields(value))
+    return 16
+
+
+def _sizeof(value: Any) -> int:
+    return _ENTRY_OVERHEAD + _estimate_size(value)
+
+
+class _BudgetCache(TTLCache):
+    """``TTLCache`` bounded by bytes (``maxsize``) and by *max_entries*.
+
+    The eviction victim comes from a pluggable policy (``eviction.py``,
+    default ``CACHE_EVICTION_POLICY``).  Counts evictions, and — with
+    *compress* — holds strings compressed.  Every read updates the policy,
+    so reads and writes alike hold the cache's re-entrant lock.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        max_entries: int,
+        ttl: float,
+        compress: bool = False,
+        policy: str | None = None,
+    ) -> None:
+        super().__init__(maxsize=max_bytes, ttl=ttl, getsizeof=_sizeof)
+        self.max_entries = max_entries
+        self.compress = compress
+        self.policy = make_policy(policy or config.CACHE_EVICTION_POLICY, max_bytes, max_entries)
+        self.evictions = 0
+        self.raw_bytes = 0  # cumulative over compressed writes
+        self.packed_bytes = 0
+        self.lock = threading.RLock()
+
+    def __getitem__(self, key, cache_getitem=Cache.__getitem__):
+        with self.lock:
+            value = super().__getitem__(key, cache_getitem)
+            self.policy.on_access(key)
+            return value
+
+    def __setitem__(self, key, value, cache_setitem=Cache.__setitem__) -> None:
+        with self.lock:
+            super().__setitem__(key, value, cache_setitem)
+            self.policy.on_insert(key, _sizeof(value))
+            while len(self) > self.max_entries:
+                self.popitem()
+
+    def __delitem__(self, key, cache_delitem=Cache.__delitem__) -> None:
+        with self.lock:
+            try:
+                super().__delitem__(key, cache_delitem)
+            finally:
+                self.policy.on_remove(key)
+
+    def get(self, key, default=None):
+        with self.lock:  # the membership test and the read as one step
+            return super().get(key, default)
+
+    def pop(self, key, *default):
+        with self.lock:
+            return super().pop(key, *default)
+
+    def expire(self, time=None):
+        with self.lock:
+            expired = super().expire(time)
+            for key, _ in expired:
+                self.policy.on_remove(key)
+            return expired
+
+    def popitem(self):
+        with self.lock:
+            self.expire()
+            key = self.policy.victim()
+            if key is None or not Cache.__contains__(self, key):
+                item = super().popitem()  # policy out of step — shouldn't happen
+            else:
+                item = (key, TTLCache.__getitem__(self, key))  # not a policy hit
+                del self[key]
+            self.evictions += 1
+            return item
+
+    def clear(self) -> None:
+        with self.lock:
+            super().clear()
+            self.policy.clear()
+
+    def peek(self, key: str) -> Any:
+        """Return the live value for *key* without counting an access, or None."""
+        with self.lock:
+            return TTLCache.__getitem__(self, key) if key in self else None
+
+    def reset(self) -> None:
+        """Drop every entry and zero the counters."""
+        with self.lock:
+            self.clear()
+            self.evictions = self.raw_bytes = self.packed_bytes = 0
+
+    def pack(self, value: Any) -> Any:
+        """Compress *value* if this cache compresses strings."""
+        if not self.compress or not isinstance(value, str):
+            return value
+        raw = value.encode("utf-8")
+        codec, payload = compress(raw)
+        with self.lock:
+            self.raw_bytes += len(raw)
+            self.packed_bytes += len(payload)
+        return value if codec == CODEC_NONE else _Packed(codec, payload)
+
+    def stats(self) -> dict[str, Any]:
+        with self.lock:
+            return self._stats()
+
+    def _stats(self) -> dict[str, Any]:
+        stats = {
+            "current_size": len(self),
+            "max_size": self.max_entries,
+            "ttl_seconds": int(self.ttl),
+            "bytes": int(self.currsize),
+            "max_bytes": int(self.maxsize),
+            "evictions": self.evictions,
+            **self.policy.stats(),
+        }
+        if self.compress:
+            stats["compression_ratio"] = (
+                round(self.raw_bytes / self.packed_bytes, 2) if self.packed_bytes else 1.0
+            )
+        return stats
+
+
+def _unpack(value: Any) -> Any:
+    if isinstance(value, _Packed):
+        return decompress(value.codec, value.payload).decode("utf-8")
+    return value
+
+
+def _store(cache: _BudgetCache, key: str, value: Any) -> None:
+    """``cache[key] = value``, dropping the key instead if *value* exceeds the budget."""
+    try:
+        cache[key] = value
+    except ValueError:
+        cache.pop(key, None)
+        logger.debug("Cache entry %s exceeds the %d-byte budget — not kept in memory",
+                     key, cache.maxsize)
+
+
+# ---------------------------------------------------------------------------
+# Two-level lookup shared by the persistent caches
+# ---------------------------------------------------------------------------
+@dataclass
+class _Entry:
+    """An L1 value with its absolute soft (fresh-until) and hard expiry."""
+
+    value: Any
+    fresh_until: float
+    expires_at: float
+
+
+@dataclass
+class CacheLookup:
+    """A cache hit; *stale* once past the soft TTL (a refresh was scheduled)."""
+
+    value: Any
+    stale: bool = False
+
+
+_swr_lock = threading.Lock()
+_swr_stats = {"stale_served": 0, "refreshes_scheduled": 0}
+_trace_lock = threading.Lock()
+
+
+def _trace(namespace: str, key: str) -> None:
+    """Append a lookup to ``CACHE_TRACE_FILE`` (input for the policy benchmark)."""
+    if not config.CACHE_TRACE_FILE:
+        return
+    try:
+        with _trace_lock, open(config.CACHE_TRACE_FILE, "a", encoding="utf-8") as fh:
+            fh.write(f"{time.time():.3f}\t{namespace}\t{key}\n")
+    except OSError as exc:
+        logger.debug("Cache trace write failed: %s", exc)
+
+
+def _entry(cache: _BudgetCache, namespace: str, key: str, soft_ttl: float) -> _Entry | None:
+    """Find *key* in the L1 *cache*, else in the L2 under *namespace* (promoted)."""
+    _trace(namespace, key)
+    entry = cache.get(key)
+    if entry is not None:
+        if entry.expires_at > time.time():
+            return entry
+        cache.pop(key, None)  # promoted from L2 with less life left than the L1 TTL
+    found = l2_get(namespace, key)
+    if found is None:
+        return None
+    entry = _Entry(cache.pack(found.value), found.stored_at + soft_ttl, found.expires_at)
+    _store(cache, key, entry)
+    logger.debug("L2 HIT %s/%s (promoted)", namespace, key)
+    return entry
+
+
+def _lookup(
+    cache: _BudgetCache,
+    namespace: str,
+    key: str,
+    soft_ttl: float,
+    refresh: Callable[[], object] | None = None,
+) -> CacheLookup | None:
+    """Return a fresh hit, or — given *refresh* — a stale one plus a background refresh.
+
+    Past the soft TTL an entry is only served if the caller can refresh
+    it; the refresh runs once per key at a time (``background.py``).
+    """
+    entry = _entry(cache, namespace, key, soft_ttl)
+    if entry is None:
+        return None
+    if entry.fresh_until > time.time():
+        return CacheLookup(_unpack(entry.value))
+    if refresh is None:
+        return None
+    scheduled = submit_background(f"swr::{namespace}::{key}", refresh)
+    with _swr_lock:
+        _swr_stats["stale_served"] += 1
+        _swr_stats["refreshes_scheduled"] += scheduled
+    logger.debug("Serving stale %s/%s (refresh %s)", namespace, key,
+                 "scheduled" if scheduled else "already pending")
+    return CacheLookup(_unpack(entry.value), stale=True)
+
+
+def _peek(cache: _BudgetCache, namespace: str, key: str) -> Any:
+    """Return the live value for *key* from either level without counting an access."""
+    entry = cache.peek(key)
+    if entry is not None and entry.expires_at > time.time():
+        return _unpack(entry.value)
+    found = l2_get(namespace, key)
+    return found.value if found is not None else None
+
+
+def _get(cache: _BudgetCache, namespace: str, key: str) -> Any:
+    """Return the live value for *key* (no stale-while-revalidate), or None."""
+    hit = _lookup(cache, namespace, key, cache.ttl)
+    return hit.value if hit is not None else None
+
+
+def _set(
+    cache: _BudgetCache, namespace: str, key: str, value: Any, soft_ttl: float | None = None
+) -> None:
+    """Store *value* in the L1 *cache* and the L2, fresh for *soft_ttl* (default: the TTL)."""
+    now = time.time()
+    fresh_for = cache.ttl if soft_ttl is None else min(soft_ttl, cache.ttl)
+    _store(cache, key, _Entry(cache.pack(value), now + fresh_for, now + cache.ttl))
+    l2_set(namespace, key, value, cache.ttl)
+
+
 # ---------------------------------------------------------------------------
 # HTML page cache — keyed by rendered URL, TTL from config
 # ---------------------------------------------------------------------------
-_page_cache: TTLCache[str, str] = TTLCache(
-    maxsize=config.CACHE_MAX_SIZE,
+_page_cache = _BudgetCache(
+    max_bytes=config.CACHE_MAX_BYTES,
+    max_entries=config.CACHE_MAX_SIZE,
     ttl=config.CACHE_TTL_SECONDS,
+    compress=True,
 )
 
 
 def get_cached_page(url: str) -> str | None:
     """Return cached HTML for *url*, or None if not cached / expired."""
-    result = _page_cache.get(url)
+    result = _get(_page_cache, "html", url)
     if result is not None:
         logger.debug("Cache HIT for %s (%d chars)", url, len(result))
     else:
@@ -42,119 +377,435 @@ def get_cached_page(url: str) -> str | None:
 
 def set_cached_page(url: str, html: str) -> None:
     """Store *html* in the page cache keyed by *url*."""
-    _page_cache[url] = html
+    _set(_page_cache, "html", url, html)
     logger.debug("Cached %s (%d chars)", url, len(html))
 
 
 # ---------------------------------------------------------------------------
-# Parsed WikiPage cache — avoids re-parsing the same HTML
+# Parsed WikiPage cache — avoids re-parsing the same HTML (stale-while-revalidate)
 # ---------------------------------------------------------------------------
-_parsed_cache: TTLCache = TTLCache(
-    maxsize=config.PARSED_CACHE_MAX_SIZE,
-    ttl=config.CACHE_TTL_SECONDS,
+_parsed_cache = _BudgetCache(
+    max_bytes=config.PARSED_CACHE_MAX_BYTES,
+    max_entries=config.PARSED_CACHE_MAX_SIZE,
+    ttl=max(config.CACHE_HARD_TTL_SECONDS, config.CACHE_TTL_SECONDS),
 )
 
 
-def get_cached_wiki_page(repo_url: str) -> Any:
-    """Return a cached ``WikiPage`` for *repo_url*, or ``None``."""
-    result = _parsed_cache.get(repo_url)
+def lookup_wiki_page(
+    repo_url: str, refresh: Callable[[], object] | None = None
+) -> CacheLookup | None:
+    """Return the cached ``WikiPage`` for *repo_url*, stale if *refresh* is given."""
+    result = _lookup(_parsed_cache, "parsed", repo_url, config.CACHE_TTL_SECONDS, refresh)
     if result is not None:
-        logger.debug("Parsed-cache HIT for %s", repo_url)
+        logger.debug("Parsed-cache HIT for %s%s", repo_url, " (stale)" if result.stale else "")
     return result
 
 
+def get_cached_wiki_page(repo_url: str) -> Any:
+    """Return a fresh cached ``WikiPage`` for *repo_url*, or ``None``."""
+    result = lookup_wiki_page(repo_url)
+    return result.value if result is not None else None
+
+
+def peek_wiki_page(key: str) -> Any:
+    """Return the cached ``WikiPage`` *key* even if stale, without counting an access."""
+    return _peek(_parsed_cache, "parsed", key)
+
+
 def set_cached_wiki_page(repo_url: str, page: Any) -> None:
-    """Cache a parsed ``WikiPage`` keyed by *repo_url*."""
-    _parsed_cache[repo_url] = page
+    """Cache a parsed ``WikiPage`` keyed by *repo_url*.
+
+    If a previous copy is still cached, its content hash decides whether
+    the entries derived from it are re-stamped or invalidated.
+    """
+    if getattr(page, "stale", False):  # e.g. derived from a stale page — stored as fresh data
+        page = dataclasses.replace(page, stale=False)
+    previous = peek_wiki_page(repo_url)
+    _set(_parsed_cache, "parsed", repo_url, page, config.CACHE_TTL_SECONDS)
     logger.debug("Parsed-cache stored %s", repo_url)
+    _page_restored(
+        repo_url, getattr(previous, "content_hash", ""), getattr(page, "content_hash", "")
+    )
+
+
+def wiki_page_fresh_until(key: str, check_shared: bool = False) -> float | None:
+    """Return when the in-memory parsed page *key* goes stale, or None if absent.
+
+    Doesn't count as an access.  With *check_shared*, a fresher copy in the
+    L2 (another process refreshed it) is promoted first.
+    """
+    entry = _parsed_cache.peek(key)
+    if entry is None:
+        return None
+    if check_shared:
+        found = l2_get("parsed", key)
+        if found is not None and found.stored_at + config.CACHE_TTL_SECONDS > entry.fresh_until:
+            entry = _Entry(_parsed_cache.pack(found.value),
+                           found.stored_at + config.CACHE_TTL_SECONDS, found.expires_at)
+            _store(_parsed_cache, key, entry)
+    return entry.fresh_until
 
 
 # ---------------------------------------------------------------------------
 # Search response cache — avoids re-querying the same question
 # ---------------------------------------------------------------------------
-_search_cache: TTLCache[str, str] = TTLCache(
-    maxsize=config.SEARCH_CACHE_MAX_SIZE,
+_search_cache = _BudgetCache(
+    max_bytes=config.SEARCH_CACHE_MAX_BYTES,
+    max_entries=config.SEARCH_CACHE_MAX_SIZE,
     ttl=config.SEARCH_CACHE_TTL_SECONDS,
 )
 
 
-def get_cached_search(repo_url: str, query: str) -> str | None:
-    """Return a cached search response, or ``None``."""
-    key = f"{repo_url}::{query.strip().lower()}"
-    result = _search_cache.get(key)
+@dataclass
+class SearchHit:
+    """A cached search answer and, if worded differently, the question it answered."""
+
+    value: str
+    matched_query: str | None = None
+    similarity: float = 1.0  # Jaccard similarity of the canonical forms
+
+
+def _search_canonical(repo_url: str, query: str) -> str:
+    if not config.SEARCH_DEDUP_ENABLED:
+        return query.strip().lower()
+    return canonical_query(query, repo_url)
+
+
+def search_key(repo_url: str, query: str) -> str:
+    """Return the search-cache key of *query* about *repo_url*."""
+    return f"{repo_url}::{_search_canonical(repo_url, query)}"
+
+
+def lookup_search(repo_url: str, query: str) -> SearchHit | None:
+    """Return the cached answer to *query* or to a near-duplicate of it, or ``None``."""
+    canonical = _search_canonical(repo_url, query)
+    result = _get(_search_cache, "search", f"{repo_url}::{canonical}")
     if result is not None:
         logger.debug("Search-cache HIT for %s :: %s", repo_url, query[:60])
-    return result
+        hit = SearchHit(result)
+        original = question_for(repo_url, canonical) if config.SEARCH_DEDUP_ENABLED else None
+        if original is not None and original.lower() != query.strip().lower():
+            hit.matched_query = original
+            count_hit(near_duplicate=False)
+        return hit
+    if not config.SEARCH_DEDUP_ENABLED:
+        return None
+    for match in find_similar(repo_url, canonical):
+        result = _get(_search_cache, "search", f"{repo_url}::{match.canonical}")
+        if result is None:  # the answer expired — the question goes too
+            forget_query(repo_url, match.canonical)
+            continue
+        count_hit(near_duplicate=True)
+        logger.debug("Search-cache near-duplicate HIT for %s :: %s ≈ %s (%.2f)",
+                     repo_url, query[:60], match.question[:60], match.similarity)
+        return SearchHit(result, match.question, match.similarity)
+    return None
 
 
-def set_cached_search(repo_url: str, query: str, response: str) -> None:
-    """Cache a search response keyed by *repo_url* + *query*."""
-    key = f"{repo_url}::{query.strip().lower()}"
-    _search_cache[key] = response
+def get_cached_search(repo_url: str, query: str) -> str | None:
+    """Return a cached search response (or a near-duplicate's), or ``None``."""
+    hit = lookup_search(repo_url, query)
+    return hit.value if hit is not None else None
+
+
+def set_cached_search(
+    repo_url: str, query: str, response: str, content_hash: str | None = None
+) -> None:
+    """Cache a search response keyed by *repo_url* + the canonical *query*.
+
+    The answer is tied to *content_hash* (default: the cached page's).
+    """
+    canonical = _search_canonical(repo_url, query)
+    key = f"{repo_url}::{canonical}"
+    _set(_search_cache, "search", key, response)
+    _depend(repo_url, "search", key, content_hash)
+    if config.SEARCH_DEDUP_ENABLED:
+        remember_query(repo_url, canonical, query.strip())
     logger.debug("Search-cache stored %s :: %s", repo_url, query[:60])
 
 
 # ---------------------------------------------------------------------------
 # Topic-list cache — longer TTL for stable structural data (30 min default)
 # ---------------------------------------------------------------------------
-_topic_cache: TTLCache[str, str] = TTLCache(
-    maxsize=config.TOPIC_CACHE_MAX_SIZE,
-    ttl=config.TOPIC_CACHE_TTL_SECONDS,
+_topic_cache = _BudgetCache(
+    max_bytes=config.TOPIC_CACHE_MAX_BYTES,
+    max_entries=config.TOPIC_CACHE_MAX_SIZE,
+    ttl=max(config.CACHE_HARD_TTL_SECONDS, config.TOPIC_CACHE_TTL_SECONDS),
 )
 
 
-def get_cached_topics(repo_url: str) -> str | None:
-    """Return a cached topic-list string for *repo_url*, or ``None``."""
-    result = _topic_cache.get(repo_url)
+def lookup_topics(
+    repo_url: str, refresh: Callable[[], object] | None = None
+) -> CacheLookup | None:
+    """Return the cached topic list for *repo_url*, stale if *refresh* is given."""
+    result = _lookup(_topic_cache, "topic", repo_url, config.TOPIC_CACHE_TTL_SECONDS, refresh)
     if result is not None:
-        logger.debug("Topic-cache HIT for %s", repo_url)
+        logger.debug("Topic-cache HIT for %s%s", repo_url, " (stale)" if result.stale else "")
     return result
 
 
-def set_cached_topics(repo_url: str, data: str) -> None:
-    """Cache a topic-list string keyed by *repo_url*."""
-    _topic_cache[repo_url] = data
+def get_cached_topics(repo_url: str) -> str | None:
+    """Return a fresh cached topic-list string for *repo_url*, or ``None``."""
+    result = lookup_topics(repo_url)
+    return result.value if result is not None else None
+
+
+def set_cached_topics(repo_url: str, data: str, content_hash: str | None = None) -> None:
+    """Cache a topic-list string keyed by *repo_url*, built from the page with *content_hash*."""
+    _set(_topic_cache, "topic", repo_url, data, config.TOPIC_CACHE_TTL_SECONDS)
+    _depend(repo_url, "topic", repo_url, content_hash)
     logger.debug("Topic-cache stored %s (%d chars)", repo_url, len(data))
 
 
+# ---------------------------------------------------------------------------
+# Section cache — one parsed DeepWiki topic page per entry (30 min default)
+# ---------------------------------------------------------------------------
+_section_cache = _BudgetCache(
+    max_bytes=config.SECTION_CACHE_MAX_BYTES,
+    max_entries=config.SECTION_CACHE_MAX_SIZE,
+    ttl=config.SECTION_CACHE_TTL_SECONDS,
+)
+
+
+def get_cached_section(url: str) -> Any:
+    """Return a cached topic ``WikiPage`` for *url*, or ``None``."""
+    _trace("section", url)
+    result = _section_cache.get(url)
+    if result is not None:
+        logger.debug("Section-cache HIT for %s", url)
+    return result
+
+
+def set_cached_section(url: str, page: Any) -> None:
+    """Cache a topic ``WikiPage`` keyed by its *url*."""
+    _store(_section_cache, url, page)
+    logger.debug("Section-cache stored %s", url)
+
+
+# ---------------------------------------------------------------------------
+# GitHub metadata cache — repo metadata from the REST API (5 min default)
+# ---------------------------------------------------------------------------
+_github_meta_cache: TTLCache = TTLCache(
+    maxsize=config.GITHUB_META_CACHE_MAX_SIZE,
+    ttl=config.GITHUB_META_CACHE_TTL_SECONDS,
+)
+
+
+def get_cached_github_meta(owner_repo: str) -> Any:
+    """Return cached ``RepoMeta`` for *owner_repo*, or ``None``."""
+    result = _github_meta_cache.get(owner_repo.lower())
+    if result is not None:
+        logger.debug("GitHub-meta-cache HIT for %s", owner_repo)
+    return result
+
+
+def set_cached_github_meta(owner_repo: str, meta: Any) -> None:
+    """Cache ``RepoMeta`` keyed by *owner_repo* (case-insensitive)."""
+    _github_meta_cache[owner_repo.lower()] = meta
+
+
+# ---------------------------------------------------------------------------
+# Negative cache — failed lookups, TTL per failure kind (both levels)
+# ---------------------------------------------------------------------------
+NEGATIVE_NOT_FOUND = "not_found"  # the source answered 404 / has no such repo
+NEGATIVE_NOT_INDEXED = "not_indexed"  # the repo exists but the source hasn't indexed it
+NEGATIVE_TIMEOUT = "timeout"  # timed out or rendered empty — transient
+
+
+def negative_ttl(kind: str) -> int:
+    """Seconds a *kind* verdict is kept (0: not cached)."""
+    return {
+        NEGATIVE_NOT_FOUND: config.NEGATIVE_CACHE_NOT_FOUND_TTL_SECONDS,
+        NEGATIVE_NOT_INDEXED: config.NEGATIVE_CACHE_NOT_INDEXED_TTL_SECONDS,
+        NEGATIVE_TIMEOUT: config.NEGATIVE_CACHE_TIMEOUT_TTL_SECONDS,
+    }.get(kind, 0)
+
+
+@dataclass
+class NegativeHit:
+    """A remembered failure and how long until it may be retried."""
+
+    kind: str
+    retry_after: float
+
+
+_negative_cache = _BudgetCache(
+    max_bytes=config.NEGATIVE_CACHE_MAX_SIZE * 1024,
+    max_entries=config.NEGATIVE_CACHE_MAX_SIZE,
+    ttl=max(1, config.NEGATIVE_CACHE_NOT_FOUND_TTL_SECONDS,
+            config.NEGATIVE_CACHE_NOT_INDEXED_TTL_SECONDS, config.NEGATIVE_CACHE_TIMEOUT_TTL_SECONDS),
+)
+_negative_lock = threading.Lock()
+_negative_stats: dict[str, dict[str, int]] = {"hits": {}, "stored": {}}
+
+
+def _count_negative(counter: str, kind: str) -> None:
+    with _negative_lock:
+        counts = _negative_stats[counter]
+        counts[kind] = counts.get(kind, 0) + 1
+
+
+def get_negative(key: str) -> NegativeHit | None:
+    """Return the live failure verdict for *key*, or ``None``."""
+    if not config.NEGATIVE_CACHE_ENABLED:
+        return None
+    entry = _entry(_negative_cache, "negative", key, 0.0)
+    if entry is None:
+        return None
+    kind = _unpack(entry.value)
+    _count_negative("hits", kind)
+    logger.debug("Negative-cache HIT for %s (%s)", key, kind)
+    return NegativeHit(kind, max(0.0, entry.expires_at - time.time()))
+
+
+def set_negative(key: str, kind: str, max_ttl: float | None = None) -> None:
+    """Remember that *key* failed with *kind*, for that kind's TTL (at most *max_ttl*)."""
+    ttl = float(negative_ttl(kind))
+    if max_ttl is not None:
+        ttl = min(ttl, max_ttl)
+    if not config.NEGATIVE_CACHE_ENABLED or ttl <= 0:
+        return
+    now = time.time()
+    _store(_negative_cache, key, _Entry(kind, now + ttl, now + ttl))
+    l2_set("negative", key, kind, ttl)
+    _count_negative("stored", kind)
+    logger.debug("Negative-cache stored %s (%s, %.0fs)", key, kind, ttl)
+
+
+# ---------------------------------------------------------------------------
+# Content-hash dependencies — derived entries follow their page's content
+# ---------------------------------------------------------------------------
+_DERIVED = {
+    "topic": (_topic_cache, config.TOPIC_CACHE_TTL_SECONDS),
+    "search": (_search_cache, None),
+}
+_content_lock = threading.Lock()
+# (repo URL, page content hash) → {(namespace, key)} of the entries derived from it
+_dependents: dict[tuple[str, str], set[tuple[str, str]]] = {}
+_content_stats = {"unchanged": 0, "changed": 0, "restamped": 0, "invalidated": 0}
+
+
+def _current_hash(repo_url: str) -> str:
+    """Content hash of the cached page for *repo_url* (TinkyWiki first, then DeepWiki)."""
+    for key in (repo_url, f"deepwiki::{repo_url}"):
+        content_hash = getattr(peek_wiki_page(key), "content_hash", "")
+        if content_hash:
+            return content_hash
+    return ""
+
+
+def _depend(repo_url: str, namespace: str, key: str, content_hash: str | None) -> None:
+    """Record that *namespace*/*key* was derived from *repo_url*'s page."""
+    content_hash = content_hash or _current_hash(repo_url)
+    if not content_hash:
+        return
+    with _content_lock:
+        _dependents.setdefault((repo_url, content_hash), set()).add((namespace, key))
+
+
+def _page_restored(key: str, old_hash: str, new_hash: str) -> None:
+    """Re-stamp or invalidate what was derived from parsed page *key* (repo URL or ``src::url``)."""
+    if not old_hash or not new_hash:
+        return
+    repo_url = key.rpartition("::")[2]
+    unchanged = old_hash == new_hash
+    with _content_lock:
+        if unchanged:
+            dependents = set(_dependents.get((repo_url, old_hash), ()))
+        else:
+            dependents = _dependents.pop((repo_url, old_hash), set())
+        _content_stats["unchanged" if unchanged else "changed"] += 1
+
+    done = 0
+    for namespace, derived_key in dependents:
+        cache, soft_ttl = _DERIVED[namespace]
+        if not unchanged:
+            cache.pop(derived_key, None)
+            l2_delete(namespace, derived_key)
+            done += 1
+            continue
+        value = _peek(cache, namespace, derived_key)
+        if value is None:  # expired or evicted meanwhile
+            with _content_lock:
+                _dependents.get((repo_url, old_hash), set()).discard((namespace, derived_key))
+            continue
+        _set(cache, namespace, derived_key, value, soft_ttl)
+        done += 1
+
+    with _content_lock:
+        _content_stats["restamped" if unchanged else "invalidated"] += done
+    if done:
+        logger.debug("Content of %s %s — %s %d derived entries", key,
+                     "unchanged" if unchanged else "changed",
+                     "re-stamped" if unchanged else "invalidated", done)
+
+
 # ---------------------------------------------------------------------------
 # General-purpose helpers
 # ---------------------------------------------------------------------------
 def invalidate(url: str) -> None:
-    """Remove *url* from the HTML cache."""
+    """Remove *url* from the HTML cache (both levels)."""
     _page_cache.pop(url, None)
+    l2_delete("html", url)
 
 
 def clear_cache() -> None:
-    """Flush all caches (HTML + parsed + search + topic)."""
-    _page_cache.clear()
-    _parsed_cache.clear()
-    _search_cache.clear()
-    _topic_cache.clear()
+    """Flush all caches (HTML, parsed, search, topic, section, GitHub meta, negative, L2)."""
+    for budgeted in (_page_cache, _parsed_cache, _search_cache, _topic_cache, _section_cache,
+                     _negative_cache):
+        budgeted.reset()
+    _github_meta_cache.clear()
+    with _negative_lock:
+        for counts in _negative_stats.values():
+            counts.clear()
+    with _content_lock:
+        _dependents.clear()
+        for key in _content_stats:
+            _content_stats[key] = 0
+    clear_query_index()
+    l2_clear()
+    with _swr_lock:
+        for key in _swr_stats:
+            _swr_stats[key] = 0
     logger.debug("All caches cleared")
 
 
 def cache_stats() -> dict[str, Any]:
-    """Return statistics for all caches."""
+    """Return statistics for all caches, including the total memory envelope."""
+    with _swr_lock:
+        swr = dict(_swr_stats)
+    parsed = _parsed_cache.stats()
+    parsed.update(ttl_seconds=config.CACHE_TTL_SECONDS, hard_ttl_seconds=int(_parsed_cache.ttl))
+    topic = _topic_cache.stats()
+    topic.update(ttl_seconds=config.TOPIC_CACHE_TTL_SECONDS, hard_ttl_seconds=int(_topic_cache.ttl))
+    negative = _negative_cache.stats()
+    with _negative_lock:
+        negative.update({counter: dict(counts) for counter, counts in _negative_stats.items()})
+    negative["ttl_seconds"] = {
+        kind: negative_ttl(kind)
+        for kind in (NEGATIVE_NOT_FOUND, NEGATIVE_NOT_INDEXED, NEGATIVE_TIMEOUT)
+    }
+    budgeted = (_page_cache, _parsed_cache, _search_cache, _topic_cache, _section_cache,
+                _negative_cache)
+    with _content_lock:
+        content = dict(_content_stats, tracked_pages=len(_dependents))
     return {
-        "html": {
-            "current_size": len(_page_cache),
-            "max_size": _page_cache.maxsize,
-            "ttl_seconds": int(_page_cache.ttl),
-        },
-        "parsed": {
-            "current_size": len(_parsed_cache),
-            "max_size": _parsed_cache.maxsize,
-            "ttl_seconds": int(_parsed_cache.ttl),
-        },
-        "search": {
-            "current_size": len(_search_cache),
-            "max_size": _search_cache.maxsize,
-            "ttl_seconds": int(_search_cache.ttl),
+        "html": _page_cache.stats(),
+        "parsed": parsed,
+        "search": {**_search_cache.stats(), **query_match_stats()},
+        "topic": topic,
+        "section": _section_cache.stats(),
+        "github_meta": {
+            "current_size": len(_github_meta_cache),
+            "max_size": _github_meta_cache.maxsize,
+            "ttl_seconds": int(_github_meta_cache.ttl),
         },
-        "topic": {
-            "current_size": len(_topic_cache),
-            "max_size": _topic_cache.maxsize,
-            "ttl_seconds": int(_topic_cache.ttl),
+        "negative": negative,
+        "memory": {
+            "bytes": sum(int(c.currsize) for c in budgeted),
+            "max_bytes": sum(int(c.maxsize) for c in budgeted),
         },
+        "l2": l2_stats(),
+        "stale_while_revalidate": swr,
+        "content_hash": content,
     }
@@ -0,0 +1,289 @@
+"""Per-upstream circuit breakers (v1.5.0).
+
+During an upstream outage every call would otherwise pay the full
+Playwright / HTTP timeout before the fallback chain moves on.  A circuit
+breaker per source tracks recent outcomes and, once the failure rate is
+too high, *opens* so callers fail immediately with
+:class:`CircuitOpenError` and the fallback chain skips straight to the
+next layer.
+
+**States**:
+
+- ``closed`` — calls pass through; outcomes are recorded in a sliding
+  time window.  When at least ``min_calls`` outcomes are in the window and
+  the failure rate reaches ``failure_rate``, the breaker opens.
+- ``open`` — calls are rejected until ``open_seconds`` have elapsed, then
+  the breaker becomes half-open.
+- ``half_open`` — up to ``half_open_calls`` trial calls pass through.  All
+  trials succeeding closes the breaker; any failure re-opens it.
+
+Settings come from ``TINKYWIKI_CB_*`` env vars and can be overridden per
+source, e.g. ``TINKYWIKI_CB_TINKYWIKI_CHAT_OPEN_SECONDS=120``.
+
+Thread-safe: each breaker guards its state with a ``threading.Lock``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import urllib.error
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, TypeVar
+
+from . import config
+from .config import _env_float, _env_int
+from .retry import http_error_status
+
+logger = logging.getLogger("TinkyWiki")
+
+T = TypeVar("T")
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        super().__init__(f"circuit '{name}' is open — retry after {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class BreakerSettings:
+    """Thresholds for one circuit breaker."""
+
+    window_seconds: float
+    min_calls: int
+    failure_rate: float
+    open_seconds: float
+    half_open_calls: int
+
+
+def breaker_settings(name: str) -> BreakerSettings:
+    """Return settings for breaker *name* (global config + per-source env)."""
+    prefix = f"TINKYWIKI_CB_{name.upper()}_"
+    return BreakerSettings(
+        window_seconds=_env_float(prefix + "WINDOW", config.CB_WINDOW_SECONDS),
+        min_calls=_env_int(prefix + "MIN_CALLS", config.CB_MIN_CALLS),
+        failure_rate=_env_float(prefix + "FAILURE_RATE", config.CB_FAILURE_RATE),
+        open_seconds=_env_float(prefix + "OPEN_SECONDS", config.CB_OPEN_SECONDS),
+        half_open_calls=_env_int(prefix + "HALF_OPEN_CALLS", config.CB_HALF_OPEN_CALLS),
+    )
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker over a sliding failure-rate window."""
+
+    def __init__(self, name: str, settings: BreakerSettings | None = None) -> None:
+        self.name = name
+        self.settings = settings or breaker_settings(name)
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._outcomes: deque[tuple[float, bool]] = deque()  # (timestamp, failed)
+        self._opened_at = 0.0
+        self._trials_started = 0
+        self._trials_succeeded = 0
+        self._times_opened = 0
+        self._rejected = 0
+
+    # -- state ------------------------------------------------------------
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.settings.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
+
+    def _maybe_half_open(self, now: float) -> None:
+        if (
+            self._state is CircuitState.OPEN
+            and now - self._opened_at >= self.settings.open_seconds
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._trials_started = 0
+            self._trials_succeeded = 0
+            logger.info("circuit[%s]: half-open — allowing trial calls", self.name)
+
+    def _open(self, now: float) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = now
+        self._times_opened += 1
+        self._outcomes.clear()
+        logger.warning(
+            "circuit[%s]: OPEN for %.0fs", self.name, self.settings.open_seconds
+        )
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets a trial call through."""
+        with self._lock:
+            if self._state is not CircuitState.OPEN:
+                return 0.0
+            elapsed = time.monotonic() - self._opened_at
+            return max(0.0, self.settings.open_seconds - elapsed)
+
+    # -- call gating ------------------------------------------------------
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed (and reserve a half-open trial)."""
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            if self._state is CircuitState.CLOSED:
+                return True
+            if (
+                self._state is CircuitState.HALF_OPEN
+                and self._trials_started < self.settings.half_open_calls
+            ):
+                self._trials_started += 1
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self._state is CircuitState.HALF_OPEN:
+                self._trials_succeeded += 1
+                if self._trials_succeeded >= self.settings.half_open_calls:
+                    self._state = CircuitState.CLOSED
+                    self._outcomes.clear()
+                    logger.info("circuit[%s]: closed — upstream recovered", self.name)
+                return
+            self._outcomes.append((now, False))
+            self._prune(now)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self._state is CircuitState.HALF_OPEN:
+                self._open(now)
+                return
+            if self._state is CircuitState.OPEN:
+                return
+            self._outcomes.append((now, True))
+            self._prune(now)
+            total = len(self._outcomes)
+            if total >= self.settings.min_calls:
+                failures = sum(1 for _, failed in self._outcomes if failed)
+                if failures / total >= self.settings.failure_rate:
+                    self._open(now)
+
+    def snapshot(self) -> dict:
+        """Return a diagnostic snapshot of this breaker."""
+        with self._lock:
+            now = time.monotonic()
+            self._maybe_half_open(now)
+            self._prune(now)
+            total = len(self._outcomes)
+            failures = sum(1 for _, failed in self._outcomes if failed)
+            retry_after = 0.0
+            if self._state is CircuitState.OPEN:
+                retry_after = max(0.0, self.settings.open_seconds - (now - self._opened_at))
+            return {
+                "state": self._state.value,
+                "window_calls": total,
+                "window_failures": failures,
+                "failure_rate": round(failures / total, 3) if total else 0.0,
+                "times_opened": self._times_opened,
+                "rejected_calls": self._rejected,
+                "retry_after_seconds": round(retry_after, 1),
+            }
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+_registry_lock = threading.Lock()
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Return (creating on first use) the breaker for upstream *name*."""
+    with _registry_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name)
+            _breakers[name] = breaker
+        return breaker
+
+
+def is_open(name: str) -> bool:
+    """Return True if upstream *name* is currently rejecting calls."""
+    return config.CB_ENABLED and get_breaker(name).state is CircuitState.OPEN
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """Return True if *exc* reflects upstream ill-health.
+
+    HTTP 4xx responses mean the upstream answered and are not counted.
+    """
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if isinstance(exc, urllib.error.HTTPError):
+        return exc.code >= 500
+    status = http_error_status(exc)
+    if status is not None:
+        return status >= 500
+    return True
+
+
+def call_with_breaker(
+    name: str,
+    fn: Callable[[], T],
+    *,
+    is_failure: Callable[[T], bool] | None = None,
+) -> T:
+    """Call *fn()* through the breaker for upstream *name*.
+
+    Raises:
+        CircuitOpenError: If the breaker is open (``fn`` is not called).
+        Whatever ``fn`` raises (recorded as a failure when applicable).
+    """
+    if not config.CB_ENABLED:
+        return fn()
+
+    breaker = get_breaker(name)
+    if not breaker.allow():
+        raise CircuitOpenError(name, breaker.retry_after())
+
+    try:
+        value = fn()
+    except Exception as exc:  # pylint: disable=broad-except
+        if is_upstream_failure(exc):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        raise
+
+    if is_failure is not None and is_failure(value):
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return value
+
+
+def breaker_stats() -> dict[str, dict]:
+    """Return a snapshot of every breaker that has seen traffic."""
+    with _registry_lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.snapshot() for b in breakers}
+
+
+def reset_breakers() -> None:
+    """Drop all breakers (mainly for testing)."""
+    with _registry_lock:
+        _breakers.clear()
@@ -0,0 +1,86 @@
+"""Compression of cached values at rest (v1.5.0).
+
+Rendered HTML (TinkyWiki pages inline base64 SVG diagrams and can reach
+several MB) and serialized pages compress 5–10×.  ``TINKYWIKI_CACHE_COMPRESSION``
+selects the codec: ``auto`` (default) uses zstd when the optional
+``zstandard`` package is installed (``pip install tinkywiki-mcp[zstd]``)
+and zlib otherwise; ``zstd``, ``zlib`` or ``none`` force one.  Every
+payload is stored with the name of its codec, so processes with
+different settings can share the persistent cache.
+"""
+
+from __future__ import annotations
+
+import logging
+import zlib
+
+from . import config
+
+try:  # optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover — depends on the environment
+    zstandard = None  # type: ignore[assignment]
+
+logger = logging.getLogger("TinkyWiki")
+
+CODEC_NONE = "none"
+CODEC_ZLIB = "zlib"
+CODEC_ZSTD = "zstd"
+
+_ZLIB_LEVEL = 6
+_ZSTD_LEVEL = 3
+
+
+def zstd_available() -> bool:
+    """Return True if the ``zstandard`` package is importable."""
+    return zstandard is not None
+
+
+def preferred_codec() -> str:
+    """The codec new payloads are written with."""
+    choice = config.CACHE_COMPRESSION
+    if choice in ("auto", CODEC_ZSTD):
+        if zstd_available():
+            return CODEC_ZSTD
+        if choice == CODEC_ZSTD:
+            logger.debug("compression: zstandard not installed — using zlib")
+        return CODEC_ZLIB
+    return choice if choice in (CODEC_ZLIB, CODEC_NONE) else CODEC_ZLIB
+
+
+def compress(data: bytes) -> tuple[str, bytes]:
+    """Return ``(codec, payload)``; small or incompressible data is kept as-is."""
+    codec = preferred_codec()
+    if codec == CODEC_NONE or len(data) < config.CACHE_COMPRESS_MIN_BYTES:
+        return CODEC_NONE, data
+    if codec == CODEC_ZSTD:
+        payload = zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(data)
+    else:
+        payload = zlib.compress(data, _ZLIB_LEVEL)
+    if len(payload) >= len(data):
+        return CODEC_NONE, data
+    return codec, payload
+
+
+def decompress(codec: str, payload: bytes) -> bytes:
+    """Inverse of :func:`compress`.
+
+    Raises:
+        ValueError: Unknown codec, zstd payload without ``zstandard``, or
+            corrupt data.
+    """
+    if codec == CODEC_NONE:
+        return payload
+    if codec == CODEC_ZLIB:
+        try:
+            return zlib.decompress(payload)
+        except zlib.error as exc:
+            raise ValueError(f"corrupt zlib payload: {exc}") from exc
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise ValueError("zstd payload but the zstandard package is not installed")
+        try:
+            return zstandard.ZstdDecompressor().decompress(payload)
+        except zstandard.ZstdError as exc:
+            raise ValueError(f"corrupt zstd payload: {exc}") from exc
+    raise ValueError(f"unknown codec {codec!r}")
@@ -19,6 +19,16 @@ def _env_int(name: str, default: int) -> int:
     return default
 
 
+def _env_float(name: str, default: float) -> float:
+    val = os.environ.get(name, "")
+    if val.strip():
+        try:
+            return float(val)
+        except ValueError:
+            pass
+    return default
+
+
 def _env_bool(name: str, default: bool) -> bool:
     val = os.environ.get(name, "").strip().lower()
     if val in ("1", "true", "yes"):
@@ -37,11 +47,42 @@ ELEMENT_WAIT_TIMEOUT_SECONDS: int = _env_int("TINKYWIKI_ELEMENT_WAIT_TIMEOUT", 2
 RESPONSE_WAIT_TIMEOUT_SECONDS: int = _env_int("TINKYWIKI_RESPONSE_WAIT_TIMEOUT", 45)
 HTTPX_TIMEOUT_SECONDS: int = _env_int("TINKYWIKI_HTTPX_TIMEOUT", 30)
 
+# ---------------------------------------------------------------------------
+# Shared HTTP client (see http_client.py)
+# ---------------------------------------------------------------------------
+HTTP2_ENABLED: bool = _env_bool("TINKYWIKI_HTTP2", True)  # needs the optional h2 package
+HTTP_MAX_CONNECTIONS: int = _env_int("TINKYWIKI_HTTP_MAX_CONNECTIONS", 20)
+HTTP_MAX_KEEPALIVE: int = _env_int("TINKYWIKI_HTTP_MAX_KEEPALIVE", 10)
+HTTP_CONDITIONAL_CACHE_TTL_SECONDS: int = _env_int("TINKYWIKI_HTTP_CONDITIONAL_CACHE_TTL", 86400)
+HTTP_CONDITIONAL_CACHE_MAX_SIZE: int = _env_int("TINKYWIKI_HTTP_CONDITIONAL_CACHE_MAX_SIZE", 200)
+HTTP_CONDITIONAL_CACHE_MAX_BYTES: int = (
+    _env_int("TINKYWIKI_HTTP_CONDITIONAL_CACHE_MAX_MB", 16) * 1024 * 1024
+)
+
 # ---------------------------------------------------------------------------
 # Retry
 # ---------------------------------------------------------------------------
 MAX_RETRIES: int = _env_int("TINKYWIKI_MAX_RETRIES", 2)
 RETRY_DELAY_SECONDS: int = _env_int("TINKYWIKI_RETRY_DELAY", 3)
+# Exponential backoff shared by all upstream retry policies (see retry.py)
+RETRY_BACKOFF_MULTIPLIER: float = _env_float("TINKYWIKI_RETRY_BACKOFF_MULTIPLIER", 2.0)
+RETRY_MAX_DELAY_SECONDS: float = _env_float("TINKYWIKI_RETRY_MAX_DELAY", 20.0)
+RETRY_JITTER: float = _env_float("TINKYWIKI_RETRY_JITTER", 0.5)
+# Per-upstream attempt counts (1 = no retries)
+PAGE_FETCH_MAX_ATTEMPTS: int = _env_int("TINKYWIKI_PAGE_FETCH_MAX_ATTEMPTS", 2)
+DEEPWIKI_ASK_MAX_ATTEMPTS: int = _env_int("DEEPWIKI_ASK_MAX_ATTEMPTS", 2)
+GITHUB_API_MAX_ATTEMPTS: int = _env_int("GITHUB_API_MAX_ATTEMPTS", 3)
+GITHUB_API_RETRY_DELAY_SECONDS: float = _env_float("GITHUB_API_RETRY_DELAY", 1.0)
+
+# ---------------------------------------------------------------------------
+# Circuit breakers (per upstream; override with TINKYWIKI_CB_<SOURCE>_<NAME>)
+# ---------------------------------------------------------------------------
+CB_ENABLED: bool = _env_bool("TINKYWIKI_CB_ENABLED", True)
+CB_WINDOW_SECONDS: float = _env_float("TINKYWIKI_CB_WINDOW", 120.0)
+CB_MIN_CALLS: int = _env_int("TINKYWIKI_CB_MIN_CALLS", 4)
+CB_FAILURE_RATE: float = _env_float("TINKYWIKI_CB_FAILURE_RATE", 0.75)
+CB_OPEN_SECONDS: float = _env_float("TINKYWIKI_CB_OPEN_SECONDS", 60.0)
+CB_HALF_OPEN_CALLS: int = _env_int("TINKYWIKI_CB_HALF_OPEN_CALLS", 1)
 
 # ---------------------------------------------------------------------------
 # Response
@@ -51,15 +92,130 @@ RESPONSE_MAX_CHARS: int = _env_int("TINKYWIKI_RESPONSE_MAX_CHARS", 30000)
 # ---------------------------------------------------------------------------
 # Cache (cachetools TTLCache)
 # ---------------------------------------------------------------------------
+# Each cache has a memory budget (*_MAX_BYTES) and an entry cap (*_MAX_SIZE);
+# whichever is reached first evicts
 CACHE_TTL_SECONDS: int = _env_int("TINKYWIKI_CACHE_TTL", 300)  # 5 minutes
 CACHE_MAX_SIZE: int = _env_int("TINKYWIKI_CACHE_MAX_SIZE", 50)
+CACHE_MAX_BYTES: int = _env_int("TINKYWIKI_CACHE_MAX_MB", 64) * 1024 * 1024
 SEARCH_CACHE_TTL_SECONDS: int = _env_int("TINKYWIKI_SEARCH_CACHE_TTL", 120)  # 2 minutes
 SEARCH_CACHE_MAX_SIZE: int = _env_int("TINKYWIKI_SEARCH_CACHE_MAX_SIZE", 30)
+SEARCH_CACHE_MAX_BYTES: int = _env_int("TINKYWIKI_SEARCH_CACHE_MAX_MB", 4) * 1024 * 1024
+# Search answers are keyed by a canonical form of the question and also match
+# near-duplicates of cached questions (Jaccard similarity of their terms)
+SEARCH_DEDUP_ENABLED: bool = _env_bool("TINKYWIKI_SEARCH_DEDUP", True)
+SEARCH_DEDUP_THRESHOLD: float = _env_float("TINKYWIKI_SEARCH_DEDUP_THRESHOLD", 0.75)
 PARSED_CACHE_MAX_SIZE: int = _env_int("TINKYWIKI_PARSED_CACHE_MAX_SIZE", 30)
+PARSED_CACHE_MAX_BYTES: int = _env_int("TINKYWIKI_PARSED_CACHE_MAX_MB", 32) * 1024 * 1024
+
+# Compression of cached HTML (in memory and on disk) and of every L2 value:
+# "auto" (zstd if the zstandard package is installed, else zlib), "zstd",
+# "zlib" or "none"; values smaller than CACHE_COMPRESS_MIN_BYTES are kept as-is
+CACHE_COMPRESSION: str = os.environ.get("TINKYWIKI_CACHE_COMPRESSION", "auto").strip().lower()
+CACHE_COMPRESS_MIN_BYTES: int = _env_int("TINKYWIKI_CACHE_COMPRESS_MIN_BYTES", 1024)
+
+# Eviction policy of the in-memory caches (see eviction.py): "tinylfu"
+# (frequency-aware admission — one-off repos can't flush the hot set) or "lru"
+CACHE_EVICTION_POLICY: str = os.environ.get("TINKYWIKI_CACHE_EVICTION", "tinylfu").strip().lower()
+# Append every cache lookup ("<time>\t<namespace>\t<key>") to this file, for
+# replaying with tests/bench_cache_policies.py; empty = off
+CACHE_TRACE_FILE: str = os.environ.get("TINKYWIKI_CACHE_TRACE", "").strip()
 
 # Topic-list cache — structural data that rarely changes (longer TTL)
 TOPIC_CACHE_TTL_SECONDS: int = _env_int("TINKYWIKI_TOPIC_CACHE_TTL", 1800)  # 30 min
 TOPIC_CACHE_MAX_SIZE: int = _env_int("TINKYWIKI_TOPIC_CACHE_MAX_SIZE", 30)
+TOPIC_CACHE_MAX_BYTES: int = _env_int("TINKYWIKI_TOPIC_CACHE_MAX_MB", 4) * 1024 * 1024
+
+# Stale-while-revalidate: past their TTL (the soft TTL) parsed pages and
+# topic lists are still served — with a background refresh — until this age
+CACHE_HARD_TTL_SECONDS: int = _env_int("TINKYWIKI_CACHE_HARD_TTL", 86400)  # 24 h
+
+# Section cache — individual DeepWiki topic pages (filled by full-topic crawls)
+SECTION_CACHE_TTL_SECONDS: int = _env_int("TINKYWIKI_SECTION_CACHE_TTL", 1800)  # 30 min
+SECTION_CACHE_MAX_SIZE: int = _env_int("TINKYWIKI_SECTION_CACHE_MAX_SIZE", 200)
+SECTION_CACHE_MAX_BYTES: int = _env_int("TINKYWIKI_SECTION_CACHE_MAX_MB", 32) * 1024 * 1024
+
+# GitHub repo-metadata cache — short-lived, shared across fallback calls
+GITHUB_META_CACHE_TTL_SECONDS: int = _env_int("TINKYWIKI_GITHUB_META_CACHE_TTL", 300)  # 5 min
+GITHUB_META_CACHE_MAX_SIZE: int = _env_int("TINKYWIKI_GITHUB_META_CACHE_MAX_SIZE", 100)
+
+# Negative cache — "not there" verdicts of the page fetchers and of search,
+# kept per failure kind: a 404 longer than "not indexed yet", and timeouts
+# (or empty renders) only briefly.  0 disables a kind.
+NEGATIVE_CACHE_ENABLED: bool = _env_bool("TINKYWIKI_NEGATIVE_CACHE", True)
+NEGATIVE_CACHE_NOT_FOUND_TTL_SECONDS: int = _env_int("TINKYWIKI_NEGATIVE_TTL_NOT_FOUND", 900)
+NEGATIVE_CACHE_NOT_INDEXED_TTL_SECONDS: int = _env_int("TINKYWIKI_NEGATIVE_TTL_NOT_INDEXED", 300)
+NEGATIVE_CACHE_TIMEOUT_TTL_SECONDS: int = _env_int("TINKYWIKI_NEGATIVE_TTL_TIMEOUT", 20)
+NEGATIVE_CACHE_MAX_SIZE: int = _env_int("TINKYWIKI_NEGATIVE_CACHE_MAX_SIZE", 2000)
+
+# Persistent L2 cache (SQLite under DATA_DIR) behind the HTML, parsed,
+# search and topic caches — survives restarts, shared between processes
+CACHE_L2_ENABLED: bool = _env_bool("TINKYWIKI_CACHE_L2", True)
+CACHE_L2_MAX_BYTES: int = _env_int("TINKYWIKI_CACHE_L2_MAX_MB", 256) * 1024 * 1024
+# Where the L2 and the cross-process single-flight locks live: "sqlite"
+# (the file above — processes on one host), "redis" (CACHE_REDIS_URL, any
+# RESP server — workers on several hosts) or "none" (per-process caches)
+CACHE_BACKEND: str = os.environ.get("TINKYWIKI_CACHE_BACKEND", "sqlite").strip().lower()
+CACHE_REDIS_URL: str = os.environ.get("TINKYWIKI_CACHE_REDIS_URL", "redis://localhost:6379/0")
+CACHE_REDIS_PREFIX: str = os.environ.get("TINKYWIKI_CACHE_REDIS_PREFIX", "tinkywiki:")
+# A render lock outlives a crashed owner by at most this long; waiters give
+# up (and render themselves) after the same time
+CACHE_LOCK_TTL_SECONDS: float = _env_float("TINKYWIKI_CACHE_LOCK_TTL", 120.0)
+
+# ---------------------------------------------------------------------------
+# Local answer engine (BM25 over parsed wiki sections)
+# ---------------------------------------------------------------------------
+LOCAL_INDEX_ENABLED: bool = _env_bool("TINKYWIKI_LOCAL_INDEX_ENABLED", True)
+LOCAL_INDEX_TTL_SECONDS: int = _env_int("TINKYWIKI_LOCAL_INDEX_TTL", 1800)  # 30 min
+LOCAL_INDEX_MAX_SIZE: int = _env_int("TINKYWIKI_LOCAL_INDEX_MAX_SIZE", 30)
+# A local answer is trusted in ``auto`` mode only above both thresholds
+LOCAL_ANSWER_MIN_SCORE: float = _env_float("TINKYWIKI_LOCAL_ANSWER_MIN_SCORE", 4.0)
+LOCAL_ANSWER_MIN_COVERAGE: float = _env_float("TINKYWIKI_LOCAL_ANSWER_MIN_COVERAGE", 0.6)
+LOCAL_ANSWER_MAX_PASSAGES: int = _env_int("TINKYWIKI_LOCAL_ANSWER_MAX_PASSAGES", 3)
+
+# ---------------------------------------------------------------------------
+# Persistent state (SQLite files under DATA_DIR)
+# ---------------------------------------------------------------------------
+DATA_DIR: str = os.environ.get("TINKYWIKI_DATA_DIR", "").strip() or os.path.join(
+    os.path.expanduser("~"), ".cache", "tinkywiki-mcp"
+)
+INDEX_REGISTRY_ENABLED: bool = _env_bool("TINKYWIKI_INDEX_REGISTRY_ENABLED", True)
+# How long a "not indexed" verdict is trusted before a background re-probe
+INDEX_REGISTRY_REPROBE_SECONDS: int = _env_int("TINKYWIKI_INDEX_REGISTRY_REPROBE", 21600)  # 6 h
+
+# Background tasks (re-probes etc.)
+BACKGROUND_WORKERS: int = _env_int("TINKYWIKI_BACKGROUND_WORKERS", 2)
+BACKGROUND_MAX_PENDING: int = _env_int("TINKYWIKI_BACKGROUND_MAX_PENDING", 32)
+
+# Auto-indexing job queue (persisted; 0 workers = queue only, never run)
+INDEXING_QUEUE_WORKERS: int = _env_int("TINKYWIKI_INDEXING_QUEUE_WORKERS", 1)
+# Don't re-submit the same repo within this window
+INDEXING_COOLDOWN_SECONDS: int = _env_int("TINKYWIKI_INDEXING_COOLDOWN", 86400)  # 24 h
+INDEXING_MAX_ATTEMPTS: int = _env_int("TINKYWIKI_INDEXING_MAX_ATTEMPTS", 3)
+INDEXING_RETRY_DELAY_SECONDS: int = _env_int("TINKYWIKI_INDEXING_RETRY_DELAY", 300)
+# Lower OS scheduling priority for queue worker threads (Linux only)
+INDEXING_WORKER_NICE: int = _env_int("TINKYWIKI_INDEXING_WORKER_NICE", 10)
+
+# Refresh-ahead: re-render the most requested repos shortly before their
+# parsed page goes stale (one background thread, lowered priority)
+REFRESH_AHEAD_ENABLED: bool = _env_bool("TINKYWIKI_REFRESH_AHEAD", True)
+REFRESH_AHEAD_TOP_K: int = _env_int("TINKYWIKI_REFRESH_AHEAD_TOP_K", 10)
+# Refresh once a hot page has less than this much freshness left
+REFRESH_AHEAD_LEAD_SECONDS: int = _env_int("TINKYWIKI_REFRESH_AHEAD_LEAD", 60)
+REFRESH_AHEAD_INTERVAL_SECONDS: int = _env_int("TINKYWIKI_REFRESH_AHEAD_INTERVAL", 30)
+# Only repos requested within this window, with at least this decayed hit score
+REFRESH_AHEAD_ACTIVE_SECONDS: int = _env_int("TINKYWIKI_REFRESH_AHEAD_ACTIVE", 900)  # 15 min
+REFRESH_AHEAD_MIN_SCORE: float = _env_float("TINKYWIKI_REFRESH_AHEAD_MIN_SCORE", 2.0)
+# Browser budget: at most this many refresh renders per rolling hour
+REFRESH_AHEAD_MAX_PER_HOUR: int = _env_int("TINKYWIKI_REFRESH_AHEAD_MAX_PER_HOUR", 60)
+
+# Startup warm-up: a manifest of repos (and optionally sections / canned
+# questions) fetched in the background after the server is ready.  A file
+# path (JSON or one repo per line), or a comma-separated repo list.
+WARMUP_MANIFEST: str = os.environ.get("TINKYWIKI_WARMUP_MANIFEST", "").strip()
+WARMUP_REPOS: str = os.environ.get("TINKYWIKI_WARMUP_REPOS", "").strip()
+WARMUP_CONCURRENCY: int = _env_int("TINKYWIKI_WARMUP_CONCURRENCY", 2)
+# Canned questions the local index can't answer are asked in the live chat
+WARMUP_USE_CHAT: bool = _env_bool("TINKYWIKI_WARMUP_USE_CHAT", True)
 
 # ---------------------------------------------------------------------------
 # Rate limiting (per-repo sliding window)
@@ -122,6 +278,30 @@ TINKYWIKI_REQUEST_URL: str = os.environ.get(
 # ---------------------------------------------------------------------------
 DEEPWIKI_BASE_URL: str = os.environ.get("DEEPWIKI_BASE_URL", "https://deepwiki.com")
 DEEPWIKI_ENABLED: bool = _env_bool("DEEPWIKI_ENABLED", True)
+# Plain-HTTP fetch of server-rendered pages; Playwright only when incomplete
+DEEPWIKI_HTTP_ENABLED: bool = _env_bool("DEEPWIKI_HTTP_ENABLED", True)
+DEEPWIKI_HTTP_MIN_CONTENT_CHARS: int = _env_int("DEEPWIKI_HTTP_MIN_CONTENT_CHARS", 200)
+# Full-topic crawl: fetch every sidebar topic so read_contents gets real content.
+# Off by default — a section request fetches just its topic either way.
+DEEPWIKI_CRAWL_ENABLED: bool = _env_bool("DEEPWIKI_CRAWL_ENABLED", False)
+DEEPWIKI_CRAWL_CONCURRENCY: int = _env_int("DEEPWIKI_CRAWL_CONCURRENCY", 4)
+DEEPWIKI_CRAWL_MAX_TOPICS: int = _env_int("DEEPWIKI_CRAWL_MAX_TOPICS", 40)
+DEEPWIKI_CRAWL_DEADLINE_SECONDS: float = _env_float("DEEPWIKI_CRAWL_DEADLINE", 90.0)
+# Ask: read the answer from the streamed network response; DOM polling is the fallback
+DEEPWIKI_ASK_STREAM_ENABLED: bool = _env_bool("DEEPWIKI_ASK_STREAM_ENABLED", True)
+# Without a streaming content type, a response or socket is only captured if its
+# host is one of these (or a subdomain) and its path contains one of the patterns
+DEEPWIKI_ASK_STREAM_HOSTS: list[str] = [
+    "deepwiki.com",
+    "devin.ai",  # DeepWiki's Ask backend (api.devin.ai/ada/…)
+]
+DEEPWIKI_ASK_STREAM_URL_PATTERNS: list[str] = [
+    "/ada/",
+    "/query",
+    "/chat",
+    "/ask",
+    "/stream",
+]
 
 # ---------------------------------------------------------------------------
 # GitHub API — last-resort fallback (v1.4.0)
@@ -130,12 +310,37 @@ GITHUB_API_BASE_URL: str = os.environ.get("GITHUB_API_BASE_URL", "https://api.gi
 GITHUB_API_ENABLED: bool = _env_bool("GITHUB_API_ENABLED", True)
 GITHUB_TOKEN: str = os.environ.get("GITHUB_TOKEN", "")
 GITHUB_API_TIMEOUT: int = _env_int("GITHUB_API_TIMEOUT", 15)
+# Pooled GitHub client (see github_client.py); all requests go to one host
+GITHUB_HTTP_MAX_CONNECTIONS: int = _env_int("GITHUB_HTTP_MAX_CONNECTIONS", 10)
+GITHUB_HTTP_MAX_KEEPALIVE: int = _env_int("GITHUB_HTTP_MAX_KEEPALIVE", 10)
+# One GraphQL query instead of the REST calls for fallback pages (needs GITHUB_TOKEN)
+GITHUB_GRAPHQL_ENABLED: bool = _env_bool("GITHUB_GRAPHQL_ENABLED", True)
+GITHUB_GRAPHQL_TREE_DEPTH: int = _env_int("GITHUB_GRAPHQL_TREE_DEPTH", 3)
+# Persistent ETag/Last-Modified cache (304s don't count against the rate limit)
+GITHUB_HTTP_CACHE_ENABLED: bool = _env_bool("GITHUB_HTTP_CACHE_ENABLED", True)
+GITHUB_HTTP_CACHE_MAX_ENTRIES: int = _env_int("GITHUB_HTTP_CACHE_MAX_ENTRIES", 2000)
+# Defer calls once this few requests remain before the rate-limit reset
+GITHUB_RATE_LIMIT_RESERVE: int = _env_int("GITHUB_RATE_LIMIT_RESERVE", 5)
+# Optional local snapshots: stream the repo tarball into a path + trigram code index
+GITHUB_SNAPSHOT_ENABLED: bool = _env_bool("GITHUB_SNAPSHOT_ENABLED", False)
+GITHUB_SNAPSHOT_REFRESH_SECONDS: int = _env_int("GITHUB_SNAPSHOT_REFRESH", 3600)
+GITHUB_SNAPSHOT_MAX_FILES: int = _env_int("GITHUB_SNAPSHOT_MAX_FILES", 20000)
+GITHUB_SNAPSHOT_MAX_FILE_BYTES: int = _env_int("GITHUB_SNAPSHOT_MAX_FILE_BYTES", 262144)  # 256 KiB
 
 # ---------------------------------------------------------------------------
 # Fallback control (v1.4.0)
 # ---------------------------------------------------------------------------
 FALLBACK_ENABLED: bool = _env_bool("TINKYWIKI_FALLBACK_ENABLED", True)
 
+# "sequential" (default) or "parallel": start lower layers after a stagger
+# delay instead of waiting for higher layers to fail (v1.5.0)
+FALLBACK_MODE: str = os.environ.get("TINKYWIKI_FALLBACK_MODE", "sequential").strip().lower()
+FALLBACK_STAGGER_SECONDS: float = _env_float("TINKYWIKI_FALLBACK_STAGGER", 3.0)
+FALLBACK_PARALLEL_DEADLINE_SECONDS: float = _env_float(
+    "TINKYWIKI_FALLBACK_PARALLEL_DEADLINE", float(HARD_TIMEOUT_SECONDS)
+)
+FALLBACK_PARALLEL_WORKERS: int = _env_int("TINKYWIKI_FALLBACK_PARALLEL_WORKERS", 6)
+
 # Strings that indicate a 404 / not-indexed page in TinkyWiki's rendered HTML
 NOT_INDEXED_INDICATORS: list[str] = [
     "This page doesn\u2019t exist",  # curly apostrophe on the 404 page
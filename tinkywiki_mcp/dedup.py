@@ -11,6 +11,10 @@ result — zero extra browser overhead.
 
 Thread-safe: uses a ``threading.Lock`` to guard the in-flight registry
 (MCP tool handlers are synchronous and may be called from different threads).
+
+**Across processes** (v1.5.0): the owning thread also holds a shared
+lock (``shared_cache.single_flight``), so other server processes wait
+for its render and then read the result from the shared cache.
 """
 
 from __future__ import annotations
@@ -19,6 +23,9 @@ import logging
 import threading
 from typing import Any
 
+from . import config
+from .shared_cache import single_flight
+
 logger = logging.getLogger("TinkyWiki")
 
 # ---------------------------------------------------------------------------
@@ -39,6 +46,10 @@ class _InflightEntry:
         self.error: Exception | None = None
 
 
+def _waiter_timeout() -> float:
+    return config.CACHE_LOCK_TTL_SECONDS + config.HARD_TIMEOUT_SECONDS
+
+
 def dedup_fetch(key: str, fetch_fn):
     """Execute *fetch_fn()* with deduplication on *key*.
 
@@ -55,6 +66,7 @@ def dedup_fetch(key: str, fetch_fn):
 
     Raises:
         Whatever *fetch_fn()* raises (propagated to all waiters).
+        TimeoutError: A waiter gave up on the owner's fetch.
     """
     with _lock:
         if key in _inflight:
@@ -69,7 +81,8 @@ def dedup_fetch(key: str, fetch_fn):
 
     if is_owner:
         try:
-            entry.result = fetch_fn()
+            with single_flight(f"fetch::{key}"):
+                entry.result = fetch_fn()
         except Exception as exc:  # pylint: disable=broad-except
             entry.error = exc
         finally:
@@ -78,8 +91,10 @@ def dedup_fetch(key: str, fetch_fn):
                 _inflight.pop(key, None)
 
     else:
-        # Wait for the owner to finish (with generous timeout)
-        entry.event.wait(timeout=120)
+        # The owner may wait up to the shared lock's TTL, then render for up
+        # to the hard timeout — wait that long, then give up (not return None)
+        if not entry.event.wait(timeout=_waiter_timeout()):
+            raise TimeoutError(f"in-flight fetch for {key} did not finish in time")
 
     if entry.error is not None:
         raise entry.error
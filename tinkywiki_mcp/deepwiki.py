@@ -12,28 +12,76 @@ making it an excellent fallback when TinkyWiki hasn't indexed a repo.
   overview + sidebar with all topic links.
 - DeepWiki has an "Ask" chat feature similar to TinkyWiki's Gemini chat.
 
-**Page fetching**: Uses the shared Playwright browser (same as TinkyWiki) to
-render the Next.js SPA, then BeautifulSoup to extract structured content.
-
-**Chat interaction**: Types into the DeepWiki Ask input and reads the streamed
-response, following the same pattern as TinkyWiki's chat.
+**Page fetching** (v1.5.0): DeepWiki server-renders its pages, so they are
+first fetched over plain HTTP (pooled ``httpx`` client, see
+``http_client.py``).  When the SSR markup lacks the article body, the
+markdown embedded in the ``__NEXT_DATA__`` JSON or the React Server
+Components flight payload (``self.__next_f.push``) is rendered into the
+page instead.  Only if neither yields enough content does the fetch fall
+back to the shared Playwright browser.  BeautifulSoup then extracts
+structured content either way.
+
+**Chat interaction**: Types into the DeepWiki Ask input and reads the
+answer from the streamed network response (SSE / fetch stream / WebSocket,
+see ``ask_stream.py``), so the text is exact and completion is detected
+from the end of the stream (v1.5.0).  Polling answer-like DOM elements is
+only the fallback when no stream is captured.
+
+**Full-topic crawl** (v1.5.0): the repo page only links to its topics, so
+``crawl_deepwiki_page`` fetches every topic page concurrently (bounded by
+``DEEPWIKI_CRAWL_CONCURRENCY``, within ``DEEPWIKI_CRAWL_DEADLINE``), caches
+each one in the section cache and merges them into one complete
+``WikiPage``.  Topics that fail keep their link stub.
 """
 
 from __future__ import annotations
 
 import asyncio
+import functools
+import html as html_lib
+import json
 import logging
 import re
+import threading
+import time
 
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, replace
 
 from bs4 import BeautifulSoup, Tag
+from cachetools import TTLCache
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from . import config
+from .ask_stream import AskCapture
 from .browser import _get_browser, fetch_rendered_html, run_in_browser_loop
-from .cache import get_cached_page, get_cached_wiki_page, set_cached_page, set_cached_wiki_page
-from .parser import WikiPage, WikiSection, _extract_text, _tag_to_markdown
+from .cache import (
+    NEGATIVE_NOT_INDEXED,
+    NEGATIVE_TIMEOUT,
+    get_cached_page,
+    get_cached_section,
+    get_cached_wiki_page,
+    get_negative,
+    invalidate,
+    lookup_wiki_page,
+    peek_wiki_page,
+    set_cached_page,
+    set_cached_section,
+    set_cached_wiki_page,
+    set_negative,
+)
+from .parser import (
+    WikiPage,
+    WikiSection,
+    _digest,
+    _extract_text,
+    _tag_to_markdown,
+    page_content_hash,
+)
+from .circuit_breaker import call_with_breaker
+from .http_client import fetch_text
+from .retry import DEEPWIKI_ASK, DEEPWIKI_HTTP, DEEPWIKI_RENDER, retry_call
 from .stealth import apply_stealth_scripts, human_click, human_type, random_delay, stealth_context_options
 
 logger = logging.getLogger("TinkyWiki")
@@ -131,6 +179,71 @@ def _parse_sidebar_topics(soup: BeautifulSoup, owner_repo: str) -> list[DeepWiki
 # ---------------------------------------------------------------------------
 # Content parsing (single page)
 # ---------------------------------------------------------------------------
+_HEADING_TAGS: frozenset[str] = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+_ATTR_CONTAINS_RE = re.compile(r"\[(\w+)\*='([^']+)'\]")
+_TITLE_ARTIFACT_RE = re.compile(r"\s*\[Image:.*?\]\s*$")
+
+
+@dataclass(frozen=True)
+class _ContentMatcher:
+    """One precompiled ``DEEPWIKI_CONTENT_SELECTORS`` entry."""
+    kind: str  # "tag", "class" (regex search) or "attr" (substring)
+    name: str  # tag name or attribute name
+    pattern: re.Pattern[str] | str = ""
+
+    def matches(self, tag: Tag) -> bool:
+        if self.kind == "tag":
+            return tag.name == self.name
+        value = tag.attrs.get(self.name)
+        if value is None:
+            return False
+        if isinstance(value, list):
+            value = " ".join(value)
+        if self.kind == "class":
+            return self.pattern.search(value) is not None  # type: ignore[union-attr]
+        return self.pattern in value.lower()  # type: ignore[operator]
+
+
+@functools.lru_cache(maxsize=8)
+def _compile_content_selectors(selectors: tuple[str, ...]) -> tuple[_ContentMatcher, ...]:
+    """Compile the supported selector forms (``tag``, ``.class``, ``[attr*='v']``)."""
+    matchers: list[_ContentMatcher] = []
+    for sel in selectors:
+        if sel.startswith("."):
+            matchers.append(_ContentMatcher("class", "class", re.compile(sel[1:], re.I)))
+        elif sel.startswith("["):
+            attr_match = _ATTR_CONTAINS_RE.match(sel)
+            if attr_match:
+                matchers.append(
+                    _ContentMatcher("attr", attr_match.group(1), attr_match.group(2).lower())
+                )
+        else:
+            matchers.append(_ContentMatcher("tag", sel))
+    return tuple(matchers)
+
+
+def _find_content_root(soup: BeautifulSoup) -> Tag | None:
+    """Return the content area in a single tree walk.
+
+    Equivalent to trying each selector in priority order with
+    ``soup.find``: the first tag (document order) matching the
+    highest-priority selector wins.
+    """
+    matchers = _compile_content_selectors(tuple(config.DEEPWIKI_CONTENT_SELECTORS))
+    best: Tag | None = None
+    best_rank = len(matchers)
+    for node in soup.descendants:
+        if not isinstance(node, Tag):
+            continue
+        for rank in range(best_rank):  # only a higher priority can replace best
+            if matchers[rank].matches(node):
+                best, best_rank = node, rank
+                break
+        if best_rank == 0:
+            break
+    return best
+
+
 def _parse_deepwiki_content(soup: BeautifulSoup) -> list[WikiSection]:
     """Parse content sections from a DeepWiki page.
 
@@ -140,33 +253,11 @@ def _parse_deepwiki_content(soup: BeautifulSoup) -> list[WikiSection]:
     """
     sections: list[WikiSection] = []
 
-    # Find main content area
-    main = None
-    for sel in config.DEEPWIKI_CONTENT_SELECTORS:
-        if sel.startswith("."):
-            main = soup.find(class_=re.compile(sel[1:], re.I))
-        elif sel.startswith("["):
-            # attribute selector like [class*='content']
-            attr_match = re.match(r"\[(\w+)\*='([^']+)'\]", sel)
-            if attr_match:
-                attr_name, attr_val = attr_match.group(1), attr_match.group(2)
-                _an, _av = attr_name, attr_val  # bind for closure
-                main = soup.find(lambda tag, an=_an, av=_av: tag and av.lower() in (str(tag.get(an, "")) or "").lower() if hasattr(tag, 'get') else False)  # type: ignore[call-overload]
-        else:
-            main = soup.find(sel)
-        if main:
-            break
-
-    if not main:
-        main = soup.find("body")
+    main = _find_content_root(soup) or soup.find("body")
     if not main:
         return sections
 
-    # Parse headings as section delimiters
-    current_section: WikiSection | None = None
-    content_parts: list[str] = []
-
-    all_headings = main.find_all(re.compile(r"h[1-6]"))
+    all_headings = main.find_all(_HEADING_TAGS)
     if not all_headings:
         # No headings — treat entire content as one section
         text = _extract_text(main) if isinstance(main, Tag) else main.get_text(strip=True)
@@ -174,70 +265,266 @@ def _parse_deepwiki_content(soup: BeautifulSoup) -> list[WikiSection]:
             sections.append(WikiSection(title="Overview", level=1, content=text))
         return sections
 
+    # Each heading owns the siblings up to the next heading; the lazy
+    # ``next_siblings`` walk stops there, so the split is one linear pass.
     for heading in all_headings:
-        if current_section is not None:
-            current_section.content = "\n".join(content_parts).strip()
-            sections.append(current_section)
-            content_parts = []
-
-        level = int(heading.name[1])
-        title = heading.get_text(strip=True)
-        # Strip trailing image/icon artifacts
-        title = re.sub(r"\s*\[Image:.*?\]\s*$", "", title).strip()
-        current_section = WikiSection(title=title, level=level)
-
-        for sibling in heading.find_next_siblings():
+        title = _TITLE_ARTIFACT_RE.sub("", heading.get_text(strip=True)).strip()
+        content_parts: list[str] = []
+        for sibling in heading.next_siblings:
             if isinstance(sibling, Tag):
-                if re.match(r"h[1-6]", sibling.name or ""):
+                if sibling.name in _HEADING_TAGS:
                     break
                 text = _tag_to_markdown(sibling)
                 if text:
                     content_parts.append(text)
-
-    if current_section is not None:
-        current_section.content = "\n".join(content_parts).strip()
-        sections.append(current_section)
+        sections.append(WikiSection(
+            title=title,
+            level=int(heading.name[1]),
+            content="\n".join(content_parts).strip(),
+        ))
 
     return sections
 
 
 # ---------------------------------------------------------------------------
-# Page fetcher (Playwright-rendered with caching)
+# Server-rendered payload extraction (v1.5.0)
+# ---------------------------------------------------------------------------
+_NEXT_DATA_RE = re.compile(
+    r'<script[^>]*id=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.S | re.I
+)
+_RSC_PUSH_RE = re.compile(r'self\.__next_f\.push\(\[1,\s*("(?:[^"\\]|\\.)*")\]\)', re.S)
+_FLIGHT_TEXT_RE = re.compile(r"(?:^|\n)[0-9a-f]+:T([0-9a-f]+),")
+_FLIGHT_JSON_RE = re.compile(r"(?:^|\n)[0-9a-f]+:(\[.*|\{.*)")
+_MD_HEADING_RE = re.compile(r"(?m)^#{1,6} \S")
+_MIN_MARKDOWN_CHARS = 200
+
+
+def _markdown_strings(obj: object) -> list[str]:
+    """Collect markdown-looking strings from decoded JSON."""
+    found: list[str] = []
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            if len(item) >= _MIN_MARKDOWN_CHARS and _MD_HEADING_RE.search(item):
+                found.append(item)
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return found
+
+
+def _flight_markdown(flight: str) -> list[str]:
+    """Extract markdown from a decoded RSC flight stream.
+
+    Text rows look like ``<id>:T<hex byte length>,<text>``; JSON rows like
+    ``<id>:[...]`` may carry markdown as string props.
+    """
+    found: list[str] = []
+    for match in _FLIGHT_TEXT_RE.finditer(flight):
+        length = int(match.group(1), 16)
+        text = flight[match.end():].encode("utf-8")[:length].decode("utf-8", "ignore")
+        if len(text) >= _MIN_MARKDOWN_CHARS and _MD_HEADING_RE.search(text):
+            found.append(text)
+    for match in _FLIGHT_JSON_RE.finditer(flight):
+        try:
+            found.extend(_markdown_strings(json.loads(match.group(1))))
+        except ValueError:
+            continue
+    return found
+
+
+def extract_payload_markdown(html: str) -> str:
+    """Return the longest markdown document embedded in a Next.js page, or ''."""
+    candidates: list[str] = []
+    match = _NEXT_DATA_RE.search(html)
+    if match:
+        try:
+            candidates.extend(_markdown_strings(json.loads(match.group(1))))
+        except ValueError:
+            logger.debug("DeepWiki: unparseable __NEXT_DATA__")
+    chunks: list[str] = []
+    for literal in _RSC_PUSH_RE.findall(html):
+        try:
+            chunks.append(json.loads(literal))
+        except ValueError:
+            continue
+    if chunks:
+        candidates.extend(_flight_markdown("".join(chunks)))
+    return max(candidates, key=len, default="")
+
+
+def _markdown_to_html(markdown: str) -> str:
+    """Render markdown into the minimal HTML ``_parse_deepwiki_content`` reads."""
+    out: list[str] = []
+    paragraph: list[str] = []
+    code: list[str] | None = None
+
+    def _flush() -> None:
+        if paragraph:
+            out.append(f"<p>{html_lib.escape(' '.join(paragraph))}</p>")
+            paragraph.clear()
+
+    for line in markdown.splitlines():
+        if code is not None:
+            if line.strip().startswith("```"):
+                out.append(f"<pre>{html_lib.escape(chr(10).join(code))}</pre>")
+                code = None
+            else:
+                code.append(line)
+            continue
+        stripped = line.strip()
+        heading = re.match(r"(#{1,6}) (.+)", stripped)
+        if stripped.startswith("```"):
+            _flush()
+            code = []
+        elif heading:
+            _flush()
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{html_lib.escape(heading.group(2).strip())}</h{level}>")
+        elif not stripped:
+            _flush()
+        else:
+            paragraph.append(stripped)
+    if code is not None:
+        out.append(f"<pre>{html_lib.escape(chr(10).join(code))}</pre>")
+    _flush()
+    return "".join(out)
+
+
+def _content_chars(soup: BeautifulSoup) -> int:
+    return sum(len(s.content) for s in _parse_deepwiki_content(soup))
+
+
+def _complete_static_html(html: str) -> str:
+    """Return *html* made parseable from its SSR markup or embedded payload.
+
+    Scripts are stripped from the result.  Returns '' when neither the
+    markup nor the payload carries enough content (Playwright needed).
+    """
+    if is_deepwiki_not_indexed(html):
+        return html
+    soup = BeautifulSoup(html, "lxml")
+    # Inline scripts (the payload itself, bundles) are not page content
+    for tag in soup(["script", "style", "noscript"]):
+        tag.decompose()
+    if _content_chars(soup) >= config.DEEPWIKI_HTTP_MIN_CONTENT_CHARS:
+        return str(soup)
+
+    markdown = extract_payload_markdown(html)
+    if not markdown:
+        return ""
+    article = BeautifulSoup(f"<article>{_markdown_to_html(markdown)}</article>", "lxml").article
+    target = soup.find("article") or soup.find("main")
+    if target is not None:
+        target.clear()
+        target.extend(list(article.children))
+    elif soup.body is not None:
+        soup.body.append(article)
+    else:
+        return ""
+    if _content_chars(soup) < config.DEEPWIKI_HTTP_MIN_CONTENT_CHARS:
+        return ""
+    return str(soup)
+
+
+def _fetch_deepwiki_static(url: str) -> str:
+    """Fetch *url* over plain HTTP; '' if a browser render is still needed."""
+    try:
+        result = call_with_breaker(DEEPWIKI_HTTP, lambda: fetch_text(url))
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.debug("DeepWiki: HTTP fetch failed for %s: %s", url, exc)
+        return ""
+    if result.status not in (200, 404):
+        logger.debug("DeepWiki: HTTP %d for %s", result.status, url)
+        return ""
+    html = _complete_static_html(result.text)
+    if not html:
+        logger.debug("DeepWiki: SSR content incomplete for %s — using Playwright", url)
+    return html
+
+
+# ---------------------------------------------------------------------------
+# Page fetcher (plain HTTP first, Playwright-rendered fallback, with caching)
 # ---------------------------------------------------------------------------
 def _fetch_deepwiki_html(url: str) -> str:
-    """Fetch rendered HTML from DeepWiki with caching."""
+    """Fetch DeepWiki HTML with caching — plain HTTP first, then Playwright."""
     cache_key = f"deepwiki::{url}"
     cached = get_cached_page(cache_key)
     if cached is not None:
         return cached
 
-    html = fetch_rendered_html(url)
+    if config.DEEPWIKI_HTTP_ENABLED:
+        html = _fetch_deepwiki_static(url)
+        if html:
+            set_cached_page(cache_key, html)
+            return html
+
+    html = retry_call(
+        DEEPWIKI_RENDER,
+        lambda: call_with_breaker(
+            DEEPWIKI_RENDER, lambda: fetch_rendered_html(url), is_failure=lambda h: not h
+        ),
+    ).value
     if html:
         set_cached_page(cache_key, html)
     return html
 
 
-def fetch_deepwiki_page(repo_url: str) -> WikiPage | None:
+def fetch_deepwiki_page(repo_url: str, force: bool = False) -> WikiPage | None:
     """Fetch and parse a DeepWiki page for *repo_url*.
 
     Returns a ``WikiPage`` normalised to the same format as TinkyWiki pages,
-    or ``None`` if the repo is not indexed on DeepWiki.
+    or ``None`` if the repo is not indexed on DeepWiki.  A render that times
+    out or comes back empty raises ``TimeoutError`` instead, so it is never
+    mistaken for a not-indexed verdict.  Like ``parser.fetch_wiki_page``, a
+    page past its soft TTL is served stale while a background call with
+    *force* refreshes it; a recent not-indexed verdict or failed fetch
+    (negative cache) returns ``None`` or raises without a request.  A
+    refresh whose HTML is unchanged reuses the parsed page.
     """
     # Check parsed cache first
     cache_key = f"deepwiki::{repo_url}"
-    cached_page = get_cached_wiki_page(cache_key)
-    if cached_page is not None:
-        return cached_page
+    if not force:
+        cached = lookup_wiki_page(
+            cache_key, refresh=lambda: fetch_deepwiki_page(repo_url, force=True)
+        )
+        if cached is not None:
+            return replace(cached.value, stale=True) if cached.stale else cached.value
+        failure = get_negative(cache_key)
+        if failure is not None and failure.kind == NEGATIVE_TIMEOUT:
+            raise TimeoutError(
+                f"DeepWiki render of {repo_url} failed recently — "
+                f"retry in {failure.retry_after:.0f}s"
+            )
+        if failure is not None:  # not indexed
+            return None
 
     owner_repo = _extract_owner_repo(repo_url)
     deepwiki_url = build_deepwiki_url(repo_url)
 
-    html = _fetch_deepwiki_html(deepwiki_url)
-    if not html:
-        return None
+    if force:
+        invalidate(f"deepwiki::{deepwiki_url}")  # re-fetch, not the cached HTML
+    try:
+        html = _fetch_deepwiki_html(deepwiki_url)
+    except (TimeoutError, FutureTimeoutError, PlaywrightTimeoutError) as exc:
+        set_negative(cache_key, NEGATIVE_TIMEOUT)
+        raise TimeoutError(f"DeepWiki render of {repo_url} timed out") from exc
+    if not html:  # an empty render is a failed fetch, not a not-indexed verdict
+        set_negative(cache_key, NEGATIVE_TIMEOUT)
+        raise TimeoutError(f"DeepWiki render of {repo_url} returned no content")
+
+    html_digest = _digest(html)
+    previous = peek_wiki_page(cache_key)
+    if previous is not None and previous.html_digest == html_digest:
+        logger.info("DeepWiki: %s unchanged — reusing the parsed page", owner_repo)
+        set_cached_wiki_page(cache_key, previous)  # re-stamps it and its dependents
+        return replace(previous, stale=False)
 
     if is_deepwiki_not_indexed(html):
         logger.info("DeepWiki: repo %s not indexed", owner_repo)
+        set_negative(cache_key, NEGATIVE_NOT_INDEXED)
         return None
 
     soup = BeautifulSoup(html, "lxml")
@@ -286,7 +573,10 @@ def fetch_deepwiki_page(repo_url: str) -> WikiPage | None:
         toc=toc,
         diagrams=[],  # DeepWiki diagrams are Mermaid-based, parsed from content
         raw_text=raw_text,
+        source="deepwiki",
+        html_digest=html_digest,
     )
+    page.content_hash = page_content_hash(page)
 
     logger.info(
         "DeepWiki parsed %s: %d sections, %d topics, %d chars",
@@ -313,8 +603,7 @@ def fetch_deepwiki_section(repo_url: str, topic_slug: str) -> WikiPage | None:
     owner_repo = _extract_owner_repo(repo_url)
     topic_url = f"{config.DEEPWIKI_BASE_URL}/{owner_repo}/{topic_slug}"
 
-    cache_key = f"deepwiki::{topic_url}"
-    cached_page = get_cached_wiki_page(cache_key)
+    cached_page = get_cached_section(topic_url)
     if cached_page is not None:
         return cached_page
 
@@ -342,13 +631,268 @@ def fetch_deepwiki_section(repo_url: str, topic_slug: str) -> WikiPage | None:
         raw_text=raw_text,
     )
 
-    set_cached_wiki_page(cache_key, page)
+    set_cached_section(topic_url, page)
+    return page
+
+
+# ---------------------------------------------------------------------------
+# Full-topic crawl (v1.5.0)
+# ---------------------------------------------------------------------------
+_STUB_PREFIX = "[Full content at: "
+
+
+@dataclass
+class CrawlProgress:
+    """Progress of one repo's full-topic crawl."""
+    total: int
+    done: int = 0
+    failed: int = 0
+    started_at: float = 0.0  # time.monotonic()
+    finished: bool = False
+
+    def to_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "done": self.done,
+            "failed": self.failed,
+            "elapsed_seconds": round(time.monotonic() - self.started_at, 1),
+            "finished": self.finished,
+        }
+
+
+_crawl_lock = threading.Lock()
+_crawl_progress: TTLCache[str, CrawlProgress] = TTLCache(maxsize=50, ttl=3600)
+
+
+def crawl_progress(repo_url: str | None = None) -> dict:
+    """Return crawl progress for *repo_url*, or for every crawled repo."""
+    with _crawl_lock:
+        if repo_url is not None:
+            progress = _crawl_progress.get(_extract_owner_repo(repo_url))
+            return progress.to_dict() if progress else {}
+        return {repo: p.to_dict() for repo, p in _crawl_progress.items()}
+
+
+def _topic_markdown(page: WikiPage) -> str:
+    """Render a topic page's sections as one markdown block."""
+    parts: list[str] = []
+    for i, section in enumerate(page.sections):
+        if i > 0:  # the first heading is the topic title itself
+            parts.append(f"{'#' * min(section.level + 1, 6)} {section.title}")
+        if section.content:
+            parts.append(section.content)
+    return "\n\n".join(parts).strip()
+
+
+def _topic_content(repo_url: str, topic: DeepWikiTopic) -> str:
+    """Fetch one topic and return its markdown ('' on failure)."""
+    try:
+        page = fetch_deepwiki_section(repo_url, topic.slug)
+        return _topic_markdown(page) if page is not None else ""
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.debug("DeepWiki crawl: topic %s failed: %s", topic.slug, exc)
+        return ""
+
+
+def _crawl_topic(repo_url: str, topic: DeepWikiTopic, progress: CrawlProgress) -> str:
+    """Fetch one topic for a crawl and count it in *progress*."""
+    content = _topic_content(repo_url, topic)
+    with _crawl_lock:
+        progress.done += 1
+        if not content:
+            progress.failed += 1
+    return content
+
+
+def _merge_topics(
+    base: WikiPage, topics: list[DeepWikiTopic], contents: dict[str, str]
+) -> WikiPage:
+    """Merge crawled topic contents into *base* (overview first, then topics)."""
+
+    def _same(a: str, b: str) -> bool:
+        a, b = a.lower(), b.lower()
+        return a in b or b in a
+
+    overview = [
+        s for s in base.sections
+        if not s.content.startswith(_STUB_PREFIX)
+        and not any(_same(t.title, s.title) and contents.get(t.slug) for t in topics)
+    ]
+    topic_sections = [
+        WikiSection(
+            title=t.title,
+            level=t.level,
+            content=contents.get(t.slug) or f"{_STUB_PREFIX}{t.url}]",
+        )
+        for t in topics
+    ]
+    raw_text = "\n\n".join([base.raw_text] + [c for c in contents.values() if c])
+    page = WikiPage(
+        repo_name=base.repo_name,
+        url=base.url,
+        title=base.title,
+        sections=overview + topic_sections,
+        toc=base.toc,
+        diagrams=base.diagrams,
+        raw_text=raw_text,
+        source=base.source,
+    )
+    page.content_hash = page_content_hash(page)
+    return page
+
+
+def _base_page(repo_url: str) -> WikiPage | None:
+    """``fetch_deepwiki_page`` for the topic fetchers (None on failure, too)."""
+    try:
+        return fetch_deepwiki_page(repo_url)
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.debug("DeepWiki topics: page of %s failed: %s", repo_url, exc)
+        return None
+
+
+def _sidebar_topics(repo_url: str) -> list[DeepWikiTopic]:
+    """Sidebar topics of *repo_url*'s overview page ([] on failure).
+
+    Usually an HTML-cache hit after a fetch, but the raw HTML can expire
+    before the parsed page does — then this re-renders.
+    """
+    try:
+        html = _fetch_deepwiki_html(build_deepwiki_url(repo_url))
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.debug("DeepWiki topics: sidebar of %s failed: %s", repo_url, exc)
+        return []
+    if not html:
+        return []
+    return _parse_sidebar_topics(BeautifulSoup(html, "lxml"), _extract_owner_repo(repo_url))
+
+
+def fetch_deepwiki_topic(repo_url: str, section_title: str) -> WikiPage | None:
+    """Fetch the DeepWiki page for *repo_url* with one topic's full content.
+
+    The first sidebar topic whose title contains *section_title*
+    (case-insensitive, like ``parser.get_section_by_title``) is fetched
+    and merged into the page; the other topics stay stubs.  Returns the
+    plain page if no topic matches or a topic fetch fails, and ``None`` if
+    DeepWiki doesn't have the repo or the page itself can't be fetched.
+    """
+    base = _base_page(repo_url)
+    if base is None:
+        return None
+    needle = section_title.lower().strip()
+    topics = _sidebar_topics(repo_url)
+    topic = next((t for t in topics if needle in t.title.lower()), None)
+    if topic is None:
+        return base
+    content = _topic_content(repo_url, topic)
+    return _merge_topics(base, topics, {topic.slug: content}) if content else base
+
+
+def crawl_deepwiki_page(repo_url: str) -> WikiPage | None:
+    """Fetch the DeepWiki page for *repo_url* with every topic's full content.
+
+    Returns the plain ``fetch_deepwiki_page`` result when crawling is
+    disabled or the repo's sidebar topics can't be listed, and ``None`` if
+    DeepWiki doesn't have the repo or the page itself can't be fetched.
+    """
+    base = _base_page(repo_url)
+    if base is None or not config.DEEPWIKI_CRAWL_ENABLED:
+        return base
+
+    cache_key = f"deepwiki-full::{repo_url}"
+    cached_page = get_cached_wiki_page(cache_key)
+    if cached_page is not None:
+        return cached_page
+
+    owner_repo = _extract_owner_repo(repo_url)
+    topics = _sidebar_topics(repo_url)[: max(0, config.DEEPWIKI_CRAWL_MAX_TOPICS)]
+    if not topics:
+        return base
+
+    progress = CrawlProgress(total=len(topics), started_at=time.monotonic())
+    with _crawl_lock:
+        _crawl_progress[owner_repo] = progress
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(config.DEEPWIKI_CRAWL_CONCURRENCY, len(topics))),
+        thread_name_prefix="deepwiki-crawl",
+    )
+    try:
+        futures = {
+            topic.slug: executor.submit(_crawl_topic, repo_url, topic, progress)
+            for topic in topics
+        }
+        wait(futures.values(), timeout=config.DEEPWIKI_CRAWL_DEADLINE_SECONDS)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    contents = {
+        slug: future.result()
+        for slug, future in futures.items()
+        if future.done() and not future.cancelled()
+    }
+    with _crawl_lock:
+        progress.finished = True
+
+    page = _merge_topics(base, topics, contents)
+    fetched = sum(1 for c in contents.values() if c)
+    logger.info(
+        "DeepWiki crawl %s: %d/%d topics in %.1fs",
+        owner_repo, fetched, len(topics), time.monotonic() - progress.started_at,
+    )
+    # Only complete crawls are cached; partial ones retry the missing topics
+    # next time (the fetched topics are section-cache hits).
+    if fetched == len(topics):
+        set_cached_wiki_page(cache_key, page)
     return page
 
 
 # ---------------------------------------------------------------------------
 # DeepWiki Chat / Ask feature (Playwright-based)
 # ---------------------------------------------------------------------------
+_ASK_ANSWER_SELECTORS = (
+    "[class*='answer']", "[class*='response']", "[class*='message']",
+    "[class*='markdown']", ".prose", "article",
+)
+
+
+async def _read_ask_answer_element(page) -> str:
+    """Return the text of the first visible answer-like element, or ``""``."""
+    for sel in _ASK_ANSWER_SELECTORS:
+        try:
+            elem = page.locator(sel).last
+            if await elem.is_visible(timeout=500):
+                return await elem.inner_text()
+        except (PlaywrightTimeoutError, RuntimeError, ValueError, TypeError, AttributeError):
+            continue
+    return ""
+
+
+async def _poll_ask_answer(page) -> str:
+    """DOM-polling fallback: wait for the answer to appear and stop growing."""
+    await asyncio.sleep(config.RESPONSE_INITIAL_DELAY_SECONDS)
+
+    deadline = asyncio.get_event_loop().time() + config.RESPONSE_WAIT_TIMEOUT_SECONDS
+    content = ""
+    while asyncio.get_event_loop().time() < deadline:
+        await asyncio.sleep(config.RESPONSE_POLL_INTERVAL_SECONDS)
+        text = await _read_ask_answer_element(page)
+        if len(text) > config.NEW_CONTENT_THRESHOLD_CHARS:
+            content = text
+            break
+    if not content:
+        return ""
+
+    # Wait for streaming to stabilize
+    last_len = len(content)
+    for _ in range(10):
+        await asyncio.sleep(config.RESPONSE_STABLE_INTERVAL_SECONDS)
+        content = await _read_ask_answer_element(page) or content
+        if len(content) == last_len:
+            break
+        last_len = len(content)
+    return content
+
+
 async def _deepwiki_ask_impl(repo_url: str, query: str) -> str | None:
     """Navigate to DeepWiki repo page and use the Ask feature.
 
@@ -406,6 +950,12 @@ async def _deepwiki_ask_impl(repo_url: str, query: str) -> str | None:
             logger.info("DeepWiki Ask: no Ask input found on %s", deepwiki_url)
             return None
 
+        # Listen for the streamed answer before submitting the query
+        capture: AskCapture | None = None
+        if config.DEEPWIKI_ASK_STREAM_ENABLED:
+            capture = AskCapture()
+            capture.attach(page)
+
         # Type the query
         await human_click(page, ask_input)
         await random_delay(0.2, 0.5)
@@ -430,51 +980,21 @@ async def _deepwiki_ask_impl(repo_url: str, query: str) -> str | None:
             except (PlaywrightTimeoutError, RuntimeError, ValueError, TypeError, AttributeError):
                 continue
 
-        # Wait for response
-        await asyncio.sleep(config.RESPONSE_INITIAL_DELAY_SECONDS)
-
-        # Wait for response content to appear and stabilize
-        deadline = asyncio.get_event_loop().time() + config.RESPONSE_WAIT_TIMEOUT_SECONDS
         content = ""
-
-        while asyncio.get_event_loop().time() < deadline:
-            await asyncio.sleep(config.RESPONSE_POLL_INTERVAL_SECONDS)
-            # Look for response content — DeepWiki renders in markdown-style divs
-            for sel in ["[class*='answer']", "[class*='response']", "[class*='message']",
-                        "[class*='markdown']", ".prose", "article"]:
-                try:
-                    elem = page.locator(sel).last
-                    if await elem.is_visible(timeout=500):
-                        text = await elem.inner_text()
-                        if len(text) > config.NEW_CONTENT_THRESHOLD_CHARS:
-                            content = text
-                            break
-                except (PlaywrightTimeoutError, RuntimeError, ValueError, TypeError, AttributeError):
-                    continue
+        if capture is not None:
+            content = await capture.wait(
+                detect_timeout=config.RESPONSE_INITIAL_DELAY_SECONDS,
+                total_timeout=config.RESPONSE_WAIT_TIMEOUT_SECONDS,
+            )
             if content:
-                break
+                logger.debug("DeepWiki Ask: answer captured from stream (%d chars)", len(content))
+        if not content:
+            content = await _poll_ask_answer(page)
 
         if not content:
             logger.info("DeepWiki Ask: no response received for %s", owner_repo)
             return None
 
-        # Wait for streaming to stabilize
-        last_len = len(content)
-        for _ in range(10):
-            await asyncio.sleep(config.RESPONSE_STABLE_INTERVAL_SECONDS)
-            for sel in ["[class*='answer']", "[class*='response']", "[class*='message']",
-                        "[class*='markdown']", ".prose", "article"]:
-                try:
-                    elem = page.locator(sel).last
-                    if await elem.is_visible(timeout=500):
-                        content = await elem.inner_text()
-                        break
-                except (PlaywrightTimeoutError, RuntimeError, ValueError, TypeError, AttributeError):
-                    continue
-            if len(content) == last_len:
-                break
-            last_len = len(content)
-
         # Clean up artifacts
         for artifact in config.DEEPWIKI_UI_ARTIFACTS:
             content = content.replace(artifact, "")
@@ -503,7 +1023,13 @@ def deepwiki_ask(repo_url: str, query: str) -> str | None:
     if not config.DEEPWIKI_ENABLED:
         return None
     try:
-        return run_in_browser_loop(_deepwiki_ask_impl(repo_url, query))
+        return retry_call(
+            DEEPWIKI_ASK,
+            lambda: call_with_breaker(
+                DEEPWIKI_ASK,
+                lambda: run_in_browser_loop(_deepwiki_ask_impl(repo_url, query)),
+            ),
+        ).value
     except (asyncio.TimeoutError, RuntimeError, ValueError, TypeError) as exc:
         logger.warning("DeepWiki Ask sync wrapper failed: %s", exc)
         return None
@@ -0,0 +1,46 @@
+"""Runtime diagnostics snapshot (v1.5.0).
+
+Aggregates the stats exposed by the individual subsystems into one dict
+so operators (and the ``tinkywiki_diagnostics`` tool) can see cache
+occupancy, local-index size, retry counters, circuit-breaker state,
+refresh-ahead activity and startup warm-up progress in a single call.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .background import background_stats
+from .cache import cache_stats
+from .circuit_breaker import breaker_stats
+from .deepwiki import crawl_progress
+from .github_cache import github_cache_stats
+from .github_client import github_client_stats
+from .http_client import http_client_stats
+from .index_registry import registry_stats
+from .indexing_queue import queue_stats
+from .local_index import index_stats
+from .refresh_ahead import refresh_ahead_stats
+from .repo_snapshot import snapshot_stats
+from .retry import retry_stats
+from .warmup import warmup_status
+
+
+def collect_diagnostics() -> dict[str, Any]:
+    """Return a JSON-serialisable snapshot of all runtime stats."""
+    return {
+        "circuit_breakers": breaker_stats(),
+        "retries": retry_stats(),
+        "cache": cache_stats(),
+        "local_index": index_stats(),
+        "index_registry": registry_stats(),
+        "background": background_stats(),
+        "indexing_queue": queue_stats(),
+        "deepwiki_crawls": crawl_progress(),
+        "http_client": http_client_stats(),
+        "github_client": github_client_stats(),
+        "github_cache": github_cache_stats(),
+        "repo_snapshots": snapshot_stats(),
+        "refresh_ahead": refresh_ahead_stats(),
+        "warmup": warmup_status(),
+    }
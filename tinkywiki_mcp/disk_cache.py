@@ -0,0 +1,303 @@
+"""Persistent second-level (L2) cache behind the in-memory caches (v1.5.0).
+
+``cache.py`` keeps its ``TTLCache``s as the L1; rendered HTML, parsed
+``WikiPage``s, search answers and topic lists are also written here, to a
+SQLite store (see ``storage.py`` — WAL mode, so several server processes
+share one file).  An L1 miss falls through to this store and promotes the
+entry, so a restarted or freshly spawned server starts warm.  Nothing is
+loaded at startup: entries are read one key at a time, on demand.
+
+Entries keep their absolute expiry time (the L1 TTL applies on disk too)
+and the store is capped at ``CACHE_L2_MAX_BYTES``: when a write takes it
+over the budget, expired entries go first, then the least recently read.
+The budget is summed every ``_EVICT_CHECK_INTERVAL`` writes, or sooner
+once this process has written the headroom a trim leaves, not per write.
+Values are compressed (``compression.py``; the codec is recorded in the
+entry's ``kind``, e.g. ``wiki_page+zstd``).  Values other than ``str``
+and ``WikiPage`` are not persisted, and any SQLite error (e.g. another
+process holding the write lock for too long) degrades to a miss — the
+L2 is an optimisation, never a requirement.
+
+The same file holds the ``locks`` table behind the cross-process
+single-flight of ``shared_cache.py``.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from . import config
+from .compression import CODEC_NONE, compress, decompress
+from .storage import SQLiteStore
+
+logger = logging.getLogger("TinkyWiki")
+
+# Reads refresh an entry's recency at most this often (saves a write per hit)
+_TOUCH_INTERVAL_SECONDS = 60.0
+# Eviction trims to this fraction of the budget, so it doesn't run every write
+_EVICT_TARGET = 0.9
+# The budget (a full-table SUM) is checked every _EVICT_CHECK_INTERVAL writes
+_EVICT_CHECK_INTERVAL = 64
+
+_store = SQLiteStore(
+    "page_cache",
+    """
+    CREATE TABLE IF NOT EXISTS entries (
+        namespace   TEXT NOT NULL,
+        key         TEXT NOT NULL,
+        kind        TEXT NOT NULL,
+        value       BLOB NOT NULL,
+        size        INTEGER NOT NULL,
+        stored_at   REAL NOT NULL,
+        expires_at  REAL NOT NULL,
+        accessed_at REAL NOT NULL,
+        PRIMARY KEY (namespace, key)
+    );
+    CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at);
+    CREATE INDEX IF NOT EXISTS entries_expires ON entries (expires_at);
+    CREATE TABLE IF NOT EXISTS locks (
+        key         TEXT PRIMARY KEY,
+        owner       TEXT NOT NULL,
+        expires_at  REAL NOT NULL
+    );
+    """,
+)
+
+_lock = threading.Lock()
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "expired": 0,
+    "writes": 0,
+    "evictions": 0,
+    "errors": 0,
+    "raw_bytes_written": 0,  # before compression
+    "stored_bytes_written": 0,
+}
+# Writes and bytes since the last budget check; start due, so a restarted
+# process trims a store left over budget on its first write
+_since_check = {"writes": _EVICT_CHECK_INTERVAL, "bytes": 0}
+
+
+@dataclass
+class DiskEntry:
+    """A live L2 entry."""
+
+    value: Any
+    stored_at: float
+    expires_at: float
+
+
+def _count(name: str, n: int = 1) -> None:
+    with _lock:
+        _stats[name] += n
+
+
+# ---------------------------------------------------------------------------
+# Value codec
+# ---------------------------------------------------------------------------
+def _encode(value: Any) -> tuple[str, bytes, int] | None:
+    """Serialise and compress *value* as ``(kind, payload, raw size)``.
+
+    Returns None if the value isn't persistable.
+    """
+    from .parser import WikiPage  # noqa: E402 — parser imports cache
+
+    if isinstance(value, str):
+        kind, data = "text", value.encode("utf-8")
+    elif isinstance(value, WikiPage):
+        kind, data = "wiki_page", json.dumps(dataclasses.asdict(value)).encode("utf-8")
+    else:
+        return None
+    codec, payload = compress(data)
+    return (kind if codec == CODEC_NONE else f"{kind}+{codec}"), payload, len(data)
+
+
+def _decode(kind: str, data: bytes) -> Any:
+    from .parser import WikiPage, WikiSection  # noqa: E402
+
+    def section(raw: dict) -> WikiSection:
+        raw["children"] = [section(child) for child in raw.get("children", [])]
+        return WikiSection(**raw)
+
+    kind, _, codec = kind.partition("+")
+    data = decompress(codec or CODEC_NONE, data)
+    if kind == "text":
+        return data.decode("utf-8")
+    if kind == "wiki_page":
+        raw = json.loads(data)
+        raw["sections"] = [section(s) for s in raw.get("sections", [])]
+        return WikiPage(**raw)
+    raise ValueError(f"unknown cache entry kind {kind!r}")
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+def disk_get(namespace: str, key: str) -> DiskEntry | None:
+    """Return the live entry for *namespace* / *key*, or None."""
+    if not config.CACHE_L2_ENABLED:
+        return None
+    now = time.time()
+    try:
+        rows = _store.execute(
+            "SELECT kind, value, stored_at, expires_at, accessed_at FROM entries "
+            "WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        )
+        if not rows:
+            _count("misses")
+            return None
+        kind, data, stored_at, expires_at, accessed_at = rows[0]
+        if expires_at <= now:
+            _store.execute(
+                "DELETE FROM entries WHERE namespace = ? AND key = ? AND expires_at <= ?",
+                (namespace, key, now),
+            )
+            _count("expired")
+            return None
+        if now - accessed_at > _TOUCH_INTERVAL_SECONDS:
+            _store.execute(
+                "UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, namespace, key),
+            )
+        value = _decode(kind, data)
+    except (sqlite3.Error, ValueError, TypeError) as exc:
+        logger.debug("disk_cache: read %s/%s failed: %s", namespace, key, exc)
+        _count("errors")
+        return None
+    _count("hits")
+    return DiskEntry(value, stored_at, expires_at)
+
+
+def disk_set(namespace: str, key: str, value: Any, ttl: float) -> None:
+    """Persist *value* for *ttl* seconds (ignored for non-persistable values)."""
+    if not config.CACHE_L2_ENABLED:
+        return
+    encoded = _encode(value)
+    if encoded is None:
+        return
+    kind, data, raw_size = encoded
+    if len(data) > config.CACHE_L2_MAX_BYTES:
+        return
+    now = time.time()
+    try:
+        _store.execute(
+            "INSERT OR REPLACE INTO entries "
+            "(namespace, key, kind, value, size, stored_at, expires_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (namespace, key, kind, data, len(data), now, now + ttl, now),
+        )
+        with _lock:
+            _stats["writes"] += 1
+            _stats["raw_bytes_written"] += raw_size
+            _stats["stored_bytes_written"] += len(data)
+            _since_check["writes"] += 1
+            _since_check["bytes"] += len(data)
+            due = (
+                _since_check["writes"] >= _EVICT_CHECK_INTERVAL
+                or _since_check["bytes"] >= config.CACHE_L2_MAX_BYTES * (1 - _EVICT_TARGET)
+            )
+            if due:
+                _since_check["writes"] = _since_check["bytes"] = 0
+        if due:
+            _evict_if_needed(now)
+    except sqlite3.Error as exc:
+        logger.debug("disk_cache: write %s/%s failed: %s", namespace, key, exc)
+        _count("errors")
+
+
+def disk_delete(namespace: str, key: str) -> None:
+    """Remove one entry."""
+    try:
+        _store.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+    except sqlite3.Error as exc:
+        logger.debug("disk_cache: delete %s/%s failed: %s", namespace, key, exc)
+
+
+def disk_try_lock(key: str, owner: str, ttl: float) -> bool:
+    """Take the cross-process lock *key* for *owner* unless another live owner holds it.
+
+    Raises:
+        sqlite3.Error: The store is unusable (callers treat this as "no lock").
+    """
+    now = time.time()
+    _store.execute(
+        "INSERT INTO locks (key, owner, expires_at) VALUES (?, ?, ?) "
+        "ON CONFLICT (key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+        "WHERE locks.expires_at <= ?",
+        (key, owner, now + ttl, now),
+    )
+    rows = _store.execute("SELECT owner FROM locks WHERE key = ?", (key,))
+    return bool(rows) and rows[0][0] == owner
+
+
+def disk_unlock(key: str, owner: str) -> None:
+    """Release *key* if *owner* still holds it."""
+    _store.execute("DELETE FROM locks WHERE key = ? AND owner = ?", (key, owner))
+
+
+def _evict_if_needed(now: float) -> None:
+    """Trim the store below the byte budget: expired entries, then least recently read."""
+    (total,), = _store.execute("SELECT COALESCE(SUM(size), 0) FROM entries")
+    if total <= config.CACHE_L2_MAX_BYTES:
+        return
+    before = _store.execute("SELECT COUNT(*) FROM entries")[0][0]
+    _store.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+    _store.execute(
+        "DELETE FROM entries WHERE rowid IN ("
+        " SELECT rowid FROM ("
+        "  SELECT rowid, SUM(size) OVER (ORDER BY accessed_at DESC, rowid DESC) AS kept"
+        "  FROM entries)"
+        " WHERE kept > ?)",
+        (int(config.CACHE_L2_MAX_BYTES * _EVICT_TARGET),),
+    )
+    evicted = before - _store.execute("SELECT COUNT(*) FROM entries")[0][0]
+    _count("evictions", evicted)
+    logger.debug("disk_cache: evicted %d entries (%d bytes over budget)", evicted,
+                 total - config.CACHE_L2_MAX_BYTES)
+
+
+# ---------------------------------------------------------------------------
+# Stats / maintenance
+# ---------------------------------------------------------------------------
+def disk_cache_stats() -> dict[str, Any]:
+    """Return counters, entry count and byte usage of the L2 store."""
+    with _lock:
+        stats: dict[str, Any] = dict(_stats)
+    stats["enabled"] = config.CACHE_L2_ENABLED
+    stats["max_bytes"] = config.CACHE_L2_MAX_BYTES
+    lookups = stats["hits"] + stats["misses"] + stats["expired"]
+    stats["hit_ratio"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+    stored = stats["stored_bytes_written"]
+    stats["compression_ratio"] = round(stats["raw_bytes_written"] / stored, 2) if stored else 1.0
+    if not config.CACHE_L2_ENABLED:
+        stats["entries"] = stats["bytes"] = 0
+        return stats
+    try:
+        (stats["entries"], stats["bytes"]), = _store.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        )
+    except sqlite3.Error:
+        stats["entries"] = stats["bytes"] = 0
+    return stats
+
+
+def clear_disk_cache() -> None:
+    """Delete every persisted entry and reset the counters."""
+    with _lock:
+        for key in _stats:
+            _stats[key] = 0
+        _since_check.update(writes=_EVICT_CHECK_INTERVAL, bytes=0)
+    try:
+        _store.execute("DELETE FROM entries")
+        _store.execute("DELETE FROM locks")
+    except sqlite3.Error as exc:
+        logger.debug("disk_cache: clear failed: %s", exc)
@@ -0,0 +1,256 @@
+"""Pluggable eviction policies for the in-memory caches (v1.5.0).
+
+``cache.py``'s byte-budgeted caches ask their policy which key to evict.
+``TINKYWIKI_CACHE_EVICTION`` selects it:
+
+- **lru** — evict the least recently used entry.  A single agent scanning
+  many one-off repos pushes every hot repo out of a 30–50 entry cache.
+- **tinylfu** (default) — W-TinyLFU: new keys enter a small LRU *window*;
+  the *main* area is a segmented LRU (probation → protected on a second
+  hit).  When the window overflows into a full main area, its oldest key
+  only gets in if a count-min sketch has seen it more often than main's
+  eviction victim — otherwise the newcomer is the one evicted.  The
+  sketch halves its counters every ``10 × max_entries`` increments, so
+  yesterday's hot set ages out.
+
+Policies track keys and weights (the cache's size estimate) only; the
+cache keeps the values and calls ``on_insert`` / ``on_access`` /
+``on_remove`` and ``victim``.  They are not thread-safe on their own —
+``cache._BudgetCache`` makes every call under its lock.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+from typing import Any, Hashable
+
+logger = logging.getLogger("TinkyWiki")
+
+POLICY_LRU = "lru"
+POLICY_TINYLFU = "tinylfu"
+
+_WINDOW_FRACTION = 0.01  # of the capacity, as in Caffeine
+_PROTECTED_FRACTION = 0.8  # of the main area
+_SKETCH_DEPTH = 4
+_COUNTER_MAX = 15  # 4-bit counters
+_SAMPLE_FACTOR = 10  # reset (halve) after this many increments per entry of capacity
+# Odd 64-bit multipliers, one per sketch row (multiply-shift hashing)
+_ROW_SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+_MASK64 = (1 << 64) - 1
+
+
+class LRUPolicy:
+    """Least recently used first."""
+
+    name = POLICY_LRU
+
+    def __init__(self) -> None:
+        self._order: OrderedDict[Hashable, int] = OrderedDict()
+
+    def on_insert(self, key: Hashable, weight: int) -> None:
+        self._order[key] = weight
+        self._order.move_to_end(key)
+
+    def on_access(self, key: Hashable) -> None:
+        if key in self._order:
+            self._order.move_to_end(key)
+
+    def on_remove(self, key: Hashable) -> None:
+        self._order.pop(key, None)
+
+    def victim(self) -> Hashable | None:
+        return next(iter(self._order), None)
+
+    def clear(self) -> None:
+        self._order.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {"policy": self.name}
+
+
+class CountMinSketch:
+    """Approximate access counts in ``depth × width`` saturating 4-bit counters."""
+
+    def __init__(self, capacity: int) -> None:
+        width, bits = 64, 6
+        while width < 4 * capacity:
+            width, bits = width * 2, bits + 1
+        self._shift = 64 - bits
+        self._rows = [[0] * width for _ in range(_SKETCH_DEPTH)]
+        self._sample_size = max(capacity, 1) * _SAMPLE_FACTOR
+        self._additions = 0
+        self.resets = 0
+
+    def _indexes(self, key: Hashable) -> list[int]:
+        h = hash(key) & _MASK64
+        return [((h * seed) & _MASK64) >> self._shift for seed in _ROW_SEEDS]
+
+    def increment(self, key: Hashable) -> None:
+        for row, index in zip(self._rows, self._indexes(key)):
+            if row[index] < _COUNTER_MAX:
+                row[index] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._age()
+
+    def estimate(self, key: Hashable) -> int:
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+    def _age(self) -> None:
+        for row in self._rows:
+            row[:] = [count >> 1 for count in row]
+        self._additions //= 2
+        self.resets += 1
+
+    def clear(self) -> None:
+        for row in self._rows:
+            row[:] = [0] * len(row)
+        self._additions = self.resets = 0
+
+
+class _Segment:
+    """An LRU-ordered key → weight map with a weight and entry budget."""
+
+    def __init__(self, max_weight: int, max_entries: int) -> None:
+        self.entries: OrderedDict[Hashable, int] = OrderedDict()
+        self.weight = 0
+        self.max_weight = max_weight
+        self.max_entries = max_entries
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, key: Hashable, weight: int) -> None:
+        self.entries[key] = weight
+        self.weight += weight
+
+    def remove(self, key: Hashable) -> int:
+        weight = self.entries.pop(key)
+        self.weight -= weight
+        return weight
+
+    def oldest(self) -> Hashable | None:
+        return next(iter(self.entries), None)
+
+    def over(self) -> bool:
+        return len(self.entries) > self.max_entries or self.weight > self.max_weight
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.weight = 0
+
+
+class TinyLFUPolicy:
+    """W-TinyLFU: LRU window, segmented-LRU main area, count-min sketch admission."""
+
+    name = POLICY_TINYLFU
+
+    def __init__(self, max_weight: int, max_entries: int) -> None:
+        window_weight = max(1, int(max_weight * _WINDOW_FRACTION))
+        window_entries = max(1, int(max_entries * _WINDOW_FRACTION))
+        main_weight = max(1, max_weight - window_weight)
+        main_entries = max(1, max_entries - window_entries)
+        self.sketch = CountMinSketch(max_entries)
+        self._window = _Segment(window_weight, window_entries)
+        self._probation = _Segment(main_weight, main_entries)
+        self._protected = _Segment(
+            max(1, int(main_weight * _PROTECTED_FRACTION)),
+            max(1, int(main_entries * _PROTECTED_FRACTION)),
+        )
+        self.admitted = 0
+        self.rejected = 0
+
+    def _segment_of(self, key: Hashable) -> _Segment | None:
+        for segment in (self._window, self._probation, self._protected):
+            if key in segment:
+                return segment
+        return None
+
+    def _main_fits(self, weight: int) -> bool:
+        main_entries = len(self._probation) + len(self._protected)
+        main_weight = self._probation.weight + self._protected.weight
+        return (main_entries < self._probation.max_entries
+                and main_weight + weight <= self._probation.max_weight)
+
+    def on_insert(self, key: Hashable, weight: int) -> None:
+        self.sketch.increment(key)
+        segment = self._segment_of(key)
+        if segment is not None:  # replaced value: new weight, counts as a hit
+            segment.remove(key)
+            segment.add(key, weight)
+            self._touch(segment, key)
+            return
+        self._window.add(key, weight)
+        # While the main area has room, window overflow moves in unfiltered
+        while len(self._window) > 1 and self._window.over():
+            oldest = self._window.oldest()
+            if not self._main_fits(self._window.entries[oldest]):
+                break
+            self._probation.add(oldest, self._window.remove(oldest))
+
+    def on_access(self, key: Hashable) -> None:
+        self.sketch.increment(key)
+        segment = self._segment_of(key)
+        if segment is not None:
+            self._touch(segment, key)
+
+    def _touch(self, segment: _Segment, key: Hashable) -> None:
+        if segment is not self._probation:
+            segment.entries.move_to_end(key)
+            return
+        self._protected.add(key, self._probation.remove(key))
+        while len(self._protected) > 1 and self._protected.over():
+            demoted = self._protected.oldest()
+            self._probation.add(demoted, self._protected.remove(demoted))
+
+    def on_remove(self, key: Hashable) -> None:
+        segment = self._segment_of(key)
+        if segment is not None:
+            segment.remove(key)
+
+    def victim(self) -> Hashable | None:
+        """Pick the key to evict, admitting the window's oldest key if it wins."""
+        main_victim = self._probation.oldest()
+        if main_victim is None:
+            main_victim = self._protected.oldest()
+        if not self._window.entries or not (self._window.over() or main_victim is None):
+            return main_victim
+        candidate = self._window.oldest()
+        if main_victim is None:
+            return candidate
+        if self.sketch.estimate(candidate) > self.sketch.estimate(main_victim):
+            self._probation.add(candidate, self._window.remove(candidate))
+            self.admitted += 1
+            return main_victim
+        self.rejected += 1
+        return candidate
+
+    def clear(self) -> None:
+        for segment in (self._window, self._probation, self._protected):
+            segment.clear()
+        self.sketch.clear()
+        self.admitted = self.rejected = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "policy": self.name,
+            "window": len(self._window),
+            "probation": len(self._probation),
+            "protected": len(self._protected),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "sketch_resets": self.sketch.resets,
+        }
+
+
+def make_policy(name: str, max_weight: int, max_entries: int) -> LRUPolicy | TinyLFUPolicy:
+    """Build the policy called *name* (unknown names fall back to LRU)."""
+    if name == POLICY_TINYLFU:
+        return TinyLFUPolicy(max_weight, max_entries)
+    if name != POLICY_LRU:
+        logger.warning("Unknown cache eviction policy %r — using LRU", name)
+    return LRUPolicy()
@@ -21,14 +21,44 @@ the fallback chain.
 
 Each layer returns a result tagged with its ``source`` so the agent
 knows the provenance and quality level of the data.
+
+**Circuit breakers** (v1.5.0): each upstream call goes through a breaker
+(``circuit_breaker.py``).  While a source is failing its breaker is open and
+the layer fails immediately, so the chain moves on without paying the full
+timeout.
+
+**Parallel mode** (v1.5.0): with ``TINKYWIKI_FALLBACK_MODE=parallel`` the
+page chain starts each lower layer after a short stagger delay instead of
+waiting for the layer above to fail, and returns the highest-priority
+usable result.  Once a layer wins, lower layers that have not started are
+cancelled; layers already running cannot be interrupted (they are blocking
+Playwright / HTTP calls), so they are abandoned and only warm the caches.
+
+**Index registry** (v1.5.0): each layer's indexed / not-indexed verdict is
+persisted per repo (``index_registry.py``).  Sources known not to have a
+repo are skipped outright and re-probed in the background once the verdict
+is older than ``INDEX_REGISTRY_REPROBE_SECONDS``.
+
+**Local index** (v1.5.0): every page returned by the chain is also fed to
+the local BM25 index (``local_index.py``) so ``tinkywiki_search_wiki`` can
+answer from already-fetched content.
 """
 
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from typing import Callable
+
 from . import config
+from .circuit_breaker import CircuitOpenError, is_open
+from .index_registry import is_known_missing, record_status
+from .local_index import index_page
 from .parser import WikiPage
+from .retry import TINKYWIKI_RENDER
 
 logger = logging.getLogger("TinkyWiki")
 
@@ -36,6 +66,7 @@ logger = logging.getLogger("TinkyWiki")
 SOURCE_CODEWIKI: str = "tinkywiki"
 SOURCE_DEEPWIKI: str = "deepwiki"
 SOURCE_GITHUB_API: str = "github_api"
+SOURCE_LOCAL_INDEX: str = "local_index"
 
 
 @dataclass
@@ -75,7 +106,8 @@ def fetch_page_with_fallback(repo_url: str) -> FallbackResult:
     """Fetch a wiki page trying TinkyWiki → DeepWiki → GitHub API.
 
     This is the main entry point for tools that need page content
-    (list_topics, read_structure, read_contents).
+    (list_topics, read_structure, read_contents).  Successful pages are
+    also indexed for local answering.
 
     Args:
         repo_url: Normalised full GitHub URL (https://github.com/owner/repo).
@@ -83,34 +115,53 @@ def fetch_page_with_fallback(repo_url: str) -> FallbackResult:
     Returns:
         FallbackResult with the page and source tag.
     """
+    result = _fetch_page_chain(repo_url)
+    page = result.page
+    if page is not None and page.sections and not _is_not_indexed_error(page):
+        index_page(repo_url, result.page)
+    return result
+
+
+def _fetch_page_chain(repo_url: str) -> FallbackResult:
+    """Run the page fallback chain without any post-processing."""
     if not config.FALLBACK_ENABLED:
         # Fallback disabled — only try TinkyWiki
-        return _try_tinkywiki(repo_url)
-
-    # --- Layer 1: TinkyWiki ---
-    result = _try_tinkywiki(repo_url)
-    if result.page is not None and not _is_not_indexed_error(result.page):
-        return result
-
-    tinkywiki_not_indexed = result.page is None or _is_not_indexed_error(result.page)
-    logger.info(
-        "fallback: TinkyWiki %s for %s, trying DeepWiki…",
-        "not indexed" if tinkywiki_not_indexed else "failed",
-        repo_url,
-    )
+        return _probe(SOURCE_CODEWIKI, repo_url)
+
+    if config.FALLBACK_MODE == "parallel":
+        return _fetch_page_parallel(repo_url)
+
+    # --- Layer 1: TinkyWiki (skipped when known not to have the repo) ---
+    if is_source_known_missing(repo_url, SOURCE_CODEWIKI):
+        logger.info("fallback: TinkyWiki known not to index %s, trying DeepWiki…", repo_url)
+        tinkywiki_not_indexed = True
+    else:
+        result = _probe(SOURCE_CODEWIKI, repo_url)
+        if result.page is not None and not _is_not_indexed_error(result.page):
+            return result
 
-    # --- Fire-and-forget: request TinkyWiki indexing ---
-    if tinkywiki_not_indexed:
-        _request_tinkywiki_indexing_async(repo_url)
+        tinkywiki_not_indexed = result.page is None or _is_not_indexed_error(result.page)
+        logger.info(
+            "fallback: TinkyWiki %s for %s, trying DeepWiki…",
+            "not indexed" if tinkywiki_not_indexed else "failed",
+            repo_url,
+        )
+
+        # --- Fire-and-forget: request TinkyWiki indexing (pointless during an outage) ---
+        if tinkywiki_not_indexed and not is_open(TINKYWIKI_RENDER):
+            _request_tinkywiki_indexing_async(repo_url)
 
     # --- Layer 2: DeepWiki ---
     if config.DEEPWIKI_ENABLED:
-        result = _try_deepwiki(repo_url)
-        result.tinkywiki_not_indexed = tinkywiki_not_indexed
-        if result.page is not None:
-            return result
+        if is_source_known_missing(repo_url, SOURCE_DEEPWIKI):
+            logger.info("fallback: DeepWiki known not to index %s, trying GitHub API…", repo_url)
+        else:
+            result = _probe(SOURCE_DEEPWIKI, repo_url)
+            result.tinkywiki_not_indexed = tinkywiki_not_indexed
+            if result.page is not None:
+                return result
 
-        logger.info("fallback: DeepWiki failed for %s, trying GitHub API…", repo_url)
+            logger.info("fallback: DeepWiki failed for %s, trying GitHub API…", repo_url)
 
     # --- Layer 3: GitHub API ---
     if config.GITHUB_API_ENABLED:
@@ -129,6 +180,236 @@ def fetch_page_with_fallback(repo_url: str) -> FallbackResult:
     )
 
 
+# ---------------------------------------------------------------------------
+# Index registry integration (v1.5.0)
+# ---------------------------------------------------------------------------
+def _layer_fn(source: str) -> Callable[[str], FallbackResult]:
+    """Return the page layer for *source* (looked up at call time)."""
+    return {
+        SOURCE_CODEWIKI: _try_tinkywiki,
+        SOURCE_DEEPWIKI: _try_deepwiki,
+        SOURCE_GITHUB_API: _try_github_api,
+    }[source]
+
+
+def _record_outcome(repo_url: str, result: FallbackResult) -> None:
+    """Persist a conclusive indexed / not-indexed verdict for *result*.
+
+    Timeouts, errors and open circuits (``page is None``) prove nothing
+    about indexing and are not recorded.
+    """
+    page = result.page
+    try:
+        if result.source == SOURCE_CODEWIKI and page is not None:
+            # A not-indexed / 404 page can still carry a heading
+            if _is_not_indexed_error(page):
+                record_status(repo_url, SOURCE_CODEWIKI, indexed=False)
+            elif page.sections:
+                record_status(repo_url, SOURCE_CODEWIKI, indexed=True)
+        elif result.source == SOURCE_DEEPWIKI:
+            if page is not None:
+                record_status(repo_url, SOURCE_DEEPWIKI, indexed=True)
+            elif result.deepwiki_not_indexed:
+                record_status(repo_url, SOURCE_DEEPWIKI, indexed=False)
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.debug("fallback: could not record index status: %s", exc)
+
+
+def _probe(source: str, repo_url: str) -> FallbackResult:
+    """Run the page layer for *source* and record its verdict."""
+    result = _layer_fn(source)(repo_url)
+    _record_outcome(repo_url, result)
+    return result
+
+
+def is_source_known_missing(repo_url: str, source: str) -> bool:
+    """Return True if *source* is known not to index *repo_url*.
+
+    Stale verdicts schedule a background re-probe of the page layer.
+    """
+    try:
+        return is_known_missing(repo_url, source, reprobe=lambda: _probe(source, repo_url))
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.debug("fallback: index registry unavailable: %s", exc)
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Parallel page fetch (v1.5.0)
+# ---------------------------------------------------------------------------
+_executor_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the shared worker pool for parallel fallback layers."""
+    global _executor  # pylint: disable=global-statement
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, config.FALLBACK_PARALLEL_WORKERS),
+                thread_name_prefix="fallback",
+            )
+        return _executor
+
+
+def _page_layers() -> list[str]:
+    """Return the sources of the enabled page layers in priority order."""
+    layers = [SOURCE_CODEWIKI]
+    if config.DEEPWIKI_ENABLED:
+        layers.append(SOURCE_DEEPWIKI)
+    if config.GITHUB_API_ENABLED:
+        layers.append(SOURCE_GITHUB_API)
+    return layers
+
+
+def _is_usable(result: FallbackResult) -> bool:
+    """Return True if a layer result can be served to the caller."""
+    if result.page is None:
+        return False
+    if result.source == SOURCE_CODEWIKI:
+        return not _is_not_indexed_error(result.page)
+    return True
+
+
+def _run_layer(source: str, repo_url: str) -> FallbackResult:
+    """Run one layer, converting unexpected errors into an empty result."""
+    try:
+        return _probe(source, repo_url)
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.warning("fallback: %s layer raised for %s: %s", source, repo_url, exc)
+        return FallbackResult(page=None, source=source)
+
+
+def _fetch_page_parallel(repo_url: str) -> FallbackResult:
+    """Staggered parallel page fetch with priority-ordered selection.
+
+    Layer *i* starts ``i * FALLBACK_STAGGER_SECONDS`` after the call (or
+    immediately once every higher layer has failed).  A result is returned
+    as soon as the highest-priority layer that can still succeed has a
+    usable page.  At the deadline the best usable result so far wins.
+    """
+    layers = _page_layers()
+    start = time.monotonic()
+    deadline = start + config.FALLBACK_PARALLEL_DEADLINE_SECONDS
+    stagger = max(0.0, config.FALLBACK_STAGGER_SECONDS)
+    futures: list[Future | None] = [None] * len(layers)
+    results: list[FallbackResult | None] = [None] * len(layers)
+
+    # Sources known not to have the repo count as already-failed layers
+    indexing_requested = False
+    for i, source in enumerate(layers):
+        if source != SOURCE_GITHUB_API and is_source_known_missing(repo_url, source):
+            skipped: Future = Future()
+            skipped.set_result(FallbackResult(page=None, source=source))
+            futures[i] = skipped
+            if source == SOURCE_CODEWIKI:
+                indexing_requested = True  # already requested when first discovered
+
+    def _finish(winner: int | None) -> FallbackResult:
+        # Cancel layers that have not started yet; running ones are abandoned
+        for future in futures:
+            if future is not None:
+                future.cancel()
+        return _parallel_result(layers, results, winner)
+
+    while True:
+        now = time.monotonic()
+
+        # Launch layers that are due
+        for i, source in enumerate(layers):
+            if futures[i] is not None:
+                continue
+            higher_failed = all(
+                results[j] is not None and not _is_usable(results[j]) for j in range(i)
+            )
+            if higher_failed or now >= start + i * stagger:
+                logger.debug("fallback[parallel]: starting %s for %s", source, repo_url)
+                futures[i] = _get_executor().submit(_run_layer, source, repo_url)
+
+        # Collect finished layers
+        for i, future in enumerate(futures):
+            if future is not None and results[i] is None and future.done():
+                results[i] = future.result()
+
+        # Fire-and-forget indexing request once TinkyWiki is known to be missing
+        tinkywiki = results[0]
+        if (
+            not indexing_requested
+            and tinkywiki is not None
+            and not _is_usable(tinkywiki)
+            and not is_open(TINKYWIKI_RENDER)
+        ):
+            indexing_requested = True
+            _request_tinkywiki_indexing_async(repo_url)
+
+        # Highest-priority usable result whose betters have all failed
+        for i, result in enumerate(results):
+            if result is None:
+                break
+            if _is_usable(result):
+                return _finish(i)
+        else:
+            return _finish(None)  # every layer finished without a page
+
+        if now >= deadline:
+            usable = [i for i, r in enumerate(results) if r is not None and _is_usable(r)]
+            logger.info(
+                "fallback[parallel]: deadline reached for %s — %s",
+                repo_url,
+                f"using {layers[usable[0]]}" if usable else "no usable result",
+            )
+            return _finish(usable[0] if usable else None)
+
+        # Sleep until a layer finishes, the next layer is due, or the deadline
+        next_event = deadline
+        for i in range(len(layers)):
+            if futures[i] is None:
+                next_event = min(next_event, start + i * stagger)
+                break
+        pending = [f for f in futures if f is not None and not f.done()]
+        timeout = max(0.0, next_event - time.monotonic())
+        if pending:
+            wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        else:
+            time.sleep(min(timeout, 0.05))
+
+
+def _parallel_result(
+    layers: list[str],
+    results: list[FallbackResult | None],
+    winner: int | None,
+) -> FallbackResult:
+    """Build the final FallbackResult with flags reflecting what is known."""
+    by_source = dict(zip(layers, results))
+
+    tinkywiki = by_source.get(SOURCE_CODEWIKI)
+    # Still-running TinkyWiki means "unknown", not "not indexed"
+    tinkywiki_not_indexed = tinkywiki is not None and not _is_usable(tinkywiki)
+
+    deepwiki = by_source.get(SOURCE_DEEPWIKI)
+    if SOURCE_DEEPWIKI not in by_source:
+        deepwiki_not_indexed = True  # disabled layer, same as sequential mode
+    else:
+        deepwiki_not_indexed = deepwiki is not None and not _is_usable(deepwiki)
+
+    if winner is None:
+        return FallbackResult(
+            page=None,
+            source=SOURCE_CODEWIKI,
+            tinkywiki_not_indexed=tinkywiki_not_indexed,
+            deepwiki_not_indexed=True,
+        )
+
+    chosen: FallbackResult = results[winner]  # type: ignore[assignment]
+    source = layers[winner]
+    return replace(
+        chosen,
+        tinkywiki_not_indexed=tinkywiki_not_indexed if source != SOURCE_CODEWIKI else False,
+        deepwiki_not_indexed=deepwiki_not_indexed if source == SOURCE_GITHUB_API else False,
+    )
+
+
 def _try_tinkywiki(repo_url: str) -> FallbackResult:
     """Try fetching from TinkyWiki (primary source)."""
     try:
@@ -136,6 +417,9 @@ def _try_tinkywiki(repo_url: str) -> FallbackResult:
         from .dedup import dedup_fetch  # noqa: E402
         page = dedup_fetch(repo_url, lambda: fetch_wiki_page(repo_url))
         return FallbackResult(page=page, source=SOURCE_CODEWIKI)
+    except CircuitOpenError as exc:
+        logger.info("fallback: TinkyWiki skipped for %s — %s", repo_url, exc)
+        return FallbackResult(page=None, source=SOURCE_CODEWIKI)
     except TimeoutError:
         logger.warning("fallback: TinkyWiki timed out for %s", repo_url)
         return FallbackResult(page=None, source=SOURCE_CODEWIKI)
@@ -148,10 +432,17 @@ def _try_deepwiki(repo_url: str) -> FallbackResult:
     """Try fetching from DeepWiki (secondary source)."""
     try:
         from .deepwiki import fetch_deepwiki_page  # noqa: E402
-        page = fetch_deepwiki_page(repo_url)
+        from .dedup import dedup_fetch  # noqa: E402
+        page = dedup_fetch(f"deepwiki::{repo_url}", lambda: fetch_deepwiki_page(repo_url))
         if page is not None:
             return FallbackResult(page=page, source=SOURCE_DEEPWIKI)
         return FallbackResult(page=None, source=SOURCE_DEEPWIKI, deepwiki_not_indexed=True)
+    except CircuitOpenError as exc:
+        logger.info("fallback: DeepWiki skipped for %s — %s", repo_url, exc)
+        return FallbackResult(page=None, source=SOURCE_DEEPWIKI)
+    except TimeoutError:
+        logger.warning("fallback: DeepWiki timed out for %s", repo_url)
+        return FallbackResult(page=None, source=SOURCE_DEEPWIKI)
     except Exception as exc:  # pylint: disable=broad-except
         logger.warning("fallback: DeepWiki failed for %s: %s", repo_url, exc)
         return FallbackResult(page=None, source=SOURCE_DEEPWIKI)
@@ -171,26 +462,23 @@ def _try_github_api(repo_url: str) -> FallbackResult:
 
 
 def _request_tinkywiki_indexing_async(repo_url: str) -> None:
-    """Fire-and-forget TinkyWiki indexing request (best-effort).
+    """Queue a TinkyWiki indexing request (best-effort, never blocks).
 
-    When TinkyWiki hasn't indexed a repo, we silently submit an indexing
-    request so that it might be available next time.
+    When TinkyWiki hasn't indexed a repo, we silently queue an indexing
+    request so that it might be available next time.  The queue
+    de-duplicates per repo and applies a cool-down (see ``indexing_queue.py``).
     """
     try:
-        import threading
-
-        def _do_request():
-            try:
-                from .tools.request_indexing import _run_request_indexing  # noqa: E402
-                _run_request_indexing(repo_url)
-                logger.info("fallback: auto-requested TinkyWiki indexing for %s", repo_url)
-            except Exception as exc:  # pylint: disable=broad-except
-                logger.debug("fallback: auto-indexing request failed: %s", exc)
-
-        thread = threading.Thread(target=_do_request, daemon=True, name="auto-index")
-        thread.start()
-    except Exception:  # pylint: disable=broad-except
-        pass  # fire-and-forget, never block the main flow
+        from .indexing_queue import (  # noqa: E402
+            ENQUEUED,
+            enqueue_indexing,
+            start_indexing_workers,
+        )
+
+        if enqueue_indexing(repo_url) == ENQUEUED:
+            start_indexing_workers()
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.debug("fallback: could not queue auto-indexing request: %s", exc)
 
 
 # ---------------------------------------------------------------------------
@@ -232,9 +520,15 @@ def search_with_fallback(
             elif result.code in (ErrorCode.INPUT_NOT_FOUND, ErrorCode.DRIVER_ERROR):
                 # Chat UI issues — try DeepWiki
                 logger.info("fallback: TinkyWiki chat failed for %s, trying DeepWiki…", repo_url)
-
-    # --- Layer 2: DeepWiki Ask ---
-    if config.DEEPWIKI_ENABLED and config.FALLBACK_ENABLED:
+            elif result.code == ErrorCode.CIRCUIT_OPEN:
+                logger.info("fallback: TinkyWiki chat circuit open, trying DeepWiki…")
+
+    # --- Layer 2: DeepWiki Ask (skipped when DeepWiki lacks the repo) ---
+    if (
+        config.DEEPWIKI_ENABLED
+        and config.FALLBACK_ENABLED
+        and not is_source_known_missing(repo_url, SOURCE_DEEPWIKI)
+    ):
         try:
             from .deepwiki import deepwiki_ask  # noqa: E402
             response = deepwiki_ask(repo_url, query)
@@ -274,23 +568,35 @@ def search_with_fallback(
 # ---------------------------------------------------------------------------
 # Source banner — prepended to responses to show provenance
 # ---------------------------------------------------------------------------
-def build_source_banner(source: str, tinkywiki_not_indexed: bool = False, deepwiki_not_indexed: bool = False) -> str:
+def build_source_banner(
+    source: str,
+    tinkywiki_not_indexed: bool = False,
+    deepwiki_not_indexed: bool = False,
+    *,
+    origin: str = "",
+) -> str:
     """Build a markdown banner indicating the data source.
 
+    *origin* names the upstream source of locally-indexed content.
+
     Examples::
         > **Source:** Google TinkyWiki
         > **Source:** DeepWiki (TinkyWiki not indexed — auto-requested)
         > **Source:** GitHub API (TinkyWiki & DeepWiki not indexed)
+        > **Source:** Local wiki index (built from Google TinkyWiki content)
     """
     labels = {
         SOURCE_CODEWIKI: "Google TinkyWiki",
         SOURCE_DEEPWIKI: "DeepWiki",
         SOURCE_GITHUB_API: "GitHub API",
+        SOURCE_LOCAL_INDEX: "Local wiki index",
     }
     label = labels.get(source, source)
 
     notes: list[str] = []
-    if source == SOURCE_DEEPWIKI and tinkywiki_not_indexed:
+    if source == SOURCE_LOCAL_INDEX and origin:
+        notes.append(f"built from {labels.get(origin, origin)} content")
+    elif source == SOURCE_DEEPWIKI and tinkywiki_not_indexed:
         notes.append("TinkyWiki not indexed — auto-requested")
     elif source == SOURCE_GITHUB_API:
         parts = []
@@ -11,20 +11,62 @@ to retrieve at least the README, file tree, and basic repo metadata.
 - ``GET /search/code?q={query}+repo:{owner}/{repo}`` — code search
 
 When ``GITHUB_TOKEN`` is set, the rate limit increases to 5000 req/hr.
+
+Requests share the pooled keep-alive client from ``github_client.py``
+(v1.5.0), so the several calls behind one fallback page reuse a warm
+connection.
+
+**Concurrent assembly** (v1.5.0): ``fetch_github_wiki_page`` issues the
+metadata, README and tree requests at once, so the layer costs roughly
+one round-trip.  Inside a :func:`github_request_scope` every endpoint is
+fetched at most once (a request-scoped memo carried in a ``ContextVar``);
+repo metadata is also kept in a short-lived shared cache across calls.
+
+**GraphQL mode** (v1.5.0): with a ``GITHUB_TOKEN`` (GraphQL needs auth),
+``fetch_github_wiki_page`` sends one GraphQL query for metadata, README
+text and the top ``GITHUB_GRAPHQL_TREE_DEPTH`` levels of the tree, and
+builds the same ``WikiPage`` from it.  Any GraphQL failure falls back to
+the REST calls; so do a tree that reaches deeper than the query (before
+its first 200 files) and a README under a name the query doesn't try,
+so the page matches the REST one.
+
+**Local snapshots** (v1.5.0, optional): with ``GITHUB_SNAPSHOT_ENABLED``
+the repo tarball is ingested in the background (``repo_snapshot.py``);
+once present, the file tree and code search are answered offline, with
+real code fragments.
 """
 
 from __future__ import annotations
 
 import base64
+import contextvars
+import functools
 import json
 import logging
-import urllib.error
+import threading
 import urllib.parse
-import urllib.request
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
+from typing import Any
+
+import httpx
 
 from . import config
+from .cache import (
+    NEGATIVE_NOT_FOUND,
+    NEGATIVE_TIMEOUT,
+    get_cached_github_meta,
+    get_negative,
+    set_cached_github_meta,
+    set_negative,
+)
+from .github_client import github_get_json, github_headers, github_post_json, is_allowed_url
+from .repo_snapshot import schedule_snapshot, search_snapshot, snapshot_tree
 from .parser import WikiPage, WikiSection
+from .circuit_breaker import CircuitOpenError, call_with_breaker
+from .retry import GITHUB_API, retry_call
 
 logger = logging.getLogger("TinkyWiki")
 
@@ -34,18 +76,76 @@ logger = logging.getLogger("TinkyWiki")
 # ---------------------------------------------------------------------------
 def _github_headers() -> dict[str, str]:
     """Build HTTP headers for GitHub API requests."""
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "User-Agent": "TinkyWiki-MCP/1.4.0",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
-    if config.GITHUB_TOKEN:
-        headers["Authorization"] = f"Bearer {config.GITHUB_TOKEN}"
-    return headers
+    return github_headers()
+
+
+class _RequestMemo:
+    """Endpoint → result memo shared by all threads of one logical request.
+
+    Concurrent lookups of the same endpoint wait for the first one instead
+    of issuing a second request.  Endpoints that answered 404 or timed out
+    are noted in *failures* (endpoint → negative-cache kind).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._futures: dict[str, Future] = {}
+        self.failures: dict[str, str] = {}
+
+    def get_or_call(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._futures[key] = future
+        if owner:
+            try:
+                future.set_result(fn())
+            except BaseException as exc:
+                future.set_exception(exc)
+                raise
+        return future.result()
+
+
+_request_memo: contextvars.ContextVar[_RequestMemo | None] = contextvars.ContextVar(
+    "github_request_memo", default=None
+)
+
+
+@contextmanager
+def github_request_scope() -> Iterator[None]:
+    """Memoize GitHub API responses for the duration of one tool call.
+
+    Nested scopes reuse the outer memo.
+    """
+    if _request_memo.get() is not None:
+        yield
+        return
+    token = _request_memo.set(_RequestMemo())
+    try:
+        yield
+    finally:
+        _request_memo.reset(token)
+
+
+def _run_concurrently(*calls: Callable[[], Any]) -> list[Any]:
+    """Run *calls* in parallel threads (sharing the request memo); return results in order."""
+    with ThreadPoolExecutor(max_workers=len(calls), thread_name_prefix="github-fetch") as pool:
+        futures = [pool.submit(contextvars.copy_context().run, call) for call in calls]
+        return [future.result() for future in futures]
 
 
 def _github_get(endpoint: str) -> dict | list | None:
-    """Make a GET request to the GitHub API.
+    """GET *endpoint*, at most once per :func:`github_request_scope`."""
+    memo = _request_memo.get()
+    if memo is None:
+        return _github_fetch(endpoint)
+    return memo.get_or_call(endpoint, lambda: _github_fetch(endpoint))
+
+
+def _github_fetch(endpoint: str) -> dict | list | None:
+    """Make a GET request to the GitHub API over the pooled client.
 
     Args:
         endpoint: Path part (e.g. ``/repos/facebook/react/readme``).
@@ -55,21 +155,36 @@ def _github_get(endpoint: str) -> dict | list | None:
     """
     url = f"{config.GITHUB_API_BASE_URL}{endpoint}"
 
-    # Security: enforce HTTPS + allowed host
-    parsed = urllib.parse.urlparse(url)
-    if parsed.scheme != "https" or parsed.netloc != "api.github.com":
+    # Security: enforce HTTPS + allowed host (the client's transport re-checks
+    # every request, including redirects)
+    if not is_allowed_url(url):
         logger.warning("github_api: blocked request to %s", url)
         return None
 
     try:
-        req = urllib.request.Request(url, headers=_github_headers())
-        with urllib.request.urlopen(req, timeout=config.GITHUB_API_TIMEOUT) as resp:
-            return json.loads(resp.read().decode())
-    except (urllib.error.URLError, TimeoutError, json.JSONDecodeError, ValueError) as exc:
+        return retry_call(
+            GITHUB_API, lambda: call_with_breaker(GITHUB_API, lambda: github_get_json(url))
+        ).value
+    except CircuitOpenError as exc:
+        logger.info("github_api: skipped %s — %s", endpoint, exc)
+        return None
+    except (httpx.HTTPError, TimeoutError, json.JSONDecodeError, ValueError) as exc:
         logger.warning("github_api: request failed for %s: %s", endpoint, exc)
+        _note_failure(endpoint, exc)
         return None
 
 
+def _note_failure(endpoint: str, exc: Exception) -> None:
+    """Record a 404 or timeout of *endpoint* in the current request memo."""
+    memo = _request_memo.get()
+    if memo is None:
+        return
+    if isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 404:
+        memo.failures[endpoint] = NEGATIVE_NOT_FOUND
+    elif isinstance(exc, (httpx.TimeoutException, TimeoutError)):
+        memo.failures[endpoint] = NEGATIVE_TIMEOUT
+
+
 def _extract_owner_repo(repo_url: str) -> tuple[str, str] | None:
     """Extract (owner, repo) from a GitHub URL."""
     clean = repo_url.replace("https://github.com/", "").replace("http://github.com/", "")
@@ -101,11 +216,15 @@ def fetch_repo_meta(repo_url: str) -> RepoMeta | None:
         return None
 
     owner, repo = parts
+    cached = get_cached_github_meta(f"{owner}/{repo}")
+    if cached is not None:
+        return cached
+
     data = _github_get(f"/repos/{owner}/{repo}")
     if not data or isinstance(data, list):
         return None
 
-    return RepoMeta(
+    meta = RepoMeta(
         owner=owner,
         repo=repo,
         description=data.get("description") or "",
@@ -114,6 +233,8 @@ def fetch_repo_meta(repo_url: str) -> RepoMeta | None:
         topics=data.get("topics") or [],
         default_branch=data.get("default_branch", "main"),
     )
+    set_cached_github_meta(f"{owner}/{repo}", meta)
+    return meta
 
 
 # ---------------------------------------------------------------------------
@@ -160,9 +281,16 @@ def fetch_file_tree(repo_url: str, max_entries: int = 200) -> list[str] | None:
 
     owner, repo = parts
 
-    # First get the default branch
-    meta = fetch_repo_meta(repo_url)
-    branch = meta.default_branch if meta else "main"
+    # A local snapshot has the full tree without any request
+    if config.GITHUB_SNAPSHOT_ENABLED:
+        paths = snapshot_tree(repo_url, max_entries)
+        if paths:
+            return paths
+
+    # Use the default branch if metadata is already cached; otherwise HEAD
+    # resolves to it server-side, so the tree doesn't wait on a metadata call
+    meta = get_cached_github_meta(f"{owner}/{repo}")
+    branch = meta.default_branch if meta else "HEAD"
 
     data = _github_get(f"/repos/{owner}/{repo}/git/trees/{branch}?recursive=1")
     if not data or isinstance(data, list):
@@ -179,7 +307,9 @@ def fetch_file_tree(repo_url: str, max_entries: int = 200) -> list[str] | None:
 def search_code(repo_url: str, query: str, max_results: int = 10) -> list[dict] | None:
     """Search for code in a repository using GitHub's code search API.
 
-    Returns a list of ``{"path": ..., "fragment": ...}`` dicts, or None.
+    Returns a list of ``{"path": ..., "name": ..., "url": ...}`` dicts, or
+    None.  Results from a local snapshot (``repo_snapshot.py``) also carry
+    ``"line"`` and ``"fragment"``.
 
     **Note**: Code search requires authentication. With no token, this
     endpoint returns 401. Falls back gracefully.
@@ -188,6 +318,11 @@ def search_code(repo_url: str, query: str, max_results: int = 10) -> list[dict]
     if not parts:
         return None
 
+    if config.GITHUB_SNAPSHOT_ENABLED:
+        local = search_snapshot(repo_url, query, max_results)
+        if local is not None:  # snapshot exists: its answer is authoritative
+            return local or None
+
     owner, repo = parts
     q = urllib.parse.quote(f"{query} repo:{owner}/{repo}", safe="")
     data = _github_get(f"/search/code?q={q}&per_page={max_results}")
@@ -208,6 +343,175 @@ def search_code(repo_url: str, query: str, max_results: int = 10) -> list[dict]
     return results if results else None
 
 
+# ---------------------------------------------------------------------------
+# GraphQL backend — metadata + README + tree in one round-trip
+# ---------------------------------------------------------------------------
+# REST ``/readme`` finds the README by name; GraphQL needs explicit paths
+_GRAPHQL_README_NAMES = ("README.md", "README.rst", "README.txt", "README", "readme.md", "Readme.md")
+
+
+def _graphql_tree_selection(depth: int) -> str:
+    """Nested ``entries`` selection for *depth* tree levels."""
+    selection = "entries { path type }"
+    for _ in range(depth - 1):
+        selection = f"entries {{ path type object {{ ... on Tree {{ {selection} }} }} }}"
+    return selection
+
+
+@functools.lru_cache(maxsize=8)
+def _graphql_query(depth: int) -> str:
+    readmes = "\n".join(
+        f'    readme{i}: object(expression: "HEAD:{name}") {{ ... on Blob {{ text }} }}'
+        for i, name in enumerate(_GRAPHQL_README_NAMES)
+    )
+    return f"""query($owner: String!, $name: String!) {{
+  rateLimit {{ cost remaining }}
+  repository(owner: $owner, name: $name) {{
+    description
+    stargazerCount
+    primaryLanguage {{ name }}
+    repositoryTopics(first: 20) {{ nodes {{ topic {{ name }} }} }}
+    defaultBranchRef {{ name }}
+{readmes}
+    tree: object(expression: "HEAD:") {{ ... on Tree {{ {_graphql_tree_selection(depth)} }} }}
+  }}
+}}"""
+
+
+def _use_graphql() -> bool:
+    """GraphQL is used automatically when enabled and a token is configured."""
+    return config.GITHUB_GRAPHQL_ENABLED and bool(config.GITHUB_TOKEN)
+
+
+def _flatten_tree(entries: list[dict], out: list[str], limit: int) -> bool:
+    """Append up to *limit* blob paths in git tree order (depth-first, like REST ``recursive=1``).
+
+    Returns False if a directory below the query depth (no ``object``) was
+    reached first — the listing is then incomplete.
+    """
+    for entry in entries:
+        if len(out) >= limit:
+            return True
+        if entry.get("type") == "blob":
+            out.append(entry.get("path", ""))
+        elif entry.get("type") == "tree":
+            if "object" not in entry:
+                return False
+            if not _flatten_tree((entry["object"] or {}).get("entries") or [], out, limit):
+                return False
+    return True
+
+
+def _github_graphql(owner: str, repo: str) -> dict | None:
+    """POST the wiki-page GraphQL query.
+
+    Returns the ``data`` object (whose ``repository`` is None if the repo
+    doesn't exist), or None if the query failed.
+    """
+    url = f"{config.GITHUB_API_BASE_URL}/graphql"
+    if not is_allowed_url(url):
+        logger.warning("github_api: blocked GraphQL request to %s", url)
+        return None
+
+    payload = {
+        "query": _graphql_query(config.GITHUB_GRAPHQL_TREE_DEPTH),
+        "variables": {"owner": owner, "name": repo},
+    }
+    try:
+        body = retry_call(
+            GITHUB_API, lambda: call_with_breaker(GITHUB_API, lambda: github_post_json(url, payload))
+        ).value
+    except CircuitOpenError as exc:
+        logger.info("github_api: skipped GraphQL for %s/%s — %s", owner, repo, exc)
+        return None
+    except (httpx.HTTPError, TimeoutError, json.JSONDecodeError, ValueError) as exc:
+        logger.warning("github_api: GraphQL request failed for %s/%s: %s", owner, repo, exc)
+        return None
+
+    data = body.get("data") if isinstance(body, dict) else None
+    errors = body.get("errors") if isinstance(body, dict) else None
+    if not isinstance(data, dict):
+        logger.warning("github_api: GraphQL returned no data for %s/%s: %s", owner, repo, errors)
+        return None
+    if errors and not all(e.get("type") == "NOT_FOUND" for e in errors):
+        logger.warning("github_api: GraphQL errors for %s/%s: %s", owner, repo, errors)
+        return None
+    cost = data.get("rateLimit") or {}
+    logger.debug(
+        "github_api: GraphQL cost %s, %s points remaining", cost.get("cost"), cost.get("remaining")
+    )
+    return data
+
+
+def _fetch_parts_graphql(
+    repo_url: str, owner: str, repo: str, max_entries: int = 200
+) -> tuple[RepoMeta | None, str | None, list[str] | None] | None:
+    """Fetch (metadata, README, tree) with one GraphQL query.
+
+    The README and tree come from REST instead when the query can't match
+    REST: no README under the names tried, or a tree deeper than
+    ``GITHUB_GRAPHQL_TREE_DEPTH``.  Returns None if the query failed
+    (caller falls back to REST).
+    """
+    data = _github_graphql(owner, repo)
+    if data is None:
+        return None
+    node = data.get("repository")
+    if not node:
+        return None, None, None
+
+    meta = RepoMeta(
+        owner=owner,
+        repo=repo,
+        description=node.get("description") or "",
+        stars=node.get("stargazerCount", 0),
+        language=(node.get("primaryLanguage") or {}).get("name") or "",
+        topics=[
+            n["topic"]["name"]
+            for n in (node.get("repositoryTopics") or {}).get("nodes") or []
+            if n.get("topic")
+        ],
+        default_branch=(node.get("defaultBranchRef") or {}).get("name") or "main",
+    )
+    set_cached_github_meta(f"{owner}/{repo}", meta)
+
+    readme = next(
+        (
+            blob["text"]
+            for i in range(len(_GRAPHQL_README_NAMES))
+            if (blob := node.get(f"readme{i}")) and blob.get("text")
+        ),
+        None,
+    )
+
+    paths: list[str] = []
+    complete = _flatten_tree((node.get("tree") or {}).get("entries") or [], paths, max_entries)
+    tree = paths or None
+
+    # REST /readme finds any README name; the recursive tree has every level
+    if readme is None and not complete:
+        readme, rest_tree = _run_concurrently(
+            lambda: fetch_readme(repo_url), lambda: fetch_file_tree(repo_url, max_entries)
+        )
+        tree = rest_tree or tree
+    elif readme is None:
+        readme = fetch_readme(repo_url)
+    elif not complete:
+        tree = fetch_file_tree(repo_url, max_entries) or tree
+    return meta, readme, tree
+
+
+def _fetch_parts_rest(repo_url: str) -> tuple[RepoMeta | None, str | None, list[str] | None]:
+    """Fetch (metadata, README, tree) with concurrent REST calls."""
+    with github_request_scope():
+        meta, readme, tree = _run_concurrently(
+            lambda: fetch_repo_meta(repo_url),
+            lambda: fetch_readme(repo_url),
+            lambda: fetch_file_tree(repo_url),
+        )
+    return meta, readme, tree
+
+
 # ---------------------------------------------------------------------------
 # Unified WikiPage builder from GitHub API data
 # ---------------------------------------------------------------------------
@@ -218,7 +522,9 @@ def fetch_github_wiki_page(repo_url: str) -> WikiPage | None:
     documentation that TinkyWiki/DeepWiki provide, but it gives the agent
     *something* to work with.
 
-    Returns a WikiPage or None if the repo doesn't exist on GitHub.
+    Returns a WikiPage or None if the repo doesn't exist on GitHub.  A
+    404 or timeout is remembered in the negative cache, and repeated calls
+    return None without a request until it expires.
     """
     if not config.GITHUB_API_ENABLED:
         return None
@@ -228,14 +534,33 @@ def fetch_github_wiki_page(repo_url: str) -> WikiPage | None:
         return None
 
     owner, repo = parts
+    negative_key = f"github::{repo_url}"
+    failure = get_negative(negative_key)
+    if failure is not None:
+        logger.info("github_api: %s/%s skipped — recently %s (retry in %.0fs)",
+                    owner, repo, failure.kind, failure.retry_after)
+        return None
     logger.info("github_api: building WikiPage for %s/%s", owner, repo)
 
+    with github_request_scope():
+        parts_graphql = _fetch_parts_graphql(repo_url, owner, repo) if _use_graphql() else None
+        if parts_graphql is not None:
+            meta, readme, tree = parts_graphql
+        else:
+            meta, readme, tree = _fetch_parts_rest(repo_url)
+        failures = dict(_request_memo.get().failures)  # type: ignore[union-attr]
+
     sections: list[WikiSection] = []
 
     # 1. Repo metadata section
-    meta = fetch_repo_meta(repo_url)
     if meta is None:
         logger.info("github_api: repo %s/%s not found", owner, repo)
+        # GraphQL answered (with a null repository) — else ask why REST failed
+        kind = NEGATIVE_NOT_FOUND if parts_graphql is not None else failures.get(
+            f"/repos/{owner}/{repo}"
+        )
+        if kind is not None:
+            set_negative(negative_key, kind)
         return None
 
     meta_content = f"**{meta.owner}/{meta.repo}**"
@@ -255,7 +580,6 @@ def fetch_github_wiki_page(repo_url: str) -> WikiPage | None:
     ))
 
     # 2. README section
-    readme = fetch_readme(repo_url)
     if readme:
         # Truncate very long READMEs
         if len(readme) > config.RESPONSE_MAX_CHARS // 2:
@@ -267,7 +591,6 @@ def fetch_github_wiki_page(repo_url: str) -> WikiPage | None:
         ))
 
     # 3. File structure section
-    tree = fetch_file_tree(repo_url)
     if tree:
         tree_content = "```\n" + "\n".join(tree[:100]) + "\n```"
         if len(tree) > 100:
@@ -299,6 +622,7 @@ def fetch_github_wiki_page(repo_url: str) -> WikiPage | None:
         "github_api: built WikiPage for %s/%s — %d sections, %d chars",
         owner, repo, len(sections), len(raw_text),
     )
+    schedule_snapshot(repo_url)
     return page
 
 
@@ -316,12 +640,28 @@ def github_search_answer(repo_url: str, query: str) -> str | None:
         return None
 
     owner, repo = parts
-
-    # Try code search
-    results: list[dict] = search_code(repo_url, query) or []
-
-    # Also get README for context
-    readme = fetch_readme(repo_url)
+    schedule_snapshot(repo_url)
+
+    with github_request_scope():
+        # Code search and README (for context) in parallel
+        search_results, readme = _run_concurrently(
+            lambda: search_code(repo_url, query),
+            lambda: fetch_readme(repo_url),
+        )
+        results: list[dict] = search_results or []
+        answer = _format_search_answer(repo_url, owner, repo, query, results, readme)
+    return answer
+
+
+def _format_search_answer(
+    repo_url: str,
+    owner: str,
+    repo: str,
+    query: str,
+    results: list[dict],
+    readme: str | None,
+) -> str | None:
+    """Format code-search hits and matching README lines as an answer."""
 
     answer_parts: list[str] = []
 
@@ -329,6 +669,8 @@ def github_search_answer(repo_url: str, query: str) -> str | None:
         answer_parts.append(f"**Code search results for \"{query}\" in {owner}/{repo}:**\n")
         for r in results:
             answer_parts.append(f"- [{r['path']}]({r.get('url', '')})")
+            if r.get("fragment"):
+                answer_parts.append(f"  ```\n{r['fragment']}\n  ```")
         answer_parts.append("")
 
     if readme:
@@ -0,0 +1,314 @@
+"""Persistent conditional-request cache and rate-limit tracking for GitHub (v1.5.0).
+
+GitHub does not count ``304 Not Modified`` answers against the rate limit,
+so every GET made through ``github_client`` stores the response's ``ETag``
+/ ``Last-Modified`` validators together with the body (SQLite, see
+``storage.py``, keyed by URL and token scope).  The next GET for that URL
+sends ``If-None-Match`` / ``If-Modified-Since``; a 304 is answered from
+disk — across restarts, and long after the in-memory caches expired.
+
+**Rate limits**: the ``X-RateLimit-*`` headers of every response are
+tracked per resource (``core``, ``search``, ``code_search``, ``graphql``).
+Once fewer than ``GITHUB_RATE_LIMIT_RESERVE`` requests remain before the
+reset, further calls are deferred: a stored body is served without a
+request, otherwise :class:`RateLimitDeferredError` (a
+:class:`CircuitOpenError`, so callers treat it like an open breaker) is
+raised until the window resets.
+
+The store is an optimisation only: SQLite errors (a database locked past
+its timeout, a corrupt file) are logged and treated as "nothing stored",
+never surfaced as a GitHub failure.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Mapping
+
+from . import config
+from .circuit_breaker import CircuitOpenError
+from .storage import SQLiteStore
+
+logger = logging.getLogger("TinkyWiki")
+
+_store = SQLiteStore(
+    "github_http_cache",
+    """
+    CREATE TABLE IF NOT EXISTS http_cache (
+        cache_key     TEXT PRIMARY KEY,
+        etag          TEXT NOT NULL,
+        last_modified TEXT NOT NULL,
+        body          TEXT NOT NULL,
+        stored_at     REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS http_cache_stored_at ON http_cache (stored_at);
+    """,
+)
+
+_lock = threading.Lock()
+_stats = {
+    "lookups": 0,  # GETs seen
+    "conditional": 0,  # GETs sent with validators
+    "not_modified": 0,  # 304s served from the stored body
+    "downloads": 0,  # full 200 responses
+    "deferred_served": 0,  # budget low: stored body served without a request
+    "deferred_refused": 0,  # budget low and nothing stored
+    "errors": 0,  # SQLite errors, served as "no cache"
+}
+_error_logged = False
+
+
+class RateLimitDeferredError(CircuitOpenError):
+    """Raised instead of spending the last requests of a rate-limit window."""
+
+    def __init__(self, resource: str, retry_after: float) -> None:
+        super().__init__(f"github_rate_limit:{resource}", retry_after)
+        self.args = (
+            f"GitHub {resource} rate limit nearly exhausted — deferred for {retry_after:.0f}s",
+        )
+
+
+@dataclass
+class CachedResponse:
+    """A stored GitHub response body with its validators."""
+
+    etag: str
+    last_modified: str
+    body: str
+    stored_at: float
+
+
+@dataclass
+class RateLimitState:
+    """Last ``X-RateLimit-*`` values seen for one resource."""
+
+    resource: str
+    limit: int
+    remaining: int
+    reset_at: float  # epoch seconds
+
+    def to_dict(self) -> dict:
+        return {
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset_in_seconds": max(0, round(self.reset_at - time.time())),
+        }
+
+
+_rate_limits: dict[str, RateLimitState] = {}
+
+# The size cap is enforced every _TRIM_INTERVAL stores, not on each one
+_TRIM_INTERVAL = 64
+_stores_since_trim = _TRIM_INTERVAL  # check on the first store after start-up
+
+
+# ---------------------------------------------------------------------------
+# Conditional-request cache
+# ---------------------------------------------------------------------------
+def _store_failed(action: str, exc: sqlite3.Error) -> None:
+    """Count a store error; warn on the first, then only at debug level."""
+    global _error_logged  # pylint: disable=global-statement
+    with _lock:
+        _stats["errors"] += 1
+        first = not _error_logged
+        _error_logged = True
+    if first:
+        logger.warning("github_cache: %s failed, continuing without the cache: %s", action, exc)
+    else:
+        logger.debug("github_cache: %s failed: %s", action, exc)
+
+
+def _cache_key(url: str) -> str:
+    """Key by URL and token, so authenticated bodies never leak to other tokens."""
+    scope = (
+        hashlib.sha256(config.GITHUB_TOKEN.encode()).hexdigest()[:16]
+        if config.GITHUB_TOKEN
+        else "anon"
+    )
+    return f"{scope} {url}"
+
+
+def get_cached_response(url: str) -> CachedResponse | None:
+    """Return the stored response for *url*, or None."""
+    with _lock:
+        _stats["lookups"] += 1
+    if not config.GITHUB_HTTP_CACHE_ENABLED:
+        return None
+    try:
+        rows = _store.execute(
+            "SELECT etag, last_modified, body, stored_at FROM http_cache WHERE cache_key = ?",
+            (_cache_key(url),),
+        )
+    except sqlite3.Error as exc:
+        _store_failed("read", exc)
+        return None
+    return CachedResponse(*rows[0]) if rows else None
+
+
+def store_response(url: str, etag: str, last_modified: str, body: str) -> None:
+    """Remember *body* and its validators; keep about ``GITHUB_HTTP_CACHE_MAX_ENTRIES``.
+
+    The cap is checked every ``_TRIM_INTERVAL`` stores, so the table may
+    briefly hold up to that many entries more.
+    """
+    global _stores_since_trim  # pylint: disable=global-statement
+    with _lock:
+        _stats["downloads"] += 1
+    if not config.GITHUB_HTTP_CACHE_ENABLED or not (etag or last_modified):
+        return
+    try:
+        _store.execute(
+            "INSERT OR REPLACE INTO http_cache (cache_key, etag, last_modified, body, stored_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (_cache_key(url), etag, last_modified, body, time.time()),
+        )
+    except sqlite3.Error as exc:
+        _store_failed("store", exc)
+        return
+    with _lock:
+        _stores_since_trim += 1
+        due = _stores_since_trim >= _TRIM_INTERVAL
+        if due:
+            _stores_since_trim = 0
+    if due:
+        _trim()
+
+
+def _trim() -> None:
+    """Drop the oldest entries beyond ``GITHUB_HTTP_CACHE_MAX_ENTRIES``."""
+    try:
+        excess = (
+            _store.execute("SELECT COUNT(*) FROM http_cache")[0][0]
+            - config.GITHUB_HTTP_CACHE_MAX_ENTRIES
+        )
+        if excess > 0:
+            _store.execute(
+                "DELETE FROM http_cache WHERE cache_key IN "
+                "(SELECT cache_key FROM http_cache ORDER BY stored_at LIMIT ?)",
+                (excess,),
+            )
+    except sqlite3.Error as exc:
+        _store_failed("trim", exc)
+
+
+def conditional_headers(cached: CachedResponse | None) -> dict[str, str]:
+    """Validator headers for a conditional GET (empty if nothing is stored)."""
+    if cached is None:
+        return {}
+    headers = {}
+    if cached.etag:
+        headers["If-None-Match"] = cached.etag
+    if cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
+    if headers:
+        with _lock:
+            _stats["conditional"] += 1
+    return headers
+
+
+def record_not_modified(url: str) -> None:
+    """Count a 304 and refresh the entry's age (it was just revalidated)."""
+    with _lock:
+        _stats["not_modified"] += 1
+    try:
+        _store.execute(
+            "UPDATE http_cache SET stored_at = ? WHERE cache_key = ?",
+            (time.time(), _cache_key(url)),
+        )
+    except sqlite3.Error as exc:
+        _store_failed("refresh", exc)
+
+
+# ---------------------------------------------------------------------------
+# Rate-limit tracking
+# ---------------------------------------------------------------------------
+def resource_for(path: str) -> str:
+    """GitHub rate-limit resource a request path is billed to.
+
+    Matches the ``X-RateLimit-Resource`` header GitHub sends back, which is
+    what :func:`record_rate_limit` stores the budget under.
+    """
+    if path.startswith("/search/code"):
+        return "code_search"
+    if path.startswith("/search/"):
+        return "search"
+    if path.startswith("/graphql"):
+        return "graphql"
+    return "core"
+
+
+def record_rate_limit(headers: Mapping[str, str], default_resource: str = "core") -> None:
+    """Update the tracked budget from a response's ``X-RateLimit-*`` headers."""
+    try:
+        remaining = int(headers["X-RateLimit-Remaining"])
+        limit = int(headers.get("X-RateLimit-Limit", remaining))
+        reset_at = float(headers.get("X-RateLimit-Reset", 0))
+    except (KeyError, TypeError, ValueError):
+        return
+    resource = headers.get("X-RateLimit-Resource") or default_resource
+    with _lock:
+        _rate_limits[resource] = RateLimitState(resource, limit, remaining, reset_at)
+    if remaining <= config.GITHUB_RATE_LIMIT_RESERVE:
+        logger.warning(
+            "github_cache: %s rate limit low — %d/%d left, resets in %.0fs",
+            resource, remaining, limit, max(0.0, reset_at - time.time()),
+        )
+
+
+def deferral_seconds(resource: str) -> float:
+    """Seconds to wait before spending more of *resource*'s budget (0 = go ahead)."""
+    with _lock:
+        state = _rate_limits.get(resource)
+    if state is None or state.remaining > config.GITHUB_RATE_LIMIT_RESERVE:
+        return 0.0
+    return max(0.0, state.reset_at - time.time())
+
+
+def record_deferral(served: bool) -> None:
+    """Count a deferred call (*served* from the stored body or refused)."""
+    with _lock:
+        _stats["deferred_served" if served else "deferred_refused"] += 1
+
+
+# ---------------------------------------------------------------------------
+# Stats / maintenance
+# ---------------------------------------------------------------------------
+def github_cache_stats() -> dict:
+    """Return counters, hit / 304 ratios and the tracked rate limits."""
+    with _lock:
+        stats: dict = dict(_stats)
+        limits = {name: state.to_dict() for name, state in _rate_limits.items()}
+    hits = stats["not_modified"] + stats["deferred_served"]
+    stats["hit_ratio"] = round(hits / stats["lookups"], 3) if stats["lookups"] else 0.0
+    stats["not_modified_ratio"] = (
+        round(stats["not_modified"] / stats["conditional"], 3) if stats["conditional"] else 0.0
+    )
+    stats["entries"] = 0
+    if config.GITHUB_HTTP_CACHE_ENABLED:
+        try:
+            stats["entries"] = _store.execute("SELECT COUNT(*) FROM http_cache")[0][0]
+        except sqlite3.Error as exc:
+            _store_failed("count", exc)
+    stats["rate_limits"] = limits
+    return stats
+
+
+def clear_github_cache() -> None:
+    """Forget every stored response."""
+    _store.execute("DELETE FROM http_cache")
+
+
+def reset_github_cache_state() -> None:
+    """Reset counters and tracked rate limits (stored responses are kept)."""
+    global _stores_since_trim, _error_logged  # pylint: disable=global-statement
+    with _lock:
+        _rate_limits.clear()
+        _stores_since_trim = _TRIM_INTERVAL
+        _error_logged = False
+        for key in _stats:
+            _stats[key] = 0
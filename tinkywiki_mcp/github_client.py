@@ -0,0 +1,241 @@
+"""Pooled ``httpx`` clients for GitHub REST calls (v1.5.0).
+
+Every GitHub request — repo metadata, README, tree, code search and the
+resolver's repository search — goes through one process-wide
+:class:`httpx.Client`, so calls reuse warm keep-alive (and, with the
+optional ``h2`` package, HTTP/2) connections instead of paying a TCP+TLS
+handshake each time.  Pool size is ``GITHUB_HTTP_MAX_CONNECTIONS`` /
+``GITHUB_HTTP_MAX_KEEPALIVE``; every request goes to ``api.github.com``,
+so these are effectively per-host limits.
+
+**Allowlist**: the transport is wrapped so *every* request the client
+sends — including redirects — must be ``https`` to a host in
+``GITHUB_ALLOWED_HOSTS``; anything else raises :class:`BlockedRequestError`
+before a connection is opened.
+
+GETs are conditional and rate-limit aware — see ``github_cache.py``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import httpx
+
+from . import config
+from .github_cache import (
+    RateLimitDeferredError,
+    conditional_headers,
+    deferral_seconds,
+    get_cached_response,
+    record_deferral,
+    record_not_modified,
+    record_rate_limit,
+    reset_github_cache_state,
+    resource_for,
+    store_response,
+)
+from .http_client import http2_available
+
+logger = logging.getLogger("TinkyWiki")
+
+# codeload.github.com serves the archives /tarball/{ref} redirects to
+GITHUB_ALLOWED_HOSTS: frozenset[str] = frozenset({"api.github.com", "codeload.github.com"})
+
+_lock = threading.Lock()
+_client: httpx.Client | None = None
+_transport: httpx.BaseTransport | None = None  # overridden in tests
+_stats = {"requests": 0, "blocked": 0, "errors": 0}
+
+
+class BlockedRequestError(httpx.RequestError):
+    """Raised for a request to a scheme/host outside the GitHub allowlist."""
+
+
+def is_allowed_url(url: str | httpx.URL) -> bool:
+    """Return True if *url* is ``https`` to an allowlisted GitHub host."""
+    try:
+        parsed = httpx.URL(url) if isinstance(url, str) else url
+    except (httpx.InvalidURL, TypeError, ValueError):
+        return False
+    return parsed.scheme == "https" and parsed.port in (None, 443) and (
+        parsed.host in GITHUB_ALLOWED_HOSTS
+    )
+
+
+def _check_allowed(request: httpx.Request) -> None:
+    with _lock:
+        _stats["requests"] += 1
+    if not is_allowed_url(request.url):
+        with _lock:
+            _stats["blocked"] += 1
+        logger.warning("github_client: blocked request to %s (not in allowlist)", request.url)
+        raise BlockedRequestError(f"blocked request to {request.url}", request=request)
+
+
+class AllowlistTransport(httpx.BaseTransport):
+    """Transport wrapper enforcing the GitHub host allowlist."""
+
+    def __init__(self, inner: httpx.BaseTransport) -> None:
+        self._inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        _check_allowed(request)
+        return self._inner.handle_request(request)
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+def github_headers() -> dict[str, str]:
+    """Build HTTP headers for GitHub API requests."""
+    headers = {
+        "Accept": "application/vnd.github+json",
+        "User-Agent": "TinkyWiki-MCP/1.5.0",
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
+    if config.GITHUB_TOKEN:
+        headers["Authorization"] = f"Bearer {config.GITHUB_TOKEN}"
+    return headers
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=config.GITHUB_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=config.GITHUB_HTTP_MAX_KEEPALIVE,
+    )
+
+
+def _client_options() -> dict[str, Any]:
+    return {
+        "timeout": httpx.Timeout(config.GITHUB_API_TIMEOUT, connect=10.0),
+        "follow_redirects": True,
+    }
+
+
+def get_github_client() -> httpx.Client:
+    """Return the shared GitHub client, creating it on first use."""
+    global _client  # pylint: disable=global-statement
+    with _lock:
+        if _client is None:
+            inner = _transport or httpx.HTTPTransport(http2=http2_available(), limits=_limits())
+            _client = httpx.Client(transport=AllowlistTransport(inner), **_client_options())
+            logger.debug("github_client: created client")
+        return _client
+
+
+def _decode(response: httpx.Response) -> Any:
+    if response.is_error:
+        with _lock:
+            _stats["errors"] += 1
+    response.raise_for_status()
+    return response.json()
+
+
+def github_get_json(url: str, params: dict[str, str] | None = None) -> Any:
+    """GET *url* with the shared client and return the decoded JSON.
+
+    Sends conditional validators from the persistent response cache and
+    answers ``304 Not Modified`` from it; defers the call while the rate
+    limit is nearly exhausted (see ``github_cache.py``).
+
+    Raises:
+        BlockedRequestError: *url* is outside the allowlist.
+        RateLimitDeferredError: Budget nearly exhausted and nothing cached.
+        httpx.HTTPStatusError: GitHub answered with a 4xx/5xx status.
+        httpx.HTTPError: Transport failures.
+        ValueError: The body is not JSON.
+    """
+    # URL(params=None) would drop a query string already present in *url*
+    full_url = httpx.URL(url).copy_merge_params(params) if params else httpx.URL(url)
+    key = str(full_url)
+    resource = resource_for(full_url.path)
+    cached = get_cached_response(key)
+
+    wait = deferral_seconds(resource)
+    if wait > 0:
+        record_deferral(served=cached is not None)
+        if cached is not None:
+            logger.info("github_client: %s budget low — serving stored %s", resource, key)
+            return json.loads(cached.body)
+        raise RateLimitDeferredError(resource, wait)
+
+    headers = {**github_headers(), **conditional_headers(cached)}
+    response = get_github_client().get(full_url, headers=headers)
+    record_rate_limit(response.headers, resource)
+
+    if response.status_code == 304 and cached is not None:
+        record_not_modified(key)
+        logger.debug("github_client: 304 Not Modified for %s", key)
+        return json.loads(cached.body)
+
+    data = _decode(response)
+    store_response(
+        key,
+        response.headers.get("ETag", ""),
+        response.headers.get("Last-Modified", ""),
+        response.text,
+    )
+    return data
+
+
+def github_post_json(url: str, payload: dict[str, Any]) -> Any:
+    """POST *payload* as JSON (e.g. a GraphQL query) and return the decoded JSON.
+
+    Raises the same exceptions as :func:`github_get_json`.
+    """
+    resource = resource_for(httpx.URL(url).path)
+    wait = deferral_seconds(resource)
+    if wait > 0:
+        record_deferral(served=False)
+        raise RateLimitDeferredError(resource, wait)
+    response = get_github_client().post(url, json=payload, headers=github_headers())
+    record_rate_limit(response.headers, resource)
+    return _decode(response)
+
+
+@contextmanager
+def github_stream(url: str) -> Iterator[httpx.Response]:
+    """Stream a large GET (e.g. a repository tarball) without buffering it.
+
+    Yields the response with its body unread; raises like
+    :func:`github_get_json` (the budget check applies, no caching).
+    """
+    resource = resource_for(httpx.URL(url).path)
+    wait = deferral_seconds(resource)
+    if wait > 0:
+        record_deferral(served=False)
+        raise RateLimitDeferredError(resource, wait)
+    with get_github_client().stream("GET", url, headers=github_headers()) as response:
+        record_rate_limit(response.headers, resource)
+        if response.is_error:
+            with _lock:
+                _stats["errors"] += 1
+        response.raise_for_status()
+        yield response
+
+
+def github_client_stats() -> dict:
+    """Return request counters and pool settings."""
+    with _lock:
+        return {
+            **_stats,
+            "max_connections": config.GITHUB_HTTP_MAX_CONNECTIONS,
+        }
+
+
+def reset_github_client() -> None:
+    """Close the shared client and reset counters and rate limits (used between tests)."""
+    global _client  # pylint: disable=global-statement
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+        for key in _stats:
+            _stats[key] = 0
+    reset_github_cache_state()
@@ -0,0 +1,152 @@
+"""Shared pooled ``httpx`` client for plain-HTTP fetches (v1.5.0).
+
+One process-wide :class:`httpx.Client` keeps TCP/TLS connections alive
+across calls (``HTTP_MAX_CONNECTIONS`` / ``HTTP_MAX_KEEPALIVE``) and speaks
+HTTP/2 when the optional ``h2`` package is installed
+(``pip install tinkywiki-mcp[http2]``; disable with ``TINKYWIKI_HTTP2=false``).
+
+**Conditional requests**: responses carrying an ``ETag`` or
+``Last-Modified`` header are remembered (a TTLCache bounded by bytes and
+entries, like the page caches); the next GET
+for the same URL sends ``If-None-Match`` / ``If-Modified-Since`` and a
+``304 Not Modified`` is answered from the remembered body.
+
+Thread-safe: the client is created once under a ``threading.Lock``
+(``httpx.Client`` itself is safe to share between threads).
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+import threading
+from dataclasses import dataclass
+
+import httpx
+
+from . import config
+from .cache import _BudgetCache
+
+logger = logging.getLogger("TinkyWiki")
+
+_DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+_lock = threading.Lock()
+_client: httpx.Client | None = None
+_transport: httpx.BaseTransport | None = None  # overridden in tests
+_validators = _BudgetCache(
+    max_bytes=config.HTTP_CONDITIONAL_CACHE_MAX_BYTES,
+    max_entries=config.HTTP_CONDITIONAL_CACHE_MAX_SIZE,
+    ttl=config.HTTP_CONDITIONAL_CACHE_TTL_SECONDS,
+)
+_stats = {"requests": 0, "not_modified": 0, "errors": 0}
+
+
+@dataclass
+class HttpResult:
+    """Outcome of :func:`fetch_text`."""
+
+    url: str  # final URL after redirects
+    status: int
+    text: str
+    from_revalidation: bool = False  # True when served via 304 Not Modified
+
+
+def http2_available() -> bool:
+    """Return True if HTTP/2 is enabled and the ``h2`` package is importable."""
+    return config.HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+
+
+def get_http_client() -> httpx.Client:
+    """Return the shared client, creating it on first use."""
+    global _client  # pylint: disable=global-statement
+    with _lock:
+        if _client is None:
+            http2 = http2_available() and _transport is None
+            _client = httpx.Client(
+                http2=http2,
+                timeout=httpx.Timeout(config.HTTPX_TIMEOUT_SECONDS, connect=10.0),
+                limits=httpx.Limits(
+                    max_connections=config.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=config.HTTP_MAX_KEEPALIVE,
+                ),
+                headers=_DEFAULT_HEADERS,
+                follow_redirects=True,
+                transport=_transport,
+            )
+            logger.debug("http_client: created (http2=%s)", http2)
+        return _client
+
+
+def fetch_text(url: str, *, headers: dict[str, str] | None = None) -> HttpResult:
+    """GET *url* with conditional-request validators and return its text.
+
+    Raises ``httpx.HTTPError`` subclasses on transport failures; HTTP error
+    statuses are returned, not raised.
+    """
+    request_headers = dict(headers or {})
+    with _lock:
+        remembered = _validators.get(url)
+    if remembered is not None:
+        etag, last_modified, _body = remembered
+        if etag:
+            request_headers["If-None-Match"] = etag
+        if last_modified:
+            request_headers["If-Modified-Since"] = last_modified
+
+    with _lock:
+        _stats["requests"] += 1
+    try:
+        response = get_http_client().get(url, headers=request_headers)
+    except httpx.HTTPError:
+        with _lock:
+            _stats["errors"] += 1
+        raise
+
+    if response.status_code == 304 and remembered is not None:
+        with _lock:
+            _stats["not_modified"] += 1
+        logger.debug("http_client: 304 Not Modified for %s", url)
+        return HttpResult(url=str(response.url), status=200, text=remembered[2],
+                          from_revalidation=True)
+
+    text = response.text
+    etag = response.headers.get("ETag", "")
+    last_modified = response.headers.get("Last-Modified", "")
+    if response.status_code == 200 and (etag or last_modified):
+        with _lock:
+            try:
+                _validators[url] = (etag, last_modified, text)
+            except ValueError:  # larger than the whole budget
+                _validators.pop(url, None)
+    return HttpResult(url=str(response.url), status=response.status_code, text=text)
+
+
+def http_client_stats() -> dict:
+    """Return request counters and pool settings."""
+    with _lock:
+        return {
+            **_stats,
+            "http2": http2_available(),
+            "conditional_entries": len(_validators),
+            "conditional_bytes": _validators.currsize,
+        }
+
+
+def reset_http_client() -> None:
+    """Close the shared client and forget validators (used between tests)."""
+    global _client  # pylint: disable=global-statement
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+        _validators.clear()
+        for key in _stats:
+            _stats[key] = 0
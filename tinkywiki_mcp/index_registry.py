@@ -0,0 +1,129 @@
+"""Persistent per-repo, per-source indexing registry (v1.5.0).
+
+Without this, the "not indexed" state is rediscovered on every cache
+expiry: TinkyWiki's 404 SPA is fully rendered and scanned before DeepWiki
+even gets a turn.  The registry records, per repo and source, whether the
+source had the repo and when that was last checked (SQLite, see
+``storage.py``), so the fallback chain can go straight to the source that
+is known to have it.
+
+**Re-probing**: a *not indexed* verdict older than
+``INDEX_REGISTRY_REPROBE_SECONDS`` is re-checked in the background (see
+``background.py``); the foreground call keeps skipping the source until
+the re-probe reports it as indexed.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from . import config
+from .background import submit_background
+from .storage import SQLiteStore
+
+logger = logging.getLogger("TinkyWiki")
+
+STATUS_INDEXED: str = "indexed"
+STATUS_NOT_INDEXED: str = "not_indexed"
+
+_store = SQLiteStore(
+    "index_registry",
+    """
+    CREATE TABLE IF NOT EXISTS repo_index_status (
+        repo_url   TEXT NOT NULL,
+        source     TEXT NOT NULL,
+        status     TEXT NOT NULL,
+        checked_at REAL NOT NULL,
+        PRIMARY KEY (repo_url, source)
+    );
+    """,
+)
+
+
+@dataclass
+class IndexStatus:
+    """Last known indexing status of a repo on one source."""
+
+    repo_url: str
+    source: str
+    status: str
+    checked_at: float  # wall-clock time.time()
+
+    @property
+    def age_seconds(self) -> float:
+        return max(0.0, time.time() - self.checked_at)
+
+
+def _key(repo_url: str) -> str:
+    return repo_url.rstrip("/").lower()
+
+
+def record_status(repo_url: str, source: str, indexed: bool) -> None:
+    """Record whether *source* had *repo_url* just now."""
+    if not config.INDEX_REGISTRY_ENABLED:
+        return
+    status = STATUS_INDEXED if indexed else STATUS_NOT_INDEXED
+    _store.execute(
+        "INSERT OR REPLACE INTO repo_index_status (repo_url, source, status, checked_at) "
+        "VALUES (?, ?, ?, ?)",
+        (_key(repo_url), source, status, time.time()),
+    )
+    logger.debug("index_registry: %s on %s → %s", repo_url, source, status)
+
+
+def get_status(repo_url: str, source: str) -> IndexStatus | None:
+    """Return the last recorded status for *repo_url* on *source*."""
+    if not config.INDEX_REGISTRY_ENABLED:
+        return None
+    rows = _store.execute(
+        "SELECT status, checked_at FROM repo_index_status WHERE repo_url = ? AND source = ?",
+        (_key(repo_url), source),
+    )
+    if not rows:
+        return None
+    status, checked_at = rows[0]
+    return IndexStatus(repo_url=repo_url, source=source, status=status, checked_at=checked_at)
+
+
+def is_known_missing(
+    repo_url: str,
+    source: str,
+    reprobe: Callable[[], object] | None = None,
+) -> bool:
+    """Return True if *source* is known not to have *repo_url*.
+
+    If the verdict is older than the re-probe interval and *reprobe* is
+    given, it is scheduled in the background (de-duplicated per repo and
+    source).
+    """
+    status = get_status(repo_url, source)
+    if status is None or status.status != STATUS_NOT_INDEXED:
+        return False
+    if reprobe is not None and status.age_seconds >= config.INDEX_REGISTRY_REPROBE_SECONDS:
+        if submit_background(f"reprobe::{source}::{_key(repo_url)}", reprobe):
+            logger.info(
+                "index_registry: re-probing %s on %s (last checked %.0fs ago)",
+                repo_url, source, status.age_seconds,
+            )
+    return True
+
+
+def registry_stats() -> dict:
+    """Return counts of recorded statuses per source."""
+    if not config.INDEX_REGISTRY_ENABLED:
+        return {"enabled": False}
+    rows = _store.execute(
+        "SELECT source, status, COUNT(*) FROM repo_index_status GROUP BY source, status"
+    )
+    stats: dict = {"enabled": True, "path": _store.path}
+    for source, status, count in rows:
+        stats.setdefault(source, {})[status] = count
+    return stats
+
+
+def clear_registry() -> None:
+    """Forget every recorded status."""
+    _store.execute("DELETE FROM repo_index_status")
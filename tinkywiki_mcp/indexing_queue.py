@@ -0,0 +1,298 @@
+"""Durable job queue for TinkyWiki auto-indexing requests (v1.5.0).
+
+The fallback chain used to start one daemon thread (and one Playwright
+context) per not-indexed fetch, so a burst of lookups for the same repo
+opened dozens of identical "Request repository" flows.  Requests now go
+through a small persisted queue (SQLite, see ``storage.py``):
+
+- **De-duplicated**: one job per repo; enqueueing a repo that is already
+  queued or running is a no-op.
+- **Cool-down**: a repo submitted (or given up on) less than
+  ``INDEXING_COOLDOWN_SECONDS`` ago is not re-submitted.
+- **Bounded**: ``INDEXING_QUEUE_WORKERS`` worker threads (default 1) drain
+  the queue at lowered OS priority; ``0`` disables the workers.
+- **Durable**: queued jobs survive restarts; jobs interrupted while
+  running are re-queued when the workers start.
+
+Failed submissions are retried (after ``INDEXING_RETRY_DELAY_SECONDS`` ×
+attempt) up to ``INDEXING_MAX_ATTEMPTS`` times before the job is marked
+``failed``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from . import config
+from .storage import SQLiteStore
+
+logger = logging.getLogger("TinkyWiki")
+
+# Job states
+JOB_QUEUED: str = "queued"
+JOB_RUNNING: str = "running"
+JOB_SUBMITTED: str = "submitted"
+JOB_FAILED: str = "failed"
+
+# enqueue_indexing() outcomes
+ENQUEUED: str = "enqueued"
+ALREADY_PENDING: str = "already_pending"
+COOLING_DOWN: str = "cooling_down"
+
+_IDLE_POLL_SECONDS: float = 30.0
+
+_store = SQLiteStore(
+    "indexing_queue",
+    """
+    CREATE TABLE IF NOT EXISTS indexing_jobs (
+        repo_key    TEXT PRIMARY KEY,
+        repo_url    TEXT NOT NULL,
+        status      TEXT NOT NULL,
+        attempts    INTEGER NOT NULL DEFAULT 0,
+        enqueued_at REAL NOT NULL,
+        updated_at  REAL NOT NULL,
+        last_error  TEXT NOT NULL DEFAULT '',
+        run_after   REAL NOT NULL DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS idx_indexing_jobs_status
+        ON indexing_jobs (status, run_after);
+    """,
+)
+_COLUMNS = "repo_url, status, attempts, enqueued_at, updated_at, last_error"
+
+_lock = threading.Lock()  # serialises read-modify-write on the job table
+_wakeup = threading.Event()
+_stop = threading.Event()
+_workers: list[threading.Thread] = []
+
+
+@dataclass
+class IndexingJob:
+    """One repo's auto-indexing request."""
+
+    repo_url: str
+    status: str
+    attempts: int
+    enqueued_at: float  # wall-clock time.time()
+    updated_at: float
+    last_error: str = ""
+
+    def to_dict(self) -> dict:
+        return {
+            "repo_url": self.repo_url,
+            "status": self.status,
+            "attempts": self.attempts,
+            "enqueued_at": self.enqueued_at,
+            "updated_at": self.updated_at,
+            "last_error": self.last_error,
+        }
+
+
+def _key(repo_url: str) -> str:
+    return repo_url.rstrip("/").lower()
+
+
+def _row_to_job(row: tuple) -> IndexingJob:
+    return IndexingJob(*row)
+
+
+# ---------------------------------------------------------------------------
+# Queue operations
+# ---------------------------------------------------------------------------
+def get_job(repo_url: str) -> IndexingJob | None:
+    """Return the job recorded for *repo_url*, if any."""
+    rows = _store.execute(
+        f"SELECT {_COLUMNS} FROM indexing_jobs WHERE repo_key = ?", (_key(repo_url),)
+    )
+    return _row_to_job(rows[0]) if rows else None
+
+
+def list_jobs(limit: int = 20) -> list[IndexingJob]:
+    """Return the most recently updated jobs."""
+    rows = _store.execute(
+        f"SELECT {_COLUMNS} FROM indexing_jobs ORDER BY updated_at DESC LIMIT ?", (limit,)
+    )
+    return [_row_to_job(row) for row in rows]
+
+
+def enqueue_indexing(repo_url: str) -> str:
+    """Queue an indexing request for *repo_url*.
+
+    Returns:
+        ``ENQUEUED``, ``ALREADY_PENDING`` (queued or running) or
+        ``COOLING_DOWN`` (submitted or given up on recently).
+    """
+    now = time.time()
+    with _lock:
+        job = get_job(repo_url)
+        if job is not None:
+            if job.status in (JOB_QUEUED, JOB_RUNNING):
+                return ALREADY_PENDING
+            if now - job.updated_at < config.INDEXING_COOLDOWN_SECONDS:
+                return COOLING_DOWN
+        _store.execute(
+            "INSERT OR REPLACE INTO indexing_jobs "
+            "(repo_key, repo_url, status, attempts, enqueued_at, updated_at, last_error, run_after) "
+            "VALUES (?, ?, ?, 0, ?, ?, '', 0)",
+            (_key(repo_url), repo_url, JOB_QUEUED, now, now),
+        )
+    logger.info("indexing_queue: queued %s", repo_url)
+    _wakeup.set()
+    return ENQUEUED
+
+
+def _claim_next_job() -> IndexingJob | None:
+    with _lock:
+        rows = _store.execute(
+            f"SELECT {_COLUMNS} FROM indexing_jobs WHERE status = ? AND run_after <= ? "
+            "ORDER BY enqueued_at LIMIT 1",
+            (JOB_QUEUED, time.time()),
+        )
+        if not rows:
+            return None
+        job = _row_to_job(rows[0])
+        job.status = JOB_RUNNING
+        job.attempts += 1
+        job.updated_at = time.time()
+        _store.execute(
+            "UPDATE indexing_jobs SET status = ?, attempts = ?, updated_at = ? "
+            "WHERE repo_key = ?",
+            (job.status, job.attempts, job.updated_at, _key(job.repo_url)),
+        )
+        return job
+
+
+def _finish_job(job: IndexingJob, status: str, error: str = "", delay: float = 0.0) -> None:
+    job.status = status
+    job.last_error = error
+    job.updated_at = time.time()
+    with _lock:
+        _store.execute(
+            "UPDATE indexing_jobs SET status = ?, updated_at = ?, last_error = ?, run_after = ? "
+            "WHERE repo_key = ?",
+            (status, job.updated_at, error, job.updated_at + delay, _key(job.repo_url)),
+        )
+
+
+def process_next_job() -> IndexingJob | None:
+    """Run the oldest queued job to completion in the calling thread.
+
+    Returns the finished job, or None if the queue is empty.
+    """
+    job = _claim_next_job()
+    if job is None:
+        return None
+
+    from .tools.request_indexing import _run_request_indexing  # noqa: E402
+    from .types import ResponseStatus  # noqa: E402
+
+    try:
+        result = _run_request_indexing(job.repo_url)
+        error = ""
+        if result.status != ResponseStatus.OK:
+            error = result.message or (result.code.value if result.code else "error")
+    except Exception as exc:  # pylint: disable=broad-except
+        error = str(exc) or type(exc).__name__
+
+    if not error:
+        _finish_job(job, JOB_SUBMITTED)
+        logger.info("indexing_queue: submitted TinkyWiki indexing request for %s", job.repo_url)
+    elif job.attempts < config.INDEXING_MAX_ATTEMPTS:
+        delay = config.INDEXING_RETRY_DELAY_SECONDS * job.attempts
+        _finish_job(job, JOB_QUEUED, error, delay=delay)
+        logger.debug(
+            "indexing_queue: attempt %d for %s failed (%s), retrying in %.0fs",
+            job.attempts, job.repo_url, error, delay,
+        )
+    else:
+        _finish_job(job, JOB_FAILED, error)
+        logger.warning(
+            "indexing_queue: giving up on %s after %d attempts: %s",
+            job.repo_url, job.attempts, error,
+        )
+    return job
+
+
+def queue_stats() -> dict:
+    """Return job counts per status and the number of live workers."""
+    rows = _store.execute("SELECT status, COUNT(*) FROM indexing_jobs GROUP BY status")
+    stats: dict = {status: count for status, count in rows}
+    stats["workers"] = sum(1 for t in _workers if t.is_alive())
+    return stats
+
+
+def clear_queue() -> None:
+    """Forget every job (mainly for testing)."""
+    with _lock:
+        _store.execute("DELETE FROM indexing_jobs")
+
+
+# ---------------------------------------------------------------------------
+# Workers
+# ---------------------------------------------------------------------------
+def _lower_thread_priority() -> None:
+    """Best-effort: raise this thread's nice value (Linux threads have their own)."""
+    if config.INDEXING_WORKER_NICE <= 0 or not hasattr(os, "setpriority"):
+        return
+    try:
+        tid = threading.get_native_id()
+        os.setpriority(
+            os.PRIO_PROCESS, tid, os.getpriority(os.PRIO_PROCESS, tid) + config.INDEXING_WORKER_NICE
+        )
+    except OSError as exc:
+        logger.debug("indexing_queue: could not lower worker priority: %s", exc)
+
+
+def _worker_loop() -> None:
+    _lower_thread_priority()
+    while not _stop.is_set():
+        try:
+            job = process_next_job()
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("indexing_queue: worker error: %s", exc)
+            job = None
+        if job is None:
+            _wakeup.wait(timeout=_IDLE_POLL_SECONDS)
+            _wakeup.clear()
+
+
+def start_indexing_workers() -> int:
+    """Start the worker threads (idempotent) and resume interrupted jobs.
+
+    Returns the number of live workers.
+    """
+    with _lock:
+        alive = [t for t in _workers if t.is_alive()]
+        if not alive:
+            # Jobs left "running" by a previous process never finished
+            _store.execute(
+                "UPDATE indexing_jobs SET status = ? WHERE status = ?",
+                (JOB_QUEUED, JOB_RUNNING),
+            )
+        _stop.clear()
+        for i in range(len(alive), max(0, config.INDEXING_QUEUE_WORKERS)):
+            thread = threading.Thread(
+                target=_worker_loop, daemon=True, name=f"tinkywiki-indexing-{i}"
+            )
+            thread.start()
+            alive.append(thread)
+        _workers[:] = alive
+    if alive:
+        _wakeup.set()
+        logger.debug("indexing_queue: %d worker(s) running", len(alive))
+    return len(alive)
+
+
+def stop_indexing_workers(timeout: float = 5.0) -> None:
+    """Signal the workers to exit after their current job."""
+    _stop.set()
+    _wakeup.set()
+    with _lock:
+        workers = list(_workers)
+        _workers.clear()
+    for thread in workers:
+        thread.join(timeout=timeout)
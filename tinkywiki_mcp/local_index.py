@@ -0,0 +1,289 @@
+"""Local BM25 answer engine over parsed wiki content (v1.5.0).
+
+Many ``tinkywiki_search_wiki`` questions can be answered straight from the
+``WikiPage.sections`` that ``tinkywiki_read_contents`` already uses, without
+a 20–60 s Playwright chat round-trip.
+
+**How it works**: Whenever the fallback chain returns a parsed page, its
+sections are split into passages (one per paragraph, tagged with the section
+title) and stored in a per-repo inverted index.  Questions are ranked against
+those passages with Okapi BM25.
+
+**Confidence**: A local answer is only *confident* when the best passage
+scores at least ``LOCAL_ANSWER_MIN_SCORE`` **and** contains at least
+``LOCAL_ANSWER_MIN_COVERAGE`` of the distinct query terms.  In ``auto`` mode
+the search tool only returns confident answers and falls through to the live
+chat otherwise.
+
+Thread-safe: uses a ``threading.Lock`` to guard the index registry.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from cachetools import TTLCache
+
+from . import config
+
+if TYPE_CHECKING:
+    from .parser import WikiPage  # parser imports cache, which imports query_match → here
+
+logger = logging.getLogger("TinkyWiki")
+
+# BM25 tuning constants (standard Okapi defaults)
+BM25_K1: float = 1.5
+BM25_B: float = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9_]+")
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+
+STOP_WORDS: frozenset[str] = frozenset(
+    """
+    a about an and are as at be been but by can could did do does doing for
+    from had has have how i if in into is it its me my of on or our should so
+    than that the their them then there these they this those to was we were
+    what when where which who why will with would you your explain tell show
+    describe work works
+    """.split()
+)
+
+
+# ---------------------------------------------------------------------------
+# Tokenisation
+# ---------------------------------------------------------------------------
+def _stem(token: str) -> str:
+    """Very light suffix folding so "components" matches "component"."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-case *text* and split it into stemmed word tokens."""
+    return [_stem(tok) for tok in _TOKEN_RE.findall(text.lower())]
+
+
+def query_terms(query: str) -> list[str]:
+    """Return the distinct content terms of *query* (stop words removed).
+
+    If the query consists only of stop words, all its tokens are kept so
+    that e.g. "what is this" still produces a ranking.
+    """
+    raw = _TOKEN_RE.findall(query.lower())
+    terms = [tok for tok in raw if tok not in STOP_WORDS] or raw
+    return list(dict.fromkeys(_stem(tok) for tok in terms))
+
+
+# ---------------------------------------------------------------------------
+# Index structures
+# ---------------------------------------------------------------------------
+@dataclass
+class Passage:
+    """A single indexed paragraph and the section it belongs to."""
+
+    section: str
+    text: str
+    length: int = 0  # token count, used for BM25 length normalisation
+
+
+@dataclass
+class PassageHit:
+    """A ranked passage for a query."""
+
+    passage: Passage
+    score: float
+    coverage: float  # fraction of query terms present in the passage
+
+
+@dataclass
+class LocalAnswer:
+    """Answer assembled from the best-ranked passages."""
+
+    text: str
+    score: float
+    coverage: float
+    confident: bool
+    page_source: str  # source of the indexed page ("tinkywiki", "deepwiki", …)
+
+
+class LocalIndex:
+    """Inverted index with BM25 ranking over one page's passages."""
+
+    def __init__(self, page: WikiPage) -> None:
+        self.page = page
+        self.passages: list[Passage] = []
+        self._postings: dict[str, list[tuple[int, int]]] = {}
+        self._term_sets: list[frozenset[str]] = []
+
+        for section in page.sections:
+            for paragraph in _PARAGRAPH_RE.split(section.content or ""):
+                paragraph = paragraph.strip()
+                if not paragraph:
+                    continue
+                # Title tokens are indexed with every passage of the section
+                tokens = tokenize(section.title) + tokenize(paragraph)
+                if not tokens:
+                    continue
+                doc_id = len(self.passages)
+                self.passages.append(
+                    Passage(section=section.title, text=paragraph, length=len(tokens))
+                )
+                counts = Counter(tokens)
+                for term, freq in counts.items():
+                    self._postings.setdefault(term, []).append((doc_id, freq))
+                self._term_sets.append(frozenset(counts))
+
+        total = sum(p.length for p in self.passages)
+        self._avgdl = total / len(self.passages) if self.passages else 0.0
+
+    def __len__(self) -> int:
+        return len(self.passages)
+
+    def _idf(self, term: str) -> float:
+        df = len(self._postings.get(term, ()))
+        n = len(self.passages)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, top_k: int = 3) -> list[PassageHit]:
+        """Return the *top_k* passages for *query*, best first."""
+        terms = query_terms(query)
+        if not terms or not self.passages:
+            return []
+
+        scores: dict[int, float] = {}
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf(term)
+            for doc_id, freq in postings:
+                length = self.passages[doc_id].length
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / self._avgdl)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * (
+                    freq * (BM25_K1 + 1) / (freq + norm)
+                )
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        term_set = set(terms)
+        return [
+            PassageHit(
+                passage=self.passages[doc_id],
+                score=score,
+                coverage=len(term_set & self._term_sets[doc_id]) / len(term_set),
+            )
+            for doc_id, score in ranked[:top_k]
+        ]
+
+
+# ---------------------------------------------------------------------------
+# Per-repo registry
+# ---------------------------------------------------------------------------
+_lock = threading.Lock()
+_indexes: TTLCache[str, LocalIndex] = TTLCache(
+    maxsize=config.LOCAL_INDEX_MAX_SIZE,
+    ttl=config.LOCAL_INDEX_TTL_SECONDS,
+)
+
+
+def index_page(repo_url: str, page: WikiPage) -> LocalIndex | None:
+    """Build (or reuse) the local index for *page* under *repo_url*.
+
+    Re-indexing the same ``WikiPage`` object — or a copy with the same
+    content hash, e.g. a re-render of an unchanged wiki — is a no-op, so
+    this is cheap to call on every cache hit.
+    """
+    if not config.LOCAL_INDEX_ENABLED:
+        return None
+
+    with _lock:
+        existing = _indexes.get(repo_url)
+        if existing is not None and (
+            existing.page is page
+            or (page.content_hash and existing.page.content_hash == page.content_hash)
+        ):
+            return existing
+
+    index = LocalIndex(page)
+    with _lock:
+        _indexes[repo_url] = index
+    logger.debug(
+        "local_index: indexed %s — %d passages (%s)", repo_url, len(index), page.source
+    )
+    return index
+
+
+def get_index(repo_url: str) -> LocalIndex | None:
+    """Return the local index for *repo_url*, or ``None``."""
+    with _lock:
+        return _indexes.get(repo_url)
+
+
+def answer_locally(repo_url: str, query: str) -> LocalAnswer | None:
+    """Answer *query* from the local index for *repo_url*.
+
+    Returns ``None`` when no index exists or no passage matches at all.
+    The returned answer's ``confident`` flag tells callers whether the
+    match is strong enough to skip the live chat.
+    """
+    index = get_index(repo_url)
+    if index is None:
+        return None
+
+    hits = index.search(query, top_k=max(1, config.LOCAL_ANSWER_MAX_PASSAGES))
+    if not hits:
+        return None
+
+    best = hits[0]
+    confident = (
+        best.score >= config.LOCAL_ANSWER_MIN_SCORE
+        and best.coverage >= config.LOCAL_ANSWER_MIN_COVERAGE
+    )
+
+    parts: list[str] = []
+    for hit in hits:
+        # Skip weak trailing passages that would only add noise
+        if hit is not best and hit.score < best.score * 0.5:
+            break
+        parts.append(f"### {hit.passage.section}\n\n{hit.passage.text}")
+
+    logger.info(
+        "local_index: %s :: %s — score %.2f, coverage %.0f%% (%s)",
+        repo_url,
+        query[:60],
+        best.score,
+        best.coverage * 100,
+        "confident" if confident else "low confidence",
+    )
+    return LocalAnswer(
+        text="\n\n".join(parts),
+        score=best.score,
+        coverage=best.coverage,
+        confident=confident,
+        page_source=index.page.source,
+    )
+
+
+def clear_indexes() -> None:
+    """Drop every local index (mainly for testing)."""
+    with _lock:
+        _indexes.clear()
+
+
+def index_stats() -> dict:
+    """Return local-index diagnostic information."""
+    with _lock:
+        return {
+            "current_size": len(_indexes),
+            "max_size": _indexes.maxsize,
+            "ttl_seconds": int(_indexes.ttl),
+            "passages": sum(len(idx) for idx in _indexes.values()),
+        }
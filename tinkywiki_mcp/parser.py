@@ -8,22 +8,34 @@ the rendered HTML.
 from __future__ import annotations
 
 import base64
+import concurrent.futures
+import hashlib
+import json
 import logging
 import re
 import warnings
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field, replace
 
 from bs4 import BeautifulSoup, Tag
 from bs4.element import NavigableString
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from . import config
 from .browser import fetch_rendered_html
 from .cache import (
+    NEGATIVE_NOT_INDEXED,
+    NEGATIVE_TIMEOUT,
     get_cached_page,
-    get_cached_wiki_page,
+    get_negative,
+    invalidate,
+    lookup_wiki_page,
+    peek_wiki_page,
     set_cached_page,
     set_cached_wiki_page,
+    set_negative,
 )
+from .circuit_breaker import call_with_breaker
+from .retry import TINKYWIKI_RENDER, retry_call
 
 logger = logging.getLogger("TinkyWiki")
 
@@ -55,6 +67,23 @@ class WikiPage:
     )  # [{type, nodes, edges, content}]
     raw_text: str = ""
     source: str = "tinkywiki"  # "tinkywiki", "deepwiki", or "github_api"
+    stale: bool = False  # served from cache past its soft TTL (refresh scheduled)
+    content_hash: str = ""  # of the extracted content (v1.5.0, see page_content_hash)
+    html_digest: str = ""  # of the rendered HTML the page was parsed from
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def page_content_hash(page: WikiPage) -> str:
+    """Return a stable hash of *page*'s extracted content.
+
+    Covers the title, sections, TOC and diagrams — not ``raw_text``, which
+    picks up UI noise — so re-rendering an unchanged wiki hashes the same.
+    """
+    content = [page.title, [asdict(s) for s in page.sections], page.toc, page.diagrams]
+    return _digest(json.dumps(content, sort_keys=True, ensure_ascii=False, default=str))
 
 
 # ---------------------------------------------------------------------------
@@ -71,7 +100,12 @@ def _fetch_html(url: str) -> str:
     if cached is not None:
         return cached
 
-    html = fetch_rendered_html(url)
+    html = retry_call(
+        TINKYWIKI_RENDER,
+        lambda: call_with_breaker(
+            TINKYWIKI_RENDER, lambda: fetch_rendered_html(url), is_failure=lambda h: not h
+        ),
+    ).value
     if html:
         set_cached_page(url, html)
     return html
@@ -438,11 +472,32 @@ def _parse_graphviz_edges(edge_groups: list[Tag]) -> list[dict[str, str]]:
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
-def fetch_wiki_page(repo_url: str) -> WikiPage:
+def _failure_kind(page: WikiPage) -> str | None:
+    """Negative-cache kind of a failed render (as ``fallback`` judges it), else None."""
+    if not page.sections and not page.raw_text:
+        return NEGATIVE_TIMEOUT  # the render came back empty
+    text = page.raw_text.lower()
+    if any(ind.lower() in text for ind in config.NOT_INDEXED_INDICATORS):
+        return NEGATIVE_NOT_INDEXED
+    return None
+
+
+def fetch_wiki_page(repo_url: str, force: bool = False) -> WikiPage:
     """Fetch and parse a TinkyWiki page for *repo_url*.
 
+    A cached page past its soft TTL is returned at once (``stale=True``)
+    while a background call with *force* re-renders it.  A re-render whose
+    HTML is unchanged reuses the cached page without re-parsing; either
+    way ``set_cached_wiki_page`` compares content hashes to re-stamp or
+    invalidate the entries derived from the page.
+
+    Not-indexed and failed renders aren't kept as pages: they go to the
+    negative cache, and until it expires the call answers at once — a
+    not-indexed stub page, or ``TimeoutError`` for a failed render.
+
     Args:
         repo_url: Full GitHub URL (e.g. https://github.com/owner/repo).
+        force: Skip the caches and re-render.
 
     Returns:
         WikiPage with structured sections, TOC, and diagrams.
@@ -451,14 +506,47 @@ def fetch_wiki_page(repo_url: str) -> WikiPage:
         Exception: If the page cannot be fetched or rendered.
     """
     # Check parsed cache first (avoids re-parsing same HTML)
-    cached_page = get_cached_wiki_page(repo_url)
-    if cached_page is not None:
-        return cached_page
+    if not force:
+        cached = lookup_wiki_page(repo_url, refresh=lambda: fetch_wiki_page(repo_url, force=True))
+        if cached is not None:
+            return replace(cached.value, stale=True) if cached.stale else cached.value
 
     clean_repo = repo_url.replace("https://", "").replace("http://", "")
     target_url = f"{config.TINKYWIKI_BASE_URL}/{clean_repo}"
+    negative_key = f"tinkywiki::{repo_url}"
+
+    if not force:
+        failure = get_negative(negative_key)
+        if failure is not None and failure.kind == NEGATIVE_TIMEOUT:
+            raise TimeoutError(
+                f"TinkyWiki render of {repo_url} failed recently — "
+                f"retry in {failure.retry_after:.0f}s"
+            )
+        if failure is not None:  # not indexed
+            return WikiPage(
+                repo_name=clean_repo,
+                url=target_url,
+                title=clean_repo,
+                raw_text=config.NOT_INDEXED_INDICATORS[0],
+            )
+
+    if force:
+        invalidate(target_url)  # re-render, not the cached HTML
+    try:
+        html = _fetch_html(target_url)
+    except (TimeoutError, concurrent.futures.TimeoutError, PlaywrightTimeoutError) as exc:
+        # run_in_browser_loop raises concurrent.futures.TimeoutError, which is
+        # not the builtin before Python 3.11 — normalise for the callers
+        set_negative(negative_key, NEGATIVE_TIMEOUT)
+        raise TimeoutError(f"TinkyWiki render of {repo_url} timed out") from exc
+
+    html_digest = _digest(html)
+    previous = peek_wiki_page(repo_url)
+    if previous is not None and previous.html_digest == html_digest:
+        logger.info("Re-render of %s unchanged — reusing the parsed page", clean_repo)
+        set_cached_wiki_page(repo_url, previous)  # re-stamps it and its dependents
+        return replace(previous, stale=False)
 
-    html = _fetch_html(target_url)
     soup = BeautifulSoup(html, "lxml")
 
     # Extract repo name from heading or URL
@@ -487,7 +575,9 @@ def fetch_wiki_page(repo_url: str) -> WikiPage:
         toc=toc,
         diagrams=diagrams,
         raw_text=raw_text,
+        html_digest=html_digest,
     )
+    page.content_hash = page_content_hash(page)
 
     logger.info(
         "Parsed %s: %d sections, %d TOC items, %d diagrams, %d chars",
@@ -498,8 +588,12 @@ def fetch_wiki_page(repo_url: str) -> WikiPage:
         len(raw_text),
     )
 
-    # Store in parsed cache for future calls
-    set_cached_wiki_page(repo_url, page)
+    # Store in parsed cache for future calls — or remember the failure
+    failure_kind = _failure_kind(page)
+    if failure_kind is not None:
+        set_negative(negative_key, failure_kind)
+    else:
+        set_cached_wiki_page(repo_url, page)
 
     return page
 
@@ -0,0 +1,244 @@
+"""Canonical forms and near-duplicate matching of search questions (v1.5.0).
+
+Search answers are cached per question, and every miss costs a 20–60 s
+chat round-trip — yet agents rarely ask the same question twice in the
+same words.  "How does the scheduler work?" and "how does the React
+scheduler work" are one question about ``facebook/react``.
+
+**Canonical form**: :func:`canonical_query` folds case, whitespace and
+punctuation, drops stop words (``local_index.STOP_WORDS``, except the
+question words — "why X" is not "how X"), strips the repo's owner and
+name, stems, and sorts the distinct terms.  The search cache is keyed by
+this form, so reworded duplicates are plain cache hits.
+
+**Near duplicates**: each repo keeps an index of the questions whose
+answers are cached — a 64-permutation MinHash signature of the canonical
+terms, banded for locality-sensitive lookup.  :func:`find_similar` takes
+the candidates that share a band and keeps those whose exact Jaccard
+similarity reaches ``SEARCH_DEDUP_THRESHOLD``, best first, so a hit can
+say which original question it reused.
+
+The index only remembers questions; whether their answer is still cached
+is up to the caller (``cache.lookup_search``), which drops stale ones with
+:func:`forget_query`.  Thread-safe: module state is guarded by a lock.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import random
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from . import config
+from .local_index import STOP_WORDS, _stem
+
+logger = logging.getLogger("TinkyWiki")
+
+_TOKEN_RE = re.compile(r"[a-z0-9_]+")
+_QUESTION_WORDS = frozenset({"how", "what", "when", "where", "which", "who", "why"})
+_CANONICAL_STOP_WORDS = STOP_WORDS - _QUESTION_WORDS
+
+_PERMUTATIONS = 64
+_BANDS = 16  # of 4 rows each: pairs with Jaccard 0.75 share a band 99.8% of the time
+_ROWS = _PERMUTATIONS // _BANDS
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x7157)
+_COEFFICIENTS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(_PERMUTATIONS)]
+
+_MAX_REPOS = 256
+_MAX_QUESTIONS_PER_REPO = 200
+
+
+@dataclass
+class QueryMatch:
+    """A cached question similar to the one asked."""
+
+    canonical: str
+    question: str  # its original wording
+    similarity: float  # Jaccard similarity of the canonical terms
+
+
+# ---------------------------------------------------------------------------
+# Canonical form
+# ---------------------------------------------------------------------------
+def _strip_repo_name(tokens: list[str], repo_url: str) -> list[str]:
+    """Drop the repo's owner and name (``vscode-copilot-chat`` as a token run or one word)."""
+    path = repo_url.rstrip("/").split("/")
+    if len(path) < 2:
+        return tokens
+    owner, name = path[-2].lower(), path[-1].lower()
+    parts = _TOKEN_RE.findall(name)
+    names = {owner, "".join(parts)}
+    kept: list[str] = []
+    i = 0
+    while i < len(tokens):
+        if len(parts) > 1 and tokens[i:i + len(parts)] == parts:
+            i += len(parts)
+            continue
+        if tokens[i] not in names:
+            kept.append(tokens[i])
+        i += 1
+    return kept
+
+
+def canonical_terms(query: str, repo_url: str = "") -> list[str]:
+    """Return the sorted distinct content terms of *query* about *repo_url*.
+
+    Falls back to fewer reductions rather than returning nothing, so a
+    question made only of stop words or of the repo name still has a form.
+    """
+    tokens = _TOKEN_RE.findall(query.lower())
+    content = [tok for tok in tokens if tok not in _CANONICAL_STOP_WORDS] or tokens
+    terms = _strip_repo_name(content, repo_url) if repo_url else content
+    return sorted({_stem(tok) for tok in terms or content})
+
+
+def canonical_query(query: str, repo_url: str = "") -> str:
+    """Return the canonical form of *query* (see the module docstring)."""
+    return " ".join(canonical_terms(query, repo_url))
+
+
+# ---------------------------------------------------------------------------
+# MinHash index
+# ---------------------------------------------------------------------------
+def _signature(terms: frozenset[str]) -> tuple[int, ...]:
+    hashes = [
+        int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "big")
+        for term in terms
+    ]
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _COEFFICIENTS)
+
+
+def _bands(signature: tuple[int, ...]) -> list[tuple[int, tuple[int, ...]]]:
+    return [(band, signature[band * _ROWS:(band + 1) * _ROWS]) for band in range(_BANDS)]
+
+
+@dataclass
+class _Question:
+    question: str
+    terms: frozenset[str]
+    signature: tuple[int, ...]
+
+
+class _RepoQuestions:
+    """The questions with cached answers for one repo (LRU-bounded)."""
+
+    def __init__(self) -> None:
+        self.questions: OrderedDict[str, _Question] = OrderedDict()
+        self.buckets: dict[tuple[int, tuple[int, ...]], set[str]] = {}
+
+    def add(self, canonical: str, question: str) -> None:
+        if canonical in self.questions:
+            self.questions[canonical].question = question
+            self.questions.move_to_end(canonical)
+            return
+        terms = frozenset(canonical.split())
+        entry = _Question(question, terms, _signature(terms))
+        self.questions[canonical] = entry
+        for band in _bands(entry.signature):
+            self.buckets.setdefault(band, set()).add(canonical)
+        while len(self.questions) > _MAX_QUESTIONS_PER_REPO:
+            self.remove(next(iter(self.questions)))
+
+    def remove(self, canonical: str) -> None:
+        entry = self.questions.pop(canonical, None)
+        if entry is None:
+            return
+        for band in _bands(entry.signature):
+            bucket = self.buckets.get(band)
+            if bucket is not None:
+                bucket.discard(canonical)
+                if not bucket:
+                    del self.buckets[band]
+
+    def similar(self, canonical: str, threshold: float) -> list[QueryMatch]:
+        terms = frozenset(canonical.split())
+        candidates: set[str] = set()
+        for band in _bands(_signature(terms)):
+            candidates |= self.buckets.get(band, set())
+        candidates.discard(canonical)
+        matches = []
+        for key in candidates:
+            other = self.questions[key]
+            similarity = len(terms & other.terms) / len(terms | other.terms)
+            if similarity >= threshold:
+                matches.append(QueryMatch(key, other.question, round(similarity, 3)))
+        return sorted(matches, key=lambda m: (-m.similarity, m.canonical))
+
+
+_lock = threading.Lock()
+_repos: OrderedDict[str, _RepoQuestions] = OrderedDict()
+_stats = {"canonical_hits": 0, "near_duplicate_hits": 0}
+
+
+def remember_query(repo_url: str, canonical: str, question: str) -> None:
+    """Index *question* (canonical form *canonical*) as answered for *repo_url*."""
+    if not canonical:
+        return
+    with _lock:
+        repo = _repos.get(repo_url)
+        if repo is None:
+            repo = _repos[repo_url] = _RepoQuestions()
+            while len(_repos) > _MAX_REPOS:
+                _repos.popitem(last=False)
+        _repos.move_to_end(repo_url)
+        repo.add(canonical, question)
+
+
+def forget_query(repo_url: str, canonical: str) -> None:
+    """Drop *canonical* from *repo_url*'s index (its answer is gone)."""
+    with _lock:
+        repo = _repos.get(repo_url)
+        if repo is not None:
+            repo.remove(canonical)
+
+
+def question_for(repo_url: str, canonical: str) -> str | None:
+    """Return the original wording indexed for *canonical*, or None."""
+    with _lock:
+        repo = _repos.get(repo_url)
+        entry = repo.questions.get(canonical) if repo is not None else None
+        return entry.question if entry is not None else None
+
+
+def find_similar(repo_url: str, canonical: str) -> list[QueryMatch]:
+    """Return indexed questions of *repo_url* near *canonical*, most similar first."""
+    if not canonical:
+        return []
+    with _lock:
+        repo = _repos.get(repo_url)
+        if repo is None:
+            return []
+        return repo.similar(canonical, config.SEARCH_DEDUP_THRESHOLD)
+
+
+def count_hit(near_duplicate: bool) -> None:
+    """Count a search-cache hit that needed the canonical form or a near duplicate."""
+    with _lock:
+        _stats["near_duplicate_hits" if near_duplicate else "canonical_hits"] += 1
+
+
+# ---------------------------------------------------------------------------
+# Stats / maintenance
+# ---------------------------------------------------------------------------
+def query_match_stats() -> dict:
+    """Return hit counters and index sizes."""
+    with _lock:
+        return {
+            **_stats,
+            "indexed_repos": len(_repos),
+            "indexed_questions": sum(len(r.questions) for r in _repos.values()),
+            "threshold": config.SEARCH_DEDUP_THRESHOLD,
+        }
+
+
+def clear_query_index() -> None:
+    """Forget every indexed question and zero the counters."""
+    with _lock:
+        _repos.clear()
+        for key in _stats:
+            _stats[key] = 0
@@ -0,0 +1,233 @@
+"""Refresh-ahead of frequently requested repositories (v1.5.0).
+
+Parsed pages go stale every ``CACHE_TTL_SECONDS`` (5 min) even while a
+team is querying the repo all day; stale-while-revalidate then serves
+old content and renders in the background, and past the hard TTL the
+next user waits on a cold render.  This module keeps the hot set fresh:
+
+- **Access tracker**: :func:`record_access` (called for every page
+  request) keeps a per-repo hit score that halves every
+  ``_HALF_LIFE_SECONDS`` plus the time of the last request.
+- **Refresher**: one background thread (lowered OS priority, like the
+  indexing workers) wakes every ``REFRESH_AHEAD_INTERVAL_SECONDS`` and
+  re-renders the pages of the ``REFRESH_AHEAD_TOP_K`` hottest repos —
+  requested within ``REFRESH_AHEAD_ACTIVE_SECONDS`` and scoring at least
+  ``REFRESH_AHEAD_MIN_SCORE`` — whose cached page has less than
+  ``REFRESH_AHEAD_LEAD_SECONDS`` of freshness left.  Renders are capped at
+  ``REFRESH_AHEAD_MAX_PER_HOUR`` (the browser budget) and held under the
+  shared single-flight lock, so several server processes refresh a repo
+  once.
+- **Metrics**: ``saved_renders`` counts user requests that arrived after
+  the page's previous freshness ran out and still found it fresh — each
+  one would otherwise have triggered a render.
+
+Only pages already cached are refreshed: a repo that isn't in memory
+has nothing to keep warm.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable
+
+from . import config
+from .cache import wiki_page_fresh_until
+from .shared_cache import single_flight
+
+logger = logging.getLogger("TinkyWiki")
+
+_HALF_LIFE_SECONDS = 600.0
+_MAX_TRACKED = 1000  # repos; the lowest scores are dropped beyond this
+
+
+@dataclass
+class _Access:
+    repo_url: str
+    score: float
+    last_access: float  # time.time()
+
+    def decayed(self, now: float) -> float:
+        return self.score * 0.5 ** ((now - self.last_access) / _HALF_LIFE_SECONDS)
+
+
+_lock = threading.Lock()
+_accesses: dict[str, _Access] = {}
+# repo key → (cache key refreshed, when it would have gone stale otherwise)
+_refreshed: dict[str, tuple[str, float]] = {}
+_renders: deque[float] = deque()  # refresh render times within the last hour
+_stats = {
+    "refreshed": 0,
+    "failed": 0,
+    "skipped_budget": 0,
+    "skipped_shared": 0,
+    "saved_renders": 0,
+}
+_stop = threading.Event()
+_thread: threading.Thread | None = None
+
+
+def _key(repo_url: str) -> str:
+    return repo_url.rstrip("/").lower()
+
+
+# ---------------------------------------------------------------------------
+# Access tracker
+# ---------------------------------------------------------------------------
+def record_access(repo_url: str) -> None:
+    """Count one user request for *repo_url*."""
+    now = time.time()
+    key = _key(repo_url)
+    with _lock:
+        access = _accesses.get(key)
+        if access is None:
+            _accesses[key] = _Access(repo_url, 1.0, now)
+            if len(_accesses) > _MAX_TRACKED:
+                coldest = min(_accesses, key=lambda k: _accesses[k].decayed(now))
+                del _accesses[coldest]
+        else:
+            access.score = access.decayed(now) + 1.0
+            access.last_access = now
+        pending = _refreshed.get(key)
+        if pending is None or now < pending[1]:
+            return
+        del _refreshed[key]
+    fresh_until = wiki_page_fresh_until(pending[0])
+    if fresh_until is not None and fresh_until > now:
+        with _lock:
+            _stats["saved_renders"] += 1
+
+
+def hot_repos(limit: int | None = None) -> list[tuple[str, float]]:
+    """Return ``(repo_url, score)`` of the hottest active repos, best first."""
+    now = time.time()
+    with _lock:
+        ranked = [
+            (access.repo_url, access.decayed(now))
+            for access in _accesses.values()
+            if now - access.last_access <= config.REFRESH_AHEAD_ACTIVE_SECONDS
+        ]
+    ranked = [item for item in ranked if item[1] >= config.REFRESH_AHEAD_MIN_SCORE]
+    ranked.sort(key=lambda item: item[1], reverse=True)
+    return ranked[: config.REFRESH_AHEAD_TOP_K if limit is None else limit]
+
+
+# ---------------------------------------------------------------------------
+# Refresher
+# ---------------------------------------------------------------------------
+def _page_refreshers(repo_url: str) -> list[tuple[str, Callable[[], object]]]:
+    """Parsed-cache keys a repo's page may live under, with how to re-render each."""
+    from .deepwiki import fetch_deepwiki_page  # noqa: E402 — deepwiki imports the browser
+    from .parser import fetch_wiki_page  # noqa: E402
+
+    return [
+        (repo_url, lambda: fetch_wiki_page(repo_url, force=True)),
+        (f"deepwiki::{repo_url}", lambda: fetch_deepwiki_page(repo_url, force=True)),
+    ]
+
+
+def _take_budget(now: float) -> bool:
+    with _lock:
+        while _renders and now - _renders[0] > 3600:
+            _renders.popleft()
+        if len(_renders) >= config.REFRESH_AHEAD_MAX_PER_HOUR:
+            _stats["skipped_budget"] += 1
+            return False
+        _renders.append(now)
+        return True
+
+
+def refresh_due() -> int:
+    """Re-render the hot pages about to go stale; return how many were refreshed."""
+    refreshed = 0
+    for repo_url, _score in hot_repos():
+        for cache_key, refresh in _page_refreshers(repo_url):
+            now = time.time()
+            fresh_until = wiki_page_fresh_until(cache_key)
+            if fresh_until is None or fresh_until - now > config.REFRESH_AHEAD_LEAD_SECONDS:
+                continue
+            if not _take_budget(now):
+                logger.debug("refresh_ahead: hourly budget used up")
+                return refreshed
+            with single_flight(f"refresh::{cache_key}"):
+                # Another process may have refreshed it while we waited
+                latest = wiki_page_fresh_until(cache_key, check_shared=True)
+                if latest is not None and latest - time.time() > config.REFRESH_AHEAD_LEAD_SECONDS:
+                    with _lock:
+                        _renders.pop()  # no render — give the budget back
+                        _stats["skipped_shared"] += 1
+                    continue
+                try:
+                    refresh()
+                except Exception as exc:  # pylint: disable=broad-except
+                    logger.debug("refresh_ahead: %s failed: %s", cache_key, exc)
+                    with _lock:
+                        _stats["failed"] += 1
+                    continue
+            with _lock:
+                _stats["refreshed"] += 1
+                _refreshed.setdefault(_key(repo_url), (cache_key, fresh_until))
+            refreshed += 1
+            logger.debug("refresh_ahead: refreshed %s", cache_key)
+    return refreshed
+
+
+def _refresh_loop() -> None:
+    from .indexing_queue import _lower_thread_priority  # noqa: E402
+
+    _lower_thread_priority()
+    while not _stop.wait(timeout=config.REFRESH_AHEAD_INTERVAL_SECONDS):
+        try:
+            refresh_due()
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("refresh_ahead: refresher error: %s", exc)
+
+
+def start_refresh_ahead() -> bool:
+    """Start the refresher thread (idempotent); False if disabled."""
+    global _thread  # pylint: disable=global-statement
+    if not config.REFRESH_AHEAD_ENABLED or config.REFRESH_AHEAD_TOP_K <= 0:
+        return False
+    with _lock:
+        if _thread is None or not _thread.is_alive():
+            _stop.clear()
+            _thread = threading.Thread(target=_refresh_loop, daemon=True, name="tinkywiki-refresh")
+            _thread.start()
+    return True
+
+
+def stop_refresh_ahead(timeout: float = 5.0) -> None:
+    """Signal the refresher to exit after its current render."""
+    _stop.set()
+    thread = _thread
+    if thread is not None:
+        thread.join(timeout=timeout)
+
+
+# ---------------------------------------------------------------------------
+# Stats / maintenance
+# ---------------------------------------------------------------------------
+def refresh_ahead_stats() -> dict:
+    """Return refresher counters, budget use and the current hot set."""
+    now = time.time()
+    with _lock:
+        stats: dict = dict(_stats)
+        stats["tracked_repos"] = len(_accesses)
+        stats["renders_last_hour"] = sum(1 for t in _renders if now - t <= 3600)
+    stats["budget_per_hour"] = config.REFRESH_AHEAD_MAX_PER_HOUR
+    stats["running"] = _thread is not None and _thread.is_alive()
+    stats["hot"] = [{"repo_url": url, "score": round(score, 2)} for url, score in hot_repos()]
+    return stats
+
+
+def reset_refresh_ahead() -> None:
+    """Forget every access and zero the counters (mainly for testing)."""
+    with _lock:
+        _accesses.clear()
+        _refreshed.clear()
+        _renders.clear()
+        for key in _stats:
+            _stats[key] = 0
@@ -0,0 +1,463 @@
+"""Local repository snapshots for the GitHub fallback layer (v1.5.0, optional).
+
+With ``GITHUB_SNAPSHOT_ENABLED=true`` the GitHub layer ingests a snapshot
+of the repository in the background the first time it serves it: the
+``/tarball/{ref}`` archive is streamed through ``tarfile`` (``r|gz`` — no
+extraction, nothing written to disk but the index) into a SQLite store
+(see ``storage.py``) holding:
+
+- **content-addressed blobs** keyed by their git blob SHA-1, shared by
+  every repo and snapshot that contains the same file;
+- a **path index** per repo (the full tree — not truncated like the REST
+  listing), used by ``github_api.fetch_file_tree``;
+- a **trigram code index** (SQLite FTS5 ``trigram`` tokenizer, external
+  content over the blob table) so ``github_api.search_code`` can return
+  real code fragments without a token.  SQLite builds without FTS5
+  trigram fall back to a substring scan.
+
+**Incremental refresh**: a snapshot older than
+``GITHUB_SNAPSHOT_REFRESH_SECONDS`` is re-checked by its tree SHA (one
+cheap, ETag-cached call).  If the tree is unchanged nothing is
+downloaded; otherwise the tarball is streamed again but only blobs not
+already stored are written and indexed.  Each ingest writes a new
+*generation* of path rows and switches to it in one statement, so
+readers never see a half-written tree.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import re
+import sqlite3
+import tarfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+
+import httpx
+
+from . import config
+from .background import submit_background
+from .circuit_breaker import CircuitOpenError
+from .github_client import github_get_json, github_stream
+from .local_index import query_terms
+from .storage import SQLiteStore
+
+logger = logging.getLogger("TinkyWiki")
+
+_BATCH_SIZE = 200
+_BINARY_SNIFF_BYTES = 8192
+
+_store = SQLiteStore(
+    "repo_snapshots",
+    """
+    CREATE TABLE IF NOT EXISTS snapshots (
+        repo_key      TEXT PRIMARY KEY,
+        ref           TEXT NOT NULL,
+        tree_sha      TEXT NOT NULL,
+        generation    INTEGER NOT NULL,
+        file_count    INTEGER NOT NULL,
+        indexed_files INTEGER NOT NULL,
+        total_bytes   INTEGER NOT NULL,
+        truncated     INTEGER NOT NULL,
+        checked_at    REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS files (
+        repo_key   TEXT NOT NULL,
+        generation INTEGER NOT NULL,
+        path       TEXT NOT NULL,
+        blob_sha   TEXT NOT NULL,
+        size       INTEGER NOT NULL,
+        PRIMARY KEY (repo_key, generation, path)
+    );
+    CREATE INDEX IF NOT EXISTS files_blob ON files (blob_sha);
+    CREATE TABLE IF NOT EXISTS blobs (
+        id       INTEGER PRIMARY KEY,
+        blob_sha TEXT NOT NULL UNIQUE,
+        size     INTEGER NOT NULL,
+        content  TEXT  -- NULL for binary / oversized files (listed, not indexed)
+    );
+    """,
+)
+
+_FTS_SCHEMA = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS blob_fts USING fts5("
+    "content, content='blobs', content_rowid='id', tokenize='trigram')"
+)
+
+
+@dataclass
+class SnapshotInfo:
+    """Metadata of a repo's current snapshot."""
+
+    repo_key: str
+    ref: str
+    tree_sha: str
+    generation: int
+    file_count: int
+    indexed_files: int
+    total_bytes: int
+    truncated: bool
+    checked_at: float
+    new_blobs: int = 0  # set by the ingest that produced it
+
+    @property
+    def age_seconds(self) -> float:
+        return max(0.0, time.time() - self.checked_at)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+def _split_repo(repo_url: str) -> tuple[str, str] | None:
+    clean = re.sub(r"^https?://github\.com/", "", repo_url.strip()).strip("/")
+    parts = clean.split("/")
+    if len(parts) < 2 or not parts[0] or not parts[1]:
+        return None
+    return parts[0], parts[1]
+
+
+def _repo_key(repo_url: str) -> str | None:
+    parts = _split_repo(repo_url)
+    return f"{parts[0]}/{parts[1]}".lower() if parts else None
+
+
+def _fts_available() -> bool:
+    """Create the trigram index if needed; False if this SQLite lacks FTS5 trigram."""
+    try:
+        _store.execute(_FTS_SCHEMA)
+        return True
+    except sqlite3.OperationalError as exc:
+        logger.debug("repo_snapshot: FTS5 trigram unavailable (%s) — using substring scan", exc)
+        return False
+
+
+class _StreamReader(io.RawIOBase):
+    """Minimal file object over an iterator of byte chunks (for ``tarfile``)."""
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:  # type: ignore[override]
+        while not self._pending:
+            try:
+                self._pending = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def _read_member(fileobj, size: int) -> tuple[str, str | None]:
+    """Return (git blob SHA-1, text or None) for one archive member."""
+    digest = hashlib.sha1(f"blob {size}\0".encode())  # noqa: S324 — git object id
+    if size > config.GITHUB_SNAPSHOT_MAX_FILE_BYTES:
+        while chunk := fileobj.read(65536):
+            digest.update(chunk)
+        return digest.hexdigest(), None
+    data = fileobj.read()
+    digest.update(data)
+    if b"\0" in data[:_BINARY_SNIFF_BYTES]:
+        return digest.hexdigest(), None
+    return digest.hexdigest(), data.decode("utf-8", errors="replace")
+
+
+def _store_blobs(batch: list[tuple[str, int, str | None]], fts: bool) -> int:
+    """Insert blobs not stored yet (and index their text); return how many were new."""
+    unique = {sha: (sha, size, text) for sha, size, text in batch}
+    marks = ",".join("?" * len(unique))
+    existing = {
+        row[0]
+        for row in _store.execute(
+            f"SELECT blob_sha FROM blobs WHERE blob_sha IN ({marks})", list(unique)
+        )
+    }
+    new = [row for sha, row in unique.items() if sha not in existing]
+    if not new:
+        return 0
+    _store.executemany("INSERT OR IGNORE INTO blobs (blob_sha, size, content) VALUES (?, ?, ?)", new)
+    if fts:
+        marks = ",".join("?" * len(new))
+        rows = _store.execute(
+            f"SELECT id, content FROM blobs WHERE content IS NOT NULL AND blob_sha IN ({marks})",
+            [row[0] for row in new],
+        )
+        _store.executemany("INSERT INTO blob_fts (rowid, content) VALUES (?, ?)", rows)
+    return len(new)
+
+
+def _collect_garbage(fts: bool) -> None:
+    """Drop blobs no longer referenced by any snapshot (and their index rows).
+
+    Only safe while no ingest is running — their blobs have no ``files``
+    rows yet; see :func:`_ingesting`.
+    """
+    orphans = _store.execute(
+        "SELECT id, content FROM blobs WHERE blob_sha NOT IN (SELECT blob_sha FROM files)"
+    )
+    if not orphans:
+        return
+    if fts:
+        _store.executemany(
+            "INSERT INTO blob_fts (blob_fts, rowid, content) VALUES ('delete', ?, ?)",
+            [row for row in orphans if row[1] is not None],
+        )
+    _store.executemany("DELETE FROM blobs WHERE id = ?", [(row[0],) for row in orphans])
+
+
+# ---------------------------------------------------------------------------
+# Ingestion
+# ---------------------------------------------------------------------------
+_ingest_lock = threading.Lock()
+_ingests_running = 0
+
+
+@contextmanager
+def _ingesting(fts: bool):
+    """Mark an ingest as running; the last one to finish collects garbage.
+
+    Ingests write their blobs batch by batch but their ``files`` rows only
+    at the end, so garbage collection waits until none is in flight (and
+    new ingests wait for it).
+    """
+    global _ingests_running
+    with _ingest_lock:
+        _ingests_running += 1
+    try:
+        yield
+    finally:
+        with _ingest_lock:
+            _ingests_running -= 1
+            if _ingests_running == 0:
+                _collect_garbage(fts)
+
+
+def get_snapshot(repo_url: str) -> SnapshotInfo | None:
+    """Return the current snapshot of *repo_url*, or None."""
+    key = _repo_key(repo_url)
+    if key is None:
+        return None
+    rows = _store.execute(
+        "SELECT repo_key, ref, tree_sha, generation, file_count, indexed_files, total_bytes, "
+        "truncated, checked_at FROM snapshots WHERE repo_key = ?",
+        (key,),
+    )
+    if not rows:
+        return None
+    row = list(rows[0])
+    row[7] = bool(row[7])
+    return SnapshotInfo(*row)
+
+
+def _ingest_tarball(key: str, response: httpx.Response, generation: int, fts: bool) -> dict:
+    """Stream the archive in *response* into the store as *generation*."""
+    files: list[tuple[str, int, str, str, int]] = []
+    batch: list[tuple[str, int, str | None]] = []
+    counts = {"indexed": 0, "bytes": 0, "new_blobs": 0, "truncated": False}
+
+    reader = io.BufferedReader(_StreamReader(response.iter_bytes()), buffer_size=65536)
+    with tarfile.open(fileobj=reader, mode="r|gz") as archive:
+        for member in archive:
+            if not member.isfile() or "/" not in member.name:
+                continue
+            if len(files) >= config.GITHUB_SNAPSHOT_MAX_FILES:
+                counts["truncated"] = True
+                break
+            path = member.name.split("/", 1)[1]  # drop the "owner-repo-sha/" prefix
+            fileobj = archive.extractfile(member)
+            if fileobj is None:
+                continue
+            sha, text = _read_member(fileobj, member.size)
+            files.append((key, generation, path, sha, member.size))
+            batch.append((sha, member.size, text))
+            counts["bytes"] += member.size
+            counts["indexed"] += text is not None
+            if len(batch) >= _BATCH_SIZE:
+                counts["new_blobs"] += _store_blobs(batch, fts)
+                batch = []
+    if batch:
+        counts["new_blobs"] += _store_blobs(batch, fts)
+
+    _store.executemany(
+        "INSERT OR REPLACE INTO files (repo_key, generation, path, blob_sha, size) "
+        "VALUES (?, ?, ?, ?, ?)",
+        files,
+    )
+    counts["files"] = len(files)
+    return counts
+
+
+def ingest_snapshot(repo_url: str, ref: str = "HEAD", force: bool = False) -> SnapshotInfo | None:
+    """Create or refresh the snapshot of *repo_url*; return it (None on failure).
+
+    Fresh snapshots are returned as-is unless *force*; older ones are
+    re-checked by tree SHA and only re-downloaded if the tree changed.
+    """
+    parts = _split_repo(repo_url)
+    if parts is None:
+        return None
+    owner, repo = parts
+    key = f"{owner}/{repo}".lower()
+    current = get_snapshot(repo_url)
+    if current is not None and not force and current.age_seconds < config.GITHUB_SNAPSHOT_REFRESH_SECONDS:
+        return current
+
+    base = f"{config.GITHUB_API_BASE_URL}/repos/{owner}/{repo}"
+    try:
+        tree = github_get_json(f"{base}/git/trees/{ref}")
+        tree_sha = tree.get("sha", "") if isinstance(tree, dict) else ""
+        if current is not None and tree_sha and tree_sha == current.tree_sha:
+            _store.execute("UPDATE snapshots SET checked_at = ? WHERE repo_key = ?", (time.time(), key))
+            logger.debug("repo_snapshot: %s unchanged (tree %s)", key, tree_sha[:12])
+            return get_snapshot(repo_url)
+
+        fts = _fts_available()
+        generation = (current.generation + 1) if current is not None else 1
+        # Leftovers of an interrupted ingest of this generation
+        _store.execute("DELETE FROM files WHERE repo_key = ? AND generation = ?", (key, generation))
+        started = time.monotonic()
+        with _ingesting(fts):
+            with github_stream(f"{base}/tarball/{ref}") as response:
+                counts = _ingest_tarball(key, response, generation, fts)
+            _store.execute(
+                "INSERT OR REPLACE INTO snapshots (repo_key, ref, tree_sha, generation, "
+                "file_count, indexed_files, total_bytes, truncated, checked_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, ref, tree_sha, generation, counts["files"], counts["indexed"],
+                 counts["bytes"], int(counts["truncated"]), time.time()),
+            )
+            _store.execute(
+                "DELETE FROM files WHERE repo_key = ? AND generation <> ?", (key, generation)
+            )
+    except (CircuitOpenError, httpx.HTTPError, tarfile.TarError, OSError, ValueError) as exc:
+        logger.warning("repo_snapshot: ingest failed for %s: %s", key, exc)
+        return current
+
+    info = get_snapshot(repo_url)
+    if info is not None:
+        info.new_blobs = counts["new_blobs"]
+    logger.info(
+        "repo_snapshot: %s — %d files (%d indexed, %d new blobs) in %.1fs",
+        key, counts["files"], counts["indexed"], counts["new_blobs"], time.monotonic() - started,
+    )
+    return info
+
+
+def schedule_snapshot(repo_url: str) -> bool:
+    """Ingest/refresh *repo_url*'s snapshot in the background if enabled and due."""
+    if not config.GITHUB_SNAPSHOT_ENABLED:
+        return False
+    key = _repo_key(repo_url)
+    if key is None:
+        return False
+    current = get_snapshot(repo_url)
+    if current is not None and current.age_seconds < config.GITHUB_SNAPSHOT_REFRESH_SECONDS:
+        return False
+    return submit_background(f"snapshot::{key}", lambda: ingest_snapshot(repo_url))
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+def snapshot_tree(repo_url: str, max_entries: int | None = None) -> list[str] | None:
+    """All file paths of the snapshot (sorted), or None without a snapshot."""
+    info = get_snapshot(repo_url)
+    if info is None:
+        return None
+    sql = "SELECT path FROM files WHERE repo_key = ? AND generation = ? ORDER BY path"
+    params: list = [info.repo_key, info.generation]
+    if max_entries is not None:
+        sql += " LIMIT ?"
+        params.append(max_entries)
+    return [row[0] for row in _store.execute(sql, params)]
+
+
+def _fragment(content: str, terms: list[str], context: int = 1) -> tuple[int, str]:
+    """Return (1-based line, snippet) around the first line matching a term."""
+    lines = content.splitlines()
+    for i, line in enumerate(lines):
+        lowered = line.lower()
+        if any(term in lowered for term in terms):
+            start, end = max(0, i - context), min(len(lines), i + context + 1)
+            return i + 1, "\n".join(lines[start:end])
+    return 1, "\n".join(lines[: 2 * context + 1])
+
+
+def search_snapshot(repo_url: str, query: str, max_results: int = 10) -> list[dict] | None:
+    """Search the snapshot's code for *query*.
+
+    Returns ``{"path", "name", "url", "line", "fragment"}`` dicts (best
+    first), or None if the repo has no snapshot.
+    """
+    info = get_snapshot(repo_url)
+    if info is None:
+        return None
+    terms = [t for t in query_terms(query) if len(t) >= 3]
+    scope = (info.repo_key, info.generation)
+    if terms and _fts_available():
+        match = " OR ".join('"' + t.replace('"', '""') + '"' for t in terms)
+        rows = _store.execute(
+            "SELECT f.path, b.content FROM blob_fts "
+            "JOIN blobs b ON b.id = blob_fts.rowid "
+            "JOIN files f ON f.blob_sha = b.blob_sha "
+            "WHERE blob_fts MATCH ? AND f.repo_key = ? AND f.generation = ? "
+            "ORDER BY rank LIMIT ?",
+            (match, *scope, max_results),
+        )
+    else:
+        terms = terms or [query.strip().lower()]
+        where = " OR ".join("instr(lower(b.content), ?) > 0" for _ in terms)
+        rows = _store.execute(
+            "SELECT f.path, b.content FROM files f JOIN blobs b ON b.blob_sha = f.blob_sha "
+            f"WHERE f.repo_key = ? AND f.generation = ? AND b.content IS NOT NULL AND ({where}) "
+            "ORDER BY f.path LIMIT ?",
+            (*scope, *terms, max_results),
+        )
+
+    results = []
+    for path, content in rows:
+        line, fragment = _fragment(content, terms)
+        results.append({
+            "path": path,
+            "name": path.rsplit("/", 1)[-1],
+            "url": f"https://github.com/{info.repo_key}/blob/HEAD/{path}#L{line}",
+            "line": line,
+            "fragment": fragment,
+        })
+    return results
+
+
+def snapshot_stats() -> dict:
+    """Return snapshot counts and store size."""
+    (repos, files), = _store.execute("SELECT COUNT(*), COALESCE(SUM(file_count), 0) FROM snapshots")
+    (blobs, blob_bytes), = _store.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs")
+    return {
+        "enabled": config.GITHUB_SNAPSHOT_ENABLED,
+        "repos": repos,
+        "files": files,
+        "blobs": blobs,
+        "blob_bytes": blob_bytes,
+    }
+
+
+def clear_snapshots() -> None:
+    """Delete every snapshot, path row and blob."""
+    fts = _fts_available()
+    _store.execute("DELETE FROM snapshots")
+    _store.execute("DELETE FROM files")
+    _store.execute("DELETE FROM blobs")
+    if fts:
+        _store.execute("INSERT INTO blob_fts (blob_fts) VALUES ('delete-all')")
@@ -29,19 +29,20 @@ import asyncio
 import json
 import logging
 import re
-import urllib.error
 import urllib.parse
-import urllib.request
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Literal
 
 from anyio import from_thread
+import httpx
 from cachetools import TTLCache
 from pydantic import BaseModel, Field
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from . import config
 from .browser import _get_browser, run_in_browser_loop
+from .circuit_breaker import CircuitOpenError
+from .github_client import github_get_json, is_allowed_url
 from .stealth import apply_stealth_scripts, stealth_context_options
 
 if TYPE_CHECKING:
@@ -211,7 +212,6 @@ def _fetch_search_results(keyword: str) -> list[SearchResult]:
 # GitHub API fallback — handles typos, misspellings, niche repos
 # ---------------------------------------------------------------------------
 GITHUB_API_SEARCH_URL = "https://api.github.com/search/repositories"
-GITHUB_API_TIMEOUT = 10  # seconds
 
 _github_cache: TTLCache[str, list[SearchResult]] = TTLCache(
     maxsize=50,
@@ -223,7 +223,7 @@ def _github_search(keyword: str, max_results: int = 10) -> list[SearchResult]:
     """Search GitHub REST API for repositories matching *keyword*.
 
     GitHub's search supports fuzzy/typo matching — e.g. "veu" finds "vue".
-    Uses ``urllib.request`` (stdlib) so no extra dependencies needed.
+    Uses the pooled GitHub client (``github_client.py``).
 
     Returns a list of SearchResult (same shape as TinkyWiki results)
     so the elicitation and selection logic is reusable.
@@ -235,35 +235,23 @@ def _github_search(keyword: str, max_results: int = 10) -> list[SearchResult]:
         )
         return cached
 
-    query = urllib.parse.urlencode(
-        {
-            "q": keyword,
-            "sort": "stars",
-            "order": "desc",
-            "per_page": str(max_results),
-        }
-    )
-    url = f"{GITHUB_API_SEARCH_URL}?{query}"
+    params = {
+        "q": keyword,
+        "sort": "stars",
+        "order": "desc",
+        "per_page": str(max_results),
+    }
 
     # Security: enforce HTTPS + allowed host before outbound request
-    parsed = urllib.parse.urlparse(url)
-    if parsed.scheme != "https" or parsed.netloc != "api.github.com":
+    if not is_allowed_url(GITHUB_API_SEARCH_URL):
         logger.warning(
-            "resolver: blocked outbound request to %s (not in allowlist)", url
+            "resolver: blocked outbound request to %s (not in allowlist)",
+            GITHUB_API_SEARCH_URL,
         )
         return []
 
     try:
-        req = urllib.request.Request(
-            url,
-            headers={
-                "Accept": "application/vnd.github+json",
-                "User-Agent": "TinkyWiki-MCP/1.3.0",
-                "X-GitHub-Api-Version": "2022-11-28",
-            },
-        )
-        with urllib.request.urlopen(req, timeout=GITHUB_API_TIMEOUT) as resp:
-            data = json.loads(resp.read().decode())
+        data = github_get_json(GITHUB_API_SEARCH_URL, params=params)
 
         results: list[SearchResult] = []
         for item in data.get("items", [])[:max_results]:
@@ -289,8 +277,11 @@ def _github_search(keyword: str, max_results: int = 10) -> list[SearchResult]:
         _github_cache[keyword.lower()] = results
         return results
 
+    except CircuitOpenError as exc:  # search budget nearly exhausted
+        logger.info("resolver: GitHub API search for '%s' deferred — %s", keyword, exc)
+        return []
     except (
-        urllib.error.URLError,
+        httpx.HTTPError,
         TimeoutError,
         json.JSONDecodeError,
         ValueError,
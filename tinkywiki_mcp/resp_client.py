@@ -0,0 +1,115 @@
+"""Minimal Redis-protocol (RESP2) client for the shared cache (v1.5.0).
+
+Only what ``shared_cache.py`` needs: one blocking socket per client,
+guarded by a ``threading.Lock``, reconnected on the next command after
+any I/O error.  Works against Redis, Valkey, KeyDB, Dragonfly or any
+other server speaking RESP — no client library to install.
+"""
+
+from __future__ import annotations
+
+import socket
+import threading
+from typing import Any
+from urllib.parse import unquote, urlparse
+
+
+class RespError(Exception):
+    """The server answered a command with an error reply."""
+
+
+class RespClient:
+    """A single connection to ``redis://[:password@]host[:port][/db]``."""
+
+    def __init__(self, url: str, timeout: float = 2.0) -> None:
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"unsupported cache URL {url!r} (expected redis://)")
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._sock: socket.socket | None = None
+        self._file: Any = None
+
+    # ------------------------------------------------------------------
+    # Connection
+    # ------------------------------------------------------------------
+    def _connect(self) -> None:
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._sock, self._file = sock, sock.makefile("rb")
+        if self.password:
+            self._call(("AUTH", self.password))
+        if self.db:
+            self._call(("SELECT", self.db))
+
+    def close(self) -> None:
+        """Drop the connection; the next command reconnects."""
+        with self._lock:
+            self._close()
+
+    def _close(self) -> None:
+        if self._sock is not None:
+            try:
+                self._file.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = self._file = None
+
+    # ------------------------------------------------------------------
+    # Protocol
+    # ------------------------------------------------------------------
+    def command(self, *args: Any) -> Any:
+        """Send one command and return its decoded reply.
+
+        Raises:
+            RespError: Error reply from the server.
+            OSError: Connection failure (the connection is dropped).
+        """
+        with self._lock:
+            try:
+                if self._sock is None:
+                    self._connect()
+                return self._call(args)
+            except (OSError, EOFError) as exc:
+                self._close()
+                raise OSError(f"cache server {self.host}:{self.port}: {exc}") from exc
+
+    def _call(self, args: tuple) -> Any:
+        self._sock.sendall(_encode_command(args))
+        return self._read_reply()
+
+    def _read_reply(self) -> Any:
+        line = self._file.readline()
+        if not line.endswith(b"\r\n"):
+            raise EOFError("connection closed")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            raise RespError(body.decode(errors="replace"))
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = self._file.read(length + 2)
+            if len(data) != length + 2:
+                raise EOFError("connection closed")
+            return data[:-2]
+        if kind == b"*":
+            count = int(body)
+            return None if count < 0 else [self._read_reply() for _ in range(count)]
+        raise RespError(f"unexpected reply {line[:40]!r}")
+
+
+def _encode_command(args: tuple) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
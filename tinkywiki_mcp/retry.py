@@ -0,0 +1,277 @@
+"""Shared retry engine with per-upstream policies (v1.5.0).
+
+Every upstream call (TinkyWiki chat and page renders, DeepWiki renders and
+Ask, GitHub REST API) goes through :func:`retry_call` with a named
+:class:`RetryPolicy` instead of hand-rolled ``time.sleep`` loops.
+
+**Classification**: only *transient* failures are retried — timeouts,
+network errors, Playwright timeouts and HTTP 5xx responses.  Deterministic
+failures (``INPUT_NOT_FOUND``, ``VALIDATION``, ``NOT_INDEXED``,
+``RATE_LIMITED``, HTTP 4xx, parse errors) fail immediately.
+
+**Backoff**: exponential (``base_delay * multiplier ** n``, capped at
+``max_delay``) with ±``jitter`` randomisation so concurrent callers don't
+retry in lockstep.
+
+**Budget**: a retry is only scheduled if the backoff sleep still fits in
+the policy's total time budget (or the caller's own deadline), so retries
+never push a call past its deadline.
+
+Thread-safe: uses a ``threading.Lock`` to guard the retry counters.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+import urllib.error
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, TypeVar
+
+from . import config
+from .types import ErrorCode
+
+logger = logging.getLogger("TinkyWiki")
+
+T = TypeVar("T")
+
+# Upstream names (also used as keys in retry_stats())
+TINKYWIKI_CHAT: str = "tinkywiki_chat"
+TINKYWIKI_RENDER: str = "tinkywiki_render"
+DEEPWIKI_RENDER: str = "deepwiki_render"
+DEEPWIKI_HTTP: str = "deepwiki_http"
+DEEPWIKI_ASK: str = "deepwiki_ask"
+GITHUB_API: str = "github_api"
+
+# ErrorCodes that are worth another attempt — everything else is terminal
+RETRYABLE_CODES: frozenset[ErrorCode] = frozenset({
+    ErrorCode.TIMEOUT,
+    ErrorCode.DRIVER_ERROR,
+    ErrorCode.NO_CONTENT,
+    ErrorCode.INTERNAL,
+})
+
+
+# ---------------------------------------------------------------------------
+# Policies
+# ---------------------------------------------------------------------------
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and how patiently to retry one upstream."""
+
+    name: str
+    max_attempts: int
+    base_delay: float
+    max_delay: float
+    multiplier: float
+    jitter: float  # ± fraction of the computed delay
+    budget_seconds: float  # total time (attempts + sleeps) allowed
+
+
+def get_policy(name: str) -> RetryPolicy:
+    """Build the retry policy for upstream *name* from current config."""
+    common: dict[str, Any] = {
+        "max_delay": config.RETRY_MAX_DELAY_SECONDS,
+        "multiplier": config.RETRY_BACKOFF_MULTIPLIER,
+        "jitter": config.RETRY_JITTER,
+    }
+    if name == TINKYWIKI_CHAT:
+        return RetryPolicy(
+            name=name,
+            max_attempts=config.MAX_RETRIES,
+            base_delay=config.RETRY_DELAY_SECONDS,
+            budget_seconds=config.HARD_TIMEOUT_SECONDS * max(1, config.MAX_RETRIES),
+            **common,
+        )
+    if name == DEEPWIKI_ASK:
+        return RetryPolicy(
+            name=name,
+            max_attempts=config.DEEPWIKI_ASK_MAX_ATTEMPTS,
+            base_delay=config.RETRY_DELAY_SECONDS,
+            budget_seconds=config.HARD_TIMEOUT_SECONDS * max(1, config.DEEPWIKI_ASK_MAX_ATTEMPTS),
+            **common,
+        )
+    if name == GITHUB_API:
+        return RetryPolicy(
+            name=name,
+            max_attempts=config.GITHUB_API_MAX_ATTEMPTS,
+            base_delay=config.GITHUB_API_RETRY_DELAY_SECONDS,
+            budget_seconds=config.GITHUB_API_TIMEOUT * 2,
+            **common,
+        )
+    # Page renders (TinkyWiki / DeepWiki) and anything unknown
+    return RetryPolicy(
+        name=name,
+        max_attempts=config.PAGE_FETCH_MAX_ATTEMPTS,
+        base_delay=config.RETRY_DELAY_SECONDS,
+        budget_seconds=config.HARD_TIMEOUT_SECONDS,
+        **common,
+    )
+
+
+def backoff_delay(policy: RetryPolicy, retry_number: int) -> float:
+    """Return the sleep before retry *retry_number* (1-based), with jitter."""
+    delay = min(policy.max_delay, policy.base_delay * policy.multiplier ** (retry_number - 1))
+    if policy.jitter > 0 and delay > 0:
+        delay *= random.uniform(1 - policy.jitter, 1 + policy.jitter)
+    return max(0.0, delay)
+
+
+# ---------------------------------------------------------------------------
+# Classification
+# ---------------------------------------------------------------------------
+def is_retryable_code(code: ErrorCode | None) -> bool:
+    """Return True if a ``ToolResponse`` error *code* is transient."""
+    return code in RETRYABLE_CODES
+
+
+def is_retryable_exception(exc: BaseException) -> bool:
+    """Return True if *exc* signals a transient upstream failure."""
+    if isinstance(exc, urllib.error.HTTPError):
+        return exc.code >= 500
+    status = http_error_status(exc)
+    if status is not None:
+        return status >= 500
+    if isinstance(exc, (TimeoutError, ConnectionError, urllib.error.URLError)):
+        return True
+    # Playwright / httpx timeouts don't subclass TimeoutError — match by name
+    # so this module doesn't import either library.
+    return type(exc).__name__ in ("TimeoutError", "ConnectTimeout", "ReadTimeout",
+                                  "WriteTimeout", "PoolTimeout", "ConnectError",
+                                  "ReadError", "WriteError", "RemoteProtocolError")
+
+
+def http_error_status(exc: BaseException) -> int | None:
+    """Return the HTTP status of an ``httpx.HTTPStatusError``, else None."""
+    if type(exc).__name__ != "HTTPStatusError":
+        return None
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+# ---------------------------------------------------------------------------
+# Counters
+# ---------------------------------------------------------------------------
+_lock = threading.Lock()
+_stats: dict[str, dict[str, int]] = {}
+
+_STAT_KEYS = ("calls", "attempts", "retries", "successes", "failures",
+              "terminal", "budget_exhausted")
+
+
+def _bump(name: str, **deltas: int) -> None:
+    with _lock:
+        counters = _stats.setdefault(name, dict.fromkeys(_STAT_KEYS, 0))
+        for key, delta in deltas.items():
+            counters[key] += delta
+
+
+def retry_stats() -> dict[str, dict[str, int]]:
+    """Return per-upstream retry counters."""
+    with _lock:
+        return {name: dict(counters) for name, counters in _stats.items()}
+
+
+def reset_retry_stats() -> None:
+    """Reset all retry counters (mainly for testing)."""
+    with _lock:
+        _stats.clear()
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+def _sleep(seconds: float) -> None:
+    """Indirection so tests can skip real backoff sleeps."""
+    time.sleep(seconds)
+
+
+@dataclass
+class RetryOutcome(Generic[T]):
+    """Final value of a retried call and how many attempts it took."""
+
+    value: T
+    attempts: int
+
+
+def retry_call(
+    policy: RetryPolicy | str,
+    fn: Callable[[], T],
+    *,
+    retry_if: Callable[[T], bool] | None = None,
+    deadline: float | None = None,
+) -> RetryOutcome[T]:
+    """Call *fn()* under *policy*, retrying transient failures.
+
+    Args:
+        policy: A ``RetryPolicy`` or the name of an upstream.
+        fn: Zero-argument callable performing one attempt.
+        retry_if: Optional predicate on a *returned* value — True means
+            the result is a transient failure worth retrying.
+        deadline: Optional absolute ``time.monotonic()`` deadline of the
+            caller; retries are never scheduled past it.
+
+    Returns:
+        ``RetryOutcome`` with the last value returned by *fn*.
+
+    Raises:
+        The last exception from *fn* if it was terminal or retries ran out.
+    """
+    if isinstance(policy, str):
+        policy = get_policy(policy)
+
+    start = time.monotonic()
+    budget_end = start + policy.budget_seconds
+    if deadline is not None:
+        budget_end = min(budget_end, deadline)
+    max_attempts = max(1, policy.max_attempts)
+    _bump(policy.name, calls=1)
+
+    attempt = 0
+    while True:
+        attempt += 1
+        _bump(policy.name, attempts=1)
+        try:
+            value = fn()
+        except Exception as exc:  # pylint: disable=broad-except
+            if not is_retryable_exception(exc):
+                _bump(policy.name, terminal=1, failures=1)
+                raise
+            value = None  # type: ignore[assignment]
+            reason: str = f"{type(exc).__name__}: {exc}"
+            error: Exception | None = exc
+        else:
+            if retry_if is None or not retry_if(value):
+                _bump(policy.name, successes=1)
+                return RetryOutcome(value=value, attempts=attempt)
+            reason = "retryable result"
+            error = None
+
+        if attempt >= max_attempts:
+            _bump(policy.name, failures=1)
+            return _give_up(value, error, attempt)
+
+        delay = backoff_delay(policy, attempt)
+        if time.monotonic() + delay >= budget_end:
+            logger.info(
+                "retry[%s]: budget exhausted after attempt %d (%s)",
+                policy.name, attempt, reason,
+            )
+            _bump(policy.name, budget_exhausted=1, failures=1)
+            return _give_up(value, error, attempt)
+
+        logger.info(
+            "retry[%s]: attempt %d/%d failed (%s) — retrying in %.1fs",
+            policy.name, attempt, max_attempts, reason, delay,
+        )
+        _bump(policy.name, retries=1)
+        _sleep(delay)
+
+
+def _give_up(value: Any, error: Exception | None, attempts: int) -> RetryOutcome:
+    """Re-raise the last exception, or return the last (failed) value."""
+    if error is not None:
+        raise error
+    return RetryOutcome(value=value, attempts=attempts)
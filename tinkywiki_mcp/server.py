@@ -107,6 +107,13 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         default=config.VERBOSE,
         help="Enable verbose/debug logging",
     )
+    parser.add_argument(
+        "--warmup",
+        metavar="FILE",
+        default=None,
+        help="Warm the caches for the repos listed in FILE after startup "
+        "(default: $TINKYWIKI_WARMUP_MANIFEST / $TINKYWIKI_WARMUP_REPOS)",
+    )
     parser.set_defaults(transport="stdio")
     return parser.parse_args(argv)
 
@@ -140,6 +147,35 @@ def main(argv: list[str] | None = None) -> None:
 
     mcp = create_server(transport=args.transport)
 
+    # Resume queued auto-indexing requests from a previous run
+    try:
+        from .indexing_queue import (  # pylint: disable=import-outside-toplevel
+            start_indexing_workers,
+        )
+
+        start_indexing_workers()
+    except (RuntimeError, OSError) as exc:
+        logger.warning("Could not start indexing queue workers: %s", exc)
+
+    # Keep the most requested repos fresh ahead of their TTL
+    try:
+        from .refresh_ahead import (  # pylint: disable=import-outside-toplevel
+            start_refresh_ahead,
+        )
+
+        start_refresh_ahead()
+    except (RuntimeError, OSError) as exc:
+        logger.warning("Could not start the refresh-ahead thread: %s", exc)
+
+    # Warm the caches for the manifest repos — in the background, so stdio
+    # clients are served at once
+    try:
+        from .warmup import start_warmup  # pylint: disable=import-outside-toplevel
+
+        start_warmup(args.warmup)
+    except (RuntimeError, OSError) as exc:
+        logger.warning("Could not start the cache warm-up: %s", exc)
+
     try:
         if args.transport == "sse":
             logger.info("Starting SSE server on port %d...", args.port)
@@ -151,6 +187,17 @@ def main(argv: list[str] | None = None) -> None:
     except SystemExit:
         pass
     finally:
+        try:
+            from .refresh_ahead import (  # pylint: disable=import-outside-toplevel
+                stop_refresh_ahead,
+            )
+
+            from .warmup import stop_warmup  # pylint: disable=import-outside-toplevel
+
+            stop_refresh_ahead()
+            stop_warmup()
+        except RuntimeError:
+            logger.debug("Suppressed exception during cleanup", exc_info=True)
         # Ensure session pool + Playwright cleanup even if signal handler didn't fire
         try:
             from .session_pool import (
@@ -0,0 +1,294 @@
+"""Shared cache backend and cross-process single-flight (v1.5.0).
+
+Several server processes behind a load balancer each keep their own L1
+(``cache.py``) and in-flight map (``dedup.py``).  This module is what
+they share, selected by ``TINKYWIKI_CACHE_BACKEND``:
+
+- **sqlite** (default) — ``disk_cache.py``'s WAL-mode file under
+  ``DATA_DIR``: every process on the host.
+- **redis** — any RESP server at ``TINKYWIKI_CACHE_REDIS_URL`` (Redis,
+  Valkey, …): workers on several hosts.  Entries expire through the
+  server's TTL; its ``maxmemory`` policy replaces the L2 byte budget.
+  An unreachable server is skipped for ``_REDIS_RETRY_SECONDS``.
+- **none** (or ``TINKYWIKI_CACHE_L2=false``) — per-process caches only.
+
+:func:`single_flight` holds a named lock in the same backend around a
+render: a process that finds it taken polls until the owner releases it
+(or ``CACHE_LOCK_TTL_SECONDS`` passes) and then runs its own fetch —
+which, the owner having written the result to the shared L2, is a cache
+hit.  Every backend failure degrades to "no shared cache, no lock".
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from . import config
+from .disk_cache import (
+    DiskEntry,
+    _decode,
+    _encode,
+    clear_disk_cache,
+    disk_cache_stats,
+    disk_delete,
+    disk_get,
+    disk_set,
+    disk_try_lock,
+    disk_unlock,
+)
+from .resp_client import RespClient, RespError
+
+logger = logging.getLogger("TinkyWiki")
+
+BACKEND_SQLITE = "sqlite"
+BACKEND_REDIS = "redis"
+BACKEND_NONE = "none"
+
+_LOCK_POLL_SECONDS = 0.2
+_REDIS_RETRY_SECONDS = 30.0
+
+_lock = threading.Lock()
+_lock_stats = {"acquired": 0, "waited": 0, "timeouts": 0, "errors": 0}
+
+
+def backend_name() -> str:
+    """The configured shared backend (unknown names mean SQLite)."""
+    if not config.CACHE_L2_ENABLED:
+        return BACKEND_NONE
+    name = config.CACHE_BACKEND
+    return name if name in (BACKEND_REDIS, BACKEND_NONE) else BACKEND_SQLITE
+
+
+# ---------------------------------------------------------------------------
+# Redis backend
+# ---------------------------------------------------------------------------
+class _RedisBackend:
+    """L2 entries and locks on a RESP server, keys under ``CACHE_REDIS_PREFIX``."""
+
+    def __init__(self, url: str, prefix: str) -> None:
+        self.url = url
+        self.prefix = prefix
+        self.client = RespClient(url)
+        self.down_until = 0.0
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "errors": 0}
+
+    def _command(self, *args: Any) -> Any:
+        """Run a command (OSError while the server is marked down)."""
+        if time.monotonic() < self.down_until:
+            raise OSError("cache server marked down")
+        try:
+            return self.client.command(*args)
+        except OSError:
+            self.down_until = time.monotonic() + _REDIS_RETRY_SECONDS
+            raise
+
+    def _count(self, name: str) -> None:
+        with _lock:
+            self.stats[name] += 1
+
+    def get(self, namespace: str, key: str) -> DiskEntry | None:
+        try:
+            blob = self._command("GET", f"{self.prefix}{namespace}:{key}")
+            if blob is None:
+                self._count("misses")
+                return None
+            kind, stored_at, expires_at, payload = blob.split(b"\n", 3)
+            entry = DiskEntry(_decode(kind.decode(), payload), float(stored_at), float(expires_at))
+        except (OSError, RespError, ValueError, TypeError) as exc:
+            logger.debug("shared_cache: redis read %s/%s failed: %s", namespace, key, exc)
+            self._count("errors")
+            return None
+        self._count("hits")
+        return entry
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        encoded = _encode(value)
+        if encoded is None:
+            return
+        kind, payload, _ = encoded
+        now = time.time()
+        blob = f"{kind}\n{now}\n{now + ttl}\n".encode() + payload
+        try:
+            self._command("SET", f"{self.prefix}{namespace}:{key}", blob, "PX", int(ttl * 1000))
+        except (OSError, RespError) as exc:
+            logger.debug("shared_cache: redis write %s/%s failed: %s", namespace, key, exc)
+            self._count("errors")
+            return
+        self._count("writes")
+
+    def delete(self, namespace: str, key: str) -> None:
+        try:
+            self._command("DEL", f"{self.prefix}{namespace}:{key}")
+        except (OSError, RespError) as exc:
+            logger.debug("shared_cache: redis delete %s/%s failed: %s", namespace, key, exc)
+
+    def clear(self) -> None:
+        with _lock:
+            for name in self.stats:
+                self.stats[name] = 0
+        self.down_until = 0.0
+        try:
+            cursor = "0"
+            while True:
+                cursor, keys = self._command("SCAN", cursor, "MATCH", f"{self.prefix}*", "COUNT", 500)
+                if keys:
+                    self._command("DEL", *keys)
+                cursor = cursor.decode() if isinstance(cursor, bytes) else str(cursor)
+                if cursor == "0":
+                    break
+        except (OSError, RespError) as exc:
+            logger.debug("shared_cache: redis clear failed: %s", exc)
+
+    def try_lock(self, key: str, owner: str, ttl: float) -> bool:
+        reply = self._command("SET", f"{self.prefix}lock:{key}", owner, "NX", "PX", int(ttl * 1000))
+        return reply == "OK"
+
+    def unlock(self, key: str, owner: str) -> None:
+        # GET + DEL is not atomic: a lock that expired in between could be
+        # dropped for its next owner — bounded by the lock TTL, and the only
+        # cost is one duplicate render
+        name = f"{self.prefix}lock:{key}"
+        if self._command("GET", name) == owner.encode():
+            self._command("DEL", name)
+
+
+_redis: _RedisBackend | None = None
+
+
+def _redis_backend() -> _RedisBackend:
+    global _redis  # pylint: disable=global-statement
+    with _lock:
+        if _redis is None or (_redis.url, _redis.prefix) != (
+            config.CACHE_REDIS_URL, config.CACHE_REDIS_PREFIX
+        ):
+            if _redis is not None:
+                _redis.client.close()
+            _redis = _RedisBackend(config.CACHE_REDIS_URL, config.CACHE_REDIS_PREFIX)
+        return _redis
+
+
+# ---------------------------------------------------------------------------
+# L2 API used by cache.py
+# ---------------------------------------------------------------------------
+def l2_get(namespace: str, key: str) -> DiskEntry | None:
+    """Return the live shared entry for *namespace* / *key*, or None."""
+    backend = backend_name()
+    if backend == BACKEND_REDIS:
+        return _redis_backend().get(namespace, key)
+    if backend == BACKEND_SQLITE:
+        return disk_get(namespace, key)
+    return None
+
+
+def l2_set(namespace: str, key: str, value: Any, ttl: float) -> None:
+    """Share *value* for *ttl* seconds."""
+    backend = backend_name()
+    if backend == BACKEND_REDIS:
+        _redis_backend().set(namespace, key, value, ttl)
+    elif backend == BACKEND_SQLITE:
+        disk_set(namespace, key, value, ttl)
+
+
+def l2_delete(namespace: str, key: str) -> None:
+    """Remove one shared entry."""
+    backend = backend_name()
+    if backend == BACKEND_REDIS:
+        _redis_backend().delete(namespace, key)
+    elif backend == BACKEND_SQLITE:
+        disk_delete(namespace, key)
+
+
+def l2_clear() -> None:
+    """Delete every shared entry and lock, and reset the counters."""
+    with _lock:
+        for name in _lock_stats:
+            _lock_stats[name] = 0
+    if backend_name() == BACKEND_REDIS:
+        _redis_backend().clear()
+    clear_disk_cache()
+
+
+def l2_stats() -> dict[str, Any]:
+    """Counters of the active backend plus the single-flight lock counters."""
+    backend = backend_name()
+    if backend == BACKEND_REDIS:
+        redis = _redis_backend()
+        with _lock:
+            stats: dict[str, Any] = dict(redis.stats)
+        stats["server"] = f"{redis.client.host}:{redis.client.port}"
+        stats["available"] = time.monotonic() >= redis.down_until
+    else:
+        stats = disk_cache_stats()
+    stats["backend"] = backend
+    with _lock:
+        stats["locks"] = dict(_lock_stats)
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# Cross-process single-flight
+# ---------------------------------------------------------------------------
+def _try_lock(key: str, owner: str) -> bool | None:
+    """True/False for taken/held elsewhere; None if the backend can't lock."""
+    backend = backend_name()
+    try:
+        if backend == BACKEND_REDIS:
+            return _redis_backend().try_lock(key, owner, config.CACHE_LOCK_TTL_SECONDS)
+        if backend == BACKEND_SQLITE:
+            return disk_try_lock(key, owner, config.CACHE_LOCK_TTL_SECONDS)
+    except (OSError, RespError, sqlite3.Error) as exc:
+        logger.debug("shared_cache: lock %s failed: %s", key, exc)
+        with _lock:
+            _lock_stats["errors"] += 1
+    return None
+
+
+def _unlock(key: str, owner: str) -> None:
+    try:
+        if backend_name() == BACKEND_REDIS:
+            _redis_backend().unlock(key, owner)
+        else:
+            disk_unlock(key, owner)
+    except (OSError, RespError, sqlite3.Error) as exc:
+        logger.debug("shared_cache: unlock %s failed: %s", key, exc)
+
+
+@contextmanager
+def single_flight(key: str) -> Iterator[bool]:
+    """Hold the shared lock *key* for the duration of the block.
+
+    Waits (polling) while another process holds it.  Yields True if the
+    lock was taken; False if the backend can't lock or the wait timed
+    out — the block runs regardless.
+    """
+    owner = f"{os.getpid()}:{uuid.uuid4().hex}"
+    deadline = time.monotonic() + config.CACHE_LOCK_TTL_SECONDS
+    waited = False
+    while True:
+        taken = _try_lock(key, owner)
+        if taken or taken is None:
+            break
+        if time.monotonic() >= deadline:
+            with _lock:
+                _lock_stats["timeouts"] += 1
+            logger.warning("shared_cache: gave up waiting for %s", key)
+            break
+        if not waited:
+            waited = True
+            logger.debug("shared_cache: %s held by another process — waiting", key)
+        time.sleep(_LOCK_POLL_SECONDS)
+    with _lock:
+        _lock_stats["acquired"] += bool(taken)
+        _lock_stats["waited"] += waited
+    try:
+        yield bool(taken)
+    finally:
+        if taken:
+            _unlock(key, owner)
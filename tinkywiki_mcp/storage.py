@@ -0,0 +1,91 @@
+"""Small SQLite persistence layer shared by on-disk stores (v1.5.0).
+
+Each store is a single SQLite file under ``config.DATA_DIR`` (env
+``TINKYWIKI_DATA_DIR``, default ``~/.cache/tinkywiki-mcp``).  Files are
+opened lazily in WAL mode so several server processes can share them, and
+each :class:`SQLiteStore` serialises its own statements with a
+``threading.Lock`` (MCP tool handlers run on several threads).
+
+If the data directory is not writable the store degrades to an in-memory
+database — persistence is an optimisation, never a requirement.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Iterable
+
+from . import config
+
+logger = logging.getLogger("TinkyWiki")
+
+_registry_lock = threading.Lock()
+_stores: list[SQLiteStore] = []
+
+
+class SQLiteStore:
+    """Lazily-opened SQLite database with a fixed schema."""
+
+    def __init__(self, name: str, schema: str) -> None:
+        self.name = name
+        self.schema = schema
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self.path: str = ""
+        with _registry_lock:
+            _stores.append(self)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+        path = os.path.join(config.DATA_DIR, f"{self.name}.sqlite3")
+        try:
+            os.makedirs(config.DATA_DIR, exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        except (OSError, sqlite3.Error) as exc:
+            logger.warning(
+                "storage: cannot open %s (%s) — using in-memory store", path, exc
+            )
+            path = ":memory:"
+            conn = sqlite3.connect(path, check_same_thread=False)
+        conn.executescript(self.schema)
+        conn.commit()
+        self._conn = conn
+        self.path = path
+        logger.debug("storage: opened %s", path)
+        return conn
+
+    def execute(self, sql: str, params: Iterable[Any] = ()) -> list[tuple]:
+        """Run one statement, commit, and return all result rows."""
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(sql, tuple(params)).fetchall()
+            conn.commit()
+            return rows
+
+    def executemany(self, sql: str, seq: Iterable[Iterable[Any]]) -> None:
+        """Run one statement for every parameter tuple in *seq*, then commit."""
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(sql, [tuple(p) for p in seq])
+            conn.commit()
+
+    def close(self) -> None:
+        """Close the connection; the next statement reopens it."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def close_all_stores() -> None:
+    """Close every store (used on shutdown and between tests)."""
+    with _registry_lock:
+        stores = list(_stores)
+    for store in stores:
+        store.close()
@@ -1,11 +1,13 @@
 """Tool registration helpers for TinkyWiki MCP.
 
-6 tools available:
+Tools available:
   - tinkywiki_list_topics       — Legacy text overview (httpx)
   - tinkywiki_read_structure    — JSON TOC/sections list (httpx)
   - tinkywiki_read_contents     — Full or section-specific markdown (httpx)
   - tinkywiki_search_wiki       — Interactive chat Q&A (Playwright)
   - tinkywiki_request_indexing  — Submit repo for indexing (Playwright)
+  - tinkywiki_diagnostics       — Circuit breakers, retries, caches (local)
+  - tinkywiki_indexing_status   — Queued auto-indexing requests (local)
 """
 
 from __future__ import annotations
@@ -21,6 +23,8 @@ def register_all_tools(mcp: FastMCP) -> None:
     # pylint: disable=import-outside-toplevel
     # Lazy imports avoid circular dependencies at module load time.
     from .contents import register as register_contents
+    from .diagnostics import register as register_diagnostics
+    from .indexing_status import register as register_indexing_status
     from .request_indexing import register as register_request_indexing
     from .search import register as register_search
     from .structure import register as register_structure
@@ -31,3 +35,5 @@ def register_all_tools(mcp: FastMCP) -> None:
     register_contents(mcp)
     register_search(mcp)
     register_request_indexing(mcp)
+    register_diagnostics(mcp)
+    register_indexing_status(mcp)
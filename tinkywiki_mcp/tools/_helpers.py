@@ -20,6 +20,7 @@ from ..fallback import (
 )
 from ..parser import WikiPage
 from ..rate_limit import time_until_next_slot, wait_for_rate_limit
+from ..refresh_ahead import record_access
 from ..resolver import is_bare_keyword, resolve_keyword, resolve_keyword_interactive
 from ..types import (
     ErrorCode,
@@ -189,6 +190,7 @@ def fetch_page_or_error(repo_url: str) -> WikiPage | ToolResponse:
     validated = validate_topics_input(repo_url)
     if isinstance(validated, ToolResponse):
         return validated
+    record_access(validated.repo_url)
 
     if not wait_for_rate_limit(validated.repo_url):
         retry_after = time_until_next_slot(validated.repo_url)
@@ -12,7 +12,8 @@ import time
 from mcp.server.fastmcp import Context, FastMCP
 
 from .. import config
-from ..fallback import build_source_banner
+from ..deepwiki import crawl_deepwiki_page, fetch_deepwiki_topic
+from ..fallback import SOURCE_DEEPWIKI, build_source_banner
 from ..parser import get_section_by_title
 from ..types import (
     ErrorCode,
@@ -134,6 +135,13 @@ def register(mcp: FastMCP) -> None:
         if isinstance(result, ToolResponse):
             return result.to_text()
 
+        # DeepWiki pages only link to their topics — fetch the requested one,
+        # or crawl them all for the full page
+        if result.source == SOURCE_DEEPWIKI and validated.section_title.strip():
+            result = fetch_deepwiki_topic(validated.repo_url, validated.section_title) or result
+        elif result.source == SOURCE_DEEPWIKI and config.DEEPWIKI_CRAWL_ENABLED:
+            result = crawl_deepwiki_page(validated.repo_url) or result
+
         if validated.section_title.strip():
             content_or_error = _build_section_content(
                 result,
@@ -159,5 +167,6 @@ def register(mcp: FastMCP) -> None:
                 truncated=truncated,
                 calls_remaining=rate_limit_remaining(validated.repo_url),
                 source=result.source,
+                stale=result.stale or None,
             ),
         ).to_text()
@@ -0,0 +1,40 @@
+"""tinkywiki_diagnostics tool — Runtime health of the upstream sources.
+
+Reports circuit-breaker state per upstream (TinkyWiki render/chat, DeepWiki
+render/Ask, GitHub API), retry counters, cache occupancy and the local
+answer index.  No network access — always instant.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+
+from mcp.server.fastmcp import Context, FastMCP
+
+from ..diagnostics import collect_diagnostics
+from ..types import ToolResponse
+
+logger = logging.getLogger("TinkyWiki")
+
+
+# ---------------------------------------------------------------------------
+# Public: tool registration
+# ---------------------------------------------------------------------------
+def register(mcp: FastMCP) -> None:
+    """Register the tinkywiki_diagnostics tool on the MCP server."""
+
+    @mcp.tool()
+    def tinkywiki_diagnostics(ctx: Context | None = None) -> str:  # pylint: disable=unused-argument
+        """
+        Show runtime diagnostics for the TinkyWiki MCP server.
+
+        Use this when tools are slow or keep falling back to DeepWiki / GitHub:
+        an ``open`` circuit breaker means that upstream is currently skipped.
+
+        **Response size**: ~1–3 KB of JSON.
+        """
+        logger.info("tinkywiki_diagnostics")
+        return ToolResponse.success(
+            json.dumps(collect_diagnostics(), indent=2)
+        ).to_text()
@@ -0,0 +1,66 @@
+"""tinkywiki_indexing_status tool — Progress of queued auto-indexing requests.
+
+When a repo is not indexed by TinkyWiki, the fallback chain queues an
+indexing request (see ``indexing_queue.py``).  This tool reports those
+jobs: one repo's job, or the most recent jobs plus per-status counts.
+Local only — always instant.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+
+from mcp.server.fastmcp import Context, FastMCP
+
+from ..indexing_queue import get_job, list_jobs, queue_stats
+from ..types import ToolResponse, validate_topics_input
+
+logger = logging.getLogger("TinkyWiki")
+
+
+# ---------------------------------------------------------------------------
+# Public: tool registration
+# ---------------------------------------------------------------------------
+def register(mcp: FastMCP) -> None:
+    """Register the tinkywiki_indexing_status tool on the MCP server."""
+
+    @mcp.tool()
+    def tinkywiki_indexing_status(
+        repo_url: str = "",
+        ctx: Context | None = None,  # pylint: disable=unused-argument
+    ) -> str:
+        """
+        Show the status of automatic TinkyWiki indexing requests.
+
+        Use this after a tool reported that TinkyWiki has not indexed a repo
+        (and fell back to DeepWiki / GitHub) to see whether the indexing
+        request is ``queued``, ``running``, ``submitted`` or ``failed``
+        (``none`` if no request was ever queued for it).
+
+        Args:
+            repo_url: Optional repository (https://github.com/owner/repo or
+                      owner/repo).  Omit to list the most recent jobs.
+        """
+        logger.info("tinkywiki_indexing_status — repo: %s", repo_url or "(all)")
+
+        if not repo_url.strip():
+            payload = {
+                "counts": queue_stats(),
+                "jobs": [job.to_dict() for job in list_jobs()],
+            }
+            return ToolResponse.success(json.dumps(payload, indent=2)).to_text()
+
+        validated = validate_topics_input(repo_url)
+        if isinstance(validated, ToolResponse):
+            return validated.to_text()
+
+        job = get_job(validated.repo_url)
+        payload = (
+            job.to_dict()
+            if job is not None
+            else {"repo_url": validated.repo_url, "status": "none"}
+        )
+        return ToolResponse.success(
+            json.dumps(payload, indent=2), repo_url=validated.repo_url
+        ).to_text()
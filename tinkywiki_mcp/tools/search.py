@@ -3,6 +3,9 @@
 The chat feature on TinkyWiki is an Angular SPA with a ``<chat>`` custom element
 containing ``<new-message-form>`` (textarea + send button) and ``<thread>``
 (virtual-scroll message list).  All interaction requires Playwright.
+
+v1.5.0: questions can be answered from the local BM25 index of already-parsed
+wiki pages (see ``local_index.py``), skipping the chat round-trip entirely.
 """
 
 from __future__ import annotations
@@ -16,13 +19,29 @@ from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from .. import config
 from ..browser import _get_browser, run_in_browser_loop
-from ..cache import get_cached_search, set_cached_search
+from ..cache import (
+    NEGATIVE_NOT_FOUND,
+    NEGATIVE_NOT_INDEXED,
+    NEGATIVE_TIMEOUT,
+    get_cached_search,
+    get_negative,
+    lookup_search,
+    search_key,
+    set_cached_search,
+    set_negative,
+)
 from ..fallback import (
     SOURCE_CODEWIKI,
+    SOURCE_LOCAL_INDEX,
     build_source_banner,
+    fetch_page_with_fallback,
+    is_source_known_missing,
     search_with_fallback,
 )
+from ..local_index import LocalAnswer, answer_locally, get_index
 from ..rate_limit import rate_limit_remaining, time_until_next_slot, wait_for_rate_limit
+from ..circuit_breaker import CircuitOpenError, call_with_breaker
+from ..retry import TINKYWIKI_CHAT, get_policy, is_retryable_code, retry_call
 from ..session_pool import (
     _get_or_create,
     _release,
@@ -488,6 +507,132 @@ def _run_search(inp: SearchInput) -> ToolResponse:
         )
 
 
+def _guarded_search(inp: SearchInput) -> ToolResponse:
+    """Run one chat attempt through the TinkyWiki chat circuit breaker."""
+    try:
+        return call_with_breaker(
+            TINKYWIKI_CHAT,
+            lambda: _run_search(inp),
+            is_failure=lambda r: r.status.value != "ok" and is_retryable_code(r.code),
+        )
+    except CircuitOpenError as exc:
+        return ToolResponse.error(
+            ErrorCode.CIRCUIT_OPEN,
+            f"TinkyWiki chat is temporarily unavailable ({exc}).",
+            repo_url=inp.repo_url,
+            query=inp.query,
+            meta=ResponseMeta(retry_after_seconds=round(exc.retry_after, 1)),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Local answer engine
+# ---------------------------------------------------------------------------
+def _answer_from_local_index(inp: SearchInput, allow_fetch: bool) -> LocalAnswer | None:
+    """Answer *inp* from the local wiki index.
+
+    When *allow_fetch* is True and the repo has not been indexed yet, the
+    wiki page is fetched through the fallback chain first (which indexes it).
+    """
+    if not config.LOCAL_INDEX_ENABLED:
+        return None
+    if allow_fetch and get_index(inp.repo_url) is None:
+        fetch_page_with_fallback(inp.repo_url)
+    return answer_locally(inp.repo_url, inp.query)
+
+
+def _local_answer_response(
+    inp: SearchInput, answer: LocalAnswer, note: str, start: float
+) -> str:
+    """Format a local-index answer as a successful tool response."""
+    banner = build_source_banner(SOURCE_LOCAL_INDEX, origin=answer.page_source)
+    cleaned = answer.text
+    truncated = False
+    if len(cleaned) > config.RESPONSE_MAX_CHARS:
+        cleaned = cleaned[: config.RESPONSE_MAX_CHARS] + "\n\n... [truncated]"
+        truncated = True
+
+    elapsed = int((time.monotonic() - start) * 1000)
+    return ToolResponse.success(
+        banner + note + cleaned,
+        repo_url=inp.repo_url,
+        query=inp.query,
+        meta=ResponseMeta(
+            elapsed_ms=elapsed,
+            truncated=truncated,
+            calls_remaining=rate_limit_remaining(inp.repo_url),
+            source=SOURCE_LOCAL_INDEX,
+        ),
+    ).to_text()
+
+
+# ---------------------------------------------------------------------------
+# Negative cache — questions no source could answer
+# ---------------------------------------------------------------------------
+_NEGATIVE_KINDS = {
+    ErrorCode.NOT_INDEXED: NEGATIVE_NOT_INDEXED,
+    ErrorCode.NO_CONTENT: NEGATIVE_TIMEOUT,  # an empty answer is transient, like an empty render
+    ErrorCode.TIMEOUT: NEGATIVE_TIMEOUT,
+}
+_NEGATIVE_CODES = {
+    NEGATIVE_NOT_FOUND: ErrorCode.NOT_INDEXED,
+    NEGATIVE_NOT_INDEXED: ErrorCode.NOT_INDEXED,
+    NEGATIVE_TIMEOUT: ErrorCode.TIMEOUT,
+}
+
+
+def _negative_key(inp: SearchInput) -> str:
+    return f"search::{search_key(inp.repo_url, inp.query)}"
+
+
+def _cached_failure_response(inp: SearchInput, start: float) -> str | None:
+    """Answer at once if every source failed this question moments ago."""
+    failure = get_negative(_negative_key(inp))
+    if failure is None:
+        return None
+    reason = "failed" if failure.kind == NEGATIVE_TIMEOUT else "had no answer"
+    return ToolResponse.error(
+        _NEGATIVE_CODES.get(failure.kind, ErrorCode.NO_CONTENT),
+        f"Every source {reason} for '{inp.query}' on {inp.repo_url} moments ago. "
+        f"Retry after {failure.retry_after:.0f}s.",
+        repo_url=inp.repo_url,
+        query=inp.query,
+        meta=ResponseMeta(
+            elapsed_ms=int((time.monotonic() - start) * 1000),
+            retry_after_seconds=round(failure.retry_after, 1),
+        ),
+    ).to_text()
+
+
+def _remember_failure(inp: SearchInput, code: ErrorCode) -> None:
+    """Negative-cache a chain-wide failure (never longer than an answer is cached)."""
+    kind = _NEGATIVE_KINDS.get(code)
+    if kind is not None:
+        set_negative(_negative_key(inp), kind, max_ttl=config.SEARCH_CACHE_TTL_SECONDS)
+
+
+def prefetch_answer(inp: SearchInput, use_chat: bool = True) -> str:
+    """Pre-answer a canned question so the first real ask is a cache hit.
+
+    Returns ``"cached"`` (already answered), ``"local"`` (the local index
+    answers it confidently — nothing to store), ``"chat"`` (asked and
+    cached) or ``"skipped"``.  Bypasses the per-repo rate limit; the chat
+    still goes through its circuit breaker.
+    """
+    if get_cached_search(inp.repo_url, inp.query) is not None:
+        return "cached"
+    local = _answer_from_local_index(inp, allow_fetch=True)
+    if local is not None and local.confident:
+        return "local"
+    if not use_chat or is_source_known_missing(inp.repo_url, SOURCE_CODEWIKI):
+        return "skipped"
+    result = _guarded_search(inp)
+    if result.status.value != "ok" or not result.data:
+        return "skipped"
+    set_cached_search(inp.repo_url, inp.query, result.data)
+    return "chat"
+
+
 # ---------------------------------------------------------------------------
 # Public: tool registration
 # ---------------------------------------------------------------------------
@@ -496,7 +641,10 @@ def register(mcp: FastMCP) -> None:
 
     @mcp.tool()
     def tinkywiki_search_wiki(
-        repo_url: str, query: str = "", ctx: Context | None = None
+        repo_url: str,
+        query: str = "",
+        answer_mode: str = "auto",
+        ctx: Context | None = None,
     ) -> str:
         """
         Ask Google TinkyWiki a question about an open-source repository.
@@ -506,6 +654,10 @@ def register(mcp: FastMCP) -> None:
 
         Results are cached for 2 minutes — repeated identical queries are instant.
 
+        **Local answers**: in ``auto`` mode, questions that the already-fetched
+        wiki content answers with high confidence are served from a local
+        index in milliseconds; other questions go to the live chat.
+
         **Response size**: typically 0.5–5 KB depending on the answer.
 
         **Rate limit**: max 10 calls per 60 s per repo URL.
@@ -516,14 +668,21 @@ def register(mcp: FastMCP) -> None:
                       Bare keywords (e.g. 'vue') are auto-resolved with
                       interactive disambiguation.
             query: The question to ask (required).
+            answer_mode: ``auto`` (default) — local index when confident,
+                         otherwise live chat; ``local`` — answer only from the
+                         wiki content (fetched if needed), never chat;
+                         ``chat`` — always use the live chat.
         """
         start = time.monotonic()
-        logger.info("tinkywiki_search_wiki — repo: %s, query: %s", repo_url, query)
+        logger.info(
+            "tinkywiki_search_wiki — repo: %s, query: %s, mode: %s",
+            repo_url, query, answer_mode,
+        )
 
         original_input = repo_url  # save before resolution
         repo_url = pre_resolve_keyword(repo_url, ctx)  # elicitation for bare keywords
 
-        validated = validate_search_input(repo_url, query)
+        validated = validate_search_input(repo_url, query, answer_mode)
         if isinstance(validated, ToolResponse):
             return validated.to_text()
 
@@ -546,53 +705,91 @@ def register(mcp: FastMCP) -> None:
 
         note = build_resolution_note(original_input, validated.repo_url)
 
-        # Check search cache first
-        cached = get_cached_search(validated.repo_url, validated.query)
+        # --- v1.5.0: local-only answers never touch the chat ---
+        if validated.answer_mode == "local":
+            local = _answer_from_local_index(validated, allow_fetch=True)
+            if local is not None:
+                return _local_answer_response(validated, local, note, start)
+            return ToolResponse.error(
+                ErrorCode.NO_CONTENT,
+                f"The local wiki index for {validated.repo_url} has no passage "
+                f"matching '{validated.query}'. Retry with answer_mode='chat'.",
+                repo_url=validated.repo_url,
+                query=validated.query,
+                meta=ResponseMeta(source=SOURCE_LOCAL_INDEX),
+            ).to_text()
+
+        # Check search cache first (also matches reworded / near-duplicate questions)
+        cached = lookup_search(validated.repo_url, validated.query)
         if cached is not None:
             elapsed = int((time.monotonic() - start) * 1000)
+            matched = ""
+            if cached.matched_query is not None:
+                matched = f'> **Cached answer** to the similar question "{cached.matched_query}"\n\n'
             return ToolResponse.success(
-                note + cached,
+                note + matched + cached.value,
                 repo_url=validated.repo_url,
                 query=validated.query,
                 meta=ResponseMeta(
                     elapsed_ms=elapsed,
-                    char_count=len(cached),
+                    char_count=len(cached.value),
                     calls_remaining=rate_limit_remaining(validated.repo_url),
+                    matched_query=cached.matched_query,
+                    similarity=cached.similarity if cached.matched_query is not None else None,
                 ),
             ).to_text()
 
-        last_error: ToolResponse | None = None
-        for attempt in range(1, config.MAX_RETRIES + 1):
-            logger.info("Attempt %d/%d", attempt, config.MAX_RETRIES)
-
-            result = _run_search(validated)
-
-            if result.status.value == "ok":
-                result.meta.attempt = attempt
-                result.meta.max_attempts = config.MAX_RETRIES
-                result.meta.elapsed_ms = int((time.monotonic() - start) * 1000)
-                result.meta.calls_remaining = rate_limit_remaining(validated.repo_url)
-                result.meta.source = SOURCE_CODEWIKI
-                # Cache the successful result
-                if result.data:
-                    set_cached_search(validated.repo_url, validated.query, result.data)
-                    result.data = note + result.data
-                return result.to_text()
-
-            last_error = result
-            last_error.meta.attempt = attempt
-            last_error.meta.max_attempts = config.MAX_RETRIES
-
-            if attempt < config.MAX_RETRIES:
-                time.sleep(config.RETRY_DELAY_SECONDS)
+        # --- v1.5.0: confident local answers skip the chat round-trip ---
+        if validated.answer_mode == "auto":
+            local = _answer_from_local_index(validated, allow_fetch=False)
+            if local is not None and local.confident:
+                return _local_answer_response(validated, local, note, start)
+
+        # --- v1.5.0: every source failed this question moments ago ---
+        failed = _cached_failure_response(validated, start)
+        if failed is not None:
+            return failed
+
+        # --- TinkyWiki chat, retried only on transient error codes ---
+        # (skipped entirely for repos TinkyWiki is known not to index)
+        if is_source_known_missing(validated.repo_url, SOURCE_CODEWIKI):
+            logger.info("TinkyWiki known not to index %s — skipping chat", validated.repo_url)
+            result = ToolResponse.error(
+                ErrorCode.NOT_INDEXED,
+                f"{validated.repo_url} is not indexed on TinkyWiki.",
+                repo_url=validated.repo_url,
+                query=validated.query,
+            )
+        else:
+            policy = get_policy(TINKYWIKI_CHAT)
+            outcome = retry_call(
+                policy,
+                lambda: _guarded_search(validated),
+                retry_if=lambda r: r.status.value != "ok" and is_retryable_code(r.code),
+            )
+            result = outcome.value
+            result.meta.attempt = outcome.attempts
+            result.meta.max_attempts = policy.max_attempts
+
+        if result.status.value == "ok":
+            result.meta.elapsed_ms = int((time.monotonic() - start) * 1000)
+            result.meta.calls_remaining = rate_limit_remaining(validated.repo_url)
+            result.meta.source = SOURCE_CODEWIKI
+            # Cache the successful result
+            if result.data:
+                set_cached_search(validated.repo_url, validated.query, result.data)
+                result.data = note + result.data
+            return result.to_text()
+
+        last_error: ToolResponse = result
 
         # --- v1.4.0: Fallback to DeepWiki Ask → GitHub search ---
-        if config.FALLBACK_ENABLED and last_error:
+        if config.FALLBACK_ENABLED:
             logger.info("TinkyWiki chat exhausted retries, trying fallback chain…")
 
             def _tinkywiki_search_fn() -> ToolResponse:
                 """Returns the last TinkyWiki error (already exhausted)."""
-                return last_error  # type: ignore[return-value]
+                return last_error
 
             fb_result = search_with_fallback(
                 validated.repo_url,
@@ -629,11 +826,9 @@ def register(mcp: FastMCP) -> None:
                     ),
                 ).to_text()
 
-        if last_error:
+        _remember_failure(validated, last_error.code)
+        # Terminal errors keep their own code — they were never retried
+        if is_retryable_code(last_error.code):
             last_error.code = ErrorCode.RETRY_EXHAUSTED
-            last_error.meta.elapsed_ms = int((time.monotonic() - start) * 1000)
-            return last_error.to_text()
-
-        return ToolResponse.error(
-            ErrorCode.INTERNAL, "All retry attempts failed."
-        ).to_text()
+        last_error.meta.elapsed_ms = int((time.monotonic() - start) * 1000)
+        return last_error.to_text()
@@ -81,5 +81,6 @@ def register(mcp: FastMCP) -> None:
                 char_count=len(data),
                 calls_remaining=rate_limit_remaining(page.url),
                 source=page.source,
+                stale=page.stale or None,
             ),
         ).to_text()
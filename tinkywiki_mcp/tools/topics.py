@@ -13,9 +13,9 @@ import time
 from mcp.server.fastmcp import Context, FastMCP
 
 from .. import config
-from ..cache import get_cached_topics, set_cached_topics
-from ..fallback import build_source_banner
-from ..parser import page_to_topic_list
+from ..cache import lookup_topics, set_cached_topics
+from ..fallback import build_source_banner, fetch_page_with_fallback
+from ..parser import WikiPage, page_to_topic_list
 from ..types import ResponseMeta, ToolResponse, validate_topics_input
 from ..rate_limit import rate_limit_remaining
 from ._helpers import (
@@ -28,6 +28,24 @@ from ._helpers import (
 logger = logging.getLogger("TinkyWiki")
 
 
+def _build_topics(page: WikiPage) -> tuple[str, bool]:
+    """Render *page* as a (possibly truncated) topic list."""
+    data = page_to_topic_list(page, preview_chars=config.TOPIC_PREVIEW_CHARS)
+    return truncate_response(data, config.RESPONSE_MAX_CHARS)
+
+
+def _refresh_topics(repo_url: str) -> None:
+    """Background refresh of a stale topic-list entry.
+
+    Only a fresh page re-stamps the entry; a stale one has just scheduled
+    its own refresh, and the next stale hit retries after it lands.
+    """
+    page = fetch_page_with_fallback(repo_url).page
+    if page is None or page.stale or not page.sections:
+        return
+    set_cached_topics(repo_url, _build_topics(page)[0], page.content_hash)
+
+
 # ---------------------------------------------------------------------------
 # Public: tool registration
 # ---------------------------------------------------------------------------
@@ -47,6 +65,8 @@ def register(mcp: FastMCP) -> None:
 
         **Response size**: typically 5–30 KB depending on the repository.
         Cached for 30 minutes — repeated calls for the same repo are instant.
+        Older lists are still returned at once (``meta.stale``) while a
+        background refresh runs.
 
         **Rate limit**: max 10 calls per 60 s per repo URL. Duplicate
         concurrent calls are automatically deduplicated.
@@ -70,16 +90,19 @@ def register(mcp: FastMCP) -> None:
 
         note = build_resolution_note(original_input, validated.repo_url)
 
-        cached = get_cached_topics(validated.repo_url)
+        cached = lookup_topics(
+            validated.repo_url, refresh=lambda: _refresh_topics(validated.repo_url)
+        )
         if cached is not None:
             elapsed = int((time.monotonic() - start) * 1000)
             return ToolResponse.success(
-                note + cached,
+                note + cached.value,
                 repo_url=validated.repo_url,
                 meta=ResponseMeta(
                     elapsed_ms=elapsed,
-                    char_count=len(cached),
+                    char_count=len(cached.value),
                     calls_remaining=rate_limit_remaining(validated.repo_url),
+                    stale=cached.stale or None,
                 ),
             ).to_text()
 
@@ -89,14 +112,11 @@ def register(mcp: FastMCP) -> None:
 
         page = result
         source_banner = build_source_banner(page.source) if page.source != "tinkywiki" else ""
-        data = page_to_topic_list(
-            page,
-            preview_chars=config.TOPIC_PREVIEW_CHARS,
-        )
-        data, truncated = truncate_response(data, config.RESPONSE_MAX_CHARS)
+        data, truncated = _build_topics(page)
 
-        # Store in topic cache (long TTL)
-        set_cached_topics(validated.repo_url, data)
+        # Store in topic cache (long TTL) — unless built from a stale page
+        if not page.stale:
+            set_cached_topics(validated.repo_url, data, page.content_hash)
 
         elapsed = int((time.monotonic() - start) * 1000)
 
@@ -109,5 +129,6 @@ def register(mcp: FastMCP) -> None:
                 truncated=truncated,
                 calls_remaining=rate_limit_remaining(validated.repo_url),
                 source=page.source,
+                stale=page.stale or None,
             ),
         ).to_text()
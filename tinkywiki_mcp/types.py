@@ -6,6 +6,7 @@ import hashlib
 import json
 import re
 from enum import Enum
+from typing import Literal
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -79,6 +80,13 @@ class SearchInput(RepoInput):
         min_length=1,
         description="The question to ask about the repository.",
     )
+    answer_mode: Literal["auto", "local", "chat"] = Field(
+        default="auto",
+        description=(
+            "'auto' answers from the local wiki index when confident, else chat; "
+            "'local' only uses the local index; 'chat' always uses live chat."
+        ),
+    )
 
     @field_validator("query")
     @classmethod
@@ -150,6 +158,7 @@ class ErrorCode(str, Enum):
     INTERNAL = "INTERNAL"
     RETRY_EXHAUSTED = "RETRY_EXHAUSTED"
     RATE_LIMITED = "RATE_LIMITED"
+    CIRCUIT_OPEN = "CIRCUIT_OPEN"
 
 
 class ResponseMeta(BaseModel):
@@ -163,7 +172,10 @@ class ResponseMeta(BaseModel):
     content_hash: str | None = None
     calls_remaining: int | None = None
     retry_after_seconds: float | None = None
-    source: str | None = None  # "tinkywiki", "deepwiki", or "github_api"
+    source: str | None = None  # "tinkywiki", "deepwiki", "github_api", or "local_index"
+    stale: bool | None = None  # True: cached data past its soft TTL, refresh scheduled
+    matched_query: str | None = None  # cached answer to this differently worded question
+    similarity: float | None = None  # of matched_query to the question asked (0–1)
 
 
 def _compute_hash(data: str) -> str:
@@ -237,10 +249,12 @@ class ToolResponse(BaseModel):
         )
 
 
-def validate_search_input(repo_url: str, query: str) -> SearchInput | ToolResponse:
+def validate_search_input(
+    repo_url: str, query: str, answer_mode: str = "auto"
+) -> SearchInput | ToolResponse:
     """Validate and normalize search inputs. Returns SearchInput or ToolResponse error."""
     try:
-        return SearchInput(repo_url=repo_url, query=query)
+        return SearchInput(repo_url=repo_url, query=query, answer_mode=answer_mode)
     except Exception as exc:  # pylint: disable=broad-except
         return ToolResponse.error(
             ErrorCode.VALIDATION,
@@ -0,0 +1,309 @@
+"""Startup cache warming from a repository manifest (v1.5.0).
+
+Every deploy starts with empty L1 caches, so the first request of the day
+for each repo pays for a full render.  A warm-up manifest lists the repos
+a team works with; after startup they are fetched in the background so
+those first requests are cache hits.
+
+The manifest comes from ``--warmup FILE``, ``TINKYWIKI_WARMUP_MANIFEST``
+(a file) or ``TINKYWIKI_WARMUP_REPOS`` (comma-separated).  Files are
+either JSON — a list, or ``{"repos": [...]}`` — whose items are repo
+strings or objects::
+
+    {"repo": "owner/name", "sections": ["Architecture"], "questions": ["How do I build it?"]}
+
+or plain text with one repo per line (``#`` starts a comment).
+
+For each repo the warm-up runs ``fetch_page_with_fallback`` (which also
+builds the local index) and caches the topic list; DeepWiki pages with
+requested sections are crawled, and canned questions are pre-answered
+(see ``tools.search.prefetch_answer``).  Repos are processed by
+``WARMUP_CONCURRENCY`` lowered-priority workers started from a daemon
+thread, so the server serves stdio clients immediately; progress is
+logged and exposed through :func:`warmup_status` and diagnostics.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from . import config
+from .types import ToolResponse, validate_topics_input
+
+logger = logging.getLogger("TinkyWiki")
+
+
+@dataclass
+class WarmupEntry:
+    """One manifest repo with the sections and questions to warm."""
+    repo_url: str
+    sections: list[str] = field(default_factory=list)
+    questions: list[str] = field(default_factory=list)
+
+
+@dataclass
+class _Progress:
+    total: int = 0
+    done: int = 0
+    failed: int = 0
+    invalid: int = 0
+    started_at: float = 0.0  # time.monotonic()
+    finished_at: float | None = None
+    current: set[str] = field(default_factory=set)
+    repos: list[dict[str, Any]] = field(default_factory=list)
+
+
+_lock = threading.Lock()
+_progress: _Progress | None = None
+_stop = threading.Event()
+_thread: threading.Thread | None = None
+
+
+# ---------------------------------------------------------------------------
+# Manifest
+# ---------------------------------------------------------------------------
+def _as_list(value: Any) -> list[str]:
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list):
+        return []
+    return [item.strip() for item in value if isinstance(item, str) and item.strip()]
+
+
+def parse_manifest(text: str) -> tuple[list[WarmupEntry], int]:
+    """Parse manifest *text*; return ``(entries, invalid_count)``.
+
+    Repos are normalised like tool input (``owner/repo`` shorthand is
+    accepted) and duplicates merged; unusable items are counted, not fatal.
+    """
+    raw: list[Any]
+    stripped = text.strip()
+    if stripped.startswith(("[", "{")):
+        data = json.loads(stripped)
+        raw = data.get("repos", []) if isinstance(data, dict) else data
+        if not isinstance(raw, list):
+            raise ValueError("manifest 'repos' must be a list")
+    else:
+        raw = [line.split("#", 1)[0].strip() for line in text.splitlines()]
+        raw = [line for line in raw if line]
+
+    entries: dict[str, WarmupEntry] = {}
+    invalid = 0
+    for item in raw:
+        if isinstance(item, str):
+            item = {"repo": item}
+        repo = (item.get("repo") or item.get("repo_url")) if isinstance(item, dict) else None
+        validated = validate_topics_input(repo) if isinstance(repo, str) else None
+        if validated is None or isinstance(validated, ToolResponse):
+            logger.warning("warmup: skipping invalid manifest entry %r", item)
+            invalid += 1
+            continue
+        entry = entries.setdefault(validated.repo_url, WarmupEntry(validated.repo_url))
+        for name in ("sections", "questions"):
+            target = getattr(entry, name)
+            target.extend(v for v in _as_list(item.get(name)) if v not in target)
+    return list(entries.values()), invalid
+
+
+def load_manifest(path: str | None = None) -> tuple[list[WarmupEntry], int]:
+    """Load the manifest from *path*, else from the environment settings."""
+    path = path or config.WARMUP_MANIFEST
+    if path:
+        return parse_manifest(Path(path).expanduser().read_text(encoding="utf-8"))
+    if config.WARMUP_REPOS:
+        return parse_manifest("\n".join(config.WARMUP_REPOS.split(",")))
+    return [], 0
+
+
+# ---------------------------------------------------------------------------
+# Warming one repo
+# ---------------------------------------------------------------------------
+def warm_repo(entry: WarmupEntry) -> dict[str, Any]:
+    """Fetch and cache everything *entry* asks for; return a result summary."""
+    # pylint: disable=import-outside-toplevel — the tools pull in the browser stack
+    from .cache import set_cached_topics
+    from .deepwiki import crawl_deepwiki_page, fetch_deepwiki_topic
+    from .fallback import SOURCE_DEEPWIKI, fetch_page_with_fallback
+    from .parser import get_section_by_title
+    from .tools.search import prefetch_answer
+    from .tools.topics import _build_topics
+    from .types import validate_search_input
+
+    start = time.monotonic()
+    summary: dict[str, Any] = {"repo_url": entry.repo_url, "status": "missing"}
+    result = fetch_page_with_fallback(entry.repo_url)
+    page = result.page
+    if page is None or not page.sections:
+        summary["elapsed_ms"] = int((time.monotonic() - start) * 1000)
+        return summary
+
+    summary["status"] = "ok"
+    summary["source"] = result.source
+    if not page.stale:
+        set_cached_topics(entry.repo_url, _build_topics(page)[0], page.content_hash)
+
+    if entry.sections:
+        if result.source == SOURCE_DEEPWIKI and config.DEEPWIKI_CRAWL_ENABLED:
+            page = crawl_deepwiki_page(entry.repo_url) or page
+        pages = {title: page for title in entry.sections}
+        if result.source == SOURCE_DEEPWIKI and not config.DEEPWIKI_CRAWL_ENABLED:
+            # fetch (and cache) just the requested topics
+            pages = {title: fetch_deepwiki_topic(entry.repo_url, title) or page
+                     for title in entry.sections}
+        missing = [title for title, found in pages.items()
+                   if get_section_by_title(found, title) is None]
+        if missing:
+            summary["sections_missing"] = missing
+
+    if entry.questions:
+        outcomes: dict[str, int] = {}
+        for question in entry.questions:
+            if _stop.is_set():
+                break
+            inp = validate_search_input(entry.repo_url, question)
+            if isinstance(inp, ToolResponse):
+                outcome = "invalid"
+            else:
+                outcome = prefetch_answer(inp, use_chat=config.WARMUP_USE_CHAT)
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        summary["questions"] = outcomes
+
+    summary["elapsed_ms"] = int((time.monotonic() - start) * 1000)
+    return summary
+
+
+def _warm_one(entry: WarmupEntry) -> None:
+    if _stop.is_set():
+        return
+    with _lock:
+        if _progress is not None:
+            _progress.current.add(entry.repo_url)
+    try:
+        summary = warm_repo(entry)
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.debug("warmup: %s failed", entry.repo_url, exc_info=True)
+        summary = {"repo_url": entry.repo_url, "status": "failed", "error": str(exc)}
+    with _lock:
+        progress = _progress
+        if progress is None:
+            return
+        progress.current.discard(entry.repo_url)
+        progress.repos.append(summary)
+        if summary["status"] == "ok":
+            progress.done += 1
+        else:
+            progress.failed += 1
+        finished = progress.done + progress.failed
+        total = progress.total
+    logger.info(
+        "warmup: [%d/%d] %s — %s", finished, total, entry.repo_url, summary["status"]
+    )
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+def _begin(entries: list[WarmupEntry], invalid: int) -> None:
+    global _progress  # pylint: disable=global-statement
+    with _lock:
+        _progress = _Progress(total=len(entries), invalid=invalid, started_at=time.monotonic())
+
+
+def _run(entries: list[WarmupEntry]) -> dict[str, Any]:
+    from .indexing_queue import _lower_thread_priority  # noqa: E402
+
+    logger.info("warmup: warming %d repos (%d workers)", len(entries), config.WARMUP_CONCURRENCY)
+    with ThreadPoolExecutor(
+        max_workers=max(1, config.WARMUP_CONCURRENCY),
+        thread_name_prefix="tinkywiki-warmup",
+        initializer=_lower_thread_priority,
+    ) as executor:
+        for entry in entries:
+            executor.submit(_warm_one, entry)
+    with _lock:
+        if _progress is not None:
+            _progress.finished_at = time.monotonic()
+    status = warmup_status()
+    logger.info(
+        "warmup: finished — %d warmed, %d failed in %.1fs",
+        status.get("done", 0), status.get("failed", 0), status.get("elapsed_seconds", 0.0),
+    )
+    return status
+
+
+def run_warmup(entries: list[WarmupEntry], invalid: int = 0) -> dict[str, Any]:
+    """Warm *entries* with ``WARMUP_CONCURRENCY`` workers; block until done."""
+    _begin(entries, invalid)
+    return _run(entries)
+
+
+def start_warmup(manifest_path: str | None = None) -> bool:
+    """Load the manifest and warm it on a daemon thread; False if there is none.
+
+    Returns at once — the caller (``server.main``) goes on to serve clients.
+    """
+    global _thread  # pylint: disable=global-statement
+    try:
+        entries, invalid = load_manifest(manifest_path)
+    except (OSError, ValueError) as exc:  # json.JSONDecodeError is a ValueError
+        logger.warning("warmup: could not read manifest: %s", exc)
+        return False
+    if not entries:
+        return False
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return True
+        _stop.clear()
+        _thread = threading.Thread(
+            target=_run, args=(entries,), daemon=True, name="tinkywiki-warmup"
+        )
+    _begin(entries, invalid)
+    _thread.start()
+    return True
+
+
+def stop_warmup(timeout: float = 5.0) -> None:
+    """Skip the repos not started yet and wait briefly for the running ones."""
+    _stop.set()
+    thread = _thread
+    if thread is not None:
+        thread.join(timeout=timeout)
+
+
+# ---------------------------------------------------------------------------
+# Stats / maintenance
+# ---------------------------------------------------------------------------
+def warmup_status() -> dict[str, Any]:
+    """Return warm-up progress (``{"configured": False}`` if none ran)."""
+    with _lock:
+        progress = _progress
+        if progress is None:
+            return {"configured": False}
+        end = progress.finished_at if progress.finished_at is not None else time.monotonic()
+        return {
+            "configured": True,
+            "total": progress.total,
+            "done": progress.done,
+            "failed": progress.failed,
+            "invalid": progress.invalid,
+            "in_progress": sorted(progress.current),
+            "finished": progress.finished_at is not None,
+            "elapsed_seconds": round(end - progress.started_at, 1),
+            "concurrency": max(1, config.WARMUP_CONCURRENCY),
+            "repos": list(progress.repos),
+        }
+
+
+def reset_warmup() -> None:
+    """Forget warm-up progress (mainly for testing)."""
+    global _progress  # pylint: disable=global-statement
+    _stop.clear()
+    with _lock:
+        _progress = None